@@ -8,6 +8,7 @@ import os
 from src.config.settings import Settings
 from entrenamiento_vistas.vista_ml_entrenamiento import VistaMLEntrenamiento
 from entrenamiento_vistas.vista_dl_entrenamiento import VistaDLEntrenamiento
+from entrenamiento_vistas.vista_cola_entrenamiento import VistaColaEntrenamiento
 
 class ModelImageIndicator(QLabel):
     """Widget que muestra la imagen del modelo (ML o DL)"""
@@ -180,10 +181,12 @@ class seleccion(QWidget):
         # Inicializar las vistas de entrenamiento
         self.vista_ml = VistaMLEntrenamiento(self.main_window_ref) # Pasar la referencia de MainWindow
         self.vista_dl = VistaDLEntrenamiento(self.main_window_ref) # Pasar la referencia de MainWindow
+        self.vista_cola = VistaColaEntrenamiento(self.main_window_ref)
         
         # Conectar señales de volver
         self.vista_ml.volver_solicitado.connect(lambda: self.stack.setCurrentIndex(0))
         self.vista_dl.volver_solicitado.connect(lambda: self.stack.setCurrentIndex(0))
+        self.vista_cola.volver_solicitado.connect(lambda: self.stack.setCurrentIndex(0))
         
         # La vista_seleccion se añade directamente, sin QScrollArea
         # self.scroll_area_seleccion = QScrollArea()
@@ -201,11 +204,17 @@ class seleccion(QWidget):
         scroll_dl.setWidget(self.vista_dl)
         scroll_dl.setWidgetResizable(True)
         scroll_dl.setFrameShape(QFrame.Shape.NoFrame)
+
+        scroll_cola = QScrollArea()
+        scroll_cola.setWidget(self.vista_cola)
+        scroll_cola.setWidgetResizable(True)
+        scroll_cola.setFrameShape(QFrame.Shape.NoFrame)
         
         # Agregar widgets/vistas al stack
         self.stack.addWidget(self.vista_seleccion)        # índice 0
         self.stack.addWidget(scroll_ml)                   # índice 1
         self.stack.addWidget(scroll_dl)                   # índice 2
+        self.stack.addWidget(scroll_cola)                 # índice 3
         
         # Layout principal
         main_layout = QVBoxLayout(self)
@@ -246,6 +255,12 @@ class seleccion(QWidget):
 
         # Añadir el cards_container (que ya tiene el layout horizontal por defecto)
         layout.addWidget(self.cards_container)
+
+        self.btn_cola = QPushButton("📋 Cola de Entrenamientos")
+        self.btn_cola.setObjectName("BotonColaEntrenamiento")
+        self.btn_cola.setToolTip("Trabajos encolados que se entrenan en segundo plano")
+        self.btn_cola.clicked.connect(lambda: self.stack.setCurrentIndex(3))
+        layout.addWidget(self.btn_cola, 0, Qt.AlignmentFlag.AlignCenter)
         layout.addStretch(1)
 
         description_label = QLabel(
@@ -0,0 +1,310 @@
+# model_browser.py
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QListView, QAbstractItemView
+from PyQt6.QtCore import (Qt, QAbstractListModel, QSortFilterProxyModel, QModelIndex,
+                          QRectF, QSize, pyqtSignal)
+from PyQt6.QtGui import QColor, QFont, QPen, QPainter
+
+# Roles propios: la vista nunca accede a la lista de modelos, solo a estos datos
+ModelDataRole = Qt.ItemDataRole.UserRole + 1
+IsDeepLearningRole = Qt.ItemDataRole.UserRole + 2
+CreationDateRole = Qt.ItemDataRole.UserRole + 3
+AccuracyRole = Qt.ItemDataRole.UserRole + 4
+SearchTextRole = Qt.ItemDataRole.UserRole + 5
+
+TYPE_ALL, TYPE_ML, TYPE_DL = 'all', 'ml', 'dl'
+
+# Opciones de orden: (etiqueta, rol, orden)
+SORT_OPTIONS = [
+    ("📅 Más recientes", CreationDateRole, Qt.SortOrder.DescendingOrder),
+    ("📅 Más antiguos", CreationDateRole, Qt.SortOrder.AscendingOrder),
+    ("🎯 Mayor precisión", AccuracyRole, Qt.SortOrder.DescendingOrder),
+    ("🔤 Nombre (A-Z)", Qt.ItemDataRole.DisplayRole, Qt.SortOrder.AscendingOrder),
+]
+
+DEFAULT_COLORS = {
+    'color_accent_red': "#E74C3C",
+    'color_accent_blue': "#3498DB",
+    'color_accent_green': "#27AE60",
+    'color_text_light': "#E0E0E0",
+    'color_text_medium': "#BDC3C7",
+    'color_text_dark': "#7F8C8D",
+    'color_groupbox_bg': "#333B47",
+    'color_groupbox_border': "#4A5568",
+}
+
+
+def model_key(model_data):
+    """Identidad de un modelo: el mismo nombre puede existir como ML y como DL"""
+    return (model_data.get('name', ''), bool(model_data.get('is_deep_learning', False)))
+
+
+class ModelListModel(QAbstractListModel):
+    """Modelos guardados como filas de un QAbstractListModel (un dict por modelo)
+
+    Las altas, bajas y cambios de un solo modelo se aplican sobre la fila
+    correspondiente sin reconstruir la lista.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._models = []
+        self._rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._models)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._models):
+            return None
+        model_data = self._models[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return model_data.get('display_name') or model_data.get('name', '')
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"{model_data.get('display_name', '')}\n{model_data.get('creation_date', '')}"
+        if role == ModelDataRole:
+            return model_data
+        if role == IsDeepLearningRole:
+            return bool(model_data.get('is_deep_learning', False))
+        if role == CreationDateRole:
+            # 'YYYY-MM-DD HH:MM:SS' ordena bien como texto; las fechas desconocidas quedan al final
+            date = model_data.get('creation_date') or ''
+            return date if date[:1].isdigit() else ''
+        if role == AccuracyRole:
+            accuracy = model_data.get('accuracy')
+            return float(accuracy) if accuracy else -1.0
+        if role == SearchTextRole:
+            return " ".join(str(model_data.get(key, '')) for key in ('name', 'display_name', 'model_type')).lower()
+        return None
+
+    def models(self):
+        return list(self._models)
+
+    def set_models(self, models):
+        """Reemplaza todas las filas (carga inicial o actualización completa)"""
+        self.beginResetModel()
+        self._models = list(models)
+        self._reindex()
+        self.endResetModel()
+
+    def _reindex(self):
+        self._rows = {model_key(model_data): row for row, model_data in enumerate(self._models)}
+
+    def find_row(self, model_data):
+        return self._rows.get(model_key(model_data), -1)
+
+    def add_or_update_model(self, model_data):
+        """Añade una fila al final o actualiza en su lugar la del mismo modelo"""
+        row = self.find_row(model_data)
+        if row >= 0:
+            self._models[row] = model_data
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+            return row
+        row = len(self._models)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._models.append(model_data)
+        self._rows[model_key(model_data)] = row
+        self.endInsertRows()
+        return row
+
+    def remove_model(self, model_data):
+        """Elimina solo la fila del modelo; retorna False si no estaba en la lista"""
+        row = self.find_row(model_data)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._models[row]
+        self._reindex()
+        self.endRemoveRows()
+        return True
+
+
+class ModelFilterProxy(QSortFilterProxyModel):
+    """Filtro por tipo (ML/DL) y texto, con orden por fecha, precisión o nombre
+
+    Con ``dynamicSortFilter`` las filas añadidas o modificadas se colocan en su
+    posición sin reordenar toda la lista.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._type_filter = TYPE_ALL
+        self._text_filter = ''
+        self.setDynamicSortFilter(True)
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+    def set_type_filter(self, type_filter):
+        if type_filter != self._type_filter:
+            self._type_filter = type_filter
+            self.invalidateFilter()
+
+    def set_text_filter(self, text):
+        text = text.strip().lower()
+        if text != self._text_filter:
+            self._text_filter = text
+            self.invalidateFilter()
+
+    def set_sort(self, role, order):
+        self.setSortRole(role)
+        self.sort(0, order)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self._type_filter != TYPE_ALL:
+            is_dl = index.data(IsDeepLearningRole)
+            if is_dl != (self._type_filter == TYPE_DL):
+                return False
+        if self._text_filter and self._text_filter not in index.data(SearchTextRole):
+            return False
+        return True
+
+
+class ModelCardDelegate(QStyledItemDelegate):
+    """Pinta cada modelo como tarjeta; solo se dibujan las filas visibles
+
+    ``compact=False`` reproduce la tarjeta de la vista de modelos (icono, nombre,
+    tipo y profesiones); ``compact=True`` es la fila de la página de inicio (nombre,
+    tipo, fecha y precisión). Los colores se leen de la ventana principal al pintar,
+    así que siguen los cambios de tema.
+    """
+
+    CARD_SIZE = QSize(280, 200)
+    COMPACT_HEIGHT = 92
+
+    def __init__(self, compact=False, parent=None):
+        super().__init__(parent)
+        self.compact = compact
+
+    @staticmethod
+    def _colors(widget):
+        window = widget.window() if widget is not None else None
+        return {name: getattr(window, name, default) for name, default in DEFAULT_COLORS.items()}
+
+    def sizeHint(self, option, index):
+        if self.compact:
+            # Fila a todo el ancho de la vista
+            width = option.widget.viewport().width() - 10 if option.widget is not None else 0
+            return QSize(max(width, 200), self.COMPACT_HEIGHT)
+        return self.CARD_SIZE
+
+    def paint(self, painter, option, index):
+        model_data = index.data(ModelDataRole)
+        if model_data is None:
+            return
+        colors = self._colors(option.widget)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = QRectF(option.rect).adjusted(1, 1, -1, -1)
+        background = QColor(colors['color_groupbox_bg'])
+        if hovered:
+            background = background.lighter(115) if background.lightnessF() < 0.5 else background.darker(105)
+        border = QColor(colors['color_accent_blue'] if hovered else colors['color_groupbox_border'])
+        painter.setPen(QPen(border, 1.5 if hovered else 1))
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 8, 8)
+
+        if self.compact:
+            self._paint_compact(painter, rect, model_data, colors)
+        else:
+            self._paint_card(painter, rect, model_data, colors)
+        painter.restore()
+
+    def _paint_card(self, painter, rect, model_data, colors):
+        is_dl = model_data.get('is_deep_learning', False)
+        content = rect.adjusted(20, 20, -20, -20)
+        flags_center = Qt.AlignmentFlag.AlignHCenter | Qt.TextFlag.TextWordWrap
+
+        icon_font = QFont(painter.font())
+        icon_font.setPixelSize(48)
+        painter.setFont(icon_font)
+        painter.setPen(QColor(colors['color_accent_red'] if is_dl else colors['color_accent_blue']))
+        painter.drawText(QRectF(content.left(), content.top(), content.width(), 80),
+                         Qt.AlignmentFlag.AlignCenter, "🧠" if is_dl else "🤖")
+
+        name_font = QFont(painter.font())
+        name_font.setPixelSize(14)
+        name_font.setBold(True)
+        painter.setFont(name_font)
+        painter.setPen(QColor(colors['color_text_light']))
+        name_rect = QRectF(content.left(), content.top() + 95, content.width(), 38)
+        painter.drawText(name_rect, flags_center, model_data.get('display_name', 'Modelo Sin Nombre'))
+
+        info_text = f"{model_data.get('model_type', 'Desconocido')}"
+        if 'num_professions' in model_data:
+            info_text += f" • {model_data['num_professions']} profesiones"
+        if model_data.get('accuracy'):
+            info_text += f" • {model_data['accuracy']:.1%}"
+        info_font = QFont(painter.font())
+        info_font.setPixelSize(11)
+        info_font.setBold(False)
+        painter.setFont(info_font)
+        painter.setPen(QColor(colors['color_text_medium']))
+        painter.drawText(QRectF(content.left(), name_rect.bottom() + 4, content.width(), 32),
+                         flags_center, info_text)
+
+    def _paint_compact(self, painter, rect, model_data, colors):
+        content = rect.adjusted(12, 8, -12, -8)
+        line_height = content.height() / 4
+        kind = 'DL' if model_data.get('is_deep_learning', False) else 'ML'
+        accuracy = model_data.get('accuracy') or 0
+
+        title_font = QFont(painter.font())
+        title_font.setPointSize(11)
+        title_font.setBold(True)
+        painter.setFont(title_font)
+        lines = [(f"{model_data.get('display_name', '')} ({kind})", colors['color_text_light'])]
+        lines.append((f"Tipo: {model_data.get('model_type', 'Desconocido')}", colors['color_text_medium']))
+        lines.append((f"Creado: {model_data.get('creation_date', 'Desconocida')}", colors['color_text_medium']))
+        lines.append((f"Precisión: {accuracy:.1%}" if accuracy > 0 else "Precisión: N/A",
+                      colors['color_accent_green'] if accuracy > 0 else colors['color_text_dark']))
+
+        for i, (text, color) in enumerate(lines):
+            if i == 1:
+                detail_font = QFont(painter.font())
+                detail_font.setPointSize(9)
+                detail_font.setBold(False)
+                painter.setFont(detail_font)
+            painter.setPen(QColor(color))
+            line_rect = QRectF(content.left(), content.top() + i * line_height, content.width(), line_height)
+            elided = painter.fontMetrics().elidedText(text, Qt.TextElideMode.ElideRight, int(line_rect.width()))
+            painter.drawText(line_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided)
+
+
+class ModelBrowserView(QListView):
+    """Vista de tarjetas de modelos sobre ModelListModel/ModelFilterProxy
+
+    En modo rejilla (por defecto) reparte las tarjetas en columnas según el ancho
+    disponible; en modo compacto es una lista vertical. Un clic emite el dict del modelo.
+    """
+    model_selected = pyqtSignal(dict)
+
+    def __init__(self, compact=False, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(ModelCardDelegate(compact, self))
+        self.setMouseTracking(True)
+        self.setUniformItemSizes(not compact)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFrameShape(QListView.Shape.NoFrame)
+        self.setStyleSheet("QListView { background: transparent; }")
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        if compact:
+            self.setViewMode(QListView.ViewMode.ListMode)
+            self.setSpacing(5)
+        else:
+            self.setViewMode(QListView.ViewMode.IconMode)
+            self.setMovement(QListView.Movement.Static)
+            self.setWrapping(True)
+            self.setSpacing(10)
+        self.clicked.connect(self._emit_model_selected)
+
+    def _emit_model_selected(self, index):
+        model_data = index.data(ModelDataRole)
+        if model_data is not None:
+            self.model_selected.emit(model_data)
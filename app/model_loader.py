@@ -0,0 +1,117 @@
+# model_loader.py
+from collections import OrderedDict
+from functools import partial
+from PyQt6.QtCore import QObject, pyqtSignal
+from models.cv_classifier import CVClassifier
+from models.deep_learning_classifier import DeepLearningClassifier
+from app.task_executor import shared_executor
+
+
+class ModelCache:
+    """Caché LRU de clasificadores ya cargados, por (nombre, es_deep_learning)"""
+
+    def __init__(self, capacity=3):
+        self.capacity = capacity
+        self._items = OrderedDict()
+
+    def get(self, key):
+        classifier = self._items.get(key)
+        if classifier is not None:
+            self._items.move_to_end(key)
+        return classifier
+
+    def put(self, key, classifier):
+        self._items[key] = classifier
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def discard(self, key):
+        self._items.pop(key, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def __contains__(self, key):
+        return key in self._items
+
+
+def load_classifier(task, model_name, is_deep_learning):
+    """Tarea del ejecutor: carga un modelo en un clasificador nuevo fuera del hilo de la interfaz
+
+    Publica avances como tuplas (paso, total, mensaje).
+    """
+    classifier = DeepLearningClassifier() if is_deep_learning else CVClassifier()
+    try:
+        success = classifier.load_model(
+            model_name,
+            progress_callback=lambda step, total, message: task.report((step, total, message))
+        )
+    except Exception as e:
+        raise RuntimeError(f"Error al cargar el modelo '{model_name}': {str(e)}") from e
+    if not success:
+        raise RuntimeError(f"No se pudo cargar el modelo '{model_name}'. Verifica su integridad.")
+    return classifier
+
+
+class AsyncModelLoader(QObject):
+    """Carga modelos en segundo plano con caché LRU para volver al instante a un modelo reciente
+
+    Las cargas se ejecutan en el ejecutor compartido (categoría ``model_io``). Mientras
+    se carga un modelo el anterior sigue en uso; si se pide otro antes de que termine,
+    el resultado de la carga anterior se descarta. Los modelos cargados quedan en la
+    caché aunque su carga se haya superado por otra.
+    """
+    load_progress = pyqtSignal(int, int, str)            # paso, total, mensaje
+    model_ready = pyqtSignal(str, bool, object, bool)    # nombre, es_dl, clasificador, desde_cache
+    load_failed = pyqtSignal(str, bool, str)             # nombre, es_dl, mensaje
+
+    def __init__(self, cache_size=3, executor=None, parent=None):
+        super().__init__(parent)
+        self.cache = ModelCache(cache_size)
+        self.executor = executor or shared_executor()
+        self._current = None
+
+    @property
+    def is_loading(self):
+        return self._current is not None and self._current.is_active
+
+    def load(self, model_name, is_deep_learning, use_cache=True):
+        key = (model_name, is_deep_learning)
+        self._current = None
+        if use_cache:
+            classifier = self.cache.get(key)
+            if classifier is not None:
+                self.model_ready.emit(model_name, is_deep_learning, classifier, True)
+                return
+        else:
+            self.cache.discard(key)
+
+        handle = self.executor.submit(load_classifier, model_name, is_deep_learning,
+                                      category='model_io', name='model_load')
+        if handle is None:
+            self.load_failed.emit(model_name, is_deep_learning,
+                                  "Hay demasiadas cargas de modelos en espera. Intenta de nuevo en unos segundos.")
+            return
+        handle.progress.connect(partial(self._on_progress, handle))
+        handle.finished.connect(partial(self._on_loaded, handle, key))
+        handle.failed.connect(partial(self._on_failed, handle, key))
+        self._current = handle
+
+    def _on_progress(self, handle, payload):
+        if handle is self._current:
+            self.load_progress.emit(*payload)
+
+    def _on_loaded(self, handle, key, classifier):
+        self.cache.put(key, classifier)
+        if handle is self._current:
+            self._current = None
+            self.model_ready.emit(key[0], key[1], classifier, False)
+
+    def _on_failed(self, handle, key, message):
+        if handle is self._current:
+            self._current = None
+            self.load_failed.emit(key[0], key[1], message)
+
+    def wait(self, msecs=-1):
+        return self.executor.wait(msecs)
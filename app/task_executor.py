@@ -0,0 +1,258 @@
+# task_executor.py
+import os
+import time
+import threading
+from collections import defaultdict, deque
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
+from src.monitoring import metrics
+
+# Tareas simultáneas por categoría; el resto espera en su cola
+DEFAULT_LIMITS = {
+    'classification': 2,  # Clasificación de un CV (extracción + predicción)
+    'batch': 1,           # Lotes de CVs: ya extraen en paralelo con su propio pool de procesos
+    'model_io': 1,        # Carga de modelos: TensorFlow no se beneficia de cargas simultáneas
+}
+DEFAULT_MAX_QUEUED = 8
+HISTORY_SIZE = 200
+
+
+class TaskCancelled(Exception):
+    """Lanzada por ``TaskHandle.check_cancelled()`` para abandonar una tarea cancelada"""
+
+
+class CancelToken:
+    """Bandera de cancelación cooperativa, segura entre hilos
+
+    La tarea la consulta entre pasos (``is_cancelled()``) o usa ``check()`` para
+    salir con ``TaskCancelled``. Puede pasarse como ``should_stop=token.is_cancelled``.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def is_cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class TaskHandle(QObject):
+    """Referencia a una tarea enviada al ejecutor
+
+    ``finished``, ``failed`` y ``cancelled`` se emiten en el hilo de la interfaz y
+    solo una de ellas por tarea; una tarea cancelada nunca entrega su resultado.
+    """
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    _completed = pyqtSignal(object)  # Interna: del hilo de trabajo al ejecutor
+
+    def __init__(self, task_id, name, category, key=None):
+        super().__init__()
+        self.task_id = task_id
+        self.name = name
+        self.category = category
+        self.key = key
+        self.token = CancelToken()
+        self.state = 'queued'
+        self.result = None
+        self.error = None
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+
+    def cancel(self):
+        self.token.cancel()
+
+    def is_cancelled(self):
+        return self.token.is_cancelled()
+
+    def check_cancelled(self):
+        self.token.check()
+
+    def report(self, payload):
+        """Publica un avance de la tarea (se ignora si ya fue cancelada)"""
+        if not self.token.is_cancelled():
+            self.progress.emit(payload)
+
+    @property
+    def is_active(self):
+        return self.state in ('queued', 'running')
+
+    @property
+    def timing(self):
+        started = self.started_at or self.finished_at or self.queued_at
+        return {
+            'task_id': self.task_id,
+            'name': self.name,
+            'category': self.category,
+            'state': self.state,
+            'queued_seconds': started - self.queued_at,
+            'run_seconds': (self.finished_at - self.started_at) if self.started_at and self.finished_at else 0.0,
+        }
+
+
+class _TaskRunnable(QRunnable):
+    def __init__(self, handle, fn, args, kwargs):
+        super().__init__()
+        self.handle = handle
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        handle = self.handle
+        handle.started_at = time.perf_counter()
+        try:
+            handle.check_cancelled()
+            handle.state = 'running'
+            result = self.fn(handle, *self.args, **self.kwargs)
+            if handle.is_cancelled():
+                handle.state = 'cancelled'
+            else:
+                handle.result = result
+                handle.state = 'finished'
+        except TaskCancelled:
+            handle.state = 'cancelled'
+        except Exception as e:
+            handle.error = str(e)
+            handle.state = 'cancelled' if handle.is_cancelled() else 'failed'
+        finally:
+            handle.finished_at = time.perf_counter()
+            handle._completed.emit(handle)
+
+
+class TaskExecutor(QObject):
+    """Ejecutor compartido de tareas de la interfaz sobre un QThreadPool
+
+    - Reutiliza los hilos del pool en lugar de crear un QThread por clic.
+    - Limita las tareas simultáneas por categoría (``limits``) y encola el resto.
+    - Contrapresión: si la cola de una categoría está llena, ``submit`` devuelve None.
+    - Con ``key``, una tarea nueva cancela la anterior con la misma clave (p. ej. un
+      segundo clic en "Clasificar" deja obsoleto el resultado del primero).
+    - Registra colas y duraciones en las métricas (etapas ``task_wait`` y ``task_run``)
+      y en ``history``.
+
+    Las tareas son funciones ``fn(handle, *args, **kwargs)``: consultan
+    ``handle.is_cancelled()`` entre pasos y publican avances con ``handle.report()``.
+    """
+    task_completed = pyqtSignal(dict)  # Tiempos de cada tarea terminada
+
+    def __init__(self, max_threads=None, limits=None, max_queued=DEFAULT_MAX_QUEUED, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or max(2, min(4, os.cpu_count() or 2)))
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_queued = max_queued
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self._queues = defaultdict(deque)
+        self._running = defaultdict(int)
+        self._keys = {}
+        self._active = {}
+        self._next_id = 0
+
+    def submit(self, fn, *args, category='classification', name=None, key=None, **kwargs):
+        """Encola ``fn`` y devuelve su TaskHandle, o None si la cola de la categoría está llena"""
+        if key is not None and key in self._keys:
+            self.cancel(self._keys[key])
+
+        queue = self._queues[category]
+        if len(queue) >= self.max_queued:
+            metrics.increment('task_rejected', category=category)
+            return None
+
+        self._next_id += 1
+        handle = TaskHandle(self._next_id, name or getattr(fn, '__name__', 'tarea'), category, key)
+        handle._completed.connect(self._on_completed)
+        self._active[handle.task_id] = handle
+        if key is not None:
+            self._keys[key] = handle
+        queue.append((handle, _TaskRunnable(handle, fn, args, kwargs)))
+        self._dispatch(category)
+        return handle
+
+    def cancel(self, handle):
+        """Cancela una tarea: si aún está en cola no llega a ejecutarse"""
+        handle.cancel()
+        queue = self._queues[handle.category]
+        for entry in queue:
+            if entry[0] is handle:
+                queue.remove(entry)
+                handle.finished_at = time.perf_counter()
+                handle.state = 'cancelled'
+                self._finish(handle)
+                break
+
+    def cancel_all(self, category=None):
+        for handle in list(self._active.values()):
+            if category is None or handle.category == category:
+                self.cancel(handle)
+
+    def _dispatch(self, category):
+        queue = self._queues[category]
+        limit = self.limits.get(category, self.pool.maxThreadCount())
+        while queue and self._running[category] < limit:
+            handle, runnable = queue.popleft()
+            self._running[category] += 1
+            self.pool.start(runnable)
+
+    def _on_completed(self, handle):
+        self._running[handle.category] -= 1
+        self._finish(handle)
+        self._dispatch(handle.category)
+
+    def _finish(self, handle):
+        self._active.pop(handle.task_id, None)
+        if handle.key is not None and self._keys.get(handle.key) is handle:
+            del self._keys[handle.key]
+
+        timing = handle.timing
+        self.history.append(timing)
+        metrics.registry.observe('task_wait', timing['queued_seconds'], category=handle.category)
+        if handle.started_at is not None:
+            metrics.registry.observe('task_run', timing['run_seconds'], error=handle.state == 'failed',
+                                     category=handle.category, task=handle.name)
+        if handle.state == 'cancelled':
+            metrics.increment('task_cancelled', category=handle.category)
+
+        if handle.state == 'finished':
+            handle.finished.emit(handle.result)
+        elif handle.state == 'failed':
+            handle.failed.emit(handle.error)
+        else:
+            handle.cancelled.emit()
+        self.task_completed.emit(timing)
+
+    def stats(self):
+        """Tareas en ejecución y en cola por categoría"""
+        categories = set(self._queues) | set(self._running)
+        return {category: {'running': self._running[category], 'queued': len(self._queues[category])}
+                for category in sorted(categories)}
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def shutdown(self, msecs=5000):
+        """Cancela todo y espera a las tareas en curso (al cerrar la aplicación)"""
+        self.cancel_all()
+        return self.wait(msecs)
+
+
+_shared_executor = None
+
+
+def shared_executor():
+    """Ejecutor único de la aplicación; se apaga solo al salir de QApplication"""
+    global _shared_executor
+    if _shared_executor is None:
+        app = QCoreApplication.instance()
+        _shared_executor = TaskExecutor(parent=app)
+        if app is not None:
+            app.aboutToQuit.connect(_shared_executor.shutdown)
+    return _shared_executor
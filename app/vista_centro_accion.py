@@ -3,13 +3,18 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QGroupBox, QComboBox, QTextEdit,
                              QFileDialog, QMessageBox, QTableWidget,
                              QTableWidgetItem, QHeaderView, QSplitter, QGridLayout,
-                             QFrame, QScrollArea)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+                             QFrame, QScrollArea, QProgressBar)
+from PyQt6.QtCore import Qt, QObject, pyqtSignal, QTimer
 from PyQt6.QtGui import QColor, QFont
 import os
-import PyPDF2
+import csv
+import time
 from models.cv_classifier import CVClassifier
 from models.deep_learning_classifier import DeepLearningClassifier
+from models.text_extraction import extract_text_from_pdf, iter_extracted_texts, list_cv_files
+from src.monitoring import profiling
+from app.model_loader import AsyncModelLoader
+from app.task_executor import shared_executor
 
 
 class PulsingButton(QPushButton):
@@ -119,57 +124,116 @@ class ModelStatusCard(QFrame):
         self._update_style()
 
 
-class ClassificationWorker(QThread):
-    """Worker thread para clasificación de CVs en segundo plano"""
-    progress_updated = pyqtSignal(str)
-    classification_completed = pyqtSignal(dict)
-    classification_failed = pyqtSignal(str)
+def classify_cv_file(task, cv_file_path, classifier, is_deep_learning=False):
+    """Tarea del ejecutor: extrae el texto de un CV y lo clasifica
 
-    def __init__(self, cv_file_path, classifier, is_deep_learning=False):
-        super().__init__()
-        self.cv_file_path = cv_file_path
-        self.classifier = classifier
-        self.is_deep_learning = is_deep_learning
+    Returns:
+        dict: resultado de ``predict_cv`` con 'cv_file' y 'model_type', o
+        {'error': True, 'message': ...} si no se pudo clasificar
+    """
+    task.report("Extrayendo texto del CV...")
 
-    def extract_text_from_pdf(self, pdf_path):
-        try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text.strip()
-        except Exception as e:
-            return ""
+    if cv_file_path.lower().endswith('.pdf'):
+        cv_text = extract_text_from_pdf(cv_file_path)
+    else:
+        with open(cv_file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            cv_text = f.read()
 
-    def run(self):
-        try:
-            self.progress_updated.emit("Extrayendo texto del CV...")
+    if not cv_text or not cv_text.strip():
+        return {'error': True, 'message': "No se pudo extraer texto o el archivo está vacío."}
 
-            if self.cv_file_path.lower().endswith('.pdf'):
-                cv_text = self.extract_text_from_pdf(self.cv_file_path)
-            else:
-                with open(self.cv_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    cv_text = f.read()
+    task.check_cancelled()
+    task.report("Clasificando CV con modelo entrenado...")
+    result = classifier.predict_cv(cv_text)
 
-            if not cv_text or not cv_text.strip():
-                self.classification_failed.emit("No se pudo extraer texto o el archivo está vacío.")
-                return
+    if result.get('error', False):
+        return {'error': True, 'message': result.get('message', 'Error desconocido en clasificación')}
+    result['cv_file'] = os.path.basename(cv_file_path)
+    result['model_type'] = 'Deep Learning' if is_deep_learning else 'Machine Learning'
+    return result
 
-            self.progress_updated.emit("Clasificando CV con modelo entrenado...")
-            result = self.classifier.predict_cv(cv_text)
 
-            if result.get('error', False):
-                self.classification_failed.emit(result.get('message', 'Error desconocido en clasificación'))
-            else:
-                result['cv_file'] = os.path.basename(self.cv_file_path)
-                result['model_type'] = 'Deep Learning' if self.is_deep_learning else 'Machine Learning'
-                self.classification_completed.emit(result)
+class BatchClassificationJob(QObject):
+    """Clasifica muchos CVs como tarea del ejecutor: extracción en paralelo y predicción por lotes
 
-        except Exception as e:
-            self.classification_failed.emit(f"Error durante la clasificación: {str(e)}")
+    Las filas se publican a medida que se clasifican; al cancelar, las ya
+    publicadas se conservan y los contadores reflejan lo procesado.
+    """
+    progress_updated = pyqtSignal(int, int)  # procesados, total
+    row_ready = pyqtSignal(dict)
+
+    def __init__(self, file_paths, classifier, is_deep_learning=False, batch_size=32, max_workers=None):
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.classifier = classifier
+        self.is_deep_learning = is_deep_learning
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.processed = 0
+        self.classified = 0
+        self.failed = 0
+
+    def summary(self, seconds, cancelled=False):
+        return {
+            'total': len(self.file_paths),
+            'processed': self.processed,
+            'classified': self.classified,
+            'failed': self.failed,
+            'cancelled': cancelled,
+            'seconds': seconds
+        }
+
+    def _emit_row(self, file_path, result):
+        row = {'file': os.path.basename(file_path), 'path': file_path}
+        if result.get('error', False):
+            row.update({'status': 'error', 'message': result.get('message', 'Error desconocido')})
+            self.failed += 1
+        else:
+            row.update({
+                'status': 'ok',
+                'predicted_profession': result['predicted_profession'],
+                'confidence': result['confidence'],
+                'confidence_level': result['confidence_level']
+            })
+            self.classified += 1
+        self.processed += 1
+        self.row_ready.emit(row)
+        self.progress_updated.emit(self.processed, len(self.file_paths))
+
+    def _classify_pending(self, pending):
+        results = self.classifier.predict_batch([text for _, text in pending])
+        for (file_path, _), result in zip(pending, results):
+            self._emit_row(file_path, result)
+
+    def run(self, task):
+        with profiling.profile_run('batch_classification', metadata={
+                'files': len(self.file_paths), 'deep_learning': self.is_deep_learning,
+                'batch_size': self.batch_size}):
+            return self._run(task)
+
+    def _run(self, task):
+        start = time.perf_counter()
+        pending = []
+        last_flush = start
+
+        for file_path, text, error in iter_extracted_texts(
+                self.file_paths, self.max_workers, should_stop=task.is_cancelled):
+            if not text:
+                self._emit_row(file_path, {'error': True,
+                                           'message': error or "No se pudo extraer texto o el archivo está vacío"})
+                continue
+
+            pending.append((file_path, text))
+            # Clasificar al completar un lote, o antes si la extracción va lenta, para mostrar filas pronto
+            if len(pending) >= self.batch_size or time.perf_counter() - last_flush > 1.0:
+                self._classify_pending(pending)
+                pending = []
+                last_flush = time.perf_counter()
+
+        if pending and not task.is_cancelled():
+            self._classify_pending(pending)
+
+        return self.summary(time.perf_counter() - start, cancelled=task.is_cancelled())
 
 
 class VistaCentroAccion(QWidget):
@@ -187,7 +251,20 @@ class VistaCentroAccion(QWidget):
         self.selected_cv_file = None
         self.ml_classifier = CVClassifier()
         self.dl_classifier = DeepLearningClassifier()
-        self.classification_worker = None
+        # Clasificación, lotes y carga de modelos comparten el ejecutor de tareas de la aplicación
+        self.executor = shared_executor()
+        self.classification_task = None
+        self.batch_files = []
+        self.batch_rows = []
+        self.batch_job = None
+        self.batch_task = None
+
+        # Carga de modelos en segundo plano; el modelo actual sigue activo hasta que el nuevo esté listo
+        self.model_loader = AsyncModelLoader(executor=self.executor, parent=self)
+        self.model_loader.load_progress.connect(self.on_model_load_progress)
+        self.model_loader.model_ready.connect(self.on_model_ready)
+        self.model_loader.load_failed.connect(self.on_model_load_failed)
+        self.loading_model_data = None
         
         self.init_ui()
         self.refresh_model_selector()
@@ -212,6 +289,7 @@ class VistaCentroAccion(QWidget):
         self.create_model_arsenal(content_layout)
         self.create_classification_center(content_layout)
         self.create_results_dashboard(content_layout)
+        self.create_batch_center(content_layout)
 
         content_layout.addStretch()
         scroll_area.setWidget(main_content)
@@ -266,6 +344,11 @@ class VistaCentroAccion(QWidget):
         self.btn_refresh_selector.clicked.connect(self.refresh_model_selector)
         selector_layout.addWidget(self.btn_refresh_selector, 1, 2)
 
+        self.model_load_progress = QProgressBar()
+        self.model_load_progress.setTextVisible(True)
+        self.model_load_progress.setVisible(False)
+        selector_layout.addWidget(self.model_load_progress, 2, 0, 1, 3)
+
         layout.addWidget(selector_frame)
         parent_layout.addWidget(group)
 
@@ -309,6 +392,10 @@ class VistaCentroAccion(QWidget):
         self.btn_classify.clicked.connect(self.classify_cv)
         self.btn_classify.setEnabled(False)
         classify_button_layout.addWidget(self.btn_classify)
+        self.btn_cancel_classify = QPushButton("⏹ Cancelar")
+        self.btn_cancel_classify.clicked.connect(self.cancel_classification)
+        self.btn_cancel_classify.setVisible(False)
+        classify_button_layout.addWidget(self.btn_cancel_classify)
         classify_button_layout.addStretch()
         main_layout.addLayout(classify_button_layout)
 
@@ -367,7 +454,65 @@ class VistaCentroAccion(QWidget):
         layout.addWidget(splitter)
         parent_layout.addWidget(group)
 
+    def create_batch_center(self, parent_layout):
+        group = QGroupBox("📚 Clasificación por Lotes")
+        group.setObjectName("BatchGroup")
+        layout = QVBoxLayout(group)
+        layout.setSpacing(12)
+        layout.setContentsMargins(15, 10, 15, 15)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(10)
+
+        self.btn_batch_folder = QPushButton("📂 Carpeta de CVs")
+        self.btn_batch_folder.clicked.connect(self.select_batch_folder)
+        buttons_layout.addWidget(self.btn_batch_folder)
+
+        self.btn_batch_files = QPushButton("📑 Varios CVs")
+        self.btn_batch_files.clicked.connect(self.select_batch_files)
+        buttons_layout.addWidget(self.btn_batch_files)
+
+        self.btn_batch_classify = QPushButton("🎯 Clasificar Lote")
+        self.btn_batch_classify.clicked.connect(self.classify_batch)
+        buttons_layout.addWidget(self.btn_batch_classify)
+
+        self.btn_batch_cancel = QPushButton("⏹ Cancelar")
+        self.btn_batch_cancel.clicked.connect(self.cancel_batch)
+        buttons_layout.addWidget(self.btn_batch_cancel)
+
+        self.btn_batch_export = QPushButton("💾 Exportar CSV")
+        self.btn_batch_export.clicked.connect(self.export_batch_csv)
+        buttons_layout.addWidget(self.btn_batch_export)
+        buttons_layout.addStretch()
+        layout.addLayout(buttons_layout)
+
+        self.batch_status_label = QLabel("🔍 Ningún lote seleccionado")
+        layout.addWidget(self.batch_status_label)
+
+        self.batch_progress = QProgressBar()
+        self.batch_progress.setValue(0)
+        layout.addWidget(self.batch_progress)
+
+        self.batch_table = QTableWidget()
+        self.batch_table.setColumnCount(5)
+        self.batch_table.setHorizontalHeaderLabels(["Archivo", "Profesión", "Confianza", "Nivel", "Estado"])
+        self.batch_table.setMinimumHeight(240)
+        self.batch_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.batch_table.setAlternatingRowColors(True)
+        self.batch_table.verticalHeader().setVisible(False)
+        header = self.batch_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        for column in (2, 3, 4):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.batch_table)
+
+        parent_layout.addWidget(group)
+        self.update_batch_ui_state()
+
     def refresh_model_selector(self):
+        # Los modelos pudieron reentrenarse o borrarse: no reutilizar los de la caché
+        self.model_loader.cache.clear()
         try:
             current_selection_data = self.model_selector_combo.currentData()
             self.model_selector_combo.clear()
@@ -398,7 +543,7 @@ class VistaCentroAccion(QWidget):
 
     def on_model_selector_changed(self):
         self.btn_load_selected_model.setEnabled(
-            self.model_selector_combo.currentData() is not None
+            self.model_selector_combo.currentData() is not None and self.loading_model_data is None
         )
 
     def load_model_from_selector(self):
@@ -409,52 +554,56 @@ class VistaCentroAccion(QWidget):
         self.load_model_by_data(model_data)
 
     def load_model_by_data(self, model_data):
-        model_name = model_data['name']
-        is_deep_learning = model_data.get('is_deep_learning', False)
+        """Inicia la carga en segundo plano; el modelo actual sigue disponible mientras tanto"""
+        self.loading_model_data = model_data
+        self.btn_load_selected_model.setEnabled(False)
+        self.model_load_progress.setRange(0, 0)
+        self.model_load_progress.setFormat(f"Cargando '{model_data.get('display_name', model_data['name'])}'...")
+        self.model_load_progress.setVisible(True)
+        self.model_loader.load(model_data['name'], model_data.get('is_deep_learning', False))
+
+    def on_model_load_progress(self, step, total, message):
+        self.model_load_progress.setRange(0, total)
+        self.model_load_progress.setValue(step)
+        self.model_load_progress.setFormat(f"{message} ({step}/{total})")
+
+    def _finish_model_load(self):
+        self.loading_model_data = None
+        self.model_load_progress.setVisible(False)
+        self.on_model_selector_changed()
+
+    def on_model_ready(self, model_name, is_deep_learning, classifier, from_cache):
+        model_data = self.loading_model_data or {}
         display_name = model_data.get('display_name', model_name)
+        self._finish_model_load()
 
-        try:
-            classifier_to_use = self.dl_classifier if is_deep_learning else self.ml_classifier
-            success = classifier_to_use.load_model(model_name)
-
-            if success:
-                self.current_loaded_model = model_name
-                self.current_model_is_dl = is_deep_learning
-                
-                # Obtener las profesiones directamente después de cargar
-                professions = []
-                if hasattr(classifier_to_use, 'label_encoder') and classifier_to_use.label_encoder is not None:
-                    professions = list(classifier_to_use.label_encoder.classes_)
-                
-                model_type = "Deep Learning" if is_deep_learning else "Machine Learning"
-                self.model_status_card.set_model_loaded(
-                    display_name, model_type, professions
-                )
-                
-                QMessageBox.information(
-                    self, "Modelo Cargado",
-                    f"El modelo '{display_name}' ha sido cargado exitosamente.\nProfesiones disponibles: {len(professions)}"
-                )
-            else:
-                self.current_loaded_model = None
-                self.current_model_is_dl = False
-                QMessageBox.critical(
-                    self, "Error al Cargar",
-                    f"No se pudo cargar el modelo '{display_name}'. Verifica su integridad."
-                )
-                self.model_status_card.set_no_model()
-            
-            self.update_ui_state()
+        if is_deep_learning:
+            self.dl_classifier = classifier
+        else:
+            self.ml_classifier = classifier
+        self.current_loaded_model = model_name
+        self.current_model_is_dl = is_deep_learning
 
-        except Exception as e:
-            self.current_loaded_model = None
-            self.current_model_is_dl = False
-            QMessageBox.critical(
-                self, "Error Inesperado",
-                f"Ocurrió un error al cargar el modelo '{display_name}':\n{str(e)}"
+        # Obtener las profesiones directamente después de cargar
+        professions = []
+        if hasattr(classifier, 'label_encoder') and classifier.label_encoder is not None:
+            professions = list(classifier.label_encoder.classes_)
+
+        model_type = "Deep Learning" if is_deep_learning else "Machine Learning"
+        self.model_status_card.set_model_loaded(display_name, model_type, professions)
+        self.update_ui_state()
+
+        if not from_cache:
+            QMessageBox.information(
+                self, "Modelo Cargado",
+                f"El modelo '{display_name}' ha sido cargado exitosamente.\nProfesiones disponibles: {len(professions)}"
             )
-            self.model_status_card.set_no_model()
-            self.update_ui_state()
+
+    def on_model_load_failed(self, model_name, is_deep_learning, error_message):
+        self._finish_model_load()
+        # El modelo cargado antes (si lo hay) se mantiene activo
+        QMessageBox.critical(self, "Error al Cargar", error_message)
+        self.update_ui_state()
 
 
     def update_model_status_ui(self):
@@ -479,6 +628,7 @@ class VistaCentroAccion(QWidget):
     def update_ui_state(self):
         model_loaded = self.current_loaded_model is not None
         cv_selected = self.selected_cv_file is not None
+        self.update_batch_ui_state()
 
         self.btn_classify.setEnabled(model_loaded and cv_selected)
 
@@ -490,6 +640,143 @@ class VistaCentroAccion(QWidget):
             self.btn_classify.setText("🎯 Clasificar CV")
 
 
+    def update_batch_ui_state(self):
+        if not hasattr(self, 'btn_batch_classify'):
+            return
+        running = self.batch_task is not None and self.batch_task.is_active
+        self.btn_batch_folder.setEnabled(not running)
+        self.btn_batch_files.setEnabled(not running)
+        self.btn_batch_classify.setEnabled(
+            not running and self.current_loaded_model is not None and bool(self.batch_files)
+        )
+        self.btn_batch_cancel.setEnabled(running)
+        self.btn_batch_export.setEnabled(not running and bool(self.batch_rows))
+
+    def set_batch_files(self, file_paths):
+        self.batch_files = list(file_paths)
+        self.batch_status_label.setText(f"📄 {len(self.batch_files)} CVs seleccionados")
+        self.update_batch_ui_state()
+
+    def select_batch_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar Carpeta de CVs", "")
+        if folder:
+            files = list_cv_files(folder)
+            if not files:
+                QMessageBox.warning(self, "Sin CVs", "La carpeta no contiene archivos PDF o de texto.")
+                return
+            self.set_batch_files(files)
+
+    def select_batch_files(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Seleccionar CVs", "",
+            "Archivos PDF (*.pdf);;Archivos de Texto (*.txt);;Todos los archivos (*)"
+        )
+        if file_paths:
+            self.set_batch_files(file_paths)
+
+    def classify_batch(self):
+        if not self.current_loaded_model:
+            QMessageBox.warning(self, "Sin Modelo", "Por favor, carga un modelo antes de clasificar.")
+            return
+        if not self.batch_files:
+            QMessageBox.warning(self, "Sin CVs", "Por favor, selecciona una carpeta o varios CVs.")
+            return
+
+        self.batch_rows = []
+        self.batch_table.setRowCount(0)
+        self.batch_progress.setMaximum(len(self.batch_files))
+        self.batch_progress.setValue(0)
+        self.batch_status_label.setText(f"⏳ Clasificando {len(self.batch_files)} CVs...")
+
+        classifier_to_use = self.dl_classifier if self.current_model_is_dl else self.ml_classifier
+        job = BatchClassificationJob(self.batch_files, classifier_to_use, self.current_model_is_dl)
+        task = self.executor.submit(job.run, category='batch', name='batch_classification')
+        if task is None:
+            self.batch_status_label.setText("⏳ Hay demasiados lotes en espera. Intenta de nuevo más tarde.")
+            return
+        job.progress_updated.connect(self.on_batch_progress)
+        job.row_ready.connect(self.on_batch_row_ready)
+        task.finished.connect(self.on_batch_completed)
+        task.failed.connect(self.on_batch_failed)
+        task.cancelled.connect(self.on_batch_cancelled)
+        self.batch_job, self.batch_task = job, task
+        self.update_batch_ui_state()
+        self.clasificacion_iniciada.emit()
+
+    def cancel_batch(self):
+        if self.batch_task is not None and self.batch_task.is_active:
+            self.executor.cancel(self.batch_task)
+            self.btn_batch_cancel.setEnabled(False)
+            self.batch_status_label.setText("⏹ Cancelando... (se conservan los CVs ya clasificados)")
+
+    def on_batch_progress(self, processed, total):
+        self.batch_progress.setValue(processed)
+        self.batch_status_label.setText(f"⏳ Clasificados {processed}/{total} CVs...")
+
+    def on_batch_row_ready(self, row):
+        self.batch_rows.append(row)
+        index = self.batch_table.rowCount()
+        self.batch_table.insertRow(index)
+
+        if row['status'] == 'ok':
+            values = [row['file'], row['predicted_profession'], f"{row['confidence']:.1%}",
+                      row['confidence_level'], "✅"]
+        else:
+            values = [row['file'], "-", "-", "-", f"❌ {row['message']}"]
+
+        for column, value in enumerate(values):
+            item = QTableWidgetItem(str(value))
+            if column in (2, 3):
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.batch_table.setItem(index, column, item)
+
+    def on_batch_completed(self, summary):
+        state = "⏹ Lote cancelado" if summary['cancelled'] else "✅ Lote completado"
+        self.batch_status_label.setText(
+            f"{state}: {summary['classified']} clasificados, {summary['failed']} con error "
+            f"de {summary['total']} en {summary['seconds']:.1f}s"
+        )
+        self.update_batch_ui_state()
+        self.clasificacion_completada.emit()
+
+    def on_batch_cancelled(self):
+        self.on_batch_completed(self.batch_job.summary(self.batch_task.timing['run_seconds'], cancelled=True))
+
+    def on_batch_failed(self, error_message):
+        error_message = f"Error durante la clasificación por lotes: {error_message}"
+        self.batch_status_label.setText(f"❌ {error_message}")
+        self.update_batch_ui_state()
+        QMessageBox.critical(self, "Error de Clasificación", f"Error: {error_message}")
+
+    def export_batch_csv(self):
+        if not self.batch_rows:
+            QMessageBox.information(self, "Sin Resultados", "No hay resultados de lote para exportar.")
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Resultados", "clasificacion_lote.csv", "Archivos CSV (*.csv)"
+        )
+        if not file_path:
+            return
+        if not file_path.lower().endswith('.csv'):
+            file_path += '.csv'
+
+        try:
+            # utf-8-sig para que Excel reconozca los acentos
+            with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+                writer = csv.writer(f)
+                writer.writerow(['archivo', 'ruta', 'profesion', 'confianza', 'nivel', 'estado', 'mensaje', 'modelo'])
+                for row in self.batch_rows:
+                    writer.writerow([
+                        row['file'], row['path'], row.get('predicted_profession', ''),
+                        f"{row['confidence']:.4f}" if 'confidence' in row else '',
+                        row.get('confidence_level', ''), row['status'], row.get('message', ''),
+                        self.current_loaded_model or ''
+                    ])
+            QMessageBox.information(self, "Exportación Exitosa", f"Resultados exportados en:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"No se pudo exportar el CSV: {str(e)}")
+
     def select_cv_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Seleccionar Archivo de CV", "",
@@ -544,15 +831,42 @@ class VistaCentroAccion(QWidget):
 
         classifier_to_use = self.dl_classifier if self.current_model_is_dl else self.ml_classifier
 
-        self.classification_worker = ClassificationWorker(
-            self.selected_cv_file, classifier_to_use, self.current_model_is_dl
+        # Un clic nuevo reemplaza (y cancela) la clasificación anterior con la misma clave
+        self.classification_task = None
+        task = self.executor.submit(
+            classify_cv_file, self.selected_cv_file, classifier_to_use, self.current_model_is_dl,
+            category='classification', name='cv_classification', key='single_classification'
         )
-        self.classification_worker.progress_updated.connect(self.update_classification_progress)
-        self.classification_worker.classification_completed.connect(self.on_classification_completed)
-        self.classification_worker.classification_failed.connect(self.on_classification_failed)
-        self.classification_worker.start()
+        if task is None:
+            self.on_classification_failed("Hay demasiadas clasificaciones en espera. Intenta de nuevo en unos segundos.")
+            return
+        task.progress.connect(self.update_classification_progress)
+        task.finished.connect(self.on_classification_finished)
+        task.failed.connect(lambda message: self.on_classification_failed(f"Error durante la clasificación: {message}"))
+        task.cancelled.connect(self.on_classification_cancelled)
+        self.classification_task = task
+        self.btn_cancel_classify.setVisible(True)
         self.clasificacion_iniciada.emit()
 
+    def cancel_classification(self):
+        if self.classification_task is not None and self.classification_task.is_active:
+            self.executor.cancel(self.classification_task)
+
+    def on_classification_finished(self, result):
+        self.btn_cancel_classify.setVisible(False)
+        if result.get('error', False):
+            self.on_classification_failed(result.get('message', 'Error desconocido en clasificación'))
+        else:
+            self.on_classification_completed(result)
+
+    def on_classification_cancelled(self):
+        if self.sender() is not self.classification_task:
+            return  # Reemplazada por una clasificación más reciente
+        self.btn_cancel_classify.setVisible(False)
+        self.btn_classify.stop_pulsing()
+        self.main_result.setHtml("<p style='color:#E0E0E0; text-align:center;'>⏹ Clasificación cancelada</p>")
+        self.update_ui_state()
+
     def update_classification_progress(self, message):
         self.main_result.setHtml(f"<p style='color:#E0E0E0; text-align:center;'>⏳ {message}</p>")
 
@@ -598,6 +912,7 @@ class VistaCentroAccion(QWidget):
 
 
     def on_classification_failed(self, error_message):
+        self.btn_cancel_classify.setVisible(False)
         self.btn_classify.stop_pulsing()
         error_html = f"""
         <div style='font-family: "Segoe UI", Arial, sans-serif; color: #E0E0E0; font-size: 12px;'>
@@ -0,0 +1,119 @@
+# vista_diagnostico.py
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QApplication, QAbstractItemView)
+from PyQt6.QtCore import Qt, QTimer
+from src.monitoring import metrics
+
+
+class DiagnosticsDialog(QDialog):
+    """Panel de diagnóstico: tiempos por etapa y contadores del proceso actual"""
+
+    REFRESH_MS = 2000
+    STAGE_COLUMNS = ["Etapa", "Etiquetas", "Llamadas", "Total (s)", "Media (ms)", "p50 (ms)", "p95 (ms)", "Máx (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico de Rendimiento")
+        self.setObjectName("DiagnosticsDialog")
+        self.resize(820, 560)
+
+        self.setup_ui()
+        self.refresh()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_MS)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        controls = QHBoxLayout()
+        self.enabled_checkbox = QCheckBox("Registrar métricas")
+        self.enabled_checkbox.setToolTip("También se activa al iniciar con la variable de entorno CV_METRICS=1")
+        self.enabled_checkbox.setChecked(metrics.is_enabled())
+        self.enabled_checkbox.toggled.connect(self.toggle_metrics)
+        controls.addWidget(self.enabled_checkbox)
+
+        self.status_label = QLabel()
+        controls.addWidget(self.status_label, 1)
+
+        reset_button = QPushButton("🗑️ Reiniciar")
+        reset_button.clicked.connect(self.reset_metrics)
+        controls.addWidget(reset_button)
+
+        copy_button = QPushButton("📋 Copiar (Prometheus)")
+        copy_button.clicked.connect(self.copy_prometheus)
+        controls.addWidget(copy_button)
+        layout.addLayout(controls)
+
+        layout.addWidget(QLabel("⏱️ Tiempos por etapa"))
+        self.stages_table = self._create_table(self.STAGE_COLUMNS)
+        layout.addWidget(self.stages_table, 3)
+
+        layout.addWidget(QLabel("🔢 Contadores"))
+        self.events_table = self._create_table(["Evento", "Etiquetas", "Valor"])
+        layout.addWidget(self.events_table, 1)
+
+    def _create_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    @staticmethod
+    def _format_labels(labels):
+        return ", ".join(f"{key}={value}" for key, value in sorted(labels.items()))
+
+    def _set_row(self, table, row, values):
+        for column, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if column >= 2:
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            table.setItem(row, column, item)
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        state = "activas" if snapshot['enabled'] else "desactivadas"
+        self.status_label.setText(f"Métricas {state} · {snapshot['uptime'] / 60:.1f} min desde el último reinicio")
+
+        self.stages_table.setRowCount(len(snapshot['stages']))
+        for row, stage in enumerate(snapshot['stages']):
+            self._set_row(self.stages_table, row, [
+                stage['stage'],
+                self._format_labels(stage['labels']),
+                str(stage['count']),
+                f"{stage['total']:.2f}",
+                f"{stage['mean'] * 1000:.1f}",
+                f"{stage['p50'] * 1000:.1f}",
+                f"{stage['p95'] * 1000:.1f}",
+                f"{stage['max'] * 1000:.1f}"
+            ])
+
+        self.events_table.setRowCount(len(snapshot['events']))
+        for row, event in enumerate(snapshot['events']):
+            self._set_row(self.events_table, row, [
+                event['event'], self._format_labels(event['labels']), str(event['value'])
+            ])
+
+    def toggle_metrics(self, checked):
+        metrics.enable(checked)
+        self.refresh()
+
+    def reset_metrics(self):
+        metrics.reset()
+        self.refresh()
+
+    def copy_prometheus(self):
+        QApplication.clipboard().setText(metrics.render_prometheus())
+        self.status_label.setText("Métricas copiadas al portapapeles")
+
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        super().closeEvent(event)
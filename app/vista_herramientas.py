@@ -1,9 +1,8 @@
 # vista_herramientas.py
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QFrame, QScrollArea, QGridLayout,
-                             QMessageBox, QMenu, QFileDialog, QDialog,
-                             QTextEdit, QInputDialog, QSizePolicy)
-from PyQt6.QtCore import Qt, pyqtSignal
+                             QPushButton, QFrame, QMessageBox, QMenu, QFileDialog,
+                             QDialog, QTextEdit, QInputDialog, QLineEdit, QComboBox)
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QCursor, QColor
 import os
 import zipfile
@@ -12,6 +11,12 @@ import datetime
 import shutil
 from models.cv_classifier import CVClassifier
 from models.deep_learning_classifier import DeepLearningClassifier
+from models.package_protection import PackageProtector
+from models.model_packager import ModelPackager
+from app.model_loader import load_classifier
+from app.task_executor import shared_executor
+from app.model_browser import (ModelListModel, ModelFilterProxy, ModelBrowserView,
+                               SORT_OPTIONS, TYPE_ALL, TYPE_ML, TYPE_DL)
 from notificacion.notification_manager import (show_success, show_error,
                                                   show_info, show_question)
 
@@ -232,84 +237,6 @@ class ModelInfoDialog(QDialog):
             self.parent().export_model(self.model_data)
 
 
-class ModelCard(QFrame):
-    """Tarjeta de modelo con diseño unificado"""
-    model_selected = pyqtSignal(dict)
-
-    def __init__(self, model_data, parent=None):
-        super().__init__(parent)
-        self.model_data = model_data
-        self.setObjectName("TrainingOptionCard")  # Usar el mismo objectName que TrainingOptionCard
-        self.setFixedSize(280, 200)  # Mantener el tamaño original
-        self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-
-        # Obtener colores del tema principal si está disponible
-        main_window = self.window()
-        if hasattr(main_window, 'color_accent_red'):
-            self.accent_red = main_window.color_accent_red
-            self.accent_blue = main_window.color_accent_blue
-            self.text_light = main_window.color_text_light
-            self.text_medium = main_window.color_text_medium
-        else:
-            self.accent_red = "#E74C3C"
-            self.accent_blue = "#3498DB"
-            self.text_light = "#E0E0E0"
-            self.text_medium = "#BDC3C7"
-
-        self.setup_ui()
-
-    def setup_ui(self):
-        """Configura la interfaz de la tarjeta"""
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(20, 20, 20, 20)  # Mantener márgenes originales
-        layout.setSpacing(15)  # Mantener espaciado original
-
-        # Contenedor de icono para centrarlo bien
-        icon_container = QFrame()
-        icon_container.setFixedHeight(80)  # Mantener altura original
-        icon_container.setStyleSheet("background-color: transparent; border: none;")
-        icon_layout = QVBoxLayout(icon_container)
-        icon_layout.setContentsMargins(0, 0, 0, 0)
-
-        # Determinar icono según tipo de modelo
-        is_dl = self.model_data.get('is_deep_learning', False)
-        icon_text = "🧠" if is_dl else "🤖"
-        icon_color = self.accent_red if is_dl else self.accent_blue
-        
-        self.icon_label = QLabel(icon_text)
-        self.icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.icon_label.setStyleSheet(f"font-size: 48px; color: {icon_color};")  # Mantener tamaño original
-
-        icon_layout.addWidget(self.icon_label)
-        layout.addWidget(icon_container)
-
-        # Nombre del modelo
-        self.name_label = QLabel(self.model_data.get('display_name', 'Modelo Sin Nombre'))
-        self.name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.name_label.setWordWrap(True)
-        self.name_label.setStyleSheet(f"font-size: 14px; font-weight: bold; color: {self.text_light};")
-        layout.addWidget(self.name_label)
-
-        # Información adicional
-        info_text = f"{self.model_data.get('model_type', 'Desconocido')}"
-        if 'num_professions' in self.model_data:
-            info_text += f" • {self.model_data['num_professions']} profesiones"
-
-        self.info_label = QLabel(info_text)
-        self.info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.info_label.setWordWrap(True)
-        self.info_label.setStyleSheet(f"font-size: 11px; color: {self.text_medium};")
-        layout.addWidget(self.info_label)
-
-        layout.addStretch()
-
-    def mousePressEvent(self, event):
-        """Maneja el clic en la tarjeta"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.model_selected.emit(self.model_data)
-        super().mousePressEvent(event)
-
-
 class VistaHerramientas(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -356,12 +283,6 @@ class VistaHerramientas(QWidget):
                 self.import_model(file_path)
                 event.acceptProposedAction()
 
-    def decrypt_data(self, data):
-        """Desencripta los datos usando un método simple (para demostración)"""
-        from itertools import cycle
-        key = b'ClasificaTalentoPRO'  # Debe ser la misma clave que en ExportWorker
-        return bytes(a ^ b for a, b in zip(data, cycle(key)))
-
     def import_model(self, file_path=None):
         """Importa un modelo desde archivo"""
         if not file_path:
@@ -431,32 +352,21 @@ class VistaHerramientas(QWidget):
 
                 os.makedirs(target_dir, exist_ok=True)
 
-                # Procesar cada archivo
-                for file_info in zipf.filelist:
-                    if file_info.filename not in ['package_info.json', 'senati_info.json']:
-                        # Leer el contenido del archivo
-                        file_data = zipf.read(file_info.filename)
-                        
-                        # Desencriptar si es necesario
-                        if protection_info['enabled']:
-                            try:
-                                file_data = self.decrypt_data(file_data)
-                            except Exception as e:
-                                show_error("Error de Desencriptación", f"Error al desencriptar {file_info.filename}: {str(e)}", parent=self)
-                                return
-
-                        # Escribir el archivo
-                        target_path = os.path.join(target_dir, file_info.filename)
-                        os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                        with open(target_path, 'wb') as f:
-                            f.write(file_data)
+                protector = PackageProtector.from_protection_info(protection_info) if protection_info['enabled'] else None
+
+                # Extraer cada archivo por bloques, sin cargarlo completo en memoria
+                try:
+                    ModelPackager().import_model(zipf, target_dir, package_info, protector)
+                except Exception as e:
+                    show_error("Error de Desencriptación", f"Error al extraer el modelo: {str(e)}", parent=self)
+                    return
 
                 show_success(
                     "Modelo Importado", 
                     f"El modelo '{final_model_name}' se ha importado correctamente.\nTipo: {model_type.upper()}, Versión: {format_version}", 
                     parent=self
                 )
-                self.load_models()
+                self.add_or_update_model_card(final_model_name, model_type == 'dl')
 
         except Exception as e:
             show_error("Error de Importación", f"Error importando modelo: {str(e)}", parent=self)
@@ -496,16 +406,46 @@ class VistaHerramientas(QWidget):
         header_layout.addLayout(buttons_layout)
         main_layout.addLayout(header_layout)
 
-        # Área de scroll para las tarjetas de modelos
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-
-        # Widget contenedor para las tarjetas
-        self.cards_container = QWidget()
-        self.cards_layout = QGridLayout(self.cards_container)
-        self.cards_layout.setSpacing(20)
-        self.cards_layout.setContentsMargins(10, 10, 10, 10)
+        # Filtros: texto, tipo y orden (se aplican sobre el proxy, sin recrear tarjetas)
+        filters_layout = QHBoxLayout()
+        filters_layout.setSpacing(10)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Buscar por nombre o tipo...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.on_filters_changed)
+
+        self.type_filter_combo = QComboBox()
+        self.type_filter_combo.addItem("Todos los tipos", TYPE_ALL)
+        self.type_filter_combo.addItem("🤖 Machine Learning", TYPE_ML)
+        self.type_filter_combo.addItem("🧠 Deep Learning", TYPE_DL)
+        self.type_filter_combo.currentIndexChanged.connect(self.on_filters_changed)
+
+        self.sort_combo = QComboBox()
+        for label, _, _ in SORT_OPTIONS:
+            self.sort_combo.addItem(label)
+        self.sort_combo.currentIndexChanged.connect(self.on_sort_changed)
+
+        self.models_count_label = QLabel()
+
+        filters_layout.addWidget(self.search_input, 1)
+        filters_layout.addWidget(self.type_filter_combo)
+        filters_layout.addWidget(self.sort_combo)
+        filters_layout.addWidget(self.models_count_label)
+        main_layout.addLayout(filters_layout)
+
+        # Vista de tarjetas: solo se pintan las visibles, aunque haya cientos de modelos
+        self.models_model = ModelListModel(self)
+        self.models_proxy = ModelFilterProxy(self)
+        self.models_proxy.setSourceModel(self.models_model)
+        for signal in (self.models_proxy.rowsInserted, self.models_proxy.rowsRemoved,
+                       self.models_proxy.modelReset, self.models_proxy.layoutChanged):
+            signal.connect(self.update_models_state)
+
+        self.models_view = ModelBrowserView(parent=self)
+        self.models_view.setModel(self.models_proxy)
+        self.models_view.model_selected.connect(self.on_model_selected)
+        self.on_sort_changed(self.sort_combo.currentIndex())
 
         # Mensaje cuando no hay modelos
         self.no_models_label = QLabel("📭 No hay modelos disponibles")
@@ -513,67 +453,67 @@ class VistaHerramientas(QWidget):
         self.no_models_label.setStyleSheet("font-size: 18px; font-weight: bold; padding: 50px; border: 2px dashed; border-radius: 15px;")
         self.no_models_label.hide()
 
-        scroll_area.setWidget(self.cards_container)
-        main_layout.addWidget(scroll_area)
+        main_layout.addWidget(self.models_view)
 
         # Agregar el label de "no hay modelos" al layout principal para que sea visible
         main_layout.addWidget(self.no_models_label)
 
     def load_models(self):
-        """Carga los modelos disponibles y crea las tarjetas"""
+        """Carga los modelos disponibles en la vista de tarjetas"""
         try:
-            # Limpiar tarjetas existentes
-            self.clear_cards()
-
-            # Obtener modelos disponibles
-            models = self.ml_classifier.list_available_models()
-
-            if not models:
-                self.show_no_models_message()
-                return
-
-            self.hide_no_models_message()
-
-            # Crear tarjetas para cada modelo
-            row, col, max_cols = 0, 0, 3
-            for model_data in models:
-                card = ModelCard(model_data)
-                card.model_selected.connect(self.on_model_selected)
-                self.cards_layout.addWidget(card, row, col)
-
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-
-            # Agregar stretch para empujar las tarjetas hacia arriba
-            self.cards_layout.setRowStretch(row + 1, 1)
-
+            self.models_model.set_models(self.ml_classifier.list_available_models())
         except Exception as e:
             self.show_error_message(f"Error cargando modelos: {str(e)}")
 
-    def clear_cards(self):
-        """Limpia todas las tarjetas del layout"""
-        while self.cards_layout.count():
-            child = self.cards_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+    def on_filters_changed(self, *_):
+        """Aplica el texto de búsqueda y el filtro de tipo"""
+        self.models_proxy.set_text_filter(self.search_input.text())
+        self.models_proxy.set_type_filter(self.type_filter_combo.currentData())
+        self.update_models_state()
+
+    def on_sort_changed(self, index):
+        """Reordena las tarjetas según la opción elegida"""
+        _, role, order = SORT_OPTIONS[index]
+        self.models_proxy.set_sort(role, order)
+
+    def update_models_state(self, *_):
+        """Actualiza el contador y el mensaje de lista vacía"""
+        total = self.models_model.rowCount()
+        visible = self.models_proxy.rowCount()
+        self.models_count_label.setText(f"{visible} de {total} modelos" if visible != total else f"{total} modelos")
+
+        if total == 0:
+            self.no_models_label.setText("📭 No hay modelos disponibles")
+            self.show_no_models_message()
+        elif visible == 0:
+            self.no_models_label.setText("🔍 Ningún modelo coincide con los filtros")
+            self.show_no_models_message()
+        else:
+            self.hide_no_models_message()
 
     def show_no_models_message(self):
         """Muestra el mensaje de no hay modelos"""
-        self.cards_container.hide()
+        self.models_view.hide()
         self.no_models_label.show()
 
     def hide_no_models_message(self):
         """Oculta el mensaje de no hay modelos"""
         self.no_models_label.hide()
-        self.cards_container.show()
+        self.models_view.show()
 
     def show_error_message(self, message):
         """Muestra un mensaje de error"""
         self.no_models_label.setText(f"❌ {message}")
         self.show_no_models_message()
 
+    def add_or_update_model_card(self, model_name, is_deep_learning):
+        """Añade o actualiza la tarjeta de un solo modelo sin recargar toda la lista"""
+        model_info = self.ml_classifier.get_saved_model_info(model_name, is_deep_learning)
+        if model_info is None:
+            self.load_models()
+            return
+        self.models_model.add_or_update_model(model_info)
+
     def on_model_selected(self, model_data):
         """Maneja la selección de un modelo"""
         menu = QMenu(self)
@@ -604,21 +544,26 @@ class VistaHerramientas(QWidget):
         dialog.exec()
 
     def load_model(self, model_data):
-        """Carga el modelo seleccionado"""
+        """Carga el modelo seleccionado en segundo plano"""
         model_name = model_data.get('name', '')
         display_name = model_data.get('display_name', model_name)
         is_dl = model_data.get('is_deep_learning', False)
 
-        try:
-            classifier = self.dl_classifier if is_dl else self.ml_classifier
-            success = classifier.load_model(model_name)
+        task = shared_executor().submit(load_classifier, model_name, is_dl,
+                                        category='model_io', name='model_load')
+        if task is None:
+            show_error("Error al Cargar", "Hay demasiadas cargas de modelos en espera.", parent=self)
+            return
+        task.finished.connect(lambda classifier: self.on_model_loaded(classifier, is_dl, display_name))
+        task.failed.connect(lambda message: show_error("Error al Cargar", message, parent=self))
+        show_info("Cargando Modelo", f"Cargando '{display_name}'...", duration=2000, parent=self)
 
-            if success:
-                show_success("Modelo Cargado", f"El modelo '{display_name}' se ha cargado correctamente.", parent=self)
-            else:
-                show_error("Error al Cargar", f"No se pudo cargar el modelo '{display_name}'.", parent=self)
-        except Exception as e:
-            show_error("Error al Cargar", f"Error cargando '{display_name}': {str(e)}", parent=self)
+    def on_model_loaded(self, classifier, is_dl, display_name):
+        if is_dl:
+            self.dl_classifier = classifier
+        else:
+            self.ml_classifier = classifier
+        show_success("Modelo Cargado", f"El modelo '{display_name}' se ha cargado correctamente.", parent=self)
 
     def test_model(self, _):
         """Prueba el modelo con datos de ejemplo"""
@@ -654,18 +599,14 @@ class VistaHerramientas(QWidget):
                     QMessageBox.critical(self, "Error", f"No se encontró el directorio del modelo: {source_dir}")
                     return
 
-                with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    senati_info = {
-                        'format_version': '1.0', 'model_type': 'dl' if is_dl else 'ml',
-                        'model_name': model_name, 'exported_by': 'ClasificaTalento PRO',
-                        'export_date': datetime.datetime.now().isoformat()
-                    }
-                    zipf.writestr('senati_info.json', json.dumps(senati_info, indent=2))
-                    for root, _, files in os.walk(source_dir):
-                        for file in files:
-                            full_path = os.path.join(root, file)
-                            arcname = os.path.relpath(full_path, source_dir)
-                            zipf.write(full_path, arcname)
+                package_info = {
+                    'format_version': '3.0', 'model_type': 'dl' if is_dl else 'ml',
+                    'model_name': model_name, 'exported_by': 'ClasificaTalento PRO',
+                    'export_date': datetime.datetime.now().isoformat(),
+                    'compression': 'auto',
+                    'protection': {'enabled': False, 'level': 'none', 'format': '.senati'}
+                }
+                ModelPackager('auto').export_model(source_dir, file_path, package_info)
 
                 show_success("Modelo Exportado", f"'{display_name}' se ha exportado correctamente.", parent=self)
             except Exception as e:
@@ -708,7 +649,7 @@ class VistaHerramientas(QWidget):
             
             shutil.rmtree(model_dir)
             show_success("Modelo Eliminado", f"El modelo '{display_name}' ha sido eliminado correctamente.", parent=self)
-            self.load_models()
+            self.models_model.remove_model(model_data)
 
         except Exception as e:
             show_error("Error al Eliminar", f"Error eliminando '{display_name}': {str(e)}", parent=self)
\ No newline at end of file
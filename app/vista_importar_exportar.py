@@ -13,6 +13,9 @@ import json
 import datetime
 from models.cv_classifier import CVClassifier
 from models.deep_learning_classifier import DeepLearningClassifier
+from models.package_protection import PackageProtector
+from models.model_packager import ModelPackager
+from models.model_backup import BackupEngine
 
 
 class ExportWorker(QThread):
@@ -21,23 +24,20 @@ class ExportWorker(QThread):
     export_completed = pyqtSignal(str)
     export_failed = pyqtSignal(str)
 
-    def __init__(self, model_name, export_path, model_type, protection_info=None):
+    def __init__(self, model_name, export_path, model_type, protection_info=None, compression='auto',
+                 deduplicate=False):
         super().__init__()
         self.model_name = model_name
         self.export_path = export_path
         self.model_type = model_type  # 'ml' o 'dl'
+        self.compression = compression  # 'auto', 'store' o 'deflate'
+        self.deduplicate = deduplicate  # bloques repetidos guardados una sola vez (sin cifrado)
         self.protection_info = protection_info or {
             'encrypted': True,
             'format': '.zip',
             'protection_level': 'high'
         }
 
-    def encrypt_data(self, data):
-        """Encripta los datos usando un método simple (para demostración)"""
-        from itertools import cycle
-        key = b'ClasificaTalentoPRO'  # Clave de ejemplo
-        return bytes(a ^ b for a, b in zip(data, cycle(key)))
-
     def run(self):
         """Ejecuta la exportación del modelo"""
         try:
@@ -55,40 +55,36 @@ class ExportWorker(QThread):
 
             self.progress_updated.emit("Comprimiendo y protegiendo archivos del modelo...")
 
-            # Crear archivo comprimido con el formato especificado
-            with zipfile.ZipFile(self.export_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Agregar metadatos especiales con información de protección
-                package_info = {
-                    'format_version': '2.0',
-                    'model_type': self.model_type,
-                    'model_name': self.model_name,
-                    'exported_by': 'ClasificaTalento PRO',
-                    'export_date': datetime.datetime.now().isoformat(),
-                    'protection': {
-                        'enabled': self.protection_info['encrypted'],
-                        'level': self.protection_info['protection_level'],
-                        'format': self.protection_info['format']
-                    }
+            protector = PackageProtector() if self.protection_info['encrypted'] and not self.deduplicate else None
+            if protector:
+                self.progress_updated.emit("Encriptando archivos por bloques...")
+
+            # Metadatos con información de protección (el empaquetador agrega la sección de archivos)
+            package_info = {
+                'format_version': '3.0',
+                'model_type': self.model_type,
+                'model_name': self.model_name,
+                'exported_by': 'ClasificaTalento PRO',
+                'export_date': datetime.datetime.now().isoformat(),
+                'compression': self.compression,
+                'protection': {
+                    'enabled': protector is not None,
+                    'level': self.protection_info['protection_level'] if protector else 'none',
+                    'format': self.protection_info['format'],
+                    **(protector.protection_info() if protector else {})
                 }
+            }
 
-                zipf.writestr('package_info.json', json.dumps(package_info, indent=2))
-
-                # Agregar todos los archivos del modelo
-                for root, dirs, files in os.walk(source_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, source_dir)
-                        
-                        # Leer y posiblemente encriptar el archivo
-                        with open(file_path, 'rb') as f:
-                            file_data = f.read()
-                            
-                        if self.protection_info['encrypted']:
-                            self.progress_updated.emit(f"Encriptando: {file}")
-                            file_data = self.encrypt_data(file_data)
-                        
-                        zipf.writestr(arcname, file_data)
-                        self.progress_updated.emit(f"Agregando: {file}")
+            packager = ModelPackager(self.compression, progress_callback=self.progress_updated.emit)
+            if self.deduplicate:
+                stats = packager.export_chunked(source_dir, self.export_path, package_info)
+                self.progress_updated.emit(f"Deduplicación: x{stats['dedup_ratio']:.2f}")
+            else:
+                stats = packager.export_model(source_dir, self.export_path, package_info, protector)
+            self.progress_updated.emit(
+                f"{stats['files']} archivos en {stats['seconds']:.1f}s "
+                f"({stats['bytes_per_second'] / (1024 * 1024):.1f} MB/s)"
+            )
 
             self.export_completed.emit(f"Modelo exportado y protegido exitosamente en: {self.export_path}")
 
@@ -109,12 +105,6 @@ class ImportWorker(QThread):
         # Lista de extensiones válidas
         self.valid_extensions = ['.zip', '.senati', '.mlmodel', '.aimodel', '.ctpro']
 
-    def decrypt_data(self, data):
-        """Desencripta los datos (usa el mismo método que la encriptación por ser XOR)"""
-        from itertools import cycle
-        key = b'ClasificaTalentoPRO'  # Debe ser la misma clave que en ExportWorker
-        return bytes(a ^ b for a, b in zip(data, cycle(key)))
-
     def is_valid_model_file(self):
         """Verifica si el archivo tiene una extensión válida"""
         return any(self.file_path.lower().endswith(ext.lower()) for ext in self.valid_extensions)
@@ -173,28 +163,19 @@ class ImportWorker(QThread):
                     os.makedirs(target_dir, exist_ok=True)
                     self.progress_updated.emit("Extrayendo archivos del modelo...")
 
-                    # Procesar cada archivo
-                    for file_info in zipf.filelist:
-                        if file_info.filename != 'package_info.json':
-                            # Leer el contenido del archivo
-                            file_data = zipf.read(file_info.filename)
-                            
-                            # Desencriptar si es necesario
-                            if protection_info['enabled']:
-                                self.progress_updated.emit(f"Desencriptando: {file_info.filename}")
-                                try:
-                                    file_data = self.decrypt_data(file_data)
-                                except Exception as e:
-                                    self.import_failed.emit(f"Error al desencriptar {file_info.filename}: {str(e)}")
-                                    return
-
-                            # Escribir el archivo
-                            target_path = os.path.join(target_dir, file_info.filename)
-                            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                            with open(target_path, 'wb') as f:
-                                f.write(file_data)
-                            
-                            self.progress_updated.emit(f"Extraído: {file_info.filename}")
+                    protector = PackageProtector.from_protection_info(protection_info) if protection_info['enabled'] else None
+
+                    # Extraer cada archivo por bloques, sin cargarlo completo en memoria
+                    packager = ModelPackager(progress_callback=self.progress_updated.emit)
+                    try:
+                        stats = packager.import_model(zipf, target_dir, package_info, protector)
+                    except Exception as e:
+                        self.import_failed.emit(f"Error al extraer el modelo: {str(e)}")
+                        return
+                    self.progress_updated.emit(
+                        f"{stats['files']} archivos en {stats['seconds']:.1f}s "
+                        f"({stats['bytes_per_second'] / (1024 * 1024):.1f} MB/s)"
+                    )
 
                     self.import_completed.emit(f"Modelo importado exitosamente como: {final_model_name}")
 
@@ -209,6 +190,36 @@ class ImportWorker(QThread):
             self.import_failed.emit(f"Error durante la importación: {str(e)}")
 
 
+class BackupWorker(QThread):
+    """Worker thread para backup incremental o restauración de todos los modelos"""
+    progress_updated = pyqtSignal(str)
+    backup_completed = pyqtSignal(dict)
+    backup_failed = pyqtSignal(str)
+
+    def __init__(self, backup_dir, models=None, mode='backup', overwrite=False, encrypted=True,
+                 compression='auto', deduplicate=False):
+        super().__init__()
+        self.backup_dir = backup_dir
+        self.models = models or []
+        self.mode = mode  # 'backup' o 'restore'
+        self.overwrite = overwrite
+        self.engine = BackupEngine(backup_dir, compression=compression, encrypted=encrypted,
+                                   progress_callback=self.progress_updated.emit,
+                                   deduplicate=deduplicate)
+
+    def run(self):
+        """Ejecuta el backup o la restauración en el pool del motor"""
+        try:
+            if self.mode == 'restore':
+                summary = self.engine.restore_all(overwrite=self.overwrite)
+            else:
+                summary = self.engine.backup_all(self.models)
+            summary['mode'] = self.mode
+            self.backup_completed.emit(summary)
+        except Exception as e:
+            self.backup_failed.emit(f"Error durante el {'restaurado' if self.mode == 'restore' else 'backup'}: {str(e)}")
+
+
 class VistaImportarExportar(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -339,14 +350,24 @@ class VistaImportarExportar(QWidget):
         self.include_metadata_checkbox.setChecked(True)
         export_options_layout.addWidget(self.include_metadata_checkbox, 4, 0, 1, 2)
 
-        self.compress_checkbox = QCheckBox("Compresión optimizada (automática)")
-        self.compress_checkbox.setChecked(True)
-        export_options_layout.addWidget(self.compress_checkbox, 5, 0, 1, 2)
+        compression_label = QLabel("Compresión:")
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItem("Automática (solo archivos de texto)", 'auto')
+        self.compression_combo.addItem("Sin compresión (más rápido)", 'store')
+        self.compression_combo.addItem("Deflate (archivo más pequeño)", 'deflate')
+        self.compression_combo.setToolTip("Los pesos .h5/.pkl apenas se comprimen; deflate gasta CPU sin reducir mucho el tamaño")
+        export_options_layout.addWidget(compression_label, 5, 0)
+        export_options_layout.addWidget(self.compression_combo, 5, 1)
+
+        self.dedup_checkbox = QCheckBox("Deduplicar bloques repetidos (sin encriptar)")
+        self.dedup_checkbox.setToolTip("Guarda una sola vez los bloques idénticos entre archivos y, en el backup, entre modelos")
+        self.dedup_checkbox.toggled.connect(lambda checked: self.encrypt_checkbox.setEnabled(not checked))
+        export_options_layout.addWidget(self.dedup_checkbox, 6, 0, 1, 2)
 
         # Información de seguridad
         security_info = QLabel("ℹ️ La protección ayuda a prevenir el uso no autorizado del modelo")
         security_info.setStyleSheet("color: #666; font-style: italic;")
-        export_options_layout.addWidget(security_info, 6, 0, 1, 2)
+        export_options_layout.addWidget(security_info, 7, 0, 1, 2)
 
         layout.addLayout(export_options_layout)
 
@@ -382,7 +403,9 @@ class VistaImportarExportar(QWidget):
         
         management_buttons_layout = QHBoxLayout()
         backup_btn = QPushButton("💾 Backup Completo")
+        backup_btn.clicked.connect(self.backup_all_models)
         restore_btn = QPushButton("🔄 Restaurar")
+        restore_btn.clicked.connect(self.restore_backup)
         clean_btn = QPushButton("🧹 Limpiar Cache")
         management_buttons_layout.addWidget(backup_btn)
         management_buttons_layout.addWidget(restore_btn)
@@ -504,13 +527,19 @@ class VistaImportarExportar(QWidget):
             }
             
             self.activity_log.append(f"💾 Iniciando exportación protegida: {model_name}")
-            self.export_worker = ExportWorker(model_name, file_path, model_type, protection_info)
+            self.export_worker = ExportWorker(model_name, file_path, model_type, protection_info,
+                                              self.compression_combo.currentData(),
+                                              deduplicate=self.dedup_checkbox.isChecked())
             self.export_worker.progress_updated.connect(self.update_export_progress)
             self.export_worker.export_completed.connect(self.on_export_completed)
             self.export_worker.export_failed.connect(self.on_export_failed)
             self.export_worker.start()
 
     def backup_all_models(self):
+        """Inicia un backup incremental de todos los modelos en segundo plano"""
+        if getattr(self, 'backup_worker', None) and self.backup_worker.isRunning():
+            QMessageBox.information(self, "Backup en Curso", "Ya hay un backup o restauración en curso.")
+            return
         try:
             models = self.ml_classifier.list_available_models()
             if not models:
@@ -519,21 +548,71 @@ class VistaImportarExportar(QWidget):
 
             backup_dir = QFileDialog.getExistingDirectory(self, "Seleccionar Directorio para Backup", "")
             if backup_dir:
-                self.activity_log.append(f"📦 Iniciando backup de {len(models)} modelos...")
-                success_count = 0
-                for model in models:
-                    try:
-                        worker = ExportWorker(model['name'], os.path.join(backup_dir, f"{model['name']}.zip"), 'dl' if model.get('is_deep_learning', False) else 'ml')
-                        worker.run() 
-                        success_count += 1
-                    except Exception as e:
-                        self.activity_log.append(f"❌ Error en {model['name']}: {str(e)}")
-                self.activity_log.append(f"✅ Backup completado: {success_count}/{len(models)} modelos")
-                QMessageBox.information(self, "Backup Completado", f"Se exportaron {success_count} de {len(models)} modelos al directorio:\n{backup_dir}")
+                self.activity_log.append(f"📦 Iniciando backup incremental de {len(models)} modelos...")
+                self.backup_worker = BackupWorker(
+                    backup_dir, models, mode='backup',
+                    encrypted=self.encrypt_checkbox.isChecked(),
+                    compression=self.compression_combo.currentData(),
+                    deduplicate=self.dedup_checkbox.isChecked()
+                )
+                self.backup_worker.progress_updated.connect(self.update_export_progress)
+                self.backup_worker.backup_completed.connect(self.on_backup_completed)
+                self.backup_worker.backup_failed.connect(self.on_export_failed)
+                self.backup_worker.start()
         except Exception as e:
             self.activity_log.append(f"❌ Error en backup: {str(e)}")
             QMessageBox.critical(self, "Error", f"Error durante el backup: {str(e)}")
 
+    def restore_backup(self):
+        """Restaura todos los modelos de un directorio de backup en segundo plano"""
+        if getattr(self, 'backup_worker', None) and self.backup_worker.isRunning():
+            QMessageBox.information(self, "Backup en Curso", "Ya hay un backup o restauración en curso.")
+            return
+
+        backup_dir = QFileDialog.getExistingDirectory(self, "Seleccionar Directorio de Backup", "")
+        if not backup_dir:
+            return
+        if not os.path.exists(os.path.join(backup_dir, BackupEngine.MANIFEST_FILE)):
+            QMessageBox.warning(self, "Backup no Válido", "El directorio no contiene un manifiesto de backup.")
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Restaurar Modelos",
+            "¿Sobrescribir los modelos que ya existen con la versión del backup?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+
+        self.activity_log.append(f"🔄 Restaurando modelos desde: {backup_dir}")
+        self.backup_worker = BackupWorker(backup_dir, mode='restore',
+                                          overwrite=reply == QMessageBox.StandardButton.Yes)
+        self.backup_worker.progress_updated.connect(self.update_import_progress)
+        self.backup_worker.backup_completed.connect(self.on_backup_completed)
+        self.backup_worker.backup_failed.connect(self.on_import_failed)
+        self.backup_worker.start()
+
+    def on_backup_completed(self, summary):
+        failed = summary['failed']
+        if summary['mode'] == 'restore':
+            message = (f"Restaurados: {len(summary['restored'])}, ya existentes: {len(summary['skipped'])}, "
+                       f"con error: {len(failed)} (de {summary['total']})")
+            self.refresh_model_lists()
+        else:
+            message = (f"Exportados: {len(summary['exported'])}, sin cambios: {len(summary['skipped'])}, "
+                       f"con error: {len(failed)} (de {summary['total']})")
+        for key, error in failed.items():
+            self.activity_log.append(f"❌ {key}: {error}")
+        if 'dedup' in summary:
+            dedup = summary['dedup']
+            mb = 1024 * 1024
+            self.activity_log.append(
+                f"🧩 Deduplicación: {dedup['logical_bytes'] / mb:.1f} MB lógicos -> "
+                f"{dedup['stored_bytes'] / mb:.1f} MB almacenados (x{dedup['dedup_ratio']:.2f})"
+            )
+        self.activity_log.append(f"✅ {message}")
+        QMessageBox.information(self, "Backup Completado" if summary['mode'] == 'backup' else "Restauración Completada", message)
+
     def update_import_progress(self, message): self.activity_log.append(f"📥 {message}")
     def update_export_progress(self, message): self.activity_log.append(f"📤 {message}")
     def on_import_completed(self, message):
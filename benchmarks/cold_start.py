@@ -0,0 +1,103 @@
+"""
+Arnés de arranque en frío de la interfaz: tiempo hasta el primer pintado de MainWindow
+
+Lanza ``main_gui.py`` varias veces en procesos nuevos con ``CV_STARTUP_TIMING`` y
+``CV_STARTUP_EXIT=1``; la ventana guarda sus marcas de tiempo al primer pintado y se
+cierra sola.
+
+Uso:
+    python -m benchmarks.cold_start [--runs 5] [--offscreen]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import datetime
+import statistics
+import subprocess
+
+from benchmarks.run_benchmarks import RESULTS_DIR, git_commit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_GUI = os.path.join(BASE_DIR, 'main_gui.py')
+
+# Fases medidas entre marcas consecutivas (la primera desde el lanzamiento del proceso)
+PHASES = [
+    ('interpreter', 'launch', 'module_start'),
+    ('imports', 'module_start', 'imports_done'),
+    ('qapplication', 'imports_done', 'qapplication'),
+    ('main_window', 'qapplication', 'window_created'),
+    ('first_paint', 'window_created', 'first_paint'),
+]
+
+
+def run_once(timeout, offscreen):
+    with tempfile.TemporaryDirectory() as tmp:
+        marks_path = os.path.join(tmp, 'startup.json')
+        env = dict(os.environ, CV_STARTUP_TIMING=marks_path, CV_STARTUP_EXIT='1')
+        if offscreen:
+            env['QT_QPA_PLATFORM'] = 'offscreen'
+        launch = time.time()
+        completed = subprocess.run([sys.executable, MAIN_GUI], cwd=BASE_DIR, env=env,
+                                   capture_output=True, text=True, timeout=timeout)
+        if not os.path.exists(marks_path):
+            raise RuntimeError(f"La aplicación terminó sin registrar el arranque "
+                               f"(código {completed.returncode}):\n{completed.stderr[-2000:]}")
+        with open(marks_path, 'r', encoding='utf-8') as f:
+            marks = json.load(f)
+    marks['launch'] = launch
+    run = {name: marks[end] - marks[start] for name, start, end in PHASES}
+    run['time_to_first_paint'] = marks['first_paint'] - launch
+    return run
+
+
+def summarize(runs):
+    summary = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs]
+        summary[key] = {
+            'median_seconds': statistics.median(values),
+            'min_seconds': min(values),
+            'max_seconds': max(values)
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de arranque en frío de ClasificaTalento PRO")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--offscreen', action='store_true', help="Sin pantalla (QT_QPA_PLATFORM=offscreen)")
+    parser.add_argument('--output-dir', default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    runs = []
+    for i in range(args.runs):
+        run = run_once(args.timeout, args.offscreen)
+        runs.append(run)
+        print(f"Ejecución {i + 1}/{args.runs}: primer pintado en {run['time_to_first_paint']:.2f}s", file=sys.stderr)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'runs': runs,
+        'summary': summarize(runs)
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    output_path = os.path.join(args.output_dir, f"{stamp}_{report['commit']}_cold_start.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for phase, values in report['summary'].items():
+        print(f"{phase:<22} mediana {values['median_seconds']:.3f}s  "
+              f"(mín {values['min_seconds']:.3f}s, máx {values['max_seconds']:.3f}s)")
+    print(f"Resultados guardados en {output_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Generador de corpus sintéticos de CVs en español para los benchmarks
+
+Los CVs se generan de forma determinista (semilla) a partir de vocabulario por
+profesión, y se pueden escribir como PDF (con un escritor mínimo sin dependencias)
+o como texto plano.
+"""
+
+import os
+import random
+
+PROFESSIONS = {
+    'Desarrollador de Software': [
+        'Python', 'Java', 'JavaScript', 'React', 'Django', 'Flask', 'APIs REST', 'SQL',
+        'Docker', 'Git', 'microservicios', 'pruebas unitarias', 'integración continua',
+        'arquitectura de software', 'desarrollo backend', 'desarrollo frontend'
+    ],
+    'Contador': [
+        'contabilidad general', 'estados financieros', 'auditoría', 'SUNAT', 'declaraciones juradas',
+        'NIIF', 'conciliaciones bancarias', 'planillas', 'costos', 'tributación', 'Excel avanzado',
+        'cierre contable', 'presupuestos', 'análisis financiero', 'libros contables'
+    ],
+    'Enfermero': [
+        'atención al paciente', 'cuidados intensivos', 'administración de medicamentos', 'triaje',
+        'signos vitales', 'emergencias', 'curaciones', 'historia clínica', 'vacunación',
+        'bioseguridad', 'pediatría', 'hospitalización', 'primeros auxilios', 'salud pública'
+    ],
+    'Diseñador Gráfico': [
+        'Photoshop', 'Illustrator', 'InDesign', 'identidad visual', 'branding', 'tipografía',
+        'diseño editorial', 'redes sociales', 'ilustración', 'maquetación', 'Figma',
+        'diseño UX', 'fotografía', 'animación', 'piezas publicitarias'
+    ],
+    'Ingeniero Civil': [
+        'AutoCAD', 'Civil 3D', 'supervisión de obras', 'estructuras', 'concreto armado',
+        'metrados', 'presupuestos de obra', 'expedientes técnicos', 'topografía', 'S10',
+        'MS Project', 'seguridad en obra', 'saneamiento', 'carreteras', 'edificaciones'
+    ],
+    'Docente': [
+        'planificación curricular', 'evaluación formativa', 'didáctica', 'tutoría',
+        'educación secundaria', 'educación primaria', 'sesiones de aprendizaje', 'TIC en el aula',
+        'comunicación', 'matemática', 'gestión del aula', 'inclusión educativa', 'proyectos educativos'
+    ],
+    'Administrador': [
+        'gestión de recursos humanos', 'logística', 'compras', 'atención al cliente', 'ERP',
+        'indicadores de gestión', 'planeamiento estratégico', 'procesos', 'ventas',
+        'negociación', 'liderazgo de equipos', 'control de inventarios', 'marketing'
+    ],
+    'Electricista': [
+        'instalaciones eléctricas', 'tableros eléctricos', 'mantenimiento preventivo',
+        'media tensión', 'baja tensión', 'motores eléctricos', 'PLC', 'cableado estructurado',
+        'iluminación', 'puesta a tierra', 'planos eléctricos', 'automatización industrial'
+    ],
+}
+
+COMMON_WORDS = [
+    'responsable', 'proactivo', 'trabajo en equipo', 'comunicación efectiva', 'orientado a resultados',
+    'Microsoft Office', 'inglés intermedio', 'disponibilidad inmediata', 'capacidad de análisis',
+    'puntualidad', 'compromiso', 'aprendizaje continuo', 'resolución de problemas'
+]
+
+FIRST_NAMES = ['María', 'José', 'Luis', 'Ana', 'Carlos', 'Rosa', 'Jorge', 'Lucía', 'Miguel', 'Carmen',
+               'Pedro', 'Sofía', 'Juan', 'Elena', 'Andrés', 'Valeria']
+LAST_NAMES = ['García', 'Quispe', 'Rodríguez', 'Flores', 'Mamani', 'Sánchez', 'Huamán', 'Torres',
+              'Ramírez', 'Chávez', 'Vargas', 'Castillo', 'Rojas', 'Mendoza']
+CITIES = ['Lima', 'Arequipa', 'Trujillo', 'Cusco', 'Piura', 'Chiclayo', 'Huancayo', 'Iquitos']
+COMPANIES = ['Grupo Andino', 'Servicios Integrales', 'Corporación del Sur', 'Inversiones Pacífico',
+             'Consultores Asociados', 'Soluciones Globales', 'Industrias Unidas']
+
+
+def generate_cv(profession, rng, noise=0.2, sections=3):
+    """Genera el texto de un CV sintético para una profesión
+
+    Args:
+        noise: fracción de términos tomados de otras profesiones (solapamiento entre clases)
+        sections: número de experiencias laborales (controla la longitud del CV)
+    """
+    keywords = PROFESSIONS[profession]
+    others = [word for prof, words in PROFESSIONS.items() if prof != profession for word in words]
+
+    def pick_terms(count):
+        return [rng.choice(others) if rng.random() < noise else rng.choice(keywords)
+                for _ in range(count)]
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name.upper(),
+        f"{profession} - {rng.choice(CITIES)}, Perú",
+        f"Correo: {name.split()[0].lower()}{rng.randint(10, 99)}@correo.com  Teléfono: 9{rng.randint(10000000, 99999999)}",
+        "",
+        "PERFIL PROFESIONAL",
+        f"{profession} con {rng.randint(1, 15)} años de experiencia en {', '.join(pick_terms(3))}. "
+        f"Persona {', '.join(rng.sample(COMMON_WORDS, 3))}.",
+        "",
+        "EXPERIENCIA LABORAL",
+    ]
+    for _ in range(sections):
+        start = rng.randint(2008, 2022)
+        lines.append(f"{rng.choice(COMPANIES)} ({start} - {min(start + rng.randint(1, 4), 2025)})")
+        for term in pick_terms(4):
+            lines.append(f"- Encargado de {term} y {rng.choice(pick_terms(2))}.")
+    lines += [
+        "",
+        "HABILIDADES",
+        ', '.join(sorted(set(pick_terms(8) + rng.sample(COMMON_WORDS, 2)))),
+        "",
+        "FORMACIÓN",
+        f"Titulado en {profession.lower()} - Universidad Nacional de {rng.choice(CITIES)}",
+    ]
+    return "\n".join(lines)
+
+
+def generate_corpus(cvs_per_profession=50, professions=None, seed=42, noise=0.2, sections=3):
+    """Genera un corpus etiquetado en memoria
+
+    Returns:
+        list: dicts con 'text', 'profession', 'filename' y 'status' (formato de entrenamiento)
+    """
+    rng = random.Random(seed)
+    professions = professions or list(PROFESSIONS)
+    corpus = []
+    for profession in professions:
+        for i in range(cvs_per_profession):
+            corpus.append({
+                'text': generate_cv(profession, rng, noise, sections),
+                'profession': profession,
+                'filename': f"{profession.lower().replace(' ', '_')}_{i:04d}.pdf",
+                'status': 'success'
+            })
+    return corpus
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(text, path, lines_per_page=55, width=95):
+    """Escribe un PDF mínimo (Helvetica, WinAnsi) con el texto dado
+
+    Las líneas largas se cortan a ``width`` caracteres. El resultado lo puede leer
+    PyPDF2, así que sirve para medir la extracción real.
+    """
+    lines = []
+    for raw in text.split("\n"):
+        while len(raw) > width:
+            cut = raw.rfind(' ', 0, width)
+            cut = cut if cut > 0 else width
+            lines.append(raw[:cut])
+            raw = raw[cut:].lstrip()
+        lines.append(raw)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objetos: 1 catálogo, 2 páginas, 3 fuente, después (página, contenido) por página
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    kids = []
+    for n, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * n, 5 + 2 * n
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 10 Tf 13 TL 50 800 Td\n" + "".join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        data = stream.encode('cp1252', errors='replace')
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def write_corpus(corpus, output_dir, file_format='pdf'):
+    """Escribe el corpus en ``output_dir/<profesión>/`` (la estructura que usa el entrenamiento)
+
+    Returns:
+        list: (ruta, profesión) de cada archivo escrito
+    """
+    labelled = []
+    for item in corpus:
+        folder = os.path.join(output_dir, item['profession'])
+        os.makedirs(folder, exist_ok=True)
+        name = os.path.splitext(item['filename'])[0]
+        if file_format == 'pdf':
+            path = os.path.join(folder, name + '.pdf')
+            write_pdf(item['text'], path)
+        else:
+            path = os.path.join(folder, name + '.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(item['text'])
+        labelled.append((path, item['profession']))
+    return labelled
@@ -0,0 +1,391 @@
+"""
+Suite de benchmarks: extracción, vectorización, entrenamiento y predicción
+
+Genera un corpus sintético de CVs en español, mide cada etapa del sistema y guarda
+los resultados en JSON para compararlos entre commits.
+
+Uso:
+    python -m benchmarks.run_benchmarks [--size 50] [--stages extraction,training,...]
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<anterior>.json
+
+Etapas: extraction, vectorization, training, prediction, dl, api. Las etapas cuyas
+dependencias no están instaladas (TensorFlow, Flask) se marcan como omitidas.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import datetime
+import subprocess
+import contextlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import generate_corpus, write_corpus  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+ML_MODEL_TYPES = ['random_forest', 'logistic_regression', 'svm', 'naive_bayes']
+ALL_STAGES = ['extraction', 'vectorization', 'training', 'prediction', 'dl', 'api']
+
+
+# --- Utilidades de medición -----------------------------------------------------
+
+def percentile(samples, p):
+    """Percentil por rango más cercano (samples no vacío)"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(samples_ms):
+    return {
+        'samples': len(samples_ms),
+        'mean_ms': sum(samples_ms) / len(samples_ms),
+        'p50_ms': percentile(samples_ms, 50),
+        'p99_ms': percentile(samples_ms, 99),
+        'max_ms': max(samples_ms)
+    }
+
+
+def measure_latency(fn, inputs):
+    """Latencia en milisegundos de ``fn`` para cada entrada"""
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - start) * 1000)
+    return latency_summary(samples)
+
+
+@contextlib.contextmanager
+def timed(results, key):
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silencia los print y logs informativos de los clasificadores durante la medición"""
+    logging.disable(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+
+# --- Etapas ---------------------------------------------------------------------
+
+def bench_extraction(ctx):
+    from models.text_extraction import extract_text, iter_extracted_texts
+
+    paths = [path for path, _ in write_corpus(ctx['corpus'], os.path.join(ctx['workdir'], 'pdf'))]
+    total_mb = sum(os.path.getsize(path) for path in paths) / (1024 * 1024)
+    results = {'files': len(paths), 'total_mb': total_mb}
+
+    with timed(results, 'sequential_seconds'):
+        empty = sum(1 for path in paths if not extract_text(path))
+    with timed(results, 'parallel_seconds'):
+        list(iter_extracted_texts(paths, ctx['jobs']))
+
+    results.update({
+        'jobs': ctx['jobs'] or os.cpu_count(),
+        'empty_texts': empty,
+        'sequential_cvs_per_second': len(paths) / results['sequential_seconds'],
+        'parallel_cvs_per_second': len(paths) / results['parallel_seconds'],
+        'sequential_mb_per_second': total_mb / results['sequential_seconds'],
+        'single_cv_latency': measure_latency(extract_text, paths[:ctx['latency_samples']])
+    })
+    return results
+
+
+def bench_vectorization(ctx):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    texts = [item['text'] for item in ctx['corpus']]
+    # Mismos parámetros que CVClassifier.train_model
+    vectorizer = TfidfVectorizer(max_features=min(5000, len(texts) * 100), ngram_range=(1, 2),
+                                 min_df=1 if len(texts) < 10 else 2, max_df=0.95)
+    results = {'documents': len(texts), 'total_chars': sum(len(text) for text in texts)}
+    with timed(results, 'fit_transform_seconds'):
+        X = vectorizer.fit_transform(texts)
+    with timed(results, 'transform_seconds'):
+        vectorizer.transform(texts)
+    results.update({
+        'features': X.shape[1],
+        'transform_docs_per_second': len(texts) / results['transform_seconds'],
+        'single_doc_latency': measure_latency(lambda text: vectorizer.transform([text]),
+                                              texts[:ctx['latency_samples']])
+    })
+    return results
+
+
+def bench_training(ctx):
+    from models.cv_classifier import CVClassifier
+
+    results = {}
+    for model_type in ctx['model_types']:
+        classifier = CVClassifier(model_dir=os.path.join(ctx['workdir'], 'models'))
+        entry = {}
+        with quiet(), timed(entry, 'seconds'):
+            training = classifier.train_model(ctx['corpus'], model_type=model_type)
+        entry['accuracy'] = float(training['accuracy'])
+        entry['train_samples'] = int(training['train_samples'])
+        results[model_type] = entry
+        ctx['classifiers'][model_type] = classifier
+    return results
+
+
+def bench_prediction(ctx):
+    from models.cv_classifier import CVClassifier
+
+    texts = [item['text'] for item in ctx['corpus']]
+    results = {}
+    for model_type in ctx['model_types']:
+        classifier = ctx['classifiers'].get(model_type)
+        if classifier is None:
+            classifier = CVClassifier(model_dir=os.path.join(ctx['workdir'], 'models'))
+            with quiet():
+                classifier.train_model(ctx['corpus'], model_type=model_type)
+            ctx['classifiers'][model_type] = classifier
+
+        entry = {'predict_cv_latency': measure_latency(classifier.predict_cv, texts[:ctx['latency_samples']])}
+        with timed(entry, 'batch_seconds'):
+            classifier.predict_batch(texts)
+        entry['batch_cvs_per_second'] = len(texts) / entry['batch_seconds']
+        results[model_type] = entry
+    return results
+
+
+def bench_dl(ctx):
+    from models.deep_learning_classifier import DeepLearningClassifier, TENSORFLOW_AVAILABLE
+    if not TENSORFLOW_AVAILABLE:
+        return {'skipped': 'TensorFlow no está instalado'}
+    from tensorflow.keras.preprocessing.sequence import pad_sequences
+
+    texts = [item['text'] for item in ctx['corpus']]
+    classifier = DeepLearningClassifier()
+    results = {'model_type': 'lstm', 'epochs': ctx['dl_epochs']}
+    with quiet(), timed(results, 'training_seconds'):
+        training = classifier.train_model(ctx['corpus'], model_type='lstm', epochs=ctx['dl_epochs'],
+                                          batch_size=32, run_name='benchmark', histogram_logging=False)
+    if not training.get('success'):
+        return {'error': training.get('error', 'Error durante el entrenamiento')}
+
+    with timed(results, 'tokenization_seconds'):
+        pad_sequences(classifier.tokenizer.texts_to_sequences(texts), maxlen=classifier.max_length,
+                      padding='post', truncating='post')
+    with quiet(), timed(results, 'batch_inference_seconds'):
+        classifier.predict_batch(texts)
+    with quiet():
+        results['predict_cv_latency'] = measure_latency(classifier.predict_cv, texts[:ctx['latency_samples']])
+    results.update({
+        'tokenization_docs_per_second': len(texts) / results['tokenization_seconds'],
+        'batch_inference_cvs_per_second': len(texts) / results['batch_inference_seconds']
+    })
+    return results
+
+
+def bench_api(ctx):
+    try:
+        import flask  # noqa: F401
+    except ImportError:
+        return {'skipped': 'Flask no está instalado'}
+
+    page_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'page')
+    sys.path.insert(0, page_dir)
+    import postulacion_db
+    import postulacion_extension
+
+    # Base de datos temporal: el benchmark nunca toca page/database/postulaciones.db
+    db_dir = os.path.join(ctx['workdir'], 'database')
+    db_path = os.path.join(db_dir, 'postulaciones.db')
+    postulacion_db.DATABASE_DIR = db_dir
+    postulacion_db.DATABASE_PATH = db_path
+    postulacion_extension.DATABASE_PATH = db_path
+
+    with quiet():
+        # Tabla y columnas de clasificación antes de importar la API, que las usa al cargarse
+        postulacion_db.init_database()
+        postulacion_extension.add_classification_columns()
+        import postulacion_classification_api as api
+        ids = []
+        for i, item in enumerate(ctx['corpus'][:ctx['latency_samples']]):
+            added = postulacion_db.add_postulacion(f"Postulante {i}", f"{10000000 + i}", "999999999",
+                                                   f"postulante{i}@correo.com", item['filename'],
+                                                   item['text'].encode('utf-8'))
+            ids.append(added['id'])
+
+    model_type = ctx['model_types'][0]
+    if model_type not in ctx['classifiers']:
+        bench_training({**ctx, 'model_types': [model_type]})
+    api.active_classifier = ctx['classifiers'][model_type]
+    api.active_model_name = f"benchmark_{model_type}"
+
+    client = api.app.test_client()
+    statuses = []
+
+    def classify(postulacion_id):
+        statuses.append(client.post(f"/api/postulaciones/classify/{postulacion_id}").status_code)
+
+    with quiet():
+        results = {'model_type': model_type, 'classify_latency': measure_latency(classify, ids)}
+        results['list_latency'] = measure_latency(lambda _: client.get('/api/postulaciones'), range(20))
+    failed = [status for status in statuses if status != 200]
+    if failed:
+        # Las latencias de peticiones fallidas no son comparables: no se reportan
+        return {'model_type': model_type, 'errors': len(failed),
+                'error': f"{len(failed)} de {len(statuses)} clasificaciones fallaron (HTTP {sorted(set(failed))})"}
+    results['errors'] = 0
+    return results
+
+
+STAGE_FUNCTIONS = {
+    'extraction': bench_extraction,
+    'vectorization': bench_vectorization,
+    'training': bench_training,
+    'prediction': bench_prediction,
+    'dl': bench_dl,
+    'api': bench_api,
+}
+
+
+# --- Comparación ----------------------------------------------------------------
+
+def _flatten(data, prefix=''):
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare_results(baseline, current, threshold=10.0):
+    """Compara métricas de tiempo y throughput entre dos ejecuciones
+
+    Returns:
+        list: (métrica, anterior, actual, cambio %, regresión) para las métricas comunes
+    """
+    old = _flatten(baseline.get('stages', {}))
+    new = _flatten(current.get('stages', {}))
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        higher_is_better = key.endswith('per_second')
+        lower_is_better = key.endswith('_seconds') or key.endswith('_ms')
+        if not (higher_is_better or lower_is_better) or not old[key]:
+            continue
+        change = 100.0 * (new[key] - old[key]) / old[key]
+        regression = change < -threshold if higher_is_better else change > threshold
+        rows.append((key, old[key], new[key], change, regression))
+    return rows
+
+
+def print_comparison(rows, baseline_commit):
+    print(f"\nComparación con {baseline_commit}:")
+    for key, old, new, change, regression in rows:
+        mark = '⚠️ ' if regression else '   '
+        print(f"{mark}{key:<60} {old:>12.4f} -> {new:>12.4f} ({change:+.1f}%)")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"{regressions} regresiones de {len(rows)} métricas")
+
+
+# --- Entrada principal ----------------------------------------------------------
+
+def run(args):
+    stages = args.stages.split(',') if args.stages else ALL_STAGES
+    unknown = set(stages) - set(STAGE_FUNCTIONS)
+    if unknown:
+        raise ValueError(f"Etapas desconocidas: {sorted(unknown)}")
+
+    corpus = generate_corpus(args.size, seed=args.seed, noise=args.noise, sections=args.sections)
+    workdir = tempfile.mkdtemp(prefix='cv_benchmarks_')
+    ctx = {
+        'corpus': corpus,
+        'workdir': workdir,
+        'jobs': args.jobs,
+        'latency_samples': min(args.latency_samples, len(corpus)),
+        'model_types': args.model_types.split(','),
+        'dl_epochs': args.dl_epochs,
+        'classifiers': {}
+    }
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('compare', 'output_dir')},
+        'corpus': {'cvs': len(corpus), 'professions': len({item['profession'] for item in corpus})},
+        'stages': {}
+    }
+
+    try:
+        for stage in stages:
+            print(f"⏱️ {stage}...", file=sys.stderr)
+            try:
+                report['stages'][stage] = STAGE_FUNCTIONS[stage](ctx)
+            except ImportError as e:
+                report['stages'][stage] = {'skipped': f"Dependencia no disponible: {e}"}
+            except Exception as e:
+                report['stages'][stage] = {'error': str(e)}
+            status = report['stages'][stage].get('skipped') or report['stages'][stage].get('error') or 'ok'
+            print(f"   {status}", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de ClasificaTalento PRO")
+    parser.add_argument('--size', type=int, default=50, help="CVs por profesión")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--noise', type=float, default=0.2, help="Solapamiento de vocabulario entre profesiones")
+    parser.add_argument('--sections', type=int, default=3, help="Experiencias por CV (longitud del CV)")
+    parser.add_argument('--stages', help=f"Etapas separadas por comas ({','.join(ALL_STAGES)})")
+    parser.add_argument('--model-types', default=','.join(ML_MODEL_TYPES))
+    parser.add_argument('--jobs', type=int, default=None, help="Procesos para la extracción paralela")
+    parser.add_argument('--latency-samples', type=int, default=100)
+    parser.add_argument('--dl-epochs', type=int, default=1)
+    parser.add_argument('--output-dir', default=RESULTS_DIR)
+    parser.add_argument('--compare', help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    output_path = os.path.join(args.output_dir, f"{stamp}_{report['commit']}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {output_path}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare_results(baseline, report)
+        print_comparison(rows, baseline.get('commit', args.compare))
+        return 1 if any(row[4] for row in rows) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,5 +6,6 @@ Contiene las interfaces para Machine Learning y Deep Learning
 
 from .vista_ml_entrenamiento import VistaMLEntrenamiento
 from .vista_dl_entrenamiento import VistaDLEntrenamiento
+from .vista_cola_entrenamiento import VistaColaEntrenamiento
 
-__all__ = ['VistaMLEntrenamiento', 'VistaDLEntrenamiento']
+__all__ = ['VistaMLEntrenamiento', 'VistaDLEntrenamiento', 'VistaColaEntrenamiento']
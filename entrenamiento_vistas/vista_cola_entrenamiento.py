@@ -0,0 +1,225 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTextEdit, QGroupBox, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QMessageBox, QSpinBox)
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtGui import QFont, QTextCursor
+from models.training_jobs import JobStore, ACTIVE_STATES, shared_scheduler
+
+
+STATE_LABELS = {
+    'queued': "⏳ En cola",
+    'running': "🔄 Entrenando",
+    'finished': "✅ Terminado",
+    'failed': "❌ Fallido",
+    'cancelled': "⏹ Cancelado",
+}
+
+
+class VistaColaEntrenamiento(QWidget):
+    """Cola de trabajos de entrenamiento: estado, registro y acciones sobre cada trabajo
+
+    Los trabajos se ejecutan en procesos aparte (ver ``models.training_jobs``), así que
+    esta vista solo consulta la base de datos de la cola periódicamente.
+    """
+    volver_solicitado = pyqtSignal()
+
+    REFRESH_MS = 2000
+    COLUMNS = ["ID", "Modelo", "Tipo", "Algoritmo", "Estado", "Prioridad", "Recursos", "Creado", "Detalle"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("VistaColaEntrenamiento")
+        self.store = JobStore()
+        self.jobs = []
+        self.init_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(30, 25, 30, 25)
+        layout.setSpacing(20)
+
+        header_layout = QHBoxLayout()
+        self.btn_volver = QPushButton("← Volver")
+        self.btn_volver.setFixedSize(100, 35)
+        self.btn_volver.clicked.connect(self.volver_solicitado.emit)
+        header_layout.addWidget(self.btn_volver)
+        header_layout.addStretch()
+        title_label = QLabel("📋 Cola de Entrenamientos")
+        title_font = QFont(); title_font.setPointSize(20); title_font.setBold(True)
+        title_label.setFont(title_font)
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+        layout.addLayout(header_layout)
+
+        jobs_group = QGroupBox("Trabajos")
+        jobs_layout = QVBoxLayout(jobs_group)
+        self.status_label = QLabel()
+        jobs_layout.addWidget(self.status_label)
+
+        self.jobs_table = QTableWidget(0, len(self.COLUMNS))
+        self.jobs_table.setObjectName("TrainingJobsTable")
+        self.jobs_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.jobs_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.jobs_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.jobs_table.horizontalHeader().setStretchLastSection(True)
+        self.jobs_table.setMinimumHeight(220)
+        self.jobs_table.itemSelectionChanged.connect(self.on_selection_changed)
+        jobs_layout.addWidget(self.jobs_table)
+
+        actions = QHBoxLayout()
+        actions.addWidget(QLabel("Prioridad:"))
+        self.priority_input = QSpinBox()
+        self.priority_input.setRange(-100, 100)
+        self.priority_input.setToolTip("Los trabajos con mayor prioridad se ejecutan antes")
+        actions.addWidget(self.priority_input)
+        self.btn_set_priority = QPushButton("Aplicar")
+        self.btn_set_priority.clicked.connect(self.apply_priority)
+        actions.addWidget(self.btn_set_priority)
+        actions.addStretch()
+        self.btn_cancel_job = QPushButton("⏹ Cancelar")
+        self.btn_cancel_job.clicked.connect(self.cancel_selected)
+        actions.addWidget(self.btn_cancel_job)
+        self.btn_retry_job = QPushButton("🔁 Reintentar")
+        self.btn_retry_job.clicked.connect(self.retry_selected)
+        actions.addWidget(self.btn_retry_job)
+        self.btn_clear_jobs = QPushButton("🗑️ Limpiar terminados")
+        self.btn_clear_jobs.clicked.connect(self.clear_finished)
+        actions.addWidget(self.btn_clear_jobs)
+        jobs_layout.addLayout(actions)
+        layout.addWidget(jobs_group)
+
+        log_group = QGroupBox("Registro del trabajo seleccionado")
+        log_layout = QVBoxLayout(log_group)
+        self.job_log = QTextEdit()
+        self.job_log.setObjectName("TrainingJobLog")
+        self.job_log.setReadOnly(True)
+        self.job_log.setMinimumHeight(200)
+        self.job_log.setPlaceholderText("Selecciona un trabajo para ver su registro...")
+        log_layout.addWidget(self.job_log)
+        layout.addWidget(log_group)
+
+        self._update_buttons()
+
+    # --- Actualización ----------------------------------------------------------
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start(self.REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def selected_job(self):
+        row = self.jobs_table.currentRow()
+        if 0 <= row < len(self.jobs) and self.jobs_table.selectionModel().hasSelection():
+            return self.jobs[row]
+        return None
+
+    def refresh(self):
+        selected = self.selected_job()
+        selected_id = selected['id'] if selected else None
+        self.jobs = self.store.list_jobs(limit=200)
+
+        # Sin señales mientras se rellena: la selección se restaura sin borrar el registro
+        self.jobs_table.blockSignals(True)
+        self.jobs_table.clearSelection()
+        self.jobs_table.setRowCount(len(self.jobs))
+        for row, job in enumerate(self.jobs):
+            values = [
+                str(job['id']),
+                job['model_name'],
+                job['kind'].upper(),
+                job['params'].get('model_type') or '-',
+                STATE_LABELS.get(job['state'], job['state']) + (" (cancelando)" if job['cancel_requested'] else ""),
+                str(job['priority']),
+                f"{job['cpus']} CPUs · {job['memory_mb'] / 1024:.1f} GB",
+                (job['created_at'] or '').replace('T', ' '),
+                job['message'] or ''
+            ]
+            for column, value in enumerate(values):
+                self.jobs_table.setItem(row, column, QTableWidgetItem(value))
+            if job['id'] == selected_id:
+                self.jobs_table.selectRow(row)
+        self.jobs_table.blockSignals(False)
+
+        counts = self.store.counts()
+        scheduler = shared_scheduler()
+        if scheduler.is_leader:
+            owner = f"planificador activo ({scheduler.max_cpus} CPUs, {scheduler.max_memory_mb / 1024:.1f} GB)"
+        elif self.store.scheduler_alive():
+            owner = "planificador en otro proceso"
+        else:
+            owner = "planificador detenido"
+        self.status_label.setText(
+            f"{counts.get('running', 0)} en ejecución · {counts.get('queued', 0)} en cola · {owner}"
+        )
+        self._update_log()
+        self._update_buttons()
+
+    def on_selection_changed(self):
+        self.job_log.clear()
+        self._update_log()
+        self._update_buttons()
+
+    def _update_log(self):
+        job = self.selected_job()
+        if job is None:
+            return
+        text = self.store.read_log(job['id']) or "(Sin registro todavía)"
+        if text != self.job_log.toPlainText():
+            scrollbar = self.job_log.verticalScrollBar()
+            at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+            self.job_log.setPlainText(text)
+            if at_bottom:
+                self.job_log.moveCursor(QTextCursor.MoveOperation.End)
+
+    def _update_buttons(self):
+        job = self.selected_job()
+        active = job is not None and job['state'] in ACTIVE_STATES
+        self.btn_cancel_job.setEnabled(active and not job['cancel_requested'])
+        self.btn_retry_job.setEnabled(job is not None and not active)
+        self.btn_set_priority.setEnabled(job is not None and job['state'] == 'queued')
+
+    # --- Acciones ---------------------------------------------------------------
+
+    def cancel_selected(self):
+        job = self.selected_job()
+        if job is None:
+            return
+        if job['state'] == 'running':
+            reply = QMessageBox.question(
+                self, "Cancelar Entrenamiento",
+                f"El trabajo {job['id']} ('{job['model_name']}') está entrenando. ¿Cancelarlo?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        self.store.request_cancel(job['id'])
+        shared_scheduler().wake()
+        self.refresh()
+
+    def retry_selected(self):
+        job = self.selected_job()
+        if job is not None and self.store.retry(job['id']):
+            shared_scheduler().wake()
+            self.refresh()
+
+    def apply_priority(self):
+        job = self.selected_job()
+        if job is not None:
+            self.store.set_priority(job['id'], self.priority_input.value())
+            self.refresh()
+
+    def clear_finished(self):
+        removed = self.store.delete_finished()
+        self.job_log.clear()
+        self.refresh()
+        self.status_label.setText(self.status_label.text() + f" · {removed} trabajos eliminados de la lista")
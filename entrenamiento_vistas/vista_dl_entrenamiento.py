@@ -1,13 +1,18 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QProgressBar, QTextEdit,
                              QComboBox, QGroupBox, QGridLayout, QLineEdit,
-                             QListWidget, QFileDialog, QMessageBox, QFrame)
+                             QListWidget, QFileDialog, QMessageBox, QFrame,
+                             QCheckBox)
 from PyQt6.QtCore import Qt, pyqtSignal, QThread, QUrl
 from PyQt6.QtGui import QFont, QDragEnterEvent, QDropEvent
 from PyQt6.QtMultimedia import QSoundEffect
 import os
-import PyPDF2
 from models.deep_learning_classifier import DeepLearningClassifier
+from models.corpus_manifest import CorpusManifest, format_diff
+from models.text_extraction import format_failures
+from models.training_jobs import JobStore, shared_scheduler
+from models.training_telemetry import TrainingTelemetry, format_snapshot
+from src.monitoring import profiling
 import tensorflow as tf
 from notificacion.model_notifications import ModelNotifications
 
@@ -50,44 +55,61 @@ class DropGroupBox(QGroupBox):
 class DLTrainingWorker(QThread):
     progress_updated = pyqtSignal(int, str)
     epoch_updated = pyqtSignal(int, int, dict)
+    telemetry_updated = pyqtSignal(dict)  # Instantánea de TrainingTelemetry (por batch: muestras/s, ETA, memoria)
+    extraction_report = pyqtSignal(list)  # Líneas de format_failures: CVs sin texto y su motivo
     training_completed = pyqtSignal(dict)
     training_failed = pyqtSignal(str)
+    training_cancelled = pyqtSignal()
 
-    def __init__(self, profession_folders, model_name, model_type, epochs, batch_size):
+    def __init__(self, profession_folders, model_name, model_type, epochs, batch_size, chunking=None,
+                 resume=False, histogram_logging=True, performance_options=None, time_budget=None):
         super().__init__()
         self.profession_folders = profession_folders
         self.model_name = model_name
         self.model_type = model_type
         self.epochs = epochs
         self.batch_size = batch_size
+        self.chunking = chunking
+        self.resume = resume
+        self.histogram_logging = histogram_logging
+        self.performance_options = performance_options
+        self.time_budget = time_budget  # segundos; None = sin límite
         self.classifier = DeepLearningClassifier()
+        self._cancelled = False
 
-    def extract_text_from_pdf(self, pdf_path):
-        try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = "".join(page.extract_text() + "\n" for page in reader.pages)
-                return text.strip()
-        except Exception:
-            return ""
+    def cancel(self):
+        """Solicita detener el entrenamiento (entre archivos o tras el batch en curso)"""
+        self._cancelled = True
 
     def run(self):
+        with profiling.profile_run('dl_training_worker', metadata={
+                'model_name': self.model_name, 'model_type': self.model_type, 'epochs': self.epochs,
+                'batch_size': self.batch_size, 'professions': len(self.profession_folders)}):
+            self._run()
+
+    def _run(self):
         try:
-            self.progress_updated.emit(10, "Preparando datos...")
-            cv_data, processed_files = [], 0
-            total_files = sum(len([f for f in os.listdir(p) if f.lower().endswith('.pdf')]) for p in self.profession_folders.values())
-            
-            for profession, folder_path in self.profession_folders.items():
-                if not os.path.isdir(folder_path): continue
-                for filename in os.listdir(folder_path):
-                    if filename.lower().endswith('.pdf'):
-                        file_path = os.path.join(folder_path, filename)
-                        text = self.extract_text_from_pdf(file_path)
-                        status = 'success' if text else 'failed'
-                        cv_data.append({'text': text, 'profession': profession, 'filename': filename, 'status': status})
-                        processed_files += 1
-                        progress = 20 + (processed_files * 40 // total_files if total_files > 0 else 0)
-                        self.progress_updated.emit(progress, f"Procesando: {filename}")
+            self.progress_updated.emit(10, "Sincronizando carpetas de profesiones...")
+            telemetry = TrainingTelemetry(callback=self.telemetry_updated.emit)
+            telemetry.start_phase('extraction', unit='archivos')
+            folders = {p: f for p, f in self.profession_folders.items() if os.path.isdir(f)}
+
+            def on_extracted(processed, total, path):
+                telemetry.update(processed, total=total)
+                self.progress_updated.emit(20 + processed * 40 // total, f"Procesando: {os.path.basename(path)}")
+
+            # Solo se extraen los PDFs nuevos o modificados; el resto sale del manifiesto
+            manifest = CorpusManifest()
+            diff = manifest.sync(folders, extensions=('.pdf',), progress_callback=on_extracted,
+                                 should_stop=lambda: self._cancelled)
+            if self._cancelled:
+                self.training_cancelled.emit()
+                return
+            self.progress_updated.emit(60, f"Corpus sincronizado: {format_diff(diff)}")
+            cv_data = manifest.training_data(folders)
+            failures = format_failures([item for item in cv_data if item['status'] != 'success'])
+            if failures:
+                self.extraction_report.emit(failures)
 
             self.progress_updated.emit(70, f"Entrenando modelo {self.model_type.upper()}...")
             
@@ -122,9 +144,24 @@ class DLTrainingWorker(QThread):
                 model_type=self.model_type, 
                 epochs=self.epochs, 
                 batch_size=self.batch_size,
-                callbacks=[epoch_callback]
+                callbacks=[epoch_callback],
+                chunking=self.chunking,
+                run_name=self.model_name,
+                resume=self.resume,
+                histogram_logging=self.histogram_logging,
+                performance_options=self.performance_options,
+                should_stop=lambda: self._cancelled,
+                time_budget=self.time_budget,
+                telemetry=telemetry
             )
 
+            if results.get('cancelled', False):
+                self.training_cancelled.emit()
+                return
+            if results.get('stopped_early') == 'time_budget':
+                self.progress_updated.emit(85, f"Presupuesto de tiempo agotado tras {results['epochs_trained']} "
+                                               "épocas: se usan los mejores pesos obtenidos")
+
             if results.get('success', False):
                 self.progress_updated.emit(90, "Guardando modelo...")
                 save_success = self.classifier.save_model(self.model_name)
@@ -152,6 +189,7 @@ class VistaDLEntrenamiento(QWidget):
         self.init_ui()
         self.profession_folders = {}
         self.selected_folder = None
+        self.dl_training_worker = None
         self.current_epoch = 0
         self.total_epochs = 0
         
@@ -243,7 +281,8 @@ class VistaDLEntrenamiento(QWidget):
         layout.addWidget(self.dl_model_name_input, 0, 1, 1, 3)
         layout.addWidget(QLabel("Tipo de arquitectura DL:"), 1, 0)
         self.dl_model_type_combo = QComboBox()
-        dl_models = [("bert", "BERT"), ("lstm", "LSTM"), ("cnn", "CNN (Texto)")]
+        dl_models = [("bert", "BERT"), ("bert_frozen", "BERT congelado (rápido en CPU)"),
+                     ("lstm", "LSTM"), ("cnn", "CNN (Texto)")]
         for value, display_name in dl_models: self.dl_model_type_combo.addItem(display_name, value)
         layout.addWidget(self.dl_model_type_combo, 1, 1, 1, 3)
         layout.addWidget(QLabel("Épocas:"), 2, 0)
@@ -252,10 +291,55 @@ class VistaDLEntrenamiento(QWidget):
         layout.addWidget(QLabel("Batch Size:"), 2, 2)
         self.dl_batch_size_input = QLineEdit("16"); self.dl_batch_size_input.setMaximumWidth(100)
         layout.addWidget(self.dl_batch_size_input, 2, 3)
+        self.dl_chunking_checkbox = QCheckBox("Ventanas deslizantes (CVs largos)")
+        self.dl_chunking_checkbox.setToolTip("Divide los CVs en ventanas solapadas en lugar de truncarlos a 512 tokens")
+        layout.addWidget(self.dl_chunking_checkbox, 3, 0)
+        layout.addWidget(QLabel("Ventana / Paso:"), 3, 1)
+        window_layout = QHBoxLayout()
+        self.dl_window_input = QLineEdit("512"); self.dl_window_input.setMaximumWidth(70)
+        self.dl_stride_input = QLineEdit("384"); self.dl_stride_input.setMaximumWidth(70)
+        window_layout.addWidget(self.dl_window_input)
+        window_layout.addWidget(self.dl_stride_input)
+        layout.addLayout(window_layout, 3, 2)
+        self.dl_pooling_combo = QComboBox()
+        for value, display_name in [("mean", "Promedio"), ("max", "Máximo"), ("attention", "Atención")]:
+            self.dl_pooling_combo.addItem(display_name, value)
+        layout.addWidget(self.dl_pooling_combo, 3, 3)
+        self.dl_light_logging_checkbox = QCheckBox("Registro ligero (sin histogramas de pesos)")
+        self.dl_light_logging_checkbox.setChecked(True)
+        layout.addWidget(self.dl_light_logging_checkbox, 4, 0, 1, 2)
+        self.dl_performance_combo = QComboBox()
+        performance_modes = [
+            ("Rendimiento: Estándar (float32)", None),
+            ("Rendimiento: XLA", {'jit_compile': True}),
+            ("Rendimiento: bfloat16 mixto", {'mixed_precision': True}),
+            ("Rendimiento: XLA + bfloat16", {'jit_compile': True, 'mixed_precision': True}),
+            ("Rendimiento: Automático (benchmark)", 'auto')
+        ]
+        for display_name, value in performance_modes: self.dl_performance_combo.addItem(display_name, value)
+        layout.addWidget(self.dl_performance_combo, 4, 2, 1, 2)
         self.btn_dl_train = QPushButton("🧠 Iniciar Entrenamiento")
         self.btn_dl_train.clicked.connect(self.start_dl_training)
         self.btn_dl_train.setEnabled(False)
-        layout.addWidget(self.btn_dl_train, 3, 1, 1, 3, Qt.AlignmentFlag.AlignRight)
+        layout.addWidget(QLabel("Límite de tiempo (min):"), 5, 0)
+        self.dl_time_budget_input = QLineEdit()
+        self.dl_time_budget_input.setPlaceholderText("Sin límite")
+        self.dl_time_budget_input.setToolTip("Al agotarse se detiene el entrenamiento y se guardan los mejores pesos obtenidos")
+        self.dl_time_budget_input.setMaximumWidth(100)
+        layout.addWidget(self.dl_time_budget_input, 5, 1)
+        self.btn_dl_cancel = QPushButton("⏹ Cancelar")
+        self.btn_dl_cancel.clicked.connect(self.cancel_dl_training)
+        self.btn_dl_cancel.setEnabled(False)
+        self.btn_dl_queue = QPushButton("📋 Encolar")
+        self.btn_dl_queue.setToolTip("Entrenar en segundo plano con la cola de entrenamientos")
+        self.btn_dl_queue.clicked.connect(self.queue_dl_training)
+        self.btn_dl_queue.setEnabled(False)
+        train_buttons = QHBoxLayout()
+        train_buttons.addStretch()
+        train_buttons.addWidget(self.btn_dl_cancel)
+        train_buttons.addWidget(self.btn_dl_queue)
+        train_buttons.addWidget(self.btn_dl_train)
+        layout.addLayout(train_buttons, 5, 2, 1, 2)
         parent_layout.addWidget(group)
 
     def create_training_log(self, parent_layout):
@@ -333,6 +417,12 @@ class VistaDLEntrenamiento(QWidget):
 
         layout.addWidget(metrics_frame)
 
+        # Rendimiento en vivo: fase, velocidad, tiempo restante y memoria
+        self.label_rendimiento = QLabel("Rendimiento: --")
+        self.label_rendimiento.setObjectName("DLTelemetryLabel")
+        self.label_rendimiento.setStyleSheet("color: #7F8C8D; font-size: 12px;")
+        layout.addWidget(self.label_rendimiento)
+
         # Log de entrenamiento con estilo mejorado
         self.log_entrenamiento = QTextEdit()
         self.log_entrenamiento.setObjectName("DLTrainingLog")
@@ -396,6 +486,7 @@ class VistaDLEntrenamiento(QWidget):
         self.log_entrenamiento.append(f"➕ Profesión agregada: {profession}")
         self._reset_profession_inputs()
         self.btn_dl_train.setEnabled(len(self.profession_folders) > 0)
+        self.btn_dl_queue.setEnabled(len(self.profession_folders) > 0)
 
     def clear_professions(self):
         reply = QMessageBox.question(self, "Confirmar", "¿Seguro que quieres limpiar la lista?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
@@ -403,6 +494,7 @@ class VistaDLEntrenamiento(QWidget):
             self.profession_folders.clear(); self.profession_list.clear()
             self._reset_profession_inputs()
             self.btn_dl_train.setEnabled(False)
+            self.btn_dl_queue.setEnabled(False)
             self.log_entrenamiento.append("🗑️ Lista de profesiones limpiada.")
 
     def _count_pdf_files(self, folder_path):
@@ -410,16 +502,16 @@ class VistaDLEntrenamiento(QWidget):
         try: return sum(1 for f in os.listdir(folder_path) if f.lower().endswith('.pdf'))
         except: return 0
             
-    def start_dl_training(self):
-        """Inicia el entrenamiento del modelo"""
+    def _collect_training_parameters(self):
+        """Valida el formulario y devuelve (nombre, parámetros) o None si algo no es válido"""
         if not self.profession_folders:
             QMessageBox.warning(self, "Sin Datos", "Agregue al menos una profesión.")
-            return
+            return None
 
         model_name = self.dl_model_name_input.text().strip()
         if not model_name:
             QMessageBox.warning(self, "Nombre Requerido", "Ingrese un nombre para el modelo.")
-            return
+            return None
 
         try:
             epochs = int(self.dl_epochs_input.text())
@@ -428,10 +520,64 @@ class VistaDLEntrenamiento(QWidget):
                 raise ValueError("Los valores deben ser positivos")
         except ValueError:
             QMessageBox.warning(self, "Parámetros Inválidos", "Épocas y Batch Size deben ser números positivos.")
+            return None
+
+        time_budget = None
+        if self.dl_time_budget_input.text().strip():
+            try:
+                time_budget = float(self.dl_time_budget_input.text().replace(',', '.')) * 60
+                if time_budget <= 0:
+                    raise ValueError("El límite debe ser positivo")
+            except ValueError:
+                QMessageBox.warning(self, "Parámetros Inválidos", "El límite de tiempo debe ser un número positivo de minutos.")
+                return None
+
+        chunking = None
+        if self.dl_chunking_checkbox.isChecked():
+            try:
+                window = int(self.dl_window_input.text())
+                stride = int(self.dl_stride_input.text())
+                if window <= 0 or stride <= 0 or stride > window:
+                    raise ValueError("Valores de ventana inválidos")
+            except ValueError:
+                QMessageBox.warning(self, "Parámetros Inválidos", "La ventana y el paso deben ser positivos y el paso no mayor que la ventana.")
+                return None
+            chunking = {'enabled': True, 'window': window, 'stride': stride,
+                        'pooling': self.dl_pooling_combo.currentData()}
+
+        return model_name, {
+            'model_type': self.dl_model_type_combo.currentData(),
+            'epochs': epochs,
+            'batch_size': batch_size,
+            'chunking': chunking,
+            'performance_options': self.dl_performance_combo.currentData(),
+            'time_budget': time_budget
+        }
+
+    def queue_dl_training(self):
+        """Envía la configuración actual a la cola de entrenamientos en segundo plano"""
+        collected = self._collect_training_parameters()
+        if collected is None:
+            return
+        model_name, params = collected
+        try:
+            job_id = JobStore().submit(model_name, 'dl', dict(self.profession_folders), params)
+        except ValueError as e:
+            QMessageBox.warning(self, "No se pudo encolar", str(e))
             return
+        shared_scheduler().wake()
+        self.log_entrenamiento.append(f"📋 Trabajo {job_id} encolado: '{model_name}' ({params['model_type']}). "
+                                      "Su progreso se sigue en la Cola de Entrenamientos.")
+
+    def start_dl_training(self):
+        """Inicia el entrenamiento del modelo"""
+        collected = self._collect_training_parameters()
+        if collected is None:
+            return
+        model_name, params = collected
+        epochs, batch_size = params['epochs'], params['batch_size']
+        model_type, chunking, time_budget = params['model_type'], params['chunking'], params['time_budget']
 
-        model_type = self.dl_model_type_combo.currentData()
-        
         # Reiniciar UI
         self.progress_bar.setValue(0)
         self.label_epoca.setText(f"Época: 0 / {epochs}")
@@ -441,19 +587,67 @@ class VistaDLEntrenamiento(QWidget):
 
         # Iniciar worker
         self.dl_training_worker = DLTrainingWorker(
-            self.profession_folders, model_name, model_type, epochs, batch_size
+            self.profession_folders, model_name, model_type, epochs, batch_size, chunking,
+            histogram_logging=not self.dl_light_logging_checkbox.isChecked(),
+            performance_options=params['performance_options'],
+            time_budget=time_budget
         )
+        if self.dl_training_worker.classifier.has_resumable_checkpoint(model_name):
+            state = self.dl_training_worker.classifier.load_run_state(model_name)
+            reply = QMessageBox.question(
+                self, "Entrenamiento Interrumpido",
+                f"Se encontró un checkpoint de '{model_name}' en la época {state.get('epochs_completed', 0)}.\n"
+                "¿Deseas reanudar el entrenamiento desde ese punto?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.Yes
+            )
+            self.dl_training_worker.resume = reply == QMessageBox.StandardButton.Yes
+            if self.dl_training_worker.resume:
+                self.log_entrenamiento.append(f"🔄 Reanudando desde la época {state.get('epochs_completed', 0)}")
         self.dl_training_worker.progress_updated.connect(self.update_dl_training_progress)
         self.dl_training_worker.epoch_updated.connect(self.update_epoch_metrics)
+        self.dl_training_worker.telemetry_updated.connect(self.update_telemetry)
+        self.dl_training_worker.extraction_report.connect(self.show_extraction_report)
+        self.last_telemetry = None
         self.dl_training_worker.training_completed.connect(self.on_dl_training_completed)
         self.dl_training_worker.training_failed.connect(self.on_dl_training_failed)
+        self.dl_training_worker.training_cancelled.connect(self.on_dl_training_cancelled)
         self.dl_training_worker.start()
+        self.btn_dl_cancel.setEnabled(True)
         self.entrenamiento_iniciado.emit()
 
+    def cancel_dl_training(self):
+        if self.dl_training_worker is not None and self.dl_training_worker.isRunning():
+            self.dl_training_worker.cancel()
+            self.btn_dl_cancel.setEnabled(False)
+            self.log_entrenamiento.append("⏹ Cancelando entrenamiento (se detiene tras el batch en curso)...")
+
+    def on_dl_training_cancelled(self):
+        self.log_entrenamiento.append("=" * 50)
+        self.log_entrenamiento.append("⏹ Entrenamiento cancelado. Se descartaron el modelo y sus checkpoints.")
+        self.btn_dl_cancel.setEnabled(False)
+        self.btn_dl_train.setEnabled(True)
+
     def update_dl_training_progress(self, progress, message):
         self.progress_bar.setValue(progress)
         self.log_entrenamiento.append(f"⏳ {message}")
 
+    def show_extraction_report(self, lines):
+        """Lista en el registro los CVs que no aportan texto al entrenamiento y el motivo"""
+        for line in lines:
+            self.log_entrenamiento.append(line)
+
+    def update_telemetry(self, snapshot):
+        """Muestra velocidad, tiempo restante y memoria; al cambiar de fase deja su resumen en el registro"""
+        previous = self.last_telemetry
+        if previous is not None and previous.get('phase') != snapshot.get('phase') and previous.get('done'):
+            self.log_entrenamiento.append(f"📊 {format_snapshot(previous)}")
+        self.last_telemetry = snapshot
+        self.label_rendimiento.setText(f"Rendimiento: {format_snapshot(snapshot)}")
+        if snapshot.get('phase') == 'training' and snapshot.get('progress') is not None:
+            # El entrenador reserva el tramo 70-90 % de la barra para el ajuste del modelo
+            self.progress_bar.setValue(70 + int(snapshot['progress'] * 20))
+
     def update_epoch_metrics(self, current_epoch, total_epochs, metrics):
         """Actualiza las métricas de la época actual"""
         self.current_epoch = current_epoch
@@ -501,6 +695,7 @@ class VistaDLEntrenamiento(QWidget):
         )
         
         # Habilitar botón de entrenamiento
+        self.btn_dl_cancel.setEnabled(False)
         self.btn_dl_train.setEnabled(True)
         
         # Emitir señal de completado
@@ -509,5 +704,6 @@ class VistaDLEntrenamiento(QWidget):
     def on_dl_training_failed(self, error_message):
         self.log_entrenamiento.append("=" * 50)
         self.log_entrenamiento.append(f"❌ Error en entrenamiento DL: {error_message}")
+        self.btn_dl_cancel.setEnabled(False)
         self.btn_dl_train.setEnabled(True)
         QMessageBox.critical(self, "Error de Entrenamiento DL", f"Error:\n{error_message}")
\ No newline at end of file
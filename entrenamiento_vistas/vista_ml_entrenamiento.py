@@ -6,8 +6,12 @@ from PyQt6.QtCore import Qt, pyqtSignal, QThread, QUrl
 from PyQt6.QtGui import QFont, QDragEnterEvent, QDropEvent
 from PyQt6.QtMultimedia import QSoundEffect
 import os
-import PyPDF2
 from models.cv_classifier import CVClassifier
+from models.corpus_manifest import CorpusManifest, format_diff
+from models.text_extraction import format_failures
+from models.training_jobs import JobStore, shared_scheduler
+from models.training_telemetry import TrainingTelemetry, format_snapshot
+from src.monitoring import profiling
 from notificacion.model_notifications import ModelNotifications
 
 
@@ -50,6 +54,9 @@ class MLTrainingWorker(QThread):
     progress_updated = pyqtSignal(int, str)
     training_completed = pyqtSignal(dict)
     training_failed = pyqtSignal(str)
+    training_cancelled = pyqtSignal()
+    telemetry_updated = pyqtSignal(dict)  # Instantánea de TrainingTelemetry (velocidad, ETA, memoria)
+    extraction_report = pyqtSignal(list)  # Líneas de format_failures: CVs sin texto y su motivo
 
     def __init__(self, profession_folders, model_name, model_type):
         super().__init__()
@@ -57,36 +64,51 @@ class MLTrainingWorker(QThread):
         self.model_name = model_name
         self.model_type = model_type
         self.classifier = CVClassifier()
+        self._cancelled = False
 
-    def extract_text_from_pdf(self, pdf_path):
-        try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = "".join(page.extract_text() + "\n" for page in reader.pages)
-                return text.strip()
-        except Exception:
-            return ""
+    def cancel(self):
+        """Solicita detener el entrenamiento: se revisa entre archivos y antes de guardar
+
+        El ajuste de scikit-learn no se puede interrumpir; si ya empezó, el modelo se
+        descarta al terminar en lugar de guardarse.
+        """
+        self._cancelled = True
 
     def run(self):
+        with profiling.profile_run('ml_training_worker', metadata={
+                'model_name': self.model_name, 'model_type': self.model_type,
+                'professions': len(self.profession_folders)}):
+            self._run()
+
+    def _run(self):
         try:
-            self.progress_updated.emit(10, "Preparando datos...")
-            cv_data, processed_files = [], 0
-            total_files = sum(len([f for f in os.listdir(p) if f.lower().endswith('.pdf')]) for p in self.profession_folders.values())
-            
-            for profession, folder_path in self.profession_folders.items():
-                if not os.path.isdir(folder_path): continue
-                for filename in os.listdir(folder_path):
-                    if filename.lower().endswith('.pdf'):
-                        file_path = os.path.join(folder_path, filename)
-                        text = self.extract_text_from_pdf(file_path)
-                        status = 'success' if text else 'failed'
-                        cv_data.append({'text': text, 'profession': profession, 'filename': filename, 'status': status})
-                        processed_files += 1
-                        progress = 20 + (processed_files * 40 // total_files if total_files > 0 else 0)
-                        self.progress_updated.emit(progress, f"Procesando: {filename}")
+            self.progress_updated.emit(10, "Sincronizando carpetas de profesiones...")
+            telemetry = TrainingTelemetry(callback=self.telemetry_updated.emit)
+            telemetry.start_phase('extraction', unit='archivos')
+            folders = {p: f for p, f in self.profession_folders.items() if os.path.isdir(f)}
+
+            def on_extracted(processed, total, path):
+                telemetry.update(processed, total=total)
+                self.progress_updated.emit(20 + processed * 40 // total, f"Procesando: {os.path.basename(path)}")
+
+            # Solo se extraen los PDFs nuevos o modificados; el resto sale del manifiesto
+            manifest = CorpusManifest()
+            diff = manifest.sync(folders, extensions=('.pdf',), progress_callback=on_extracted,
+                                 should_stop=lambda: self._cancelled)
+            if self._cancelled:
+                self.training_cancelled.emit()
+                return
+            self.progress_updated.emit(60, f"Corpus sincronizado: {format_diff(diff)}")
+            cv_data = manifest.training_data(folders)
+            failures = format_failures([item for item in cv_data if item['status'] != 'success'])
+            if failures:
+                self.extraction_report.emit(failures)
 
             self.progress_updated.emit(70, "Entrenando modelo de Machine Learning...")
-            results = self.classifier.train_model(cv_data, model_type=self.model_type)
+            results = self.classifier.train_model(cv_data, model_type=self.model_type, telemetry=telemetry)
+            if self._cancelled:
+                self.training_cancelled.emit()
+                return
             self.progress_updated.emit(90, "Guardando modelo...")
             save_success = self.classifier.save_model(self.model_name)
             if save_success:
@@ -111,6 +133,8 @@ class VistaMLEntrenamiento(QWidget):
         self.init_ui()
         self.profession_folders = {}
         self.selected_folder = None
+        self.training_worker = None
+        self.last_telemetry = None
         
         # Configurar sonido de éxito
         self.success_sound = QSoundEffect()
@@ -235,7 +259,19 @@ class VistaMLEntrenamiento(QWidget):
         self.btn_train = QPushButton("🚀 Iniciar Entrenamiento")
         self.btn_train.clicked.connect(self.start_training)
         self.btn_train.setEnabled(False)
-        layout.addWidget(self.btn_train, 2, 1, 1, 2, Qt.AlignmentFlag.AlignRight)
+        self.btn_cancel_training = QPushButton("⏹ Cancelar")
+        self.btn_cancel_training.clicked.connect(self.cancel_training)
+        self.btn_cancel_training.setEnabled(False)
+        self.btn_queue_training = QPushButton("📋 Encolar")
+        self.btn_queue_training.setToolTip("Entrenar en segundo plano con la cola de entrenamientos")
+        self.btn_queue_training.clicked.connect(self.queue_training)
+        self.btn_queue_training.setEnabled(False)
+        train_buttons = QHBoxLayout()
+        train_buttons.addStretch()
+        train_buttons.addWidget(self.btn_cancel_training)
+        train_buttons.addWidget(self.btn_queue_training)
+        train_buttons.addWidget(self.btn_train)
+        layout.addLayout(train_buttons, 2, 1, 1, 2)
         parent_layout.addWidget(group)
 
     def create_training_log(self, parent_layout):
@@ -244,6 +280,11 @@ class VistaMLEntrenamiento(QWidget):
         layout = QVBoxLayout(group); layout.setSpacing(15)
         self.progress_bar = QProgressBar(); self.progress_bar.setVisible(False); self.progress_bar.setTextVisible(True)
         layout.addWidget(self.progress_bar)
+        self.telemetry_label = QLabel()
+        self.telemetry_label.setObjectName("MLTelemetryLabel")
+        self.telemetry_label.setStyleSheet("color: #7F8C8D;")
+        self.telemetry_label.setVisible(False)
+        layout.addWidget(self.telemetry_label)
         self.training_log = QTextEdit()
         self.training_log.setObjectName("MLTrainingLog")
         self.training_log.setReadOnly(True)
@@ -282,6 +323,7 @@ class VistaMLEntrenamiento(QWidget):
         self.training_log.append(f"➕ Profesión agregada: {profession}")
         self._reset_profession_inputs()
         self.btn_train.setEnabled(len(self.profession_folders) > 0)
+        self.btn_queue_training.setEnabled(len(self.profession_folders) > 0)
 
     def clear_professions(self):
         reply = QMessageBox.question(self, "Confirmar", "¿Seguro que quieres limpiar la lista de profesiones?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
@@ -289,6 +331,7 @@ class VistaMLEntrenamiento(QWidget):
             self.profession_folders.clear(); self.profession_list.clear()
             self._reset_profession_inputs()
             self.btn_train.setEnabled(False)
+            self.btn_queue_training.setEnabled(False)
             self.training_log.append("🗑️ Lista de profesiones limpiada.")
 
     def _count_pdf_files(self, folder_path):
@@ -312,9 +355,60 @@ class VistaMLEntrenamiento(QWidget):
         self.training_worker.progress_updated.connect(self.update_training_progress)
         self.training_worker.training_completed.connect(self.on_training_completed)
         self.training_worker.training_failed.connect(self.on_training_failed)
+        self.training_worker.training_cancelled.connect(self.on_training_cancelled)
+        self.training_worker.telemetry_updated.connect(self.update_telemetry)
+        self.training_worker.extraction_report.connect(self.show_extraction_report)
+        self.last_telemetry = None
+        self.telemetry_label.setVisible(True)
         self.training_worker.start()
+        self.btn_cancel_training.setEnabled(True)
         self.entrenamiento_iniciado.emit()
 
+    def queue_training(self):
+        """Envía la configuración actual a la cola de entrenamientos en segundo plano"""
+        if not self.profession_folders:
+            QMessageBox.warning(self, "Sin Datos", "Agregue al menos una profesión.")
+            return
+        model_name = self.training_model_name_input.text().strip()
+        if not model_name:
+            QMessageBox.warning(self, "Nombre Requerido", "Por favor, ingrese un nombre para el modelo.")
+            return
+        model_type = self.model_type_combo.currentData()
+        try:
+            job_id = JobStore().submit(model_name, 'ml', dict(self.profession_folders), {'model_type': model_type})
+        except ValueError as e:
+            QMessageBox.warning(self, "No se pudo encolar", str(e))
+            return
+        shared_scheduler().wake()
+        self.training_log.append(f"📋 Trabajo {job_id} encolado: '{model_name}' ({model_type}). "
+                                 "Su progreso se sigue en la Cola de Entrenamientos.")
+
+    def cancel_training(self):
+        if self.training_worker is not None and self.training_worker.isRunning():
+            self.training_worker.cancel()
+            self.btn_cancel_training.setEnabled(False)
+            self.training_log.append("⏹ Cancelando entrenamiento...")
+
+    def on_training_cancelled(self):
+        self.training_log.append("=" * 50)
+        self.training_log.append("⏹ Entrenamiento cancelado. No se guardó ningún modelo.")
+        self.progress_bar.setVisible(False)
+        self.btn_cancel_training.setEnabled(False)
+        self.btn_train.setEnabled(True)
+
+    def show_extraction_report(self, lines):
+        """Lista en el registro los CVs que no aportan texto al entrenamiento y el motivo"""
+        for line in lines:
+            self.training_log.append(line)
+
+    def update_telemetry(self, snapshot):
+        """Muestra velocidad, tiempo restante y memoria; al cambiar de fase deja su resumen en el registro"""
+        previous = self.last_telemetry
+        if previous is not None and previous.get('phase') != snapshot.get('phase') and previous.get('done'):
+            self.training_log.append(f"📊 {format_snapshot(previous)}")
+        self.last_telemetry = snapshot
+        self.telemetry_label.setText(format_snapshot(snapshot))
+
     def update_training_progress(self, progress, message):
         self.progress_bar.setValue(progress)
         self.training_log.append(f"⏳ {message}")
@@ -325,7 +419,7 @@ class VistaMLEntrenamiento(QWidget):
         self.training_log.append("=" * 50)
         self.training_log.append("✅ ¡Entrenamiento completado exitosamente!")
         self.training_log.append(f"📈 Accuracy: {results.get('accuracy', 0):.3f}")
-        self.training_log.append("💾 Modelo guardado correctamente.")
+        self.training_log.append("💾 Modelo guardado correctamente (con su telemetría de entrenamiento).")
         
         # Reproducir sonido de éxito
         self.success_sound.play()
@@ -338,6 +432,7 @@ class VistaMLEntrenamiento(QWidget):
         )
         
         # Habilitar botón de entrenamiento
+        self.btn_cancel_training.setEnabled(False)
         self.btn_train.setEnabled(True)
         
         # Emitir señal de completado
@@ -346,5 +441,6 @@ class VistaMLEntrenamiento(QWidget):
     def on_training_failed(self, error_message):
         self.training_log.append("=" * 50)
         self.training_log.append(f"❌ Error durante el entrenamiento: {error_message}")
+        self.btn_cancel_training.setEnabled(False)
         self.btn_train.setEnabled(True)
         QMessageBox.critical(self, "Error de Entrenamiento", f"Error:\n{error_message}")
\ No newline at end of file
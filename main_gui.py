@@ -1,5 +1,13 @@
 import sys
 import os 
+import json
+import time
+from dataclasses import asdict
+
+# Marcas de tiempo del arranque (ver benchmarks/cold_start.py)
+STARTUP_MARKS = {'module_start': time.time()}
+STARTUP_TIMING_FILE = os.environ.get('CV_STARTUP_TIMING')
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFrame, QToolBar, QSizePolicy,
@@ -10,21 +18,19 @@ from PyQt6.QtGui import (
     QColor, QBrush, QPen, QPainter, QFont, QAction, QIcon, QPixmap,
     QPalette, QMouseEvent, QImage 
 )
-from PyQt6.QtCore import Qt, QRectF, QSize, QPoint, QEvent, pyqtSignal
+from PyQt6.QtCore import Qt, QRectF, QSize, QPoint, QEvent, QObject, QTimer, pyqtSignal
 from PyQt6.QtSvg import QSvgRenderer 
 from PyQt6.QtSvgWidgets import QSvgWidget 
 import webbrowser
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEnginePage
 from PyQt6.QtCore import QUrl
 
 
-# --- Importar las vistas desde sus archivos separados ---
-from app.entrenar_vista import seleccion
-from app.vista_herramientas import VistaHerramientas
-from app.vista_centro_accion import VistaCentroAccion
-from app.vista_importar_exportar import VistaImportarExportar
+# --- Las vistas (y con ellas scikit-learn/TensorFlow) se importan al abrir cada página ---
+from app.vista_diagnostico import DiagnosticsDialog
 from models.model_manager import ModelManager, ModelMetadata # Añadido
+from app.model_browser import ModelListModel, ModelBrowserView, ModelCardDelegate
+
+STARTUP_MARKS['imports_done'] = time.time()
 
 # --- Icon Resource Function ---
 def get_icon(icon_name_or_path, color_str=None): 
@@ -261,6 +267,9 @@ class DocumentationWindow(QMainWindow):
         self.setWindowTitle("Documentación - ClasificaTalento PRO")
         self.setGeometry(100, 100, 1200, 800)
 
+        # QtWebEngine tarda en cargarse: solo se importa al abrir la primera ventana web
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+
         # Crear el widget web
         self.web_view = QWebEngineView()
         self.setCentralWidget(self.web_view)
@@ -386,25 +395,16 @@ class MainWindow(QMainWindow):
 
         self.central_stacked_widget.addWidget(self.inicio_page_widget)
 
-        # Página 1: Entrenamiento
-        self.entrenamiento_page_widget = seleccion(parent_window=self) 
-        self.entrenamiento_page_widget.setObjectName("EntrenamientoPage")
-        self.central_stacked_widget.addWidget(self.entrenamiento_page_widget)
-
-        # Página 2: Modelos (usa VistaHerramientas)
-        self.modelos_page_widget = VistaHerramientas() 
-        self.modelos_page_widget.setObjectName("ModelosPage")
-        self.central_stacked_widget.addWidget(self.modelos_page_widget)
-
-        # Página 3: Clasificar CV (usa VistaCentroAccion)
-        self.clasificar_cv_page_widget = VistaCentroAccion() 
-        self.clasificar_cv_page_widget.setObjectName("ClasificarCVPage")
-        self.central_stacked_widget.addWidget(self.clasificar_cv_page_widget)
-
-        # Página 4: Importar/Exportar
-        self.importar_exportar_page_widget = VistaImportarExportar()
-        self.importar_exportar_page_widget.setObjectName("ImportarExportarPage")
-        self.central_stacked_widget.addWidget(self.importar_exportar_page_widget)
+        # Páginas 1-4: se construyen la primera vez que se navega a ellas (ver _ensure_page).
+        # Mientras tanto ocupan su índice con un widget vacío.
+        self.page_factories = {
+            1: ('entrenamiento_page_widget', "EntrenamientoPage", self._crear_pagina_entrenamiento),
+            2: ('modelos_page_widget', "ModelosPage", self._crear_pagina_modelos),
+            3: ('clasificar_cv_page_widget', "ClasificarCVPage", self._crear_pagina_clasificar_cv),
+            4: ('importar_exportar_page_widget', "ImportarExportarPage", self._crear_pagina_importar_exportar),
+        }
+        for _ in self.page_factories:
+            self.central_stacked_widget.addWidget(QWidget())
         
         main_content_layout.addWidget(self.central_stacked_widget, 1)
         overall_layout.addWidget(main_content_widget)
@@ -427,13 +427,14 @@ class MainWindow(QMainWindow):
         action_admin.triggered.connect(self.open_admin_panel)
         action_postulacion = QAction(get_icon("joystick"), "Postulación", self)
         action_postulacion.triggered.connect(self.open_postulacion)
-        action_dots = QAction(get_icon("dots"), "Más", self)
+        action_diagnostics = QAction(get_icon("dots"), "Diagnóstico de rendimiento", self)
+        action_diagnostics.triggered.connect(self.open_diagnostics)
 
         # Agregar acciones a la barra de herramientas
         self.right_toolbar.addAction(action_docs)
         self.right_toolbar.addAction(action_admin)
         self.right_toolbar.addAction(action_postulacion)
-        self.right_toolbar.addAction(action_dots)
+        self.right_toolbar.addAction(action_diagnostics)
         
         self.apply_stylesheet()
 
@@ -688,7 +689,7 @@ class MainWindow(QMainWindow):
         self.subtitulo_recientes_label.setStyleSheet(f"color: {self.color_text_light}; font-size: 14pt; font-weight: bold; margin-top: 15px;")
         self.inicio_page_layout.addWidget(self.subtitulo_recientes_label)
 
-        # Contenedor para la lista de modelos recientes
+        # Lista de modelos recientes: vista sobre un modelo de filas pintadas por un delegate
         self.modelos_recientes_frame = QFrame()
         self.modelos_recientes_frame.setObjectName("InicioModelosRecientesFrame")
         self.modelos_recientes_layout = QVBoxLayout(self.modelos_recientes_frame)
@@ -703,41 +704,14 @@ class MainWindow(QMainWindow):
             no_models_label.setStyleSheet(f"color: {self.color_text_dark}; font-style: italic; font-size: 11pt;")
             self.modelos_recientes_layout.addWidget(no_models_label)
         else:
-            for i, model_meta in enumerate(modelos_a_mostrar):
-                model_card = QFrame()
-                model_card.setObjectName(f"InicioModelCard_{i}")
-                model_card_layout = QVBoxLayout(model_card)
-
-                nombre_modelo = QLabel(f"{model_meta.display_name} ({'DL' if model_meta.is_deep_learning else 'ML'})")
-                nombre_modelo.setStyleSheet(f"font-weight: bold; font-size: 11pt; color: {self.color_text_light};")
-                
-                tipo_modelo = QLabel(f"Tipo: {model_meta.model_type}")
-                tipo_modelo.setStyleSheet(f"font-size: 9pt; color: {self.color_text_medium};")
-                
-                fecha_creacion = QLabel(f"Creado: {model_meta.creation_date}")
-                fecha_creacion.setStyleSheet(f"font-size: 9pt; color: {self.color_text_medium};")
-                
-                accuracy_text = f"Precisión: {model_meta.accuracy:.1%}" if model_meta.accuracy > 0 else "Precisión: N/A"
-                precision_modelo = QLabel(accuracy_text)
-                precision_modelo.setStyleSheet(f"font-size: 9pt; color: {self.color_accent_green if model_meta.accuracy > 0 else self.color_text_dark};")
-
-                model_card_layout.addWidget(nombre_modelo)
-                model_card_layout.addWidget(tipo_modelo)
-                model_card_layout.addWidget(fecha_creacion)
-                model_card_layout.addWidget(precision_modelo)
-                
-                model_card.setStyleSheet(f"""
-                    #{model_card.objectName()} {{
-                        background-color: {QColor(self.color_central_bg).lighter(110).name()};
-                        border: 1px solid {self.color_groupbox_border};
-                        border-radius: 8px;
-                        padding: 10px;
-                    }}
-                    #{model_card.objectName()}:hover {{
-                        border-color: {self.color_accent_blue};
-                    }}
-                """)
-                self.modelos_recientes_layout.addWidget(model_card)
+            self.modelos_recientes_model = ModelListModel(self.modelos_recientes_frame)
+            self.modelos_recientes_model.set_models(asdict(model_meta) for model_meta in modelos_a_mostrar)
+            self.modelos_recientes_view = ModelBrowserView(compact=True, parent=self.modelos_recientes_frame)
+            self.modelos_recientes_view.setModel(self.modelos_recientes_model)
+            self.modelos_recientes_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            row_height = ModelCardDelegate.COMPACT_HEIGHT + 2 * self.modelos_recientes_view.spacing()
+            self.modelos_recientes_view.setFixedHeight(row_height * len(modelos_a_mostrar) + 4)
+            self.modelos_recientes_layout.addWidget(self.modelos_recientes_view)
         
         self.inicio_page_layout.addWidget(self.modelos_recientes_frame)
         self.inicio_page_layout.addStretch(1) # Empujar todo hacia arriba
@@ -753,8 +727,43 @@ class MainWindow(QMainWindow):
             is_active = (button == active_button)
             button.set_active(is_active, self.color_accent_red)
         if hasattr(self, 'central_stacked_widget'):
+            self._ensure_page(page_index)
             self.central_stacked_widget.setCurrentIndex(page_index)
 
+    def _ensure_page(self, page_index):
+        """Construye la página la primera vez que se muestra y reemplaza su marcador"""
+        spec = self.page_factories.pop(page_index, None)
+        if spec is None:
+            return
+        attr_name, object_name, factory = spec
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            page = factory()
+        finally:
+            QApplication.restoreOverrideCursor()
+        page.setObjectName(object_name)
+        setattr(self, attr_name, page)
+        placeholder = self.central_stacked_widget.widget(page_index)
+        self.central_stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.central_stacked_widget.insertWidget(page_index, page)
+
+    def _crear_pagina_entrenamiento(self):
+        from app.entrenar_vista import seleccion
+        return seleccion(parent_window=self)
+
+    def _crear_pagina_modelos(self):
+        from app.vista_herramientas import VistaHerramientas
+        return VistaHerramientas()
+
+    def _crear_pagina_clasificar_cv(self):
+        from app.vista_centro_accion import VistaCentroAccion
+        return VistaCentroAccion()
+
+    def _crear_pagina_importar_exportar(self):
+        from app.vista_importar_exportar import VistaImportarExportar
+        return VistaImportarExportar()
+
     def changeEvent(self, event: QEvent):
         super().changeEvent(event)
         if event.type() == QEvent.Type.WindowStateChange: 
@@ -1110,12 +1119,65 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al abrir el formulario de postulación: {str(e)}")
 
+    def open_diagnostics(self):
+        """Abre el panel de diagnóstico con los tiempos por etapa"""
+        if getattr(self, 'diagnostics_window', None) is None:
+            self.diagnostics_window = DiagnosticsDialog(self)
+            self.diagnostics_window.finished.connect(lambda _: setattr(self, 'diagnostics_window', None))
+        self.diagnostics_window.show()
+        self.diagnostics_window.raise_()
+
+
+class StartupTimer(QObject):
+    """Registra el primer pintado de la ventana y guarda las marcas de arranque en JSON
+
+    Con ``CV_STARTUP_EXIT=1`` la aplicación se cierra justo después (arnés de arranque en frío).
+    """
+
+    def __init__(self, window, output_path):
+        super().__init__(window)
+        self.output_path = output_path
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and 'first_paint' not in STARTUP_MARKS:
+            STARTUP_MARKS['first_paint'] = time.time()
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, self.finish)
+        return False
+
+    def finish(self):
+        STARTUP_MARKS['event_loop_idle'] = time.time()
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            json.dump(STARTUP_MARKS, f, indent=2)
+        if os.environ.get('CV_STARTUP_EXIT') == '1':
+            QApplication.quit()
+
+
+def start_training_scheduler(app):
+    """Reparte los trabajos de la cola de entrenamientos mientras la aplicación está abierta
+
+    Los entrenamientos ya iniciados siguen en sus procesos al cerrar la aplicación.
+    """
+    from models.training_jobs import shared_scheduler
+    scheduler = shared_scheduler()
+    scheduler.start()
+    app.aboutToQuit.connect(scheduler.stop)
+
 
 if __name__ == '__main__':
+    # Necesario para poder importar QtWebEngine después de crear la QApplication
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setApplicationName("ClasificaTalento PRO") 
     app.setOrganizationName("TalentHunter") 
+    STARTUP_MARKS['qapplication'] = time.time()
     
     window = MainWindow()
+    STARTUP_MARKS['window_created'] = time.time()
+    if STARTUP_TIMING_FILE:
+        startup_timer = StartupTimer(window, STARTUP_TIMING_FILE)
     window.show()
+    if os.environ.get('CV_STARTUP_EXIT') != '1':
+        QTimer.singleShot(3000, lambda: start_training_scheduler(app))
     sys.exit(app.exec())
\ No newline at end of file
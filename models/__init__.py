@@ -1,17 +1,34 @@
 """
 Modelos de Machine Learning y Deep Learning
+
+Los clasificadores se importan al primer acceso (``from models import CVClassifier``):
+importar un submódulo ligero como ``models.model_manager`` no carga scikit-learn ni
+TensorFlow, lo que acelera el arranque de la interfaz.
 """
 
-from .cv_classifier import CVClassifier
+import importlib
+
+__all__ = ['CVClassifier', 'DeepLearningClassifier']
 
-# Importar Deep Learning si está disponible
-try:
-    from .deep_learning_classifier import DeepLearningClassifier
-    DEEP_LEARNING_AVAILABLE = True
-except ImportError:
-    DEEP_LEARNING_AVAILABLE = False
+_LAZY_ATTRIBUTES = {
+    'CVClassifier': '.cv_classifier',
+    'DeepLearningClassifier': '.deep_learning_classifier',
+}
 
-__all__ = ['CVClassifier']
 
-if DEEP_LEARNING_AVAILABLE:
-    __all__.append('DeepLearningClassifier')
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    if name == 'DEEP_LEARNING_AVAILABLE':
+        # Importar Deep Learning si está disponible
+        try:
+            __getattr__('DeepLearningClassifier')
+            available = True
+        except ImportError:
+            available = False
+        globals()[name] = available
+        return available
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
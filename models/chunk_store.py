@@ -0,0 +1,200 @@
+"""
+Almacén de bloques deduplicados para paquetes y backups de modelos
+Divide los archivos en bloques definidos por contenido (hash gear vectorizado con
+NumPy) y guarda cada bloque distinto una sola vez, indexado por su SHA-256
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+import numpy as np
+
+MIN_CHUNK_SIZE = 16 * 1024
+AVG_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 256 * 1024
+READ_SIZE = 8 * 1024 * 1024
+
+# Ventana del hash gear: los bits altos de un uint32 dependen de los últimos 32 bytes
+WINDOW = 32
+
+
+def _gear_table():
+    """Tabla gear determinista (la misma en todas las máquinas y ejecuciones)"""
+    seed = b''.join(hashlib.sha256(b'ClasificaTalentoPRO-gear-%d' % i).digest() for i in range(32))
+    return np.frombuffer(seed, dtype='<u4').astype(np.uint32)
+
+
+GEAR = _gear_table()
+
+
+def gear_hashes(data):
+    """Hash gear por posición sobre una ventana de ``WINDOW`` bytes
+
+    h[i] = sum_{k<32} gear[data[i-k]] << k (mod 2^32), calculado por duplicación
+    (S_2m[i] = S_m[i] + S_m[i-m] << m) en 5 pasadas vectorizadas en lugar de 32.
+    """
+    h = GEAR[np.frombuffer(data, dtype=np.uint8)]
+    m = 1
+    while m < WINDOW:
+        shifted = np.zeros_like(h)
+        shifted[m:] = h[:-m] << np.uint32(m)
+        h = h + shifted
+        m *= 2
+    return h
+
+
+class Chunker:
+    """Corte de archivos en bloques definidos por contenido (estilo FastCDC simplificado)"""
+
+    def __init__(self, min_size=MIN_CHUNK_SIZE, avg_size=AVG_CHUNK_SIZE, max_size=MAX_CHUNK_SIZE):
+        if not (WINDOW <= min_size <= avg_size <= max_size):
+            raise ValueError("Se requiere min_size <= avg_size <= max_size")
+        self.min_size = min_size
+        self.avg_size = avg_size
+        self.max_size = max_size
+        bits = max(1, int(round(np.log2(avg_size - min_size))))
+        self.mask = np.uint32(((1 << bits) - 1) << (32 - bits))
+
+    def _cut_points(self, buf, final):
+        """Posiciones de corte dentro de ``buf``; el resto queda pendiente si no es el final"""
+        candidates = np.flatnonzero((gear_hashes(buf) & self.mask) == 0) + 1
+        cuts = []
+        start = 0
+        n = len(buf)
+        while n - start > (0 if final else self.max_size):
+            lo = start + self.min_size
+            idx = np.searchsorted(candidates, lo)
+            if idx < len(candidates) and candidates[idx] <= start + self.max_size:
+                cut = int(candidates[idx])
+            else:
+                cut = start + self.max_size
+            if cut >= n:
+                if not final:
+                    break
+                cut = n
+            cuts.append(cut)
+            start = cut
+        return cuts
+
+    def iter_chunks(self, fileobj):
+        """Genera los bloques de un archivo abierto en modo binario"""
+        buf = b''
+        eof = False
+        while not eof:
+            data = fileobj.read(READ_SIZE)
+            eof = not data
+            buf += data
+            start = 0
+            for cut in self._cut_points(buf, final=eof):
+                yield buf[start:cut]
+                start = cut
+            buf = buf[start:]
+
+
+class ChunkStore:
+    """Almacén de objetos por contenido en ``<root>/objects/<aa>/<sha256>``.
+
+    Un archivo se representa con una receta: la lista ``[[sha256, tamaño], ...]`` de
+    sus bloques. Escribir un objeto es idempotente (temporal + ``os.replace``), por lo
+    que varios hilos pueden guardar modelos en el mismo almacén a la vez.
+    """
+
+    def __init__(self, root, chunker=None):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.chunker = chunker or Chunker()
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def object_path(self, chunk_hash):
+        return os.path.join(self.objects_dir, chunk_hash[:2], chunk_hash)
+
+    def has(self, chunk_hash):
+        return os.path.exists(self.object_path(chunk_hash))
+
+    def put_chunk(self, chunk):
+        """Guarda un bloque si no existe; devuelve (hash, bytes nuevos escritos)"""
+        chunk_hash = hashlib.sha256(chunk).hexdigest()
+        path = self.object_path(chunk_hash)
+        if os.path.exists(path):
+            return chunk_hash, 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(chunk)
+        os.replace(tmp_path, path)
+        return chunk_hash, len(chunk)
+
+    def put_stream(self, fileobj):
+        """Divide y guarda un archivo; devuelve (receta, bytes nuevos escritos)"""
+        recipe = []
+        new_bytes = 0
+        for chunk in self.chunker.iter_chunks(fileobj):
+            chunk_hash, written = self.put_chunk(chunk)
+            recipe.append([chunk_hash, len(chunk)])
+            new_bytes += written
+        return recipe, new_bytes
+
+    def read_chunk(self, chunk_hash):
+        with open(self.object_path(chunk_hash), 'rb') as f:
+            chunk = f.read()
+        if hashlib.sha256(chunk).hexdigest() != chunk_hash:
+            raise ValueError(f"Bloque dañado en el almacén: {chunk_hash}")
+        return chunk
+
+    def restore_stream(self, recipe, dst):
+        """Reconstruye un archivo a partir de su receta"""
+        for chunk_hash, size in recipe:
+            chunk = self.read_chunk(chunk_hash)
+            if len(chunk) != size:
+                raise ValueError(f"Tamaño inesperado del bloque {chunk_hash[:12]}: {len(chunk)} (receta: {size})")
+            dst.write(chunk)
+
+    def stored_bytes(self):
+        total = 0
+        for root, _, files in os.walk(self.objects_dir):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files
+                         if not name.endswith('.tmp'))
+        return total
+
+
+def dedup_report(recipes_by_file, stored_bytes=None):
+    """Estadísticas de deduplicación de un conjunto de recetas
+
+    Args:
+        recipes_by_file: dict {archivo: receta} (puede abarcar varios modelos)
+        stored_bytes: bytes realmente ocupados; si no se indica se calcula con los bloques únicos
+
+    Returns:
+        dict: bytes lógicos, bytes almacenados, bloques y razón de deduplicación
+    """
+    unique = {}
+    logical = 0
+    total_chunks = 0
+    for recipe in recipes_by_file.values():
+        for chunk_hash, size in recipe:
+            unique[chunk_hash] = size
+            logical += size
+            total_chunks += 1
+    stored = sum(unique.values()) if stored_bytes is None else stored_bytes
+    return {
+        'files': len(recipes_by_file),
+        'logical_bytes': logical,
+        'stored_bytes': stored,
+        'chunks': total_chunks,
+        'unique_chunks': len(unique),
+        'dedup_ratio': logical / stored if stored else 1.0,
+        'saved_percent': 100.0 * (1 - stored / logical) if logical else 0.0
+    }
+
+
+if __name__ == '__main__':
+    # Reporte de deduplicación de un directorio de backup deduplicado
+    from .model_backup import BackupEngine
+
+    if len(sys.argv) < 2:
+        print("Uso: python -m models.chunk_store <directorio_backup>")
+        sys.exit(1)
+    report = BackupEngine(sys.argv[1], deduplicate=True).dedup_report()
+    print(json.dumps(report, indent=2))
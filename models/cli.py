@@ -0,0 +1,560 @@
+"""
+Interfaz de línea de comandos para entrenar, clasificar, evaluar y medir modelos
+sin la interfaz gráfica (servidores, cron)
+
+Uso:
+    python -m models.cli train --data /ruta/profesiones --name modelo [--kind ml|dl]
+    python -m models.cli classify --model modelo /ruta/cvs [--output resultados.csv]
+    python -m models.cli eval --model modelo --manifest corpus.csv
+    python -m models.cli eval --model modelo_dl --deep --data /ruta/profesiones --chunking
+    python -m models.cli bench --model modelo /ruta/cvs
+    python -m models.cli bench --training-options lstm cnn
+    python -m models.cli snapshot --data /ruta/profesiones --output corpus.parquet
+    python -m models.cli distill --teacher modelo_bert --data /ruta/profesiones --name estudiante
+
+Los datos etiquetados se leen de una carpeta con una subcarpeta por profesión
+(``--data``), de pares ``--folder profesion=ruta`` o de un manifiesto CSV/JSON/JSONL
+con columnas ``path`` y ``profession``. Con ``--snapshot`` se usa una instantánea ya
+extraída (ver ``models.corpus_snapshot``) en lugar de volver a leer los PDFs. Con
+``--incremental`` las carpetas se sincronizan con el manifiesto del corpus (ver
+``models.corpus_manifest``) y solo se extraen los CVs nuevos o modificados.
+
+Para encolar entrenamientos en segundo plano con límites de CPU y memoria, ver
+``python -m models.training_jobs``.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import signal
+import argparse
+import threading
+
+from src.monitoring import profiling
+from .text_extraction import (CV_EXTENSIONS, DEFAULT_TIMEOUT, list_cv_files, iter_extracted_texts,
+                              iter_extracted_documents, extract_labelled_corpus, format_failures)
+from .corpus_snapshot import create_snapshot, load_snapshot, snapshot_info
+from .corpus_manifest import CorpusManifest, format_diff
+
+ML_MODEL_TYPES = ['random_forest', 'logistic_regression', 'svm', 'naive_bayes']
+DL_MODEL_TYPES = ['lstm', 'cnn', 'bert', 'bert_frozen']
+POOLING_MODES = ['mean', 'max', 'attention']
+
+# Modos de --performance (los mismos que ofrece la vista de entrenamiento DL)
+PERFORMANCE_MODES = {
+    'auto': 'auto',
+    'xla': {'jit_compile': True},
+    'bf16': {'mixed_precision': True},
+    'xla_bf16': {'jit_compile': True, 'mixed_precision': True},
+}
+
+# Modos de --profile-mode y su valor equivalente de CV_PROFILE
+PROFILE_MODES = {
+    'full': '1',
+    'cprofile': 'cprofile',
+}
+
+
+# --- Entrada de datos -----------------------------------------------------------
+
+def read_manifest(manifest_path):
+    """Lee un manifiesto CSV, JSON (lista) o JSONL con 'path' y 'profession'"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    if manifest_path.lower().endswith('.csv'):
+        with open(manifest_path, 'r', encoding='utf-8-sig', newline='') as f:
+            records = list(csv.DictReader(f))
+    elif manifest_path.lower().endswith('.jsonl'):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+    labelled = []
+    for record in records:
+        path = record['path']
+        if not os.path.isabs(path):
+            path = os.path.join(base_dir, path)
+        labelled.append((path, record['profession']))
+    return labelled
+
+
+def collect_profession_folders(args):
+    """Lista (profesión, carpeta) a partir de --data y --folder"""
+    folders = []
+    if args.data:
+        with os.scandir(args.data) as entries:
+            folders.extend((entry.name, entry.path) for entry in sorted(entries, key=lambda e: e.name)
+                           if entry.is_dir())
+    for spec in args.folder or []:
+        profession, _, folder = spec.partition('=')
+        if not folder:
+            raise ValueError(f"Formato inválido para --folder (se espera profesion=ruta): {spec}")
+        folders.append((profession, folder))
+    return folders
+
+
+def collect_labelled_files(args):
+    """Lista (ruta, profesión) a partir de --data, --folder o --manifest"""
+    labelled = []
+    if args.manifest:
+        labelled.extend(read_manifest(args.manifest))
+    for profession, folder in collect_profession_folders(args):
+        labelled.extend((path, profession) for path in list_cv_files(folder))
+    if not labelled:
+        raise ValueError("No se encontraron CVs: indica --data, --folder o --manifest")
+    return labelled
+
+
+def collect_input_files(inputs):
+    """Expande archivos y carpetas de entrada a una lista de CVs"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(list_cv_files(item, recursive=True))
+        elif item.lower().endswith(CV_EXTENSIONS):
+            paths.append(item)
+    return paths
+
+
+def load_corpus(args):
+    if args.snapshot:
+        if args.data or args.folder or args.manifest:
+            raise ValueError("--snapshot no se combina con --data, --folder ni --manifest")
+        start = time.perf_counter()
+        corpus = load_snapshot(args.snapshot)
+        info = snapshot_info(args.snapshot)
+        print(f"Instantánea cargada en {time.perf_counter() - start:.1f}s: {len(corpus)} CVs "
+              f"(creada {info.get('created_at', '?')}, {info.get('failed', 0)} sin texto omitidos)", file=sys.stderr)
+        if not corpus:
+            raise ValueError(f"La instantánea no contiene CVs con texto: {args.snapshot}")
+        return corpus
+    if args.incremental:
+        return sync_corpus(args)[0]
+
+    labelled = dict(collect_labelled_files(args))  # Si una ruta se repite, prevalece la última etiqueta
+    print(f"Extrayendo texto de {len(labelled)} CVs con {args.jobs or os.cpu_count()} procesos...",
+          file=sys.stderr)
+    start = time.perf_counter()
+    corpus = extract_labelled_corpus(list(labelled.items()), args.jobs, **extraction_limits(args))
+    failed = sum(1 for item in corpus if item['status'] != 'success')
+    print(f"Extracción completada en {time.perf_counter() - start:.1f}s ({failed} sin texto)", file=sys.stderr)
+    print_failures(corpus)
+    return corpus
+
+
+def extraction_limits(args):
+    return {'timeout': args.extract_timeout or None, 'max_pages': args.max_pages, 'max_chars': args.max_chars}
+
+
+def print_failures(documents):
+    for line in format_failures(documents):
+        print(line, file=sys.stderr)
+
+
+def sync_corpus(args):
+    """Sincroniza --data/--folder con el manifiesto del corpus; devuelve (corpus, carpetas)"""
+    if args.manifest:
+        raise ValueError("--incremental funciona con --data o --folder, no con --manifest")
+    folders = collect_profession_folders(args)
+    if not folders:
+        raise ValueError("No se encontraron carpetas: indica --data o --folder")
+    start = time.perf_counter()
+    manifest = CorpusManifest()
+    diff = manifest.sync(folders, max_workers=args.jobs, **extraction_limits(args))
+    print(f"Corpus sincronizado en {time.perf_counter() - start:.1f}s: {format_diff(diff)} "
+          f"({diff['extracted']} extraídos, {diff['failed']} sin texto)", file=sys.stderr)
+    print_failures(diff['failures'])
+    return manifest.training_data(folders), folders
+
+
+def load_classifier(model_name, deep):
+    if deep:
+        from .deep_learning_classifier import DeepLearningClassifier
+        classifier = DeepLearningClassifier()
+    else:
+        from .cv_classifier import CVClassifier
+        classifier = CVClassifier()
+    if not classifier.load_model(model_name):
+        raise ValueError(f"No se pudo cargar el modelo '{model_name}'")
+    return classifier
+
+
+def write_json(data, output=None):
+    text = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+# --- Subcomandos ----------------------------------------------------------------
+
+def cmd_train(args):
+    corpus = load_corpus(args)
+
+    if args.kind == 'ml':
+        from .cv_classifier import CVClassifier
+        classifier = CVClassifier()
+        results = classifier.train_model(corpus, model_type=args.model_type or 'random_forest')
+    else:
+        from .deep_learning_classifier import DeepLearningClassifier
+        classifier = DeepLearningClassifier()
+        chunking = None
+        if args.chunking:
+            chunking = {'enabled': True, 'pooling': args.pooling}
+            if args.chunk_window:
+                chunking['window'] = args.chunk_window
+            if args.chunk_stride:
+                chunking['stride'] = args.chunk_stride
+
+        # SIGTERM (p. ej. al cancelar un trabajo de la cola) detiene tras el batch en curso
+        stop = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        results = classifier.train_model(
+            [item for item in corpus if item['status'] == 'success'],
+            model_type=args.model_type or 'lstm',
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            chunking=chunking,
+            run_name=args.name,
+            resume=args.resume,
+            histogram_logging=False,
+            performance_options=PERFORMANCE_MODES.get(args.performance),
+            should_stop=stop.is_set,
+            time_budget=args.time_budget * 60 if args.time_budget else None
+        )
+        if results.get('cancelled'):
+            print("⏹ Entrenamiento cancelado; no se guardó el modelo", file=sys.stderr)
+            return 1
+        if not results.get('success', True):
+            raise ValueError(results.get('error', 'Error durante el entrenamiento'))
+
+    results['model_saved'] = bool(classifier.save_model(args.name))
+    results['model_name'] = args.name
+    write_json({k: v for k, v in results.items() if k not in ('history', 'classification_report')}
+               if not args.full else results, args.output)
+    return 0 if results['model_saved'] else 1
+
+
+def cmd_classify(args):
+    classifier = load_classifier(args.model, args.deep)
+    paths = collect_input_files(args.inputs)
+    if not paths:
+        raise ValueError("No se encontraron CVs en las rutas indicadas")
+
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    as_csv = args.format == 'csv' or (args.format is None and args.output and args.output.lower().endswith('.csv'))
+    fields = ['path', 'status', 'predicted_profession', 'confidence', 'confidence_level', 'message']
+    writer = csv.DictWriter(output, fieldnames=fields, extrasaction='ignore') if as_csv else None
+    if writer:
+        writer.writeheader()
+
+    def write(row):
+        if writer:
+            writer.writerow(row)
+        else:
+            output.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def flush(pending):
+        results = classifier.predict_batch([text for _, text in pending])
+        for (path, _), result in zip(pending, results):
+            row = {'path': path, 'status': 'error' if result.get('error') else 'ok', **result}
+            row.pop('profession_ranking', None)
+            row.pop('error', None)
+            write(row)
+
+    start = time.perf_counter()
+    pending = []
+    failed = 0
+    try:
+        for document in iter_extracted_documents(paths, args.jobs, **extraction_limits(args)):
+            if document['status'] != 'success':
+                # Como en la clasificación por lotes de la interfaz: sin texto no se llama al modelo
+                write({'path': document['path'], 'status': 'error', 'message': document['error']})
+                failed += 1
+                continue
+            pending.append((document['path'], document['text']))
+            if len(pending) >= args.batch_size:
+                flush(pending)
+                pending = []
+        if pending:
+            flush(pending)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} CVs clasificados en {elapsed:.1f}s ({len(paths) / elapsed:.1f} CVs/s, "
+          f"{failed} sin texto)", file=sys.stderr)
+    return 0
+
+
+def cmd_eval(args):
+    if args.chunking and not args.deep:
+        raise ValueError("--chunking solo aplica a modelos de Deep Learning (--deep)")
+    from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+
+    classifier = load_classifier(args.model, args.deep)
+    corpus = [item for item in load_corpus(args) if item['status'] == 'success']
+    known = set(classifier.label_encoder.classes_)
+    unknown = sorted({item['profession'] for item in corpus} - known)
+    if unknown:
+        print(f"⚠️ Profesiones no conocidas por el modelo (se omiten): {unknown}", file=sys.stderr)
+        corpus = [item for item in corpus if item['profession'] in known]
+
+    start = time.perf_counter()
+    results = classifier.predict_batch([item['text'] for item in corpus])
+    elapsed = time.perf_counter() - start
+
+    y_true = [item['profession'] for item in corpus]
+    y_pred = [result.get('predicted_profession', '') for result in results]
+    labels = list(classifier.label_encoder.classes_)
+    report = {
+        'model': args.model,
+        'samples': len(corpus),
+        'accuracy': float(accuracy_score(y_true, y_pred)),
+        'report': classification_report(y_true, y_pred, labels=labels, output_dict=True, zero_division=0),
+        'confusion_matrix': {'labels': labels, 'matrix': confusion_matrix(y_true, y_pred, labels=labels).tolist()},
+        'prediction_seconds': elapsed,
+        'cvs_per_second': len(corpus) / elapsed if elapsed else 0.0
+    }
+    if args.chunking:
+        # Costo vs. precisión: truncado clásico frente a ventanas con cada tipo de pooling
+        report['chunking'] = classifier.evaluate_chunking(corpus)
+    write_json(report, args.output)
+    return 0
+
+
+def cmd_distill(args):
+    from .deep_learning_classifier import DeepLearningClassifier
+
+    corpus = [item for item in load_corpus(args) if item['status'] == 'success']
+    classifier = DeepLearningClassifier()
+    results = classifier.distill_from_teacher(
+        args.teacher, corpus,
+        student_type=args.student,
+        temperature=args.temperature,
+        alpha=args.alpha,
+        epochs=args.epochs,
+        batch_size=args.batch_size
+    )
+    if not results['success']:
+        raise ValueError(results['error'])
+
+    # El estudiante TF-IDF es un modelo de Machine Learning (se carga sin --deep)
+    student = results.pop('student_classifier') or classifier
+    results['model_saved'] = bool(student.save_model(args.name))
+    results['model_name'] = args.name
+    write_json(results, args.output)
+    return 0 if results['model_saved'] else 1
+
+
+def cmd_snapshot(args):
+    if args.incremental:
+        _, folders = sync_corpus(args)
+        info = CorpusManifest().export_snapshot(folders, args.output)
+        info['output'] = os.path.abspath(args.output)
+        write_json(info)
+        return 0
+
+    labelled = dict(collect_labelled_files(args))
+    print(f"Extrayendo texto de {len(labelled)} CVs con {args.jobs or os.cpu_count()} procesos...",
+          file=sys.stderr)
+    start = time.perf_counter()
+    info = create_snapshot(list(labelled.items()), args.output, args.jobs, metadata={
+        'sources': [os.path.abspath(p) for p in [args.data, args.manifest] + (args.folder or []) if p]
+    }, **extraction_limits(args))
+    info['output'] = os.path.abspath(args.output)
+    info['extraction_seconds'] = time.perf_counter() - start
+    write_json(info)
+    return 0
+
+
+def cmd_bench(args):
+    report = {}
+    if args.training_options:
+        # Resultado guardado en cache/benchmarks: lo usa --performance auto (y la vista DL)
+        from .deep_learning_classifier import DeepLearningClassifier
+        report['training_options'] = DeepLearningClassifier().benchmark_training_options(
+            model_types=tuple(args.training_options))
+        if not args.inputs:
+            write_json(report, args.output)
+            return 0
+
+    paths = collect_input_files(args.inputs)[:args.limit]
+    if not paths:
+        raise ValueError("No se encontraron CVs en las rutas indicadas")
+
+    report.update(files=len(paths), extraction=[])
+    texts = []
+    jobs_list = sorted({1, args.jobs or os.cpu_count() or 1})
+    for jobs in jobs_list:
+        start = time.perf_counter()
+        extracted = list(iter_extracted_texts(paths, jobs, use_processes=jobs > 1))
+        elapsed = time.perf_counter() - start
+        report['extraction'].append({'jobs': jobs, 'seconds': elapsed, 'cvs_per_second': len(paths) / elapsed})
+        texts = [text for _, text, _ in extracted if text]
+
+    if args.model:
+        classifier = load_classifier(args.model, args.deep)
+        classifier.predict_batch(texts[:1])  # Calentamiento
+
+        start = time.perf_counter()
+        classifier.predict_batch(texts)
+        batch_seconds = time.perf_counter() - start
+
+        latencies = []
+        for text in texts[:args.latency_samples]:
+            start = time.perf_counter()
+            classifier.predict_cv(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+
+        report['prediction'] = {
+            'model': args.model,
+            'texts': len(texts),
+            'batch_seconds': batch_seconds,
+            'batch_cvs_per_second': len(texts) / batch_seconds if batch_seconds else 0.0,
+            'latency_ms_p50': latencies[len(latencies) // 2] if latencies else None,
+            'latency_ms_p95': latencies[int(len(latencies) * 0.95)] if latencies else None
+        }
+
+    write_json(report, args.output)
+    return 0
+
+
+# --- Argumentos -----------------------------------------------------------------
+
+def _add_data_arguments(parser, snapshot=True):
+    parser.add_argument('--data', help="Carpeta con una subcarpeta por profesión")
+    parser.add_argument('--folder', action='append', metavar='PROFESION=RUTA',
+                        help="Carpeta de una profesión (se puede repetir)")
+    parser.add_argument('--manifest', help="Manifiesto CSV/JSON/JSONL con 'path' y 'profession'")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Extraer solo los CVs nuevos o modificados desde la última sincronización")
+    if snapshot:
+        parser.add_argument('--snapshot', help="Instantánea del corpus (.parquet o .jsonl.gz) creada con 'snapshot'")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m models.cli',
+                                     description="ClasificaTalento PRO sin interfaz gráfica")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Procesos para la extracción de texto (por defecto, número de CPUs)")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="Hilos de TensorFlow por operación (se fijan antes de cargar TensorFlow)")
+    parser.add_argument('--extract-timeout', type=float, default=DEFAULT_TIMEOUT, metavar='SEG',
+                        help="Segundos máximos de extracción por CV (0 = sin límite)")
+    parser.add_argument('--max-pages', type=int, help="Páginas máximas a extraer por CV")
+    parser.add_argument('--max-chars', type=int, help="Caracteres máximos a extraer por CV")
+    parser.add_argument('--profile', action='store_true',
+                        help="Perfilar la ejecución (artefactos en cache/profiles)")
+    parser.add_argument('--profile-mode', choices=list(PROFILE_MODES), default='full',
+                        help="Con --profile: 'full' incluye el profiler de TensorFlow, 'cprofile' solo cProfile")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train = subparsers.add_parser('train', help="Entrenar y guardar un modelo")
+    _add_data_arguments(train)
+    train.add_argument('--name', required=True, help="Nombre con el que se guarda el modelo")
+    train.add_argument('--kind', choices=['ml', 'dl'], default='ml')
+    train.add_argument('--model-type', choices=ML_MODEL_TYPES + DL_MODEL_TYPES)
+    train.add_argument('--epochs', type=int, default=10)
+    train.add_argument('--batch-size', type=int, default=32)
+    train.add_argument('--chunking', action='store_true', help="Ventanas deslizantes para CVs largos (DL)")
+    train.add_argument('--chunk-window', type=int, help="Tokens por ventana con --chunking")
+    train.add_argument('--chunk-stride', type=int, help="Paso entre ventanas con --chunking")
+    train.add_argument('--pooling', choices=POOLING_MODES, default='mean',
+                       help="Combinación de las predicciones de las ventanas con --chunking")
+    train.add_argument('--resume', action='store_true', help="Reanudar desde el último checkpoint (DL)")
+    train.add_argument('--performance', choices=list(PERFORMANCE_MODES), default=None,
+                       help="XLA, bfloat16 mixto o 'auto' (la mejor opción medida con el benchmark) (DL)")
+    train.add_argument('--time-budget', type=float, metavar='MIN',
+                       help="Minutos máximos de entrenamiento; al agotarse se usan los mejores pesos (DL)")
+    train.add_argument('--full', action='store_true', help="Incluir historial y reporte completo")
+    train.add_argument('--output', help="Archivo JSON de resultados (por defecto, salida estándar)")
+    train.set_defaults(func=cmd_train)
+
+    classify = subparsers.add_parser('classify', help="Clasificar CVs en lote")
+    classify.add_argument('inputs', nargs='+', help="Archivos o carpetas de CVs")
+    classify.add_argument('--model', required=True)
+    classify.add_argument('--deep', action='store_true', help="El modelo es de Deep Learning")
+    classify.add_argument('--batch-size', type=int, default=64)
+    classify.add_argument('--format', choices=['csv', 'jsonl'], default=None)
+    classify.add_argument('--output', help="Archivo de salida (por defecto, JSONL en salida estándar)")
+    classify.set_defaults(func=cmd_classify)
+
+    evaluate = subparsers.add_parser('eval', help="Evaluar un modelo con datos etiquetados")
+    _add_data_arguments(evaluate)
+    evaluate.add_argument('--model', required=True)
+    evaluate.add_argument('--deep', action='store_true', help="El modelo es de Deep Learning")
+    evaluate.add_argument('--chunking', action='store_true',
+                          help="Comparar precisión y tiempo por CV del truncado y de las ventanas deslizantes (DL)")
+    evaluate.add_argument('--output', help="Archivo JSON de resultados")
+    evaluate.set_defaults(func=cmd_eval)
+
+    distill = subparsers.add_parser('distill', help="Destilar un modelo BERT en un estudiante pequeño y rápido")
+    _add_data_arguments(distill)
+    distill.add_argument('--teacher', required=True, help="Modelo BERT entrenado que hace de profesor")
+    distill.add_argument('--name', required=True, help="Nombre con el que se guarda el estudiante")
+    distill.add_argument('--student', choices=['cnn', 'lstm', 'tfidf'], default='cnn',
+                         help="Tipo de estudiante ('tfidf' se guarda como modelo de Machine Learning)")
+    distill.add_argument('--temperature', type=float, default=2.0,
+                         help="Temperatura aplicada a las probabilidades del profesor")
+    distill.add_argument('--alpha', type=float, default=0.3,
+                         help="Peso de la etiqueta real frente a la del profesor")
+    distill.add_argument('--epochs', type=int, default=10)
+    distill.add_argument('--batch-size', type=int, default=32)
+    distill.add_argument('--output', help="Archivo JSON de resultados")
+    distill.set_defaults(func=cmd_distill)
+
+    snapshot = subparsers.add_parser('snapshot', help="Extraer un corpus etiquetado y guardarlo como instantánea")
+    _add_data_arguments(snapshot, snapshot=False)
+    snapshot.add_argument('--output', required=True, help="Archivo de la instantánea (.parquet o .jsonl.gz)")
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    bench = subparsers.add_parser('bench', help="Medir extracción y predicción")
+    bench.add_argument('inputs', nargs='*', help="Archivos o carpetas de CVs")
+    bench.add_argument('--training-options', nargs='+', choices=['lstm', 'cnn', 'bert'], metavar='TIPO',
+                       help="Medir XLA/bfloat16 al entrenar estas arquitecturas (lstm, cnn, bert) y "
+                            "guardar la mejor opción para --performance auto")
+    bench.add_argument('--model', help="Modelo a medir (opcional)")
+    bench.add_argument('--deep', action='store_true', help="El modelo es de Deep Learning")
+    bench.add_argument('--limit', type=int, default=500, help="Máximo de CVs a usar")
+    bench.add_argument('--latency-samples', type=int, default=50)
+    bench.add_argument('--output', help="Archivo JSON de resultados")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def configure_tensorflow(args):
+    """Opciones de TensorFlow que solo surten efecto antes de su primera operación"""
+    os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1')  # Kernels oneDNN en CPU (también en Windows)
+    if args.threads:
+        os.environ['TF_NUM_INTRAOP_THREADS'] = str(args.threads)
+        os.environ['TF_NUM_INTEROP_THREADS'] = str(min(2, args.threads))
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'bench' and not args.inputs and not args.training_options:
+        build_parser().error("bench: indica archivos o carpetas de CVs, o --training-options")
+    configure_tensorflow(args)
+    if args.profile:
+        profiling.enable(PROFILE_MODES[args.profile_mode])
+    try:
+        with profiling.profile_run(f"cli_{args.command}", metadata={
+                k: v for k, v in vars(args).items() if k not in ('func', 'profile', 'profile_mode')}):
+            return args.func(args)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+Sincronización incremental del corpus de entrenamiento
+
+El manifiesto (SQLite, ``Settings.CORPUS_MANIFEST_DB``) recuerda cada CV visto en
+las carpetas de profesiones: ruta, profesión, tamaño, fecha de modificación, hash
+SHA-256 y el texto extraído. Antes de entrenar, ``sync`` recorre las carpetas con
+``os.scandir`` (una sola pasada, sin abrir los archivos) y calcula la diferencia con
+el manifiesto:
+
+- ``added``: archivos nuevos
+- ``modified``: cambió el tamaño o la fecha y también el contenido
+- ``deleted``: ya no están en la carpeta
+- ``relabeled``: misma ruta, otra profesión (no se vuelven a extraer)
+
+Solo se extraen los nuevos y modificados; si su hash coincide con el de un CV ya
+conocido (p. ej. un archivo movido de carpeta) se reutiliza su texto. Después
+``training_data`` devuelve el corpus completo en el formato ``cv_data``.
+"""
+
+import os
+import hashlib
+import sqlite3
+import datetime
+from contextlib import contextmanager
+
+from src.config.settings import Settings
+from src.monitoring import metrics
+from .text_extraction import CV_EXTENSIONS, DEFAULT_TIMEOUT, iter_extracted_documents
+
+WRITE_BATCH = 200       # Documentos extraídos por transacción
+HASH_BLOCK = 1024 * 1024
+
+
+def _folder_items(profession_folders):
+    """Acepta ``{profesión: carpeta}`` o una lista de (profesión, carpeta)"""
+    items = profession_folders.items() if isinstance(profession_folders, dict) else profession_folders
+    return [(profession, os.path.abspath(folder)) for profession, folder in items]
+
+
+def scan_folders(profession_folders, extensions=CV_EXTENSIONS):
+    """Lista los CVs de cada carpeta con los datos de ``os.scandir``, sin leerlos
+
+    Returns:
+        dict: {ruta: {'profession', 'folder', 'size', 'mtime_ns'}}
+    """
+    scanned = {}
+    with metrics.timer('corpus_scan'):
+        for profession, folder in _folder_items(profession_folders):
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(extensions) or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    scanned[entry.path] = {'profession': profession, 'folder': folder,
+                                           'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return scanned
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CorpusManifest:
+    """Archivos del corpus y su texto extraído en SQLite (caché de extracción del entrenamiento)
+
+    Como ``JobStore``, cada operación abre su propia conexión, así que el manifiesto
+    puede usarse desde los workers de entrenamiento y la línea de comandos a la vez.
+    """
+
+    TABLE = 'corpus_archivos'
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or Settings.CORPUS_MANIFEST_DB)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                ruta TEXT PRIMARY KEY,
+                carpeta TEXT NOT NULL,
+                archivo TEXT NOT NULL,
+                profesion TEXT NOT NULL,
+                tamano INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT,
+                paginas INTEGER,
+                texto TEXT NOT NULL DEFAULT '',
+                estado TEXT NOT NULL,
+                motivo TEXT,
+                error TEXT,
+                fecha_actualizacion TIMESTAMP NOT NULL
+            )
+            """)
+            # Manifiestos creados antes de registrar el motivo de los fallos
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.TABLE})")}
+            if 'motivo' not in columns:
+                conn.execute(f"ALTER TABLE {self.TABLE} ADD COLUMN motivo TEXT")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_corpus_carpeta ON {self.TABLE}(carpeta, archivo)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_corpus_sha256 ON {self.TABLE}(sha256)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _known(self, conn, folders):
+        known = {}
+        for folder in folders:
+            for row in conn.execute(
+                    f"SELECT ruta, profesion, tamano, mtime_ns, sha256 FROM {self.TABLE} WHERE carpeta = ?",
+                    (folder,)):
+                known[row[0]] = {'profession': row[1], 'size': row[2], 'mtime_ns': row[3], 'sha256': row[4]}
+        return known
+
+    # --- Diferencias ------------------------------------------------------------
+
+    def diff(self, scanned, profession_folders):
+        """Compara un resultado de ``scan_folders`` con el manifiesto
+
+        Las carpetas se toman de ``profession_folders`` y no del recorrido: una carpeta
+        que se ha quedado vacía también debe informar de sus archivos eliminados.
+
+        Returns:
+            dict: listas de rutas 'added', 'modified', 'deleted' y 'relabeled', y el
+            número de archivos 'unchanged'
+        """
+        folders = {folder for _, folder in _folder_items(profession_folders)}
+        with self._connect() as conn:
+            known = self._known(conn, folders)
+
+        diff = {'added': [], 'modified': [], 'deleted': [], 'relabeled': [], 'unchanged': 0}
+        for path, entry in scanned.items():
+            previous = known.get(path)
+            if previous is None:
+                diff['added'].append(path)
+            elif (previous['size'], previous['mtime_ns']) != (entry['size'], entry['mtime_ns']):
+                diff['modified'].append(path)
+            elif previous['profession'] != entry['profession']:
+                diff['relabeled'].append(path)
+            else:
+                diff['unchanged'] += 1
+        diff['deleted'] = sorted(set(known) - set(scanned))
+        return diff
+
+    # --- Sincronización ---------------------------------------------------------
+
+    def sync(self, profession_folders, extensions=CV_EXTENSIONS, max_workers=None, use_processes=True,
+             progress_callback=None, should_stop=None, timeout=DEFAULT_TIMEOUT, max_pages=None, max_chars=None):
+        """Actualiza el manifiesto con el contenido actual de las carpetas
+
+        Args:
+            profession_folders: ``{profesión: carpeta}`` o lista de (profesión, carpeta)
+            extensions: extensiones de CV a considerar
+            progress_callback: función (extraídos, por_extraer, ruta) opcional
+            should_stop: función sin argumentos; lo ya extraído queda guardado
+            timeout, max_pages, max_chars: límites por archivo (ver ``ExtractionRunner``);
+                un archivo que agota el tiempo queda como fallido hasta que cambie o se
+                use ``forget``
+
+        Returns:
+            dict: el resultado de ``diff`` más 'extracted', 'reused' (texto reutilizado por
+            hash), 'failed' (extracciones sin texto), 'failures' (dicts de los fallidos con
+            'path', 'reason' y 'error') y 'cancelled'
+        """
+        scanned = scan_folders(profession_folders, extensions)
+        diff = self.diff(scanned, profession_folders)
+        diff.update(extracted=0, reused=0, failed=0, failures=[], cancelled=False)
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+
+        to_extract = []
+        with self._connect() as conn:
+            conn.executemany(f"UPDATE {self.TABLE} SET profesion = ?, fecha_actualizacion = ? WHERE ruta = ?",
+                             [(scanned[path]['profession'], now, path) for path in diff['relabeled']])
+
+            # Un archivo modificado con el mismo contenido (solo cambió la fecha) no se extrae;
+            # uno nuevo cuyo contenido ya se conoce (movido o copiado) reutiliza el texto
+            candidates = diff['modified'] + (diff['added'] if diff['deleted'] or diff['modified'] else [])
+            hashes = {}
+            for path in candidates:
+                try:
+                    hashes[path] = file_sha256(path)
+                except OSError:
+                    pass
+            touched = set()
+            for path in diff['added'] + diff['modified']:
+                entry = scanned[path]
+                sha256 = hashes.get(path)
+                row = None
+                if sha256 is not None:
+                    row = conn.execute(
+                        f"SELECT ruta, paginas, texto, estado, motivo, error FROM {self.TABLE} WHERE sha256 = ? "
+                        f"ORDER BY ruta = ? DESC LIMIT 1", (sha256, path)).fetchone()
+                if row is None:
+                    to_extract.append(path)
+                    continue
+                self._upsert(conn, path, entry, {'sha256': sha256, 'pages': row[1], 'text': row[2],
+                                                 'status': row[3], 'reason': row[4], 'error': row[5]}, now)
+                if row[0] == path:
+                    touched.add(path)
+                else:
+                    diff['reused'] += 1
+            diff['modified'] = [path for path in diff['modified'] if path not in touched]
+            diff['unchanged'] += len(touched)
+
+            conn.executemany(f"DELETE FROM {self.TABLE} WHERE ruta = ?", [(path,) for path in diff['deleted']])
+
+        pending = []
+        documents = iter_extracted_documents(to_extract, max_workers, use_processes, should_stop,
+                                             timeout=timeout, max_pages=max_pages, max_chars=max_chars)
+        for processed, document in enumerate(documents, 1):
+            pending.append(document)
+            diff['extracted'] += 1
+            if document['status'] != 'success':
+                diff['failed'] += 1
+                diff['failures'].append({k: document[k] for k in ('path', 'status', 'reason', 'error')})
+            if len(pending) >= WRITE_BATCH:
+                self._write_documents(pending, scanned)
+                pending = []
+            if progress_callback:
+                progress_callback(processed, len(to_extract), document['path'])
+        self._write_documents(pending, scanned)
+        diff['cancelled'] = diff['extracted'] < len(to_extract)
+        metrics.increment('corpus_sync_extracted', diff['extracted'])
+        return diff
+
+    def _upsert(self, conn, path, entry, document, now):
+        conn.execute(f"""
+        INSERT OR REPLACE INTO {self.TABLE}
+            (ruta, carpeta, archivo, profesion, tamano, mtime_ns, sha256, paginas, texto, estado, motivo, error,
+             fecha_actualizacion)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (path, entry['folder'], os.path.basename(path), entry['profession'],
+              document.get('size', entry['size']), document.get('mtime_ns', entry['mtime_ns']),
+              document['sha256'], document['pages'], document['text'], document['status'], document.get('reason'),
+              document['error'], now))
+
+    def _write_documents(self, documents, scanned):
+        if not documents:
+            return
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        with self._connect() as conn:
+            for document in documents:
+                entry = scanned[document['path']]
+                # El tamaño y la fecha del archivo leído, no los del recorrido: si cambió
+                # entre ambos, la próxima sincronización lo detecta
+                document = {k: v for k, v in document.items() if v is not None or k not in ('size', 'mtime_ns')}
+                self._upsert(conn, document['path'], entry, document, now)
+
+    # --- Lectura ----------------------------------------------------------------
+
+    def training_data(self, profession_folders, successful_only=False):
+        """Corpus de las carpetas indicadas con el formato ``cv_data`` de los entrenamientos
+
+        El orden es estable (carpetas en el orden dado, archivos por nombre) para que las
+        particiones de entrenamiento sean reproducibles entre sincronizaciones.
+        """
+        query = (f"SELECT ruta, archivo, profesion, texto, sha256, tamano, mtime_ns, paginas, estado, motivo, error "
+                 f"FROM {self.TABLE} WHERE carpeta = ?" + (" AND estado = 'success'" if successful_only else "") +
+                 " ORDER BY archivo")
+        cv_data = []
+        with self._connect() as conn:
+            for _, folder in _folder_items(profession_folders):
+                cv_data.extend({
+                    'path': row[0], 'filename': row[1], 'profession': row[2], 'text': row[3], 'sha256': row[4],
+                    'size': row[5], 'mtime_ns': row[6], 'pages': row[7], 'status': row[8], 'reason': row[9],
+                    'error': row[10]
+                } for row in conn.execute(query, (folder,)))
+        return cv_data
+
+    def export_snapshot(self, profession_folders, output_path, metadata=None):
+        """Guarda el corpus sincronizado como instantánea (ver ``corpus_snapshot``)"""
+        from .corpus_snapshot import write_snapshot
+        metadata = dict(metadata or {}, sources={profession: folder
+                                                 for profession, folder in _folder_items(profession_folders)})
+        return write_snapshot(self.training_data(profession_folders), output_path, metadata)
+
+    def forget(self, folder=None):
+        """Elimina del manifiesto una carpeta (o todo) para forzar una nueva extracción"""
+        with self._connect() as conn:
+            if folder is None:
+                return conn.execute(f"DELETE FROM {self.TABLE}").rowcount
+            return conn.execute(f"DELETE FROM {self.TABLE} WHERE carpeta = ?",
+                                (os.path.abspath(folder),)).rowcount
+
+
+def format_diff(diff):
+    """Resumen de una línea de una sincronización para los registros de entrenamiento"""
+    summary = (f"{len(diff['added'])} nuevos, {len(diff['modified'])} modificados, "
+               f"{len(diff['deleted'])} eliminados, {len(diff['relabeled'])} reetiquetados, "
+               f"{diff['unchanged']} sin cambios")
+    if diff.get('reused'):
+        summary += f" · {diff['reused']} reutilizados por hash"
+    return summary
@@ -0,0 +1,213 @@
+"""
+Instantáneas del corpus de entrenamiento en formato columnar (Parquet)
+
+Una instantánea guarda, por cada CV, el texto extraído, la profesión, el hash del
+archivo, su tamaño y fecha, el número de páginas y el estado de la extracción. Se
+crea una vez a partir de las carpetas de profesiones y después cualquier
+entrenamiento (``CVClassifier``, ``DeepLearningClassifier``, ``models.cli``) la
+carga en segundos en lugar de volver a extraer todos los PDFs:
+
+    python -m models.cli snapshot --data /ruta/profesiones --output corpus.parquet
+    python -m models.cli train --snapshot corpus.parquet --name modelo
+
+Parquet (comprimido con zstd) requiere ``pyarrow``. Sin él se usa ``.jsonl.gz``: el
+mismo contenido, una línea JSON por CV, más lento de cargar pero sin dependencias.
+"""
+
+import os
+import gzip
+import json
+import datetime
+
+from .text_extraction import iter_extracted_documents
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SNAPSHOT_VERSION = 1
+METADATA_KEY = b'cv_corpus_snapshot'
+PARQUET_EXTENSION = '.parquet'
+JSONL_EXTENSION = '.jsonl.gz'
+ROW_GROUP_SIZE = 2000  # CVs por grupo de filas: permite leer columnas sueltas sin cargar todo el texto
+
+COLUMNS = ['path', 'filename', 'profession', 'text', 'sha256', 'size', 'mtime_ns', 'pages', 'status', 'reason',
+           'error']
+
+
+def _schema():
+    return pa.schema([
+        ('path', pa.string()),
+        ('filename', pa.string()),
+        ('profession', pa.dictionary(pa.int32(), pa.string())),
+        ('text', pa.large_string()),
+        ('sha256', pa.string()),
+        ('size', pa.int64()),
+        ('mtime_ns', pa.int64()),
+        ('pages', pa.int32()),
+        ('status', pa.dictionary(pa.int8(), pa.string())),
+        ('reason', pa.dictionary(pa.int8(), pa.string())),
+        ('error', pa.string()),
+    ])
+
+
+def default_snapshot_path(name):
+    """Ruta por defecto de una instantánea según el formato disponible"""
+    return name + (PARQUET_EXTENSION if PYARROW_AVAILABLE else JSONL_EXTENSION)
+
+
+def _is_parquet(path):
+    if str(path).lower().endswith(PARQUET_EXTENSION):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Las instantáneas Parquet requieren pyarrow (pip install pyarrow); "
+                              f"sin él usa la extensión {JSONL_EXTENSION}")
+        return True
+    if str(path).lower().endswith(JSONL_EXTENSION):
+        return False
+    raise ValueError(f"Formato de instantánea no reconocido (usa {PARQUET_EXTENSION} o {JSONL_EXTENSION}): {path}")
+
+
+def _summary(records):
+    professions = {}
+    failures = {}
+    for record in records:
+        professions[record['profession']] = professions.get(record['profession'], 0) + 1
+        if record['status'] != 'success':
+            reason = record.get('reason') or 'unknown'
+            failures[reason] = failures.get(reason, 0) + 1
+    return {'total': len(records), 'failed': sum(failures.values()), 'failures': failures,
+            'professions': dict(sorted(professions.items()))}
+
+
+# --- Escritura ------------------------------------------------------------------
+
+def write_snapshot(records, output_path, metadata=None):
+    """Escribe registros (dicts con ``COLUMNS``) como instantánea
+
+    Se escribe en un archivo temporal y se renombra al final, así que una instantánea
+    existente nunca queda a medio escribir.
+
+    Returns:
+        dict: metadatos guardados (versión, fecha, totales y ``metadata``)
+    """
+    records = [{column: record.get(column) for column in COLUMNS} for record in records]
+    info = {
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        **_summary(records),
+        **(metadata or {})
+    }
+    parent = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+
+    if _is_parquet(output_path):
+        table = pa.Table.from_pylist(records, schema=_schema())
+        table = table.replace_schema_metadata({METADATA_KEY: json.dumps(info, ensure_ascii=False).encode('utf-8')})
+        pq.write_table(table, tmp_path, compression='zstd', row_group_size=ROW_GROUP_SIZE)
+    else:
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            f.write(json.dumps({'_snapshot': info}, ensure_ascii=False) + "\n")
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, output_path)
+    return info
+
+
+def create_snapshot(labelled_paths, output_path, max_workers=None, progress_callback=None,
+                    should_stop=None, metadata=None, **limits):
+    """Extrae en paralelo un corpus etiquetado y lo guarda como instantánea
+
+    Args:
+        labelled_paths: lista de (ruta, profesión)
+        progress_callback: función (procesados, total, ruta) opcional
+        should_stop: función sin argumentos; si devuelve True no se escribe nada
+        limits: ``timeout``, ``max_pages`` y ``max_chars`` por archivo (ver ``ExtractionRunner``)
+
+    Returns:
+        dict: metadatos de la instantánea, o None si se canceló
+    """
+    profession_by_path = dict(labelled_paths)
+    order = {path: i for i, path in enumerate(profession_by_path)}
+    records = [None] * len(order)
+    documents = iter_extracted_documents(list(order), max_workers, should_stop=should_stop, **limits)
+    for processed, document in enumerate(documents, 1):
+        path = document['path']
+        # Mismo orden que la lista de entrada: las particiones de entrenamiento no cambian
+        records[order[path]] = dict(document, filename=os.path.basename(path),
+                                    profession=profession_by_path[path])
+        if progress_callback:
+            progress_callback(processed, len(order), path)
+    if should_stop and should_stop():
+        return None
+    return write_snapshot(records, output_path, metadata)
+
+
+def snapshot_from_folders(profession_folders, output_path, **kwargs):
+    """Crea una instantánea desde ``{profesión: carpeta}`` (formato de las vistas de entrenamiento)"""
+    from .text_extraction import list_cv_files
+    labelled = [(path, profession) for profession, folder in profession_folders.items()
+                for path in list_cv_files(folder)]
+    metadata = dict(kwargs.pop('metadata', None) or {},
+                    sources={profession: os.path.abspath(folder) for profession, folder in profession_folders.items()})
+    return create_snapshot(labelled, output_path, metadata=metadata, **kwargs)
+
+
+# --- Lectura --------------------------------------------------------------------
+
+def snapshot_info(path):
+    """Metadatos de una instantánea sin cargar los textos"""
+    if _is_parquet(path):
+        raw = (pq.read_schema(path).metadata or {}).get(METADATA_KEY)
+        return json.loads(raw) if raw else {}
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.loads(f.readline()).get('_snapshot', {})
+
+
+def load_snapshot(path, successful_only=True, professions=None, columns=None, as_frame=False):
+    """Carga una instantánea con el formato ``cv_data`` de los entrenamientos
+
+    Args:
+        successful_only: omitir los CVs cuya extracción falló
+        professions: conjunto opcional de profesiones a cargar
+        columns: columnas a leer (por defecto, todas); en Parquet las demás no se leen del disco
+        as_frame: devolver un ``pandas.DataFrame`` (lo acepta ``CVClassifier.train_model``)
+            en lugar de una lista de dicts
+
+    Returns:
+        list | DataFrame: registros con 'text', 'profession', 'filename', 'status'... (o solo ``columns``)
+    """
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ['profession', 'status']))
+
+    if _is_parquet(path):
+        filters = []
+        if successful_only:
+            filters.append(('status', '=', 'success'))
+        if professions:
+            filters.append(('profession', 'in', sorted(professions)))
+        table = pq.read_table(path, columns=columns, filters=filters or None)
+        # Las columnas de diccionario se devuelven como texto normal
+        table = table.cast(pa.schema([
+            pa.field(field.name, field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ]))
+        return table.to_pandas() if as_frame else table.to_pylist()
+
+    records = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        f.readline()  # Cabecera con los metadatos
+        for line in f:
+            record = json.loads(line)
+            if successful_only and record['status'] != 'success':
+                continue
+            if professions and record['profession'] not in professions:
+                continue
+            records.append({k: record.get(k) for k in columns} if columns else record)
+    if as_frame:
+        import pandas as pd
+        return pd.DataFrame(records, columns=columns or COLUMNS)
+    return records
@@ -19,6 +19,8 @@ import joblib
 import datetime
 import logging
 from src.config import logging_config  # noqa: F401
+from src.monitoring import metrics, profiling
+from .training_telemetry import TrainingTelemetry, save_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -31,17 +33,23 @@ class CVClassifier:
         self.classifier = None
         self.label_encoder = None
         self.is_trained = False
+        self.accuracy = None  # Precisión en el conjunto de prueba del último entrenamiento
+        self.training_telemetry = None  # Serie de rendimiento del último entrenamiento (ver training_telemetry)
 
         # Crear directorio de modelos
         os.makedirs(model_dir, exist_ok=True)
     
     def prepare_training_data(self, cv_data):
-        """Prepara los datos para entrenamiento"""
-        if not cv_data:
+        """Prepara los datos para entrenamiento
+
+        ``cv_data`` es una lista de dicts o un DataFrame con las mismas columnas (p. ej.
+        ``load_snapshot(..., as_frame=True)``, ver ``corpus_snapshot``)
+        """
+        if cv_data is None or len(cv_data) == 0:
             raise ValueError("No hay datos de CVs para entrenar")
         
         # Convertir a DataFrame
-        df = pd.DataFrame(cv_data)
+        df = cv_data if isinstance(cv_data, pd.DataFrame) else pd.DataFrame(cv_data)
         
         # Filtrar solo CVs procesados exitosamente
         df = df[df['status'] == 'success'].copy()
@@ -58,9 +66,16 @@ class CVClassifier:
         
         return texts, professions
     
-    def train_model(self, cv_data, test_size=0.2, model_type='random_forest'):
-        """Entrena el modelo de clasificación"""
+    @profiling.profiled('ml_train_model')
+    def train_model(self, cv_data, test_size=0.2, model_type='random_forest', telemetry=None):
+        """Entrena el modelo de clasificación
+
+        ``telemetry`` (``TrainingTelemetry``) recibe la duración, la velocidad y la
+        memoria de cada fase; el ajuste de scikit-learn no informa de su avance, así que
+        durante ``fit`` solo se publican tiempo transcurrido y memoria.
+        """
         logger.info("=== INICIANDO ENTRENAMIENTO ===")
+        telemetry = telemetry or TrainingTelemetry()
         
         # Preparar datos
         texts, professions = self.prepare_training_data(cv_data)
@@ -83,7 +98,9 @@ class CVClassifier:
             max_df=0.95  # Máximo 95% de documentos
         )
         
-        X = self.vectorizer.fit_transform(texts)
+        with metrics.timer('vectorization', model='ml', phase='fit'), telemetry.ticking('vectorization', unit='CVs'):
+            X = self.vectorizer.fit_transform(texts)
+            telemetry.update(len(texts), samples=len(texts), total=len(texts), force=True)
         
         # Codificar etiquetas
         self.label_encoder = LabelEncoder()
@@ -139,11 +156,15 @@ class CVClassifier:
             # TF-IDF ya produce valores no negativos, así que está bien
             pass
 
-        self.classifier.fit(X_train, y_train)
+        with metrics.timer('training', model='ml', model_type=model_type), telemetry.ticking('training', unit='muestras'):
+            self.classifier.fit(X_train, y_train)
+            telemetry.update(X_train.shape[0], samples=X_train.shape[0], total=X_train.shape[0], force=True)
         
         # Evaluar modelo
+        telemetry.start_phase('evaluation', total=X_test.shape[0], unit='muestras')
         y_pred = self.classifier.predict(X_test)
         accuracy = accuracy_score(y_test, y_pred)
+        telemetry.update(X_test.shape[0], samples=X_test.shape[0], force=True, accuracy=float(accuracy))
         
         logger.info(f"\n=== RESULTADOS DEL ENTRENAMIENTO ===")
         logger.info(f"Precisión: {accuracy:.3f}")
@@ -161,6 +182,8 @@ class CVClassifier:
             logger.info(report)
         
         self.is_trained = True
+        self.accuracy = float(accuracy)
+        self.training_telemetry = telemetry.to_dict()
         
         return {
             'success': True,
@@ -184,51 +207,86 @@ class CVClassifier:
         
         try:
             # Vectorizar texto
-            X = self.vectorizer.transform([cv_text])
+            with metrics.timer('vectorization', model='ml', phase='transform'):
+                X = self.vectorizer.transform([cv_text])
             
             # Predecir
-            prediction = self.classifier.predict(X)[0]
-            probabilities = self.classifier.predict_proba(X)[0]
-            
-            # Obtener nombre de la profesión
-            profession = self.label_encoder.inverse_transform([prediction])[0]
-            confidence = float(max(probabilities))
-            
-            # Crear ranking de profesiones
-            profession_ranking = []
-            for i, prob in enumerate(probabilities):
-                prof_name = self.label_encoder.inverse_transform([i])[0]
-                profession_ranking.append({
-                    'profession': prof_name,
-                    'probability': float(prob),
-                    'percentage': f"{prob*100:.1f}%"
-                })
-            
-            # Ordenar por probabilidad
-            profession_ranking.sort(key=lambda x: x['probability'], reverse=True)
-            
-            # Determinar nivel de confianza
-            if confidence > 0.8:
-                confidence_level = 'Alta'
-            elif confidence > 0.6:
-                confidence_level = 'Media'
-            else:
-                confidence_level = 'Baja'
-            
-            return {
-                'predicted_profession': profession,
-                'confidence': confidence,
-                'confidence_level': confidence_level,
-                'confidence_percentage': f"{confidence*100:.1f}%",
-                'profession_ranking': profession_ranking,
-                'error': False
-            }
+            with metrics.timer('prediction', model='ml'):
+                probabilities = self.classifier.predict_proba(X)[0]
+            metrics.increment('predictions', model='ml')
+            return self._format_prediction(probabilities)
             
         except Exception as e:
             return {
                 'error': True,
                 'message': f'Error en la predicción: {str(e)}'
             }
+
+    def predict_batch(self, cv_texts):
+        """Predice la profesión de varios CVs con una sola vectorización y predicción
+
+        Returns:
+            list: un resultado por texto, con el mismo formato que ``predict_cv``
+        """
+        if not self.is_trained:
+            raise ValueError("El modelo no ha sido entrenado")
+
+        results = [None] * len(cv_texts)
+        valid = [i for i, text in enumerate(cv_texts) if text and text.strip()]
+        for i in set(range(len(cv_texts))) - set(valid):
+            results[i] = {'error': True, 'message': 'El texto del CV está vacío'}
+
+        if valid:
+            try:
+                with metrics.timer('vectorization', model='ml', phase='transform_batch'):
+                    X = self.vectorizer.transform([cv_texts[i] for i in valid])
+                with metrics.timer('prediction_batch', model='ml'):
+                    probabilities = self.classifier.predict_proba(X)
+                metrics.increment('predictions', len(valid), model='ml')
+                for i, row in zip(valid, probabilities):
+                    results[i] = self._format_prediction(row)
+            except Exception as e:
+                for i in valid:
+                    results[i] = {'error': True, 'message': f'Error en la predicción: {str(e)}'}
+
+        return results
+
+    def _format_prediction(self, probabilities):
+        """Construye el resultado de predicción a partir de las probabilidades por clase"""
+        prediction = int(np.argmax(probabilities))
+
+        # Obtener nombre de la profesión
+        profession = self.label_encoder.inverse_transform([prediction])[0]
+        confidence = float(max(probabilities))
+        
+        # Crear ranking de profesiones
+        profession_ranking = []
+        for prof_name, prob in zip(self.label_encoder.classes_, probabilities):
+            profession_ranking.append({
+                'profession': prof_name,
+                'probability': float(prob),
+                'percentage': f"{prob*100:.1f}%"
+            })
+        
+        # Ordenar por probabilidad
+        profession_ranking.sort(key=lambda x: x['probability'], reverse=True)
+        
+        # Determinar nivel de confianza
+        if confidence > 0.8:
+            confidence_level = 'Alta'
+        elif confidence > 0.6:
+            confidence_level = 'Media'
+        else:
+            confidence_level = 'Baja'
+        
+        return {
+            'predicted_profession': profession,
+            'confidence': confidence,
+            'confidence_level': confidence_level,
+            'confidence_percentage': f"{confidence*100:.1f}%",
+            'profession_ranking': profession_ranking,
+            'error': False
+        }
     
     def save_model(self, model_name='cv_classifier'):
         """Guarda el modelo entrenado y sus componentes"""
@@ -264,11 +322,16 @@ class CVClassifier:
                 'num_classes': len(self.label_encoder.classes_),
                 'classes': list(self.label_encoder.classes_),
                 'saved_date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'accuracy': self.accuracy,
                 'is_deep_learning': False
             }
             joblib.dump(metadata, os.path.join(model_folder, 'metadata.pkl'))
             logger.info("✅ Metadatos guardados")
 
+            if self.training_telemetry:
+                save_telemetry(self.training_telemetry, model_folder)
+                logger.info("✅ Telemetría del entrenamiento guardada")
+
             logger.info(f"\\n✅ Modelo '{model_name}' guardado exitosamente")
             return True
 
@@ -278,8 +341,18 @@ class CVClassifier:
             logger.info(f"Traceback: {traceback.format_exc()}")
             return False
 
-    def load_model(self, model_name='cv_classifier'):
-        """Carga un modelo guardado"""
+    LOAD_STEPS = 4
+
+    def load_model(self, model_name='cv_classifier', progress_callback=None):
+        """Carga un modelo guardado
+
+        Args:
+            progress_callback: función (paso, total, mensaje) llamada tras cada artefacto
+        """
+        with metrics.timer('model_load', model='ml'):
+            return self._load_model(model_name, progress_callback or (lambda *args: None))
+
+    def _load_model(self, model_name, report):
         try:
             logger.info(f"\\n=== Cargando modelo '{model_name}' ===")
             
@@ -293,9 +366,11 @@ class CVClassifier:
             metadata_path = os.path.join(model_folder, 'metadata.pkl')
             if os.path.exists(metadata_path):
                 metadata = joblib.load(metadata_path)
+                self.accuracy = metadata.get('accuracy')
                 logger.info("✅ Metadatos cargados")
                 logger.info(f"   Tipo de modelo: {metadata.get('model_type', 'Unknown')}")
                 logger.info(f"   Profesiones: {len(metadata.get('classes', []))}")
+            report(1, self.LOAD_STEPS, "Metadatos cargados")
 
             # Cargar modelo
             classifier_path = os.path.join(model_folder, 'classifier.pkl')
@@ -304,6 +379,7 @@ class CVClassifier:
                 return False
             self.classifier = joblib.load(classifier_path)
             logger.info("✅ Clasificador cargado")
+            report(2, self.LOAD_STEPS, "Clasificador cargado")
 
             # Cargar vectorizer
             vectorizer_path = os.path.join(model_folder, 'vectorizer.pkl')
@@ -312,6 +388,7 @@ class CVClassifier:
                 return False
             self.vectorizer = joblib.load(vectorizer_path)
             logger.info("✅ Vectorizer cargado")
+            report(3, self.LOAD_STEPS, "Vectorizer cargado")
 
             # Cargar encoder
             encoder_path = os.path.join(model_folder, 'encoder.pkl')
@@ -320,6 +397,7 @@ class CVClassifier:
                 return False
             self.label_encoder = joblib.load(encoder_path)
             logger.info("✅ Encoder cargado")
+            report(4, self.LOAD_STEPS, "Encoder cargado")
 
             self.is_trained = True
             logger.info(f"\\n✅ Modelo '{model_name}' cargado exitosamente")
@@ -358,67 +436,77 @@ class CVClassifier:
             'model_type': model_type_name
         }
 
+    def _deep_models_dir(self):
+        return os.path.join(os.path.dirname(self.model_dir), 'saved_deep_models')
+
+    def _read_model_info(self, item_path, item, is_deep_learning):
+        """Lee los metadatos de la carpeta de un modelo; None si no es una carpeta de modelo"""
+        metadata_path = os.path.join(item_path, 'metadata.pkl')
+        if not os.path.isdir(item_path) or not os.path.exists(metadata_path):
+            return None
+        metadata = joblib.load(metadata_path)
+
+        if is_deep_learning:
+            return {
+                'name': item,
+                'display_name': metadata.get('model_name', item),
+                'model_type': metadata.get('model_type', 'Deep Learning'),
+                'professions': metadata.get('classes', []),
+                'num_professions': metadata.get('num_classes', 0),
+                'creation_date': metadata.get('saved_date', 'Unknown'),
+                'num_features': metadata.get('max_length', 0),
+                'accuracy': metadata.get('accuracy'),
+                'is_deep_learning': True
+            }
+
+        # Si no hay clases en los metadatos, intentar cargarlas del encoder
+        if not metadata.get('classes'):
+            encoder_path = os.path.join(item_path, 'encoder.pkl')
+            if os.path.exists(encoder_path):
+                encoder = joblib.load(encoder_path)
+                metadata['classes'] = list(encoder.classes_)
+                metadata['num_classes'] = len(encoder.classes_)
+                # Actualizar los metadatos con las clases
+                joblib.dump(metadata, metadata_path)
+
+        return {
+            'name': item,
+            'display_name': metadata.get('model_name', item),
+            'model_type': metadata.get('model_type', 'Unknown'),
+            'professions': metadata.get('classes', []),
+            'num_professions': metadata.get('num_classes', 0),
+            'creation_date': metadata.get('saved_date', 'Unknown'),
+            'num_features': metadata.get('num_features', 0),
+            'accuracy': metadata.get('accuracy'),
+            'is_deep_learning': False
+        }
+
+    def get_saved_model_info(self, model_name, is_deep_learning=False):
+        """Información de un solo modelo, con el mismo formato que list_available_models"""
+        base_dir = self._deep_models_dir() if is_deep_learning else self.model_dir
+        try:
+            return self._read_model_info(os.path.join(base_dir, model_name), model_name, is_deep_learning)
+        except Exception as e:
+            logger.info(f"Error leyendo metadatos de {model_name}: {e}")
+            return None
+
     def list_available_models(self):
         """Lista todos los modelos disponibles (tradicionales y Deep Learning)"""
         models = []
 
-        # Modelos tradicionales (en carpetas)
-        if os.path.exists(self.model_dir):
-            for item in os.listdir(self.model_dir):
-                item_path = os.path.join(self.model_dir, item)
-                if os.path.isdir(item_path):
-                    try:
-                        metadata_path = os.path.join(item_path, 'metadata.pkl')
-                        if os.path.exists(metadata_path):
-                            metadata = joblib.load(metadata_path)
-                            
-                            # Si no hay clases en los metadatos, intentar cargarlas del encoder
-                            if not metadata.get('classes'):
-                                encoder_path = os.path.join(item_path, 'encoder.pkl')
-                                if os.path.exists(encoder_path):
-                                    encoder = joblib.load(encoder_path)
-                                    metadata['classes'] = list(encoder.classes_)
-                                    metadata['num_classes'] = len(encoder.classes_)
-                                    # Actualizar los metadatos con las clases
-                                    joblib.dump(metadata, metadata_path)
-                            
-                            models.append({
-                                'name': item,
-                                'display_name': metadata.get('model_name', item),
-                                'model_type': metadata.get('model_type', 'Unknown'),
-                                'professions': metadata.get('classes', []),
-                                'num_professions': metadata.get('num_classes', 0),
-                                'creation_date': metadata.get('saved_date', 'Unknown'),
-                                'num_features': metadata.get('num_features', 0),
-                                'is_deep_learning': False
-                            })
-                    except Exception as e:
-                        logger.info(f"Error leyendo metadatos de {item}: {e}")
-                        continue
-
-        # Modelos de Deep Learning
-        deep_models_dir = os.path.join(os.path.dirname(self.model_dir), 'saved_deep_models')
-        if os.path.exists(deep_models_dir):
-            for item in os.listdir(deep_models_dir):
-                item_path = os.path.join(deep_models_dir, item)
-                if os.path.isdir(item_path):
-                    try:
-                        metadata_path = os.path.join(item_path, 'metadata.pkl')
-                        if os.path.exists(metadata_path):
-                            metadata = joblib.load(metadata_path)
-                            models.append({
-                                'name': item,
-                                'display_name': metadata.get('model_name', item),
-                                'model_type': metadata.get('model_type', 'Deep Learning'),
-                                'professions': metadata.get('classes', []),
-                                'num_professions': metadata.get('num_classes', 0),
-                                'creation_date': metadata.get('saved_date', 'Unknown'),
-                                'num_features': metadata.get('max_length', 0),
-                                'is_deep_learning': True
-                            })
-                    except Exception as e:
-                        logger.info(f"Error leyendo metadatos DL de {item}: {e}")
-                        continue
+        # Modelos tradicionales (en carpetas) y de Deep Learning
+        for base_dir, is_deep_learning in ((self.model_dir, False), (self._deep_models_dir(), True)):
+            if not os.path.exists(base_dir):
+                continue
+            for item in os.listdir(base_dir):
+                try:
+                    model_info = self._read_model_info(os.path.join(base_dir, item), item, is_deep_learning)
+                    if model_info is not None:
+                        models.append(model_info)
+                except Exception as e:
+                    label = "DL " if is_deep_learning else ""
+                    logger.info(f"Error leyendo metadatos {label}de {item}: {e}")
+                    continue
 
         return sorted(models, key=lambda x: x['creation_date'], reverse=True)
 
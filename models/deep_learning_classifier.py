@@ -4,6 +4,10 @@ Incluye LSTM, BERT y CNN para texto
 """
 
 import os
+import re
+import shutil
+import hashlib
+import time
 import pandas as pd
 import numpy as np
 import joblib
@@ -17,6 +21,10 @@ import pickle
 warnings.filterwarnings('ignore')
 
 from .model_manager import ModelManager
+from .embedding_cache import EmbeddingCache
+from .training_telemetry import TrainingTelemetry, save_telemetry
+from src.config.settings import Settings
+from src.monitoring import metrics, profiling
 
 # Verificar disponibilidad de librerías de deep learning
 try:
@@ -44,6 +52,21 @@ except ImportError:
 
 class DeepLearningClassifier:
     """Clasificador de CVs usando modelos de Deep Learning"""
+
+    DEFAULT_PERFORMANCE_OPTIONS = {
+        'jit_compile': False,       # Compilación XLA de los pasos de entrenamiento
+        'mixed_precision': False    # Política mixed_bfloat16 (solo si la CPU soporta bf16)
+    }
+
+    BENCHMARK_MODEL_TYPES = ('lstm', 'cnn', 'bert')  # Arquitecturas que mide benchmark_training_options
+
+    DEFAULT_CHUNKING = {
+        'enabled': False,
+        'window': 512,       # Tokens por ventana
+        'stride': 384,       # Desplazamiento entre inicios de ventana
+        'pooling': 'mean',   # 'mean', 'max' o 'attention'
+        'max_windows': 8     # Límite de ventanas por documento (0 = sin límite)
+    }
     
     def __init__(self):
         """Inicializa el clasificador de Deep Learning"""
@@ -54,11 +77,26 @@ class DeepLearningClassifier:
         self.vocab_size = 10000
         self.tokenizer = None
         self.bert_tokenizer = None
+        self.bert_encoder = None
         self.label_encoder = None
+        self.metadata = {}
+        self.accuracy = None  # Precisión en el conjunto de prueba del último entrenamiento
+        self.distillation_report = None
+        self.training_telemetry = None  # Serie de rendimiento del último entrenamiento (ver training_telemetry)
+        self.frozen_head = 'dense'
+        self.embedding_batch_size = 8
+
+        # Configuración de ventanas deslizantes para CVs largos
+        self.chunking = dict(self.DEFAULT_CHUNKING)
+
+        # Opciones de rendimiento en CPU (XLA, bfloat16); los hilos se fijan al arrancar el proceso
+        # (variables TF_NUM_*_THREADS de cli.configure_tensorflow y de la cola de trabajos)
+        self.performance_options = dict(self.DEFAULT_PERFORMANCE_OPTIONS)
         
         # Configuración de BERT
         self.bert_config = {
             'model_name': 'dccuchile/bert-base-spanish-wwm-uncased',
+            'revision': 'main',  # Rama a seguir; se fija al commit descargado (resolve_bert_revision)
             'version': '1.0',
             'files': {
                 'model': 'pytorch_model.bin',  # ~440MB
@@ -77,7 +115,7 @@ class DeepLearningClassifier:
     def check_dependencies(self, model_type):
         """Verifica y carga las dependencias necesarias según el tipo de modelo"""
         try:
-            if model_type == 'bert':
+            if model_type in ('bert', 'bert_frozen'):
                 from transformers import AutoTokenizer, TFAutoModel
                 if self.bert_tokenizer is None:
                     print("\n=== Configurando tokenizer BERT ===")
@@ -85,6 +123,7 @@ class DeepLearningClassifier:
                     
                     self.bert_tokenizer = AutoTokenizer.from_pretrained(
                         self.bert_config['model_name'],
+                        revision=self.bert_config['revision'],
                         cache_dir=self.bert_cache_dir,
                         do_lower_case=True
                     )
@@ -147,6 +186,219 @@ class DeepLearningClassifier:
             'attention_mask': encoded['attention_mask']
         }, labels
     
+    def _window_starts(self, length, window, stride, max_windows):
+        """Calcula los inicios de ventana cubriendo todo el documento"""
+        if length <= window:
+            return [0]
+        starts = list(range(0, length - window + 1, stride))
+        if starts[-1] + window < length:
+            starts.append(length - window)  # Asegurar que la cola del CV se procese
+        if max_windows and len(starts) > max_windows:
+            picks = np.linspace(0, len(starts) - 1, max_windows).round().astype(int)
+            starts = [starts[i] for i in sorted(set(picks))]
+        return starts
+
+    def prepare_windows_traditional(self, texts, window=None, stride=None, max_windows=None):
+        """Divide los textos en ventanas solapadas de secuencias para LSTM/CNN
+
+        Returns:
+            tuple: (matriz de ventanas, índice de documento de cada ventana)
+        """
+        window = window or self.chunking['window']
+        stride = stride or self.chunking['stride']
+        max_windows = self.chunking['max_windows'] if max_windows is None else max_windows
+        if window > self.max_length:
+            raise ValueError(f"La ventana ({window}) no puede superar max_length ({self.max_length})")
+
+        windows, doc_index = [], []
+        for doc, sequence in enumerate(self.tokenizer.texts_to_sequences(texts)):
+            for start in self._window_starts(len(sequence), window, stride, max_windows):
+                windows.append(sequence[start:start + window])
+                doc_index.append(doc)
+
+        X = pad_sequences(windows, maxlen=self.max_length, padding='post', truncating='post')
+        return X, np.array(doc_index, dtype=np.int64)
+
+    def prepare_windows_bert(self, texts, window=None, stride=None, max_windows=None):
+        """Divide los textos en ventanas solapadas de tokens BERT
+
+        Returns:
+            tuple: (dict con input_ids/attention_mask, índice de documento de cada ventana)
+        """
+        window = window or self.chunking['window']
+        stride = stride or self.chunking['stride']
+        max_windows = self.chunking['max_windows'] if max_windows is None else max_windows
+        if window > self.max_length:
+            raise ValueError(f"La ventana ({window}) no puede superar max_length ({self.max_length})")
+
+        # En transformers 'stride' es el número de tokens solapados entre ventanas
+        encoded = self.bert_tokenizer(
+            list(texts),
+            truncation=True,
+            padding='max_length',
+            max_length=window,
+            stride=max(0, window - stride),
+            return_overflowing_tokens=True,
+            return_attention_mask=True,
+            return_tensors='np'
+        )
+        input_ids = encoded['input_ids']
+        attention_mask = encoded['attention_mask']
+        doc_index = np.asarray(encoded['overflow_to_sample_mapping'], dtype=np.int64)
+
+        if max_windows:
+            keep = []
+            for doc in np.unique(doc_index):
+                rows = np.flatnonzero(doc_index == doc)
+                if len(rows) > max_windows:
+                    rows = rows[np.unique(np.linspace(0, len(rows) - 1, max_windows).round().astype(int))]
+                keep.extend(rows.tolist())
+            keep = np.array(sorted(keep), dtype=np.int64)
+            input_ids, attention_mask, doc_index = input_ids[keep], attention_mask[keep], doc_index[keep]
+
+        if window < self.max_length:
+            pad = ((0, 0), (0, self.max_length - window))
+            pad_id = self.bert_tokenizer.pad_token_id or 0
+            input_ids = np.pad(input_ids, pad, constant_values=pad_id)
+            attention_mask = np.pad(attention_mask, pad, constant_values=0)
+
+        return {
+            'input_ids': tf.convert_to_tensor(input_ids, dtype=tf.int32),
+            'attention_mask': tf.convert_to_tensor(attention_mask, dtype=tf.int32)
+        }, doc_index
+
+    def prepare_windows(self, texts, window=None, stride=None, max_windows=None):
+        """Prepara ventanas según el tipo de modelo actual"""
+        if self.model_type == 'bert':
+            return self.prepare_windows_bert(texts, window, stride, max_windows)
+        return self.prepare_windows_traditional(texts, window, stride, max_windows)
+
+    @staticmethod
+    def pool_window_predictions(probabilities, doc_index, num_docs, pooling='mean'):
+        """Combina las probabilidades de cada ventana en una predicción por documento
+
+        La combinación se hace en espacio logarítmico: 'mean' promedia, 'max' toma el
+        máximo por clase y 'attention' pondera cada ventana por su confianza.
+        """
+        logits = np.log(np.clip(probabilities, 1e-7, 1.0))
+        pooled = np.zeros((num_docs, probabilities.shape[1]), dtype=np.float64)
+
+        order = np.argsort(doc_index, kind='stable')
+        docs, starts = np.unique(doc_index[order], return_index=True)
+        for doc, rows in zip(docs, np.split(order, starts[1:])):
+            doc_logits = logits[rows]
+            if pooling == 'max':
+                pooled[doc] = doc_logits.max(axis=0)
+            elif pooling == 'attention':
+                scores = doc_logits.max(axis=1)
+                weights = np.exp(scores - scores.max())
+                weights /= weights.sum()
+                pooled[doc] = (weights[:, None] * doc_logits).sum(axis=0)
+            elif pooling == 'mean':
+                pooled[doc] = doc_logits.mean(axis=0)
+            else:
+                raise ValueError(f"Tipo de pooling no soportado: {pooling}")
+
+        pooled -= pooled.max(axis=1, keepdims=True)
+        exp = np.exp(pooled)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict_probabilities(self, texts, batch_size=32):
+        """Devuelve la matriz de probabilidades (n_textos, n_clases) del modelo cargado"""
+        texts = list(texts)
+        with metrics.timer('prediction', model='dl', model_type=self.model_type):
+            probabilities = self._predict_probabilities(texts, batch_size)
+        metrics.increment('predictions', len(texts), model='dl')
+        return probabilities
+
+    def _predict_probabilities(self, texts, batch_size):
+        if self.chunking['enabled'] and self.model_type in ('lstm', 'cnn', 'bert'):
+            # Todas las ventanas de todos los textos en una sola llamada por lotes
+            X, doc_index = self.prepare_windows(texts)
+            window_probs = self.model.predict(X, batch_size=batch_size, verbose=0)
+            return self.pool_window_predictions(window_probs, doc_index, len(texts), self.chunking['pooling'])
+
+        if self.model_type == 'bert':
+            encoded = self.bert_tokenizer(
+                texts,
+                truncation=True,
+                padding='max_length',  # Usar max_length para consistencia
+                max_length=self.max_length,
+                return_tensors='tf',
+                return_attention_mask=True
+            )
+            X = {
+                'input_ids': encoded['input_ids'],
+                'attention_mask': encoded['attention_mask']
+            }
+        elif self.model_type == 'bert_frozen':
+            # Las predicciones sueltas no se guardan en caché para no fragmentarla
+            X = self.embed_texts(texts, use_cache=False)
+        else:
+            with metrics.timer('tokenization', model='dl'):
+                sequences = self.tokenizer.texts_to_sequences(texts)
+                X = pad_sequences(sequences, maxlen=self.max_length, padding='post', truncating='post')
+
+        return self.model.predict(X, batch_size=batch_size, verbose=0)
+
+    def evaluate_chunking(self, data, configurations=None):
+        """Mide costo vs. precisión de distintas configuraciones de ventanas
+
+        Args:
+            data: lista de dicts con 'text' y 'profession' (CVs no vistos en entrenamiento)
+            configurations: lista de dicts con 'window', 'stride', 'pooling' y 'max_windows'.
+                Una configuración con ``'enabled': False`` mide el truncado clásico.
+
+        Returns:
+            list: un dict por configuración con precisión, segundos por CV y ventanas por CV
+        """
+        import time
+
+        if not self.is_trained:
+            raise ValueError("El modelo no ha sido entrenado")
+        if self.model_type not in ('lstm', 'cnn', 'bert'):
+            raise ValueError(f"El modo por ventanas no aplica a modelos {self.model_type}")
+
+        if configurations is None:
+            configurations = [{'enabled': False}]
+            for pooling in ('mean', 'max', 'attention'):
+                configurations.append({'window': self.max_length, 'stride': self.max_length * 3 // 4,
+                                       'pooling': pooling, 'max_windows': 8})
+            configurations.append({'window': self.max_length // 2, 'stride': self.max_length // 4,
+                                   'pooling': 'mean', 'max_windows': 16})
+
+        texts = [item['text'] for item in data]
+        y_true = self.label_encoder.transform([item['profession'] for item in data])
+        original = dict(self.chunking)
+        results = []
+
+        try:
+            for config in configurations:
+                self.chunking = {**original, 'enabled': True, **config}
+                num_windows = len(texts)
+                if self.chunking['enabled']:
+                    num_windows = len(self.prepare_windows(texts)[1])
+
+                start = time.perf_counter()
+                probabilities = self.predict_probabilities(texts)
+                elapsed = time.perf_counter() - start
+
+                accuracy = accuracy_score(y_true, np.argmax(probabilities, axis=1))
+                result = {
+                    'config': dict(config),
+                    'accuracy': float(accuracy),
+                    'seconds_per_cv': elapsed / max(len(texts), 1),
+                    'windows_per_cv': num_windows / max(len(texts), 1)
+                }
+                results.append(result)
+                print(f"📏 {config} -> precisión {accuracy:.3f}, "
+                      f"{result['seconds_per_cv'] * 1000:.1f} ms/CV, "
+                      f"{result['windows_per_cv']:.1f} ventanas/CV")
+        finally:
+            self.chunking = original
+
+        return results
+
     def create_lstm_model(self, num_classes):
         """Crea un modelo LSTM para clasificación de texto"""
         model = tf.keras.Sequential([
@@ -155,13 +407,14 @@ class DeepLearningClassifier:
             tf.keras.layers.Bidirectional(tf.keras.layers.LSTM(32)),
             tf.keras.layers.Dense(64, activation='relu'),
             tf.keras.layers.Dropout(0.5),
-            tf.keras.layers.Dense(num_classes, activation='softmax')
+            tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')
         ])
         
         model.compile(
             optimizer='adam',
             loss='categorical_crossentropy',
-            metrics=['accuracy']
+            metrics=['accuracy'],
+            **self._compile_options()
         )
         return model
 
@@ -175,13 +428,14 @@ class DeepLearningClassifier:
             tf.keras.layers.Dropout(0.5),
             tf.keras.layers.Dense(64, activation='relu'),
             tf.keras.layers.Dropout(0.3),
-            tf.keras.layers.Dense(num_classes, activation='softmax')
+            tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')
         ])
         
         model.compile(
             optimizer='adam',
             loss='categorical_crossentropy',
-            metrics=['accuracy']
+            metrics=['accuracy'],
+            **self._compile_options()
         )
         return model
 
@@ -268,7 +522,7 @@ class DeepLearningClassifier:
             x = tf.keras.layers.Dropout(0.5)(x)
             x = tf.keras.layers.Dense(128, activation='relu')(x)
             x = tf.keras.layers.Dropout(0.3)(x)
-            outputs = tf.keras.layers.Dense(num_classes, activation='softmax')(x)
+            outputs = tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')(x)
             
             model = tf.keras.Model(
                 inputs={'input_ids': input_ids, 'attention_mask': attention_mask},
@@ -281,7 +535,8 @@ class DeepLearningClassifier:
             model.compile(
                 optimizer=tf.keras.optimizers.Adam(learning_rate=2e-5),
                 loss='categorical_crossentropy',
-                metrics=['accuracy']
+                metrics=['accuracy'],
+                **self._compile_options()
             )
             print("✅ Modelo BERT compilado y listo para entrenar")
             
@@ -291,8 +546,487 @@ class DeepLearningClassifier:
             print(f"❌ Error creando modelo BERT: {str(e)}")
             raise e
 
-    def train_model(self, data, model_type='lstm', epochs=10, batch_size=32, callbacks=None):
-        """Entrena un modelo de Deep Learning con los datos proporcionados"""
+    def load_bert_encoder(self):
+        """Carga el encoder BERT base (sin capas de clasificación) para el modo congelado"""
+        if self.bert_encoder is not None:
+            return self.bert_encoder
+
+        print("📥 Cargando encoder BERT congelado...")
+        self.bert_encoder = TFAutoModel.from_pretrained(
+            self.bert_config['model_name'],
+            revision=self.bert_config['revision'],
+            cache_dir=self.bert_cache_dir,
+            from_pt=True
+        )
+        self.bert_encoder.trainable = False
+        self.update_bert_cache_info()
+        print("✅ Encoder BERT cargado")
+        return self.bert_encoder
+
+    def resolve_bert_revision(self):
+        """Fija la revisión BERT al commit de Hugging Face y devuelve su hash
+
+        Una rama como 'main' avanza cuando se publican pesos nuevos: con la revisión
+        fijada al commit, la caché de embeddings y los modelos guardados (``bert_revision``)
+        no mezclan vectores de pesos distintos.
+        """
+        revision = str(self.bert_config['revision'])
+        if re.fullmatch(r'[0-9a-f]{40}', revision):
+            return revision
+        repo_dir = 'models--' + self.bert_config['model_name'].replace('/', '--')
+        ref_path = os.path.join(self.bert_cache_dir, repo_dir, 'refs', revision)
+        if not os.path.exists(ref_path):
+            # Descargar config.json registra en la caché del hub el commit de la revisión
+            from huggingface_hub import hf_hub_download
+            hf_hub_download(self.bert_config['model_name'], self.bert_config['files']['config'],
+                            revision=revision, cache_dir=self.bert_cache_dir)
+        try:
+            with open(ref_path, 'r', encoding='utf-8') as f:
+                commit = f.read().strip()
+        except OSError as e:
+            raise RuntimeError(f"No se pudo resolver la revisión BERT '{revision}' a un commit") from e
+        print(f"📌 Revisión BERT '{revision}' fijada al commit {commit[:12]}")
+        self.bert_config['revision'] = commit
+        return commit
+
+    def get_embedding_cache(self):
+        """Devuelve la caché de embeddings para el modelo y commit BERT actuales"""
+        return EmbeddingCache(
+            os.path.join(self.bert_cache_dir, 'embeddings'),
+            self.bert_config['model_name'],
+            revision=self.resolve_bert_revision(),
+            max_length=self.max_length,
+            pooling='mean'
+        )
+
+    def _encode_bert_batches(self, texts, batch_size):
+        """Ejecuta el encoder BERT por lotes y devuelve embeddings con mean pooling"""
+        encoder = self.load_bert_encoder()
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            encoded = self.bert_tokenizer(
+                batch,
+                truncation=True,
+                padding=True,  # Padding dinámico: no se paga atención sobre relleno innecesario
+                max_length=self.max_length,
+                return_tensors='tf',
+                return_attention_mask=True
+            )
+            outputs = encoder(
+                input_ids=encoded['input_ids'],
+                attention_mask=encoded['attention_mask'],
+                training=False
+            )
+            hidden = outputs[0]
+            mask = tf.cast(tf.expand_dims(encoded['attention_mask'], -1), hidden.dtype)
+            pooled = tf.reduce_sum(hidden * mask, axis=1) / tf.maximum(tf.reduce_sum(mask, axis=1), 1.0)
+            vectors.append(pooled.numpy().astype(np.float32))
+        return np.concatenate(vectors, axis=0)
+
+    def embed_texts(self, texts, batch_size=None, use_cache=True):
+        """Obtiene los embeddings BERT de los textos, calculando solo los que no están en caché"""
+        batch_size = batch_size or self.embedding_batch_size
+        if not use_cache:
+            return self._encode_bert_batches(list(texts), batch_size)
+
+        cache = self.get_embedding_cache()
+        hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        missing = cache.missing(hashes)
+
+        print(f"Embeddings en caché: {len(set(hashes)) - len(missing)}, por calcular: {len(missing)}")
+        if missing:
+            text_by_hash = dict(zip(hashes, texts))
+            missing_texts = [text_by_hash[h] for h in missing]
+            cache.add(missing, self._encode_bert_batches(missing_texts, batch_size))
+
+        return cache.get(hashes)
+
+    def create_frozen_bert_head(self, num_classes, input_dim, head_type='dense'):
+        """Crea la cabeza ligera (densa o logística) que se entrena sobre embeddings congelados"""
+        if head_type == 'logistic':
+            layers = [
+                tf.keras.layers.Input(shape=(input_dim,)),
+                tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')
+            ]
+        elif head_type == 'dense':
+            layers = [
+                tf.keras.layers.Input(shape=(input_dim,)),
+                tf.keras.layers.Dense(256, activation='relu'),
+                tf.keras.layers.Dropout(0.3),
+                tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')
+            ]
+        else:
+            raise ValueError(f"Tipo de cabeza no soportado: {head_type}")
+
+        model = tf.keras.Sequential(layers)
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3),
+            loss='categorical_crossentropy',
+            metrics=['accuracy'],
+            **self._compile_options()
+        )
+        return model
+
+    @staticmethod
+    def cpu_supports_bfloat16():
+        """Detecta si la CPU tiene instrucciones bf16 nativas (AVX512_BF16 o AMX)"""
+        try:
+            with open('/proc/cpuinfo', 'r') as f:
+                flags = f.read()
+            return 'avx512_bf16' in flags or 'amx_bf16' in flags
+        except OSError:
+            return False
+
+    def set_performance_options(self, options=None, model_type=None):
+        """Establece las opciones de rendimiento
+
+        Con ``'auto'`` se usan las opciones más rápidas medidas por
+        ``benchmark_training_options`` para ``model_type``; si esa arquitectura aún no se
+        ha medido, se mide ahora (unos pocos pasos con datos sintéticos) y el resultado
+        queda guardado para los siguientes entrenamientos.
+        """
+        if options == 'auto':
+            options = self.load_best_training_options(model_type)
+            if options is None and model_type in self.BENCHMARK_MODEL_TYPES:
+                print(f"⏱️ Sin benchmark para {model_type.upper()}: midiendo opciones de rendimiento...")
+                options = self.benchmark_training_options(model_types=(model_type,), steps=5)['best'].get(model_type)
+            elif options is None:
+                print(f"⚠️ El benchmark no cubre {model_type}; se usan las opciones estándar")
+        self.performance_options = {**self.DEFAULT_PERFORMANCE_OPTIONS, **(options or {})}
+
+        if self.performance_options['mixed_precision'] and not self.cpu_supports_bfloat16():
+            print("⚠️ La CPU no soporta bfloat16 de forma nativa; se usará float32")
+            self.performance_options['mixed_precision'] = False
+        return self.performance_options
+
+    def _compile_options(self):
+        """Argumentos extra para model.compile según las opciones de rendimiento"""
+        if self.performance_options.get('jit_compile'):
+            return {'jit_compile': True}
+        return {}
+
+    def _build_model(self, model_type, num_classes, input_dim=None):
+        """Crea el modelo aplicando la política de precisión solo durante su construcción"""
+        policy = 'mixed_bfloat16' if self.performance_options.get('mixed_precision') else 'float32'
+        previous_policy = tf.keras.mixed_precision.global_policy()
+        tf.keras.mixed_precision.set_global_policy(policy)
+        try:
+            if model_type == 'lstm':
+                return self.create_lstm_model(num_classes)
+            elif model_type == 'cnn':
+                return self.create_cnn_model(num_classes)
+            elif model_type == 'bert':
+                return self.create_bert_model(num_classes)
+            elif model_type == 'bert_frozen':
+                return self.create_frozen_bert_head(num_classes, input_dim, self.frozen_head)
+            raise ValueError(f"Tipo de modelo no soportado: {model_type}")
+        finally:
+            tf.keras.mixed_precision.set_global_policy(previous_policy)
+
+    def _benchmark_results_path(self):
+        return os.path.join(Settings.CACHE_DIR, 'benchmarks', 'dl_training_options.json')
+
+    def load_best_training_options(self, model_type):
+        """Devuelve las opciones más rápidas medidas para una arquitectura (o None)"""
+        results_path = self._benchmark_results_path()
+        if not os.path.exists(results_path):
+            return None
+        try:
+            with open(results_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('best', {}).get(model_type)
+        except Exception as e:
+            print(f"⚠️ Error leyendo resultados de benchmark: {str(e)}")
+            return None
+
+    def benchmark_training_options(self, model_types=BENCHMARK_MODEL_TYPES, option_sets=None,
+                                   batch_size=16, steps=10, num_classes=4, save=True):
+        """Mide el tiempo por paso de entrenamiento de cada arquitectura con cada opción
+
+        Usa lotes sintéticos de longitud ``max_length`` para que el resultado dependa solo de
+        la arquitectura y la configuración. El primer paso (trazado/compilación) se reporta
+        aparte y no entra en el promedio.
+
+        Returns:
+            dict: {'results': [...], 'best': {model_type: opciones}}
+        """
+        import time
+
+        if option_sets is None:
+            option_sets = [{}, {'jit_compile': True}]
+            if self.cpu_supports_bfloat16():
+                option_sets += [{'mixed_precision': True},
+                                {'jit_compile': True, 'mixed_precision': True}]
+
+        original_options = dict(self.performance_options)
+        rng = np.random.default_rng(42)
+        y = tf.keras.utils.to_categorical(rng.integers(0, num_classes, batch_size), num_classes=num_classes)
+        results, best = [], {}
+
+        try:
+            for model_type in model_types:
+                if model_type == 'bert':
+                    self.check_dependencies('bert')
+                    vocab = self.bert_tokenizer.vocab_size
+                    X = {
+                        'input_ids': tf.constant(rng.integers(1, vocab, (batch_size, self.max_length)), dtype=tf.int32),
+                        'attention_mask': tf.ones((batch_size, self.max_length), dtype=tf.int32)
+                    }
+                else:
+                    X = tf.constant(rng.integers(1, self.vocab_size, (batch_size, self.max_length)), dtype=tf.float32)
+
+                for options in option_sets:
+                    self.set_performance_options(options)
+                    if options.get('mixed_precision') and not self.performance_options['mixed_precision']:
+                        continue
+                    tf.keras.backend.clear_session()
+                    model = self._build_model(model_type, num_classes)
+
+                    start = time.perf_counter()
+                    model.train_on_batch(X, y)
+                    first_step = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    for _ in range(steps):
+                        model.train_on_batch(X, y)
+                    step_time = (time.perf_counter() - start) / steps
+
+                    result = {
+                        'model_type': model_type,
+                        'options': dict(self.performance_options),
+                        'first_step_seconds': first_step,
+                        'step_seconds': step_time,
+                        'samples_per_second': batch_size / step_time
+                    }
+                    results.append(result)
+                    print(f"⏱️ {model_type.upper()} {options or 'float32'}: {step_time * 1000:.1f} ms/paso "
+                          f"(primer paso {first_step:.1f}s)")
+
+                    current_best = best.get(model_type)
+                    if current_best is None or step_time < current_best[0]:
+                        best[model_type] = (step_time, dict(self.performance_options))
+                    del model
+        finally:
+            self.performance_options = original_options
+            tf.keras.backend.clear_session()
+
+        report = {
+            'date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'batch_size': batch_size,
+            'max_length': self.max_length,
+            'bfloat16_supported': self.cpu_supports_bfloat16(),
+            'results': results,
+            'best': {model_type: options for model_type, (_, options) in best.items()}
+        }
+        if save:
+            # Conservar lo medido antes para arquitecturas que esta ejecución no incluye
+            previous = {}
+            if os.path.exists(self._benchmark_results_path()):
+                try:
+                    with open(self._benchmark_results_path(), 'r', encoding='utf-8') as f:
+                        previous = json.load(f)
+                except Exception:
+                    previous = {}
+            saved = dict(report, best={**previous.get('best', {}), **report['best']},
+                         results=[r for r in previous.get('results', []) if r.get('model_type') not in model_types]
+                         + results)
+            os.makedirs(os.path.dirname(self._benchmark_results_path()), exist_ok=True)
+            with open(self._benchmark_results_path(), 'w', encoding='utf-8') as f:
+                json.dump(saved, f, indent=4)
+        return report
+
+    def get_checkpoint_dir(self, run_name):
+        """Directorio de checkpoints propio de una ejecución de entrenamiento"""
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', run_name)
+        return os.path.join(Settings.CHECKPOINTS_DIR, safe_name)
+
+    def load_run_state(self, run_name):
+        """Lee el estado guardado de una ejecución (None si no existe)"""
+        state_path = os.path.join(self.get_checkpoint_dir(run_name), 'run_state.json')
+        if not os.path.exists(state_path):
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error leyendo estado de la ejecución '{run_name}': {str(e)}")
+            return None
+
+    def has_resumable_checkpoint(self, run_name):
+        """Indica si existe un entrenamiento interrumpido que se puede reanudar"""
+        state = self.load_run_state(run_name)
+        return bool(state) and state.get('status') != 'completed' and state.get('epochs_completed', 0) > 0
+
+    def list_resumable_runs(self):
+        """Lista las ejecuciones interrumpidas con checkpoint disponible"""
+        runs = []
+        if os.path.exists(Settings.CHECKPOINTS_DIR):
+            for run_name in os.listdir(Settings.CHECKPOINTS_DIR):
+                if self.has_resumable_checkpoint(run_name):
+                    runs.append(self.load_run_state(run_name))
+        return runs
+
+    @staticmethod
+    def _data_fingerprint(texts, labels, settings=None):
+        """Huella de los datos y de la forma de las entradas para validar una reanudación
+
+        ``settings`` recoge lo que determina la arquitectura y las entradas (tipo de
+        modelo, longitud, vocabulario, ventanas...): un checkpoint solo se restaura si
+        coinciden, porque sus pesos no encajarían con otras formas.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(settings or {}, sort_keys=True, default=str).encode('utf-8'))
+        for text, label in zip(texts, labels):
+            digest.update(str(label).encode('utf-8'))
+            digest.update(hashlib.sha256(text.encode('utf-8', errors='ignore')).digest())
+        return digest.hexdigest()
+
+    def _create_checkpoint_callback(self, manager, run_dir, run_state):
+        """Callback que guarda pesos + estado del optimizador al final de cada época"""
+
+        class ResumableCheckpoint(tf.keras.callbacks.Callback):
+            def on_epoch_end(self, epoch, logs=None):
+                manager.save(checkpoint_number=epoch + 1)
+                run_state['epochs_completed'] = epoch + 1
+                run_state['updated'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                state_path = os.path.join(run_dir, 'run_state.json')
+                with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+                    json.dump(run_state, f, indent=4)
+                os.replace(state_path + '.tmp', state_path)
+
+        return ResumableCheckpoint()
+
+    def _create_control_callback(self, should_stop=None, time_budget=None):
+        """Callback que detiene ``fit`` al cancelar o al agotar el presupuesto de tiempo
+
+        Se revisa tras cada batch; ``stop_reason`` queda en 'cancelled' o 'time_budget'.
+        """
+
+        class TrainingControl(tf.keras.callbacks.Callback):
+            def __init__(self):
+                super().__init__()
+                self.stop_reason = None
+                self.deadline = None
+
+            def on_train_begin(self, logs=None):
+                if time_budget:
+                    self.deadline = time.monotonic() + time_budget
+
+            def on_train_batch_end(self, batch, logs=None):
+                if self.stop_reason:
+                    return
+                if should_stop is not None and should_stop():
+                    self.stop_reason = 'cancelled'
+                elif self.deadline is not None and time.monotonic() >= self.deadline:
+                    self.stop_reason = 'time_budget'
+                    print(f"⏱️ Presupuesto de tiempo agotado ({time_budget / 60:.1f} min): deteniendo el entrenamiento")
+                if self.stop_reason:
+                    self.model.stop_training = True
+
+        return TrainingControl()
+
+    def _create_telemetry_callback(self, telemetry, num_samples, batch_size, epochs, initial_epoch,
+                                   tokens_per_sample=None):
+        """Callback que informa a la telemetría tras cada batch (muestras/s, tokens/s, ETA)"""
+
+        class TelemetryCallback(tf.keras.callbacks.Callback):
+            def __init__(self):
+                super().__init__()
+                self.steps = max(1, -(-num_samples // batch_size))
+                self.epoch = initial_epoch
+
+            def on_train_begin(self, logs=None):
+                self.steps = self.params.get('steps') or self.steps
+                telemetry.start_phase('training', total=self.steps * max(epochs - initial_epoch, 1), unit='batches')
+
+            def on_epoch_begin(self, epoch, logs=None):
+                self.epoch = epoch
+
+            def _done(self, batch):
+                return (self.epoch - initial_epoch) * self.steps + batch + 1
+
+            def on_train_batch_end(self, batch, logs=None):
+                logs = logs or {}
+                samples = max(0, min(batch_size, num_samples - batch * batch_size))
+                telemetry.update(
+                    self._done(batch), samples=samples,
+                    tokens=int(samples * tokens_per_sample) if tokens_per_sample else 0,
+                    epoch=self.epoch + 1, epochs=epochs,
+                    **{key: float(logs[key]) for key in ('loss', 'accuracy') if key in logs}
+                )
+
+            def on_epoch_end(self, epoch, logs=None):
+                logs = logs or {}
+                telemetry.update(
+                    self._done(self.steps - 1), force=True, epoch=epoch + 1, epochs=epochs,
+                    **{key: float(value) for key, value in logs.items()
+                       if key in ('loss', 'accuracy', 'val_loss', 'val_accuracy')}
+                )
+
+        return TelemetryCallback()
+
+    @staticmethod
+    def _tokens_per_sample(X, model_type):
+        """Tokens reales (sin relleno) por muestra, para estimar tokens/s; None si no aplica"""
+        if model_type == 'bert_frozen':
+            return None  # Se entrena sobre embeddings: los tokens se procesaron al calcularlos
+        try:
+            if isinstance(X, dict):
+                mask = X['attention_mask']
+                return float(tf.reduce_sum(tf.cast(mask, tf.float32))) / max(int(mask.shape[0]), 1)
+            return float(tf.math.count_nonzero(X)) / max(int(X.shape[0]), 1)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _cancelled_result(run_name=None):
+        print("⏹ Entrenamiento cancelado")
+        return {
+            'success': False,
+            'cancelled': True,
+            'run_name': run_name,
+            'error': 'Entrenamiento cancelado por el usuario'
+        }
+
+    @profiling.profiled('dl_train_model', tf_trace=True)
+    def train_model(self, data, model_type='lstm', epochs=10, batch_size=32, callbacks=None,
+                    frozen_head=None, chunking=None, run_name=None, resume=False,
+                    histogram_logging=True, keep_checkpoints=False, performance_options=None,
+                    should_stop=None, time_budget=None, telemetry=None):
+        """Entrena un modelo de Deep Learning con los datos proporcionados
+
+        ``data`` es una lista de dicts con 'text' y 'profession' (el formato de los
+        workers de entrenamiento y de ``corpus_snapshot.load_snapshot``).
+
+        Con ``model_type='bert_frozen'`` el encoder BERT solo se ejecuta una vez por CV
+        (los embeddings se guardan en caché) y únicamente se entrena la cabeza
+        ``frozen_head`` ('dense' o 'logistic').
+
+        ``chunking`` (dict, ver ``DEFAULT_CHUNKING``) activa el entrenamiento por ventanas
+        deslizantes: cada ventana hereda la etiqueta de su CV y la evaluación se hace por
+        documento combinando las predicciones de sus ventanas.
+
+        Cada ejecución usa su propio directorio de checkpoints (``run_name``); con
+        ``resume=True`` se continúa desde la última época guardada, incluyendo el estado
+        del optimizador. ``histogram_logging=False`` evita calcular histogramas de pesos
+        en TensorBoard en cada época.
+
+        ``performance_options`` (ver ``DEFAULT_PERFORMANCE_OPTIONS``) activa XLA, bfloat16
+        mixto y el ajuste de hilos; ``'auto'`` usa la configuración más rápida medida por
+        ``benchmark_training_options``.
+
+        ``should_stop`` (callable sin argumentos) permite cancelar: se consulta antes de
+        entrenar y tras cada batch; al cancelar se devuelve ``{'success': False,
+        'cancelled': True}`` y se eliminan los checkpoints de la ejecución (salvo si se
+        estaba reanudando otra anterior). ``time_budget`` (segundos) detiene el
+        entrenamiento al agotarse y continúa con los mejores pesos guardados hasta ese
+        momento; el resultado incluye ``'stopped_early': 'time_budget'``.
+
+        ``telemetry`` (``TrainingTelemetry``) recibe el avance por batch: muestras/s,
+        tokens/s, tiempo restante y memoria. Si no se indica se crea una; la serie se
+        guarda con el modelo en ``training_telemetry.json``.
+        """
+        telemetry = telemetry or TrainingTelemetry()
         try:
             print(f"\n=== ENTRENAMIENTO DE MODELO {model_type.upper()} ===")
             print(f"Épocas configuradas: {epochs}")
@@ -304,65 +1038,141 @@ class DeepLearningClassifier:
             # Preparar datos
             texts = [item['text'] for item in data]
             labels = [item['profession'] for item in data]
+            telemetry.start_phase('preparation', total=len(texts), unit='CVs')
             
             # Codificar etiquetas
             self.label_encoder = LabelEncoder()
             labels_encoded = self.label_encoder.fit_transform(labels)
             
-            # Preparar textos según el tipo de modelo
-            if model_type == 'bert':
-                X, _ = self.prepare_data_bert(texts, labels_encoded)
-            else:
-                X, _ = self.prepare_data_traditional(texts, labels_encoded)
-            
+            # Configurar ventanas deslizantes
+            self.chunking = {**self.DEFAULT_CHUNKING, **(chunking or {})}
+            use_chunking = self.chunking['enabled'] and model_type in ('lstm', 'cnn', 'bert')
+            if self.chunking['enabled'] and not use_chunking:
+                print(f"⚠️ El modo por ventanas no aplica a modelos {model_type}; se usará truncado")
+                self.chunking['enabled'] = False
+
             num_classes = len(self.label_encoder.classes_)
             print(f"Número de clases: {num_classes}")
             print(f"Clases: {self.label_encoder.classes_}")
             
             # Convertir etiquetas a one-hot encoding usando TensorFlow
             y = tf.keras.utils.to_categorical(labels_encoded, num_classes=num_classes)
-            
-            # Dividir datos asegurando que sean tensores de TensorFlow
-            if model_type == 'bert':
-                X_train_ids, X_test_ids, X_train_mask, X_test_mask, y_train, y_test = train_test_split(
-                    X['input_ids'].numpy(), X['attention_mask'].numpy(), y,
-                    test_size=0.2, random_state=42, stratify=labels_encoded
+
+            if use_chunking:
+                print(f"🪟 Entrenamiento por ventanas: {self.chunking}")
+                self.model_type = model_type
+                self.max_length = self.chunking['window']
+                if model_type != 'bert':
+                    self.tokenizer.fit_on_texts(texts)
+                    self.vocab_size = min(self.vocab_size, len(self.tokenizer.word_index) + 1)
+
+                # Dividir por documento para que las ventanas de un CV no se repartan entre train y test
+                train_docs, test_docs = train_test_split(
+                    np.arange(len(texts)), test_size=0.2, random_state=42, stratify=labels_encoded
                 )
-                # Convertir de nuevo a tensores
-                X_train = {
-                    'input_ids': tf.convert_to_tensor(X_train_ids, dtype=tf.int32),
-                    'attention_mask': tf.convert_to_tensor(X_train_mask, dtype=tf.int32)
-                }
-                X_test = {
-                    'input_ids': tf.convert_to_tensor(X_test_ids, dtype=tf.int32),
-                    'attention_mask': tf.convert_to_tensor(X_test_mask, dtype=tf.int32)
-                }
+                X_train, train_index = self.prepare_windows([texts[i] for i in train_docs])
+                X_test, test_index = self.prepare_windows([texts[i] for i in test_docs])
+                y_train = y[train_docs][train_index]
+                y_test = y[test_docs][test_index]
+                print(f"Ventanas de entrenamiento: {len(train_index)}, de prueba: {len(test_index)}")
+
+                if model_type != 'bert':
+                    X_train = tf.convert_to_tensor(X_train, dtype=tf.float32)
+                    X_test = tf.convert_to_tensor(X_test, dtype=tf.float32)
             else:
-                X = tf.convert_to_tensor(X, dtype=tf.float32)
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X.numpy(), y, test_size=0.2, random_state=42, stratify=labels_encoded
-                )
-                # Convertir de nuevo a tensores
-                X_train = tf.convert_to_tensor(X_train, dtype=tf.float32)
-                X_test = tf.convert_to_tensor(X_test, dtype=tf.float32)
-            
+                # Preparar textos según el tipo de modelo
+                if model_type == 'bert':
+                    X, _ = self.prepare_data_bert(texts, labels_encoded)
+                elif model_type == 'bert_frozen':
+                    X = self.embed_texts(texts)
+                else:
+                    X, _ = self.prepare_data_traditional(texts, labels_encoded)
+
+                # Dividir datos asegurando que sean tensores de TensorFlow
+                if model_type == 'bert':
+                    X_train_ids, X_test_ids, X_train_mask, X_test_mask, y_train, y_test = train_test_split(
+                        X['input_ids'].numpy(), X['attention_mask'].numpy(), y,
+                        test_size=0.2, random_state=42, stratify=labels_encoded
+                    )
+                    # Convertir de nuevo a tensores
+                    X_train = {
+                        'input_ids': tf.convert_to_tensor(X_train_ids, dtype=tf.int32),
+                        'attention_mask': tf.convert_to_tensor(X_train_mask, dtype=tf.int32)
+                    }
+                    X_test = {
+                        'input_ids': tf.convert_to_tensor(X_test_ids, dtype=tf.int32),
+                        'attention_mask': tf.convert_to_tensor(X_test_mask, dtype=tf.int32)
+                    }
+                else:
+                    X = tf.convert_to_tensor(X, dtype=tf.float32)
+                    X_train, X_test, y_train, y_test = train_test_split(
+                        X.numpy(), y, test_size=0.2, random_state=42, stratify=labels_encoded
+                    )
+                    # Convertir de nuevo a tensores
+                    X_train = tf.convert_to_tensor(X_train, dtype=tf.float32)
+                    X_test = tf.convert_to_tensor(X_test, dtype=tf.float32)
+
             # Convertir etiquetas a tensores
             y_train = tf.convert_to_tensor(y_train, dtype=tf.float32)
             y_test = tf.convert_to_tensor(y_test, dtype=tf.float32)
+
+            if should_stop is not None and should_stop():
+                return self._cancelled_result(run_name)
             
             # Crear modelo
             print(f"Creando modelo {model_type.upper()}...")
-            if model_type == 'lstm':
-                self.model = self.create_lstm_model(num_classes)
-            elif model_type == 'cnn':
-                self.model = self.create_cnn_model(num_classes)
-            elif model_type == 'bert':
-                self.model = self.create_bert_model(num_classes)
-            else:
-                raise ValueError(f"Tipo de modelo no soportado: {model_type}")
+            self.set_performance_options(performance_options, model_type)
+            print(f"Opciones de rendimiento: {self.performance_options}")
+            if model_type == 'bert_frozen':
+                self.frozen_head = frozen_head or self.frozen_head
+            input_dim = X_train.shape[1] if model_type == 'bert_frozen' else None
+            self.model = self._build_model(model_type, num_classes, input_dim)
             
             self.model_type = model_type
             
+            # Checkpoints propios de esta ejecución
+            run_name = run_name or f"{model_type}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            run_dir = self.get_checkpoint_dir(run_name)
+            os.makedirs(run_dir, exist_ok=True)
+            input_settings = {
+                'model_type': model_type,
+                'max_length': self.max_length,
+                'vocab_size': self.vocab_size,
+                'chunking': self.chunking if self.chunking['enabled'] else None,
+            }
+            if model_type in ('bert', 'bert_frozen'):
+                input_settings['bert_model_name'] = self.bert_config['model_name']
+            if model_type == 'bert_frozen':
+                input_settings.update(bert_revision=self.bert_config['revision'], frozen_head=self.frozen_head,
+                                      input_dim=int(input_dim))
+            fingerprint = self._data_fingerprint(texts, labels, input_settings)
+
+            checkpoint = tf.train.Checkpoint(model=self.model, optimizer=self.model.optimizer)
+            manager = tf.train.CheckpointManager(checkpoint, os.path.join(run_dir, 'ckpt'), max_to_keep=2)
+
+            initial_epoch = 0
+            previous_state = self.load_run_state(run_name) if resume else None
+            if previous_state and manager.latest_checkpoint:
+                if (previous_state.get('data_fingerprint') != fingerprint or
+                        previous_state.get('model_type') != model_type):
+                    print("⚠️ Los datos o la configuración del modelo (tipo, longitud, ventanas) cambiaron: "
+                          "se entrenará desde cero")
+                else:
+                    checkpoint.restore(manager.latest_checkpoint)
+                    initial_epoch = previous_state.get('epochs_completed', 0)
+                    print(f"🔄 Reanudando '{run_name}' desde la época {initial_epoch}")
+
+            run_state = {
+                'run_name': run_name,
+                'model_type': model_type,
+                'epochs': epochs,
+                'batch_size': batch_size,
+                'epochs_completed': initial_epoch,
+                'data_fingerprint': fingerprint,
+                'status': 'running',
+                'started': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+
             # Callbacks base
             training_callbacks = [
                 tf.keras.callbacks.EarlyStopping(
@@ -372,16 +1182,25 @@ class DeepLearningClassifier:
                     verbose=1
                 ),
                 tf.keras.callbacks.ModelCheckpoint(
-                    filepath=os.path.join(self.model_dir, 'best_model.h5'),
+                    filepath=os.path.join(run_dir, 'best_model.weights.h5'),
                     monitor='val_accuracy',
                     save_best_only=True,
+                    save_weights_only=True,
                     verbose=1
                 ),
+                self._create_checkpoint_callback(manager, run_dir, run_state),
                 tf.keras.callbacks.TensorBoard(
-                    log_dir=os.path.join(self.model_dir, 'logs'),
-                    histogram_freq=1
+                    log_dir=os.path.join(run_dir, 'logs'),
+                    histogram_freq=1 if histogram_logging else 0
                 )
             ]
+            control = self._create_control_callback(should_stop, time_budget)
+            training_callbacks.append(control)
+            num_samples = int(y_train.shape[0])
+            training_callbacks.append(self._create_telemetry_callback(
+                telemetry, num_samples, batch_size, epochs, initial_epoch,
+                self._tokens_per_sample(X_train, model_type)
+            ))
             
             # Agregar callbacks adicionales si se proporcionan
             if callbacks:
@@ -395,26 +1214,51 @@ class DeepLearningClassifier:
             print(f"Épocas: {epochs}")
             print(f"Batch size: {batch_size}")
             
-            history = self.model.fit(
-                X_train, y_train,
-                validation_data=(X_test, y_test),
-                epochs=epochs,
-                batch_size=batch_size,
-                callbacks=training_callbacks,
-                verbose=1
-            )
+            with metrics.timer('training', model='dl', model_type=model_type):
+                history = self.model.fit(
+                    X_train, y_train,
+                    validation_data=(X_test, y_test),
+                    epochs=epochs,
+                    initial_epoch=initial_epoch,
+                    batch_size=batch_size,
+                    callbacks=training_callbacks,
+                    verbose=1
+                )
+            epochs_trained = initial_epoch + len(history.history.get('loss', []))
+
+            if control.stop_reason == 'cancelled':
+                self.model = None
+                self.is_trained = False
+                if initial_epoch == 0:
+                    shutil.rmtree(run_dir, ignore_errors=True)
+                else:
+                    print(f"💾 Se conservan los checkpoints previos de '{run_name}' para reanudar")
+                return self._cancelled_result(run_name)
+
+            if control.stop_reason == 'time_budget':
+                best_weights_path = os.path.join(run_dir, 'best_model.weights.h5')
+                if os.path.exists(best_weights_path):
+                    self.model.load_weights(best_weights_path)
+                    print("🏆 Restaurados los mejores pesos guardados antes de agotar el presupuesto")
             
             # Evaluar modelo
             print(f"\nEvaluando modelo...")
+            telemetry.start_phase('evaluation', total=int(y_test.shape[0]), unit='muestras')
             y_pred = self.model.predict(X_test)
+            if use_chunking:
+                y_pred = self.pool_window_predictions(
+                    y_pred, test_index, len(test_docs), self.chunking['pooling']
+                )
+                y_test_classes = labels_encoded[test_docs]
+            else:
+                y_test_classes = np.argmax(y_test.numpy(), axis=1)
             y_pred_classes = np.argmax(y_pred, axis=1)
-            y_test_classes = np.argmax(y_test.numpy(), axis=1)
             
             accuracy = accuracy_score(y_test_classes, y_pred_classes)
             
             print(f"\n=== RESULTADOS DEL ENTRENAMIENTO ===")
             print(f"Precisión: {accuracy:.3f}")
-            print(f"Épocas completadas: {len(history.history['loss'])}")
+            print(f"Épocas completadas: {epochs_trained}")
             
             # Reporte detallado
             report = classification_report(
@@ -426,12 +1270,25 @@ class DeepLearningClassifier:
             print(report)
             
             self.is_trained = True
+            self.accuracy = float(accuracy)
+            telemetry.update(int(y_test.shape[0]), force=True, accuracy=self.accuracy)
+            self.training_telemetry = telemetry.to_dict()
+
+            # Marcar la ejecución como completada y liberar los checkpoints intermedios
+            run_state['status'] = 'completed'
+            with open(os.path.join(run_dir, 'run_state.json'), 'w', encoding='utf-8') as f:
+                json.dump(run_state, f, indent=4)
+            if not keep_checkpoints:
+                shutil.rmtree(os.path.join(run_dir, 'ckpt'), ignore_errors=True)
             
             return {
                 'success': True,
                 'accuracy': accuracy,
                 'model_type': model_type,
-                'epochs_trained': len(history.history['loss']),
+                'run_name': run_name,
+                'resumed_from_epoch': initial_epoch,
+                'epochs_trained': epochs_trained,
+                'stopped_early': control.stop_reason,
                 'num_classes': num_classes,
                 'history': history.history
             }
@@ -443,70 +1300,293 @@ class DeepLearningClassifier:
                 'error': str(e)
             }
     
-    def predict_cv(self, text):
-        """Predice la profesión de un CV"""
-        if not self.is_trained:
-            return {'error': True, 'message': 'Modelo no entrenado'}
-        
+    def generate_soft_labels(self, teacher, teacher_name, texts, batch_size=16):
+        """Calcula (o recupera de caché) las probabilidades del profesor para cada texto
+
+        La caché se invalida automáticamente si el profesor se vuelve a guardar,
+        porque su fecha de guardado forma parte de la clave.
+        """
+        cache = EmbeddingCache(
+            os.path.join(Settings.CACHE_DIR, 'distillation'),
+            f"teacher_{teacher_name}",
+            revision=teacher.metadata.get('saved_date', 'unknown'),
+            max_length=teacher.max_length,
+            pooling='softlabels'
+        )
+        hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        missing = cache.missing(hashes)
+        print(f"Etiquetas suaves en caché: {len(set(hashes)) - len(missing)}, por calcular: {len(missing)}")
+
+        if missing:
+            text_by_hash = dict(zip(hashes, texts))
+            missing_texts = [text_by_hash[h] for h in missing]
+            probabilities = teacher.predict_probabilities(missing_texts, batch_size=batch_size)
+            cache.add(missing, probabilities)
+
+        return cache.get(hashes)
+
+    @staticmethod
+    def soften_probabilities(probabilities, temperature):
+        """Aplica temperatura a una distribución de probabilidades (p^(1/T) normalizado)"""
+        logits = np.log(np.clip(probabilities, 1e-7, 1.0)) / temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    @staticmethod
+    def _train_tfidf_student(texts, targets, label_encoder):
+        """Entrena un CVClassifier TF-IDF + regresión logística sobre etiquetas suaves
+
+        La regresión logística de scikit-learn no acepta objetivos continuos, así que cada
+        CV se replica una vez por clase con peso igual a su probabilidad objetivo.
+        """
+        from scipy.sparse import vstack
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from .cv_classifier import CVClassifier
+
+        student = CVClassifier()
+        student.vectorizer = TfidfVectorizer(
+            max_features=min(5000, len(texts) * 100),
+            ngram_range=(1, 2),
+            min_df=1 if len(texts) < 10 else 2,
+            max_df=0.95
+        )
+        X = student.vectorizer.fit_transform(texts)
+        num_classes = targets.shape[1]
+
+        X_rep = vstack([X] * num_classes)
+        y_rep = np.repeat(np.arange(num_classes), X.shape[0])
+        weights = targets.T.ravel()
+
+        student.classifier = LogisticRegression(random_state=42, max_iter=1000, C=1.0)
+        student.classifier.fit(X_rep, y_rep, sample_weight=weights)
+        student.label_encoder = label_encoder
+        student.is_trained = True
+        return student
+
+    @staticmethod
+    def _measure_latency(predict_fn, texts):
+        """Latencia media por CV (ms) prediciendo uno a uno"""
+        import time
+        if not texts:
+            return 0.0
+        predict_fn(texts[0])  # Calentamiento
+        start = time.perf_counter()
+        for text in texts:
+            predict_fn(text)
+        return (time.perf_counter() - start) * 1000 / len(texts)
+
+    def distill_from_teacher(self, teacher_model_name, data, student_type='cnn', temperature=2.0,
+                             alpha=0.3, epochs=10, batch_size=32, callbacks=None, latency_samples=50):
+        """Entrena un modelo estudiante pequeño a partir de un profesor BERT ya entrenado
+
+        Args:
+            teacher_model_name: nombre del modelo profesor guardado en saved_deep_models
+                (tipo 'bert' o 'bert_frozen')
+            data: lista de dicts con 'text' y 'profession'
+            student_type: 'cnn', 'lstm' o 'tfidf'
+            temperature: temperatura aplicada a las probabilidades del profesor
+            alpha: peso de la etiqueta real frente a la etiqueta suave del profesor
+
+        Returns:
+            dict: resultado con la comparación profesor vs. estudiante. Para 'cnn'/'lstm'
+            este clasificador queda como estudiante (usar ``save_model``); para 'tfidf'
+            el estudiante es un ``CVClassifier`` en ``result['student_classifier']``.
+        """
         try:
-            # Preparar texto
-            if self.model_type == 'bert':
-                encoded = self.bert_tokenizer(
-                    [text],
-                    truncation=True,
-                    padding='max_length',  # Usar max_length para consistencia
-                    max_length=self.max_length,
-                    return_tensors='tf',
-                    return_attention_mask=True
+            print(f"\n=== DESTILACIÓN {teacher_model_name} -> {student_type.upper()} ===")
+            if student_type not in ('cnn', 'lstm', 'tfidf'):
+                raise ValueError(f"Tipo de estudiante no soportado: {student_type}")
+
+            teacher = DeepLearningClassifier()
+            if not teacher.load_model(teacher_model_name):
+                raise ValueError(f"No se pudo cargar el modelo profesor '{teacher_model_name}'")
+            if str(teacher.model_type).lower() not in ('bert', 'bert_frozen'):
+                raise ValueError(f"El profesor debe ser un modelo BERT; '{teacher_model_name}' es "
+                                 f"{teacher.model_type}")
+
+            texts = [item['text'] for item in data]
+            labels = [item['profession'] for item in data]
+            unknown = set(labels) - set(teacher.label_encoder.classes_)
+            if unknown:
+                raise ValueError(f"Profesiones desconocidas para el profesor: {sorted(unknown)}")
+
+            label_encoder = teacher.label_encoder
+            num_classes = len(label_encoder.classes_)
+            y_hard = label_encoder.transform(labels)
+
+            # Etiquetas suaves del profesor sobre todo el corpus (en caché)
+            teacher_probs = self.generate_soft_labels(teacher, teacher_model_name, texts)
+            one_hot = tf.keras.utils.to_categorical(y_hard, num_classes=num_classes)
+            targets = alpha * one_hot + (1 - alpha) * self.soften_probabilities(teacher_probs, temperature)
+
+            train_idx, test_idx = train_test_split(
+                np.arange(len(texts)), test_size=0.2, random_state=42, stratify=y_hard
+            )
+            train_texts = [texts[i] for i in train_idx]
+            test_texts = [texts[i] for i in test_idx]
+
+            print(f"Entrenando estudiante {student_type.upper()}...")
+            student_classifier = None
+            if student_type == 'tfidf':
+                student_classifier = self._train_tfidf_student(train_texts, targets[train_idx], label_encoder)
+                student_probs = student_classifier.classifier.predict_proba(
+                    student_classifier.vectorizer.transform(test_texts)
                 )
-                X = {
-                    'input_ids': encoded['input_ids'],
-                    'attention_mask': encoded['attention_mask']
-                }
+                student_predict = student_classifier.predict_cv
             else:
-                sequence = self.tokenizer.texts_to_sequences([text])
-                X = pad_sequences(sequence, maxlen=self.max_length, padding='post', truncating='post')
-            
-            # Predecir
-            prediction = self.model.predict(X, verbose=0)
-            predicted_class = np.argmax(prediction[0])
-            confidence = float(prediction[0][predicted_class])
-            
-            # Obtener nombre de la profesión
-            profession = self.label_encoder.inverse_transform([predicted_class])[0]
-            
-            # Ranking de todas las profesiones
-            ranking = []
-            for i, prob in enumerate(prediction[0]):
-                prof_name = self.label_encoder.inverse_transform([i])[0]
-                ranking.append({
-                    'profession': prof_name,
-                    'probability': float(prob),
-                    'percentage': f"{float(prob)*100:.1f}%"
-                })
-
-            # Ordenar por probabilidad
-            ranking.sort(key=lambda x: x['probability'], reverse=True)
-
-            # Determinar nivel de confianza
-            if confidence > 0.8:
-                confidence_level = "Alta"
-            elif confidence > 0.6:
-                confidence_level = "Media"
+                self.tokenizer = None
+                self.check_dependencies(student_type)
+                X_train, _ = self.prepare_data_traditional(train_texts, None)
+                self.label_encoder = label_encoder
+                self.model_type = student_type
+                self.chunking = dict(self.DEFAULT_CHUNKING)
+                self.model = self._build_model(student_type, num_classes)
+
+                training_callbacks = [
+                    tf.keras.callbacks.EarlyStopping(
+                        monitor='val_loss', patience=3, restore_best_weights=True, verbose=1
+                    )
+                ]
+                if callbacks:
+                    training_callbacks.extend(callbacks if isinstance(callbacks, list) else [callbacks])
+
+                self.model.fit(
+                    tf.convert_to_tensor(X_train, dtype=tf.float32),
+                    tf.convert_to_tensor(targets[train_idx], dtype=tf.float32),
+                    validation_split=0.1,
+                    epochs=epochs,
+                    batch_size=batch_size,
+                    callbacks=training_callbacks,
+                    verbose=1
+                )
+                self.is_trained = True
+                student_probs = self.predict_probabilities(test_texts)
+                student_predict = self.predict_cv
+
+            # Comparación profesor vs. estudiante sobre el conjunto de prueba
+            y_test = y_hard[test_idx]
+            teacher_pred = np.argmax(teacher_probs[test_idx], axis=1)
+            student_pred = np.argmax(student_probs, axis=1)
+            latency_texts = test_texts[:latency_samples]
+
+            report = {
+                'teacher': teacher_model_name,
+                'student_type': student_type,
+                'temperature': temperature,
+                'alpha': alpha,
+                'test_samples': len(test_idx),
+                'teacher_accuracy': float(accuracy_score(y_test, teacher_pred)),
+                'student_accuracy': float(accuracy_score(y_test, student_pred)),
+                'agreement': float(np.mean(teacher_pred == student_pred)),
+                'teacher_latency_ms': self._measure_latency(teacher.predict_cv, latency_texts),
+                'student_latency_ms': self._measure_latency(student_predict, latency_texts),
+                'date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            report['speedup'] = report['teacher_latency_ms'] / max(report['student_latency_ms'], 1e-9)
+            self.distillation_report = report
+            if student_classifier is not None:
+                student_classifier.accuracy = report['student_accuracy']
             else:
-                confidence_level = "Baja"
+                self.accuracy = report['student_accuracy']
+
+            print("\n=== PROFESOR vs. ESTUDIANTE ===")
+            print(f"{'':<12}{'Precisión':>12}{'ms/CV':>12}")
+            print(f"{'Profesor':<12}{report['teacher_accuracy']:>12.3f}{report['teacher_latency_ms']:>12.1f}")
+            print(f"{'Estudiante':<12}{report['student_accuracy']:>12.3f}{report['student_latency_ms']:>12.1f}")
+            print(f"Acuerdo: {report['agreement']:.1%}  •  Aceleración: x{report['speedup']:.1f}")
 
             return {
-                'error': False,
-                'predicted_profession': profession,
-                'confidence': confidence,
-                'confidence_percentage': f"{confidence*100:.1f}%",
-                'confidence_level': confidence_level,
-                'profession_ranking': ranking
+                'success': True,
+                'accuracy': report['student_accuracy'],
+                'model_type': student_type,
+                'num_classes': num_classes,
+                'distillation': report,
+                'student_classifier': student_classifier
             }
+
+        except Exception as e:
+            print(f"❌ Error durante la destilación: {e}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+
+    def predict_cv(self, text):
+        """Predice la profesión de un CV"""
+        if not self.is_trained:
+            return {'error': True, 'message': 'Modelo no entrenado'}
+        
+        try:
+            # Predecir
+            prediction = self.predict_probabilities([text])
+            return self._format_prediction(prediction[0])
             
         except Exception as e:
             return {'error': True, 'message': str(e)}
+
+    def predict_batch(self, texts, batch_size=32):
+        """Predice la profesión de varios CVs en lotes
+
+        Returns:
+            list: un resultado por texto, con el mismo formato que ``predict_cv``
+        """
+        if not self.is_trained:
+            return [{'error': True, 'message': 'Modelo no entrenado'} for _ in texts]
+
+        results = [None] * len(texts)
+        valid = [i for i, text in enumerate(texts) if text and text.strip()]
+        for i in set(range(len(texts))) - set(valid):
+            results[i] = {'error': True, 'message': 'El texto del CV está vacío'}
+
+        if valid:
+            try:
+                probabilities = self.predict_probabilities([texts[i] for i in valid], batch_size=batch_size)
+                for i, row in zip(valid, probabilities):
+                    results[i] = self._format_prediction(row)
+            except Exception as e:
+                for i in valid:
+                    results[i] = {'error': True, 'message': str(e)}
+
+        return results
+
+    def _format_prediction(self, probabilities):
+        """Construye el resultado de predicción a partir de las probabilidades por clase"""
+        predicted_class = np.argmax(probabilities)
+        confidence = float(probabilities[predicted_class])
+        
+        # Obtener nombre de la profesión
+        profession = self.label_encoder.inverse_transform([predicted_class])[0]
+        
+        # Ranking de todas las profesiones
+        ranking = []
+        for prof_name, prob in zip(self.label_encoder.classes_, probabilities):
+            ranking.append({
+                'profession': prof_name,
+                'probability': float(prob),
+                'percentage': f"{float(prob)*100:.1f}%"
+            })
+
+        # Ordenar por probabilidad
+        ranking.sort(key=lambda x: x['probability'], reverse=True)
+
+        # Determinar nivel de confianza
+        if confidence > 0.8:
+            confidence_level = "Alta"
+        elif confidence > 0.6:
+            confidence_level = "Media"
+        else:
+            confidence_level = "Baja"
+
+        return {
+            'error': False,
+            'predicted_profession': profession,
+            'confidence': confidence,
+            'confidence_percentage': f"{confidence*100:.1f}%",
+            'confidence_level': confidence_level,
+            'profession_ranking': ranking
+        }
     
     def save_model(self, model_name='deep_cv_classifier'):
         """Guarda el modelo entrenado y sus componentes"""
@@ -530,8 +1610,15 @@ class DeepLearningClassifier:
                 'num_classes': len(self.label_encoder.classes_),
                 'classes': list(self.label_encoder.classes_),
                 'saved_date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'accuracy': self.accuracy,
                 'is_deep_learning': True
             }
+            if self.chunking['enabled']:
+                metadata['chunking'] = dict(self.chunking)
+            if self.model_type == 'bert_frozen':
+                metadata['bert_model_name'] = self.bert_config['model_name']
+                metadata['bert_revision'] = self.bert_config['revision']
+                metadata['frozen_head'] = self.frozen_head
 
             # Guardar modelo en formato H5
             model_path = os.path.join(model_folder, 'model.h5')
@@ -539,10 +1626,10 @@ class DeepLearningClassifier:
             print("✅ Modelo guardado")
 
             # Guardar tokenizer
-            if self.tokenizer:
-                joblib.dump(self.tokenizer, os.path.join(model_folder, 'tokenizer.pkl'))
-            elif self.bert_tokenizer:
+            if self.model_type in ('bert', 'bert_frozen') and self.bert_tokenizer:
                 self.bert_tokenizer.save_pretrained(os.path.join(model_folder, 'bert_tokenizer'))
+            elif self.tokenizer:
+                joblib.dump(self.tokenizer, os.path.join(model_folder, 'tokenizer.pkl'))
             print("✅ Tokenizer guardado")
 
             # Guardar encoder
@@ -553,6 +1640,16 @@ class DeepLearningClassifier:
             joblib.dump(metadata, os.path.join(model_folder, 'metadata.pkl'))
             print("✅ Metadatos guardados")
 
+            if self.training_telemetry:
+                save_telemetry(self.training_telemetry, model_folder)
+                print("✅ Telemetría del entrenamiento guardada")
+
+            # Guardar comparación con el profesor si el modelo fue destilado
+            if self.distillation_report:
+                with open(os.path.join(model_folder, 'distillation_report.json'), 'w', encoding='utf-8') as f:
+                    json.dump(self.distillation_report, f, indent=4, ensure_ascii=False)
+                print("✅ Reporte de destilación guardado")
+
             print(f"\n✅ Modelo '{model_name}' guardado exitosamente")
             return True
 
@@ -562,8 +1659,18 @@ class DeepLearningClassifier:
             print(f"Traceback: {traceback.format_exc()}")
             return False
     
-    def load_model(self, model_name):
-        """Carga un modelo entrenado y sus componentes"""
+    LOAD_STEPS = 4
+
+    def load_model(self, model_name, progress_callback=None):
+        """Carga un modelo entrenado y sus componentes
+
+        Args:
+            progress_callback: función (paso, total, mensaje) llamada tras cada artefacto
+        """
+        with metrics.timer('model_load', model='dl'):
+            return self._load_model(model_name, progress_callback or (lambda *args: None))
+
+    def _load_model(self, model_name, report):
         try:
             print(f"\n=== Cargando modelo '{model_name}' ===")
             
@@ -580,7 +1687,10 @@ class DeepLearningClassifier:
                 return False
             
             metadata = joblib.load(metadata_path)
+            self.metadata = metadata
+            self.accuracy = metadata.get('accuracy')
             print("✅ Metadatos cargados")
+            report(1, self.LOAD_STEPS, "Metadatos cargados")
             
             # Cargar modelo
             model_path = os.path.join(model_folder, 'model.h5')
@@ -590,9 +1700,17 @@ class DeepLearningClassifier:
             
             self.model = tf.keras.models.load_model(model_path)
             print("✅ Modelo cargado")
+            report(2, self.LOAD_STEPS, "Red neuronal cargada")
             
+            # Configuración del encoder congelado
+            if metadata['model_type'].lower() == 'bert_frozen':
+                self.bert_config['model_name'] = metadata.get('bert_model_name', self.bert_config['model_name'])
+                self.bert_config['revision'] = metadata.get('bert_revision', self.bert_config['revision'])
+                self.frozen_head = metadata.get('frozen_head', self.frozen_head)
+                self.bert_encoder = None
+
             # Cargar tokenizer
-            if metadata['model_type'].lower() == 'bert':
+            if metadata['model_type'].lower() in ('bert', 'bert_frozen'):
                 tokenizer_path = os.path.join(model_folder, 'bert_tokenizer')
                 if os.path.exists(tokenizer_path):
                     self.bert_tokenizer = AutoTokenizer.from_pretrained(tokenizer_path)
@@ -602,17 +1720,20 @@ class DeepLearningClassifier:
                 if os.path.exists(tokenizer_path):
                     self.tokenizer = joblib.load(tokenizer_path)
                     print("✅ Tokenizer cargado")
+            report(3, self.LOAD_STEPS, "Tokenizer cargado")
             
             # Cargar encoder
             encoder_path = os.path.join(model_folder, 'encoder.pkl')
             if os.path.exists(encoder_path):
                 self.label_encoder = joblib.load(encoder_path)
                 print("✅ Label encoder cargado")
+            report(4, self.LOAD_STEPS, "Label encoder cargado")
             
             # Configurar parámetros
             self.model_type = metadata['model_type']
             self.max_length = metadata.get('max_length', self.max_length)
             self.vocab_size = metadata.get('vocab_size', self.vocab_size)
+            self.chunking = {**self.DEFAULT_CHUNKING, **metadata.get('chunking', {})}
             self.is_trained = True
             
             print(f"\n✅ Modelo '{model_name}' cargado exitosamente")
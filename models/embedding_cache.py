@@ -0,0 +1,199 @@
+"""
+Caché en disco de embeddings de oraciones (BERT congelado)
+Guarda los vectores en fragmentos .npy memory-mapped indexados por hash de texto
+"""
+
+import os
+import re
+import json
+import uuid
+import hashlib
+import datetime
+from contextlib import contextmanager
+import numpy as np
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class EmbeddingCache:
+    """Caché persistente de embeddings indexada por hash del texto y revisión del modelo.
+
+    Cada lote de embeddings nuevos se escribe en un fragmento ``shard_<pid>_<uuid>.npy``
+    independiente, de modo que agregar CVs nuevos nunca reescribe los anteriores.
+    El índice ``index.json`` mapea ``sha256(texto)`` -> ``[fragmento, fila]``.
+
+    Varios procesos pueden compartir la caché (trabajos de entrenamiento en paralelo,
+    destilación): los nombres de fragmento son únicos y el índice se fusiona con el
+    del disco bajo un bloqueo de archivo antes de reemplazarlo.
+
+    ``revision`` debe ser un commit concreto del modelo (ver
+    ``DeepLearningClassifier.resolve_bert_revision``): con una rama como 'main' los
+    embeddings quedarían obsoletos sin aviso al publicarse pesos nuevos.
+    """
+
+    INDEX_FILE = 'index.json'
+    LOCK_FILE = 'index.lock'
+
+    def __init__(self, cache_root, model_name, revision='main', max_length=512, pooling='mean'):
+        self.model_name = model_name
+        self.revision = revision
+        self.max_length = max_length
+        self.pooling = pooling
+        self.cache_dir = os.path.join(cache_root, self.cache_key())
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._index = {}
+        self._shards = []
+        self._mmaps = {}
+        self.embedding_dim = None
+        self._load_index()
+
+    def cache_key(self):
+        """Clave de la caché: modelo, revisión, longitud máxima y tipo de pooling"""
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', self.model_name)
+        safe_revision = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(self.revision))
+        return f"{safe_name}@{safe_revision}_len{self.max_length}_{self.pooling}"
+
+    @staticmethod
+    def text_hash(text):
+        """Hash estable del texto de un CV"""
+        return hashlib.sha256(text.encode('utf-8', errors='ignore')).hexdigest()
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    @contextmanager
+    def _index_lock(self):
+        """Bloqueo exclusivo entre procesos para leer, fusionar y reemplazar el índice"""
+        with open(os.path.join(self.cache_dir, self.LOCK_FILE), 'a+b') as f:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if os.name == 'nt':
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _load_index(self):
+        """Carga el índice del disco; el índice se reemplaza de forma atómica, así que no requiere bloqueo"""
+        index_path = self._index_path()
+        if not os.path.exists(index_path):
+            return
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._index = {k: tuple(v) for k, v in data.get('entries', {}).items()}
+            self._shards = data.get('shards', [])
+            self.embedding_dim = data.get('embedding_dim')
+        except Exception as e:
+            print(f"⚠️ Índice de embeddings dañado, se reconstruirá: {str(e)}")
+            self._index, self._shards = {}, []
+
+    def _save_index(self):
+        """Escribe el índice en memoria; llamar con ``_index_lock`` tomado"""
+        data = {
+            'model_name': self.model_name,
+            'revision': self.revision,
+            'max_length': self.max_length,
+            'pooling': self.pooling,
+            'embedding_dim': self.embedding_dim,
+            'last_update': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'shards': self._shards,
+            'entries': {k: list(v) for k, v in self._index.items()}
+        }
+        tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._index_path())
+
+    def _shard(self, shard_name):
+        if shard_name not in self._mmaps:
+            self._mmaps[shard_name] = np.load(os.path.join(self.cache_dir, shard_name), mmap_mode='r')
+        return self._mmaps[shard_name]
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, text_hash):
+        return text_hash in self._index
+
+    def missing(self, hashes):
+        """Devuelve los hashes (sin repetir, en orden) que aún no están en caché"""
+        seen = set()
+        result = []
+        for h in hashes:
+            if h not in self._index and h not in seen:
+                seen.add(h)
+                result.append(h)
+        return result
+
+    def add(self, hashes, embeddings):
+        """Agrega un lote de embeddings como un fragmento nuevo"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(hashes) == 0:
+            return
+        if embeddings.shape[0] != len(hashes):
+            raise ValueError("El número de embeddings no coincide con el número de hashes")
+        if self.embedding_dim is None:
+            self.embedding_dim = int(embeddings.shape[1])
+        elif embeddings.shape[1] != self.embedding_dim:
+            raise ValueError(f"Dimensión de embedding inesperada: {embeddings.shape[1]} (esperada {self.embedding_dim})")
+
+        # Nombre único: otro proceso puede estar escribiendo fragmentos en la misma caché
+        shard_name = f"shard_{os.getpid()}_{uuid.uuid4().hex[:12]}.npy"
+        shard = np.lib.format.open_memmap(
+            os.path.join(self.cache_dir, shard_name), mode='w+',
+            dtype=np.float32, shape=embeddings.shape
+        )
+        shard[:] = embeddings
+        shard.flush()
+        del shard
+
+        with self._index_lock():
+            # Fusionar con lo que otros procesos hayan agregado desde la última lectura
+            index, shards = self._index, self._shards
+            self._load_index()
+            if self.embedding_dim is not None and self.embedding_dim != embeddings.shape[1]:
+                os.remove(os.path.join(self.cache_dir, shard_name))
+                raise ValueError(f"Dimensión de embedding inesperada: {embeddings.shape[1]} "
+                                 f"(esperada {self.embedding_dim})")
+            self.embedding_dim = int(embeddings.shape[1])
+            self._index = {**index, **self._index}
+            self._shards = list(dict.fromkeys(self._shards + shards + [shard_name]))
+            for row, h in enumerate(hashes):
+                self._index[h] = (shard_name, row)
+            self._save_index()
+
+    def get(self, hashes):
+        """Devuelve una matriz (n, dim) con los embeddings de los hashes indicados"""
+        if self.embedding_dim is None:
+            raise KeyError("La caché de embeddings está vacía")
+        result = np.empty((len(hashes), self.embedding_dim), dtype=np.float32)
+        for i, h in enumerate(hashes):
+            shard_name, row = self._index[h]
+            result[i] = self._shard(shard_name)[row]
+        return result
+
+    def clear(self):
+        """Elimina todos los fragmentos e índice de esta clave de caché"""
+        self._mmaps.clear()
+        with self._index_lock():
+            shards = self._shards
+            self._load_index()
+            for shard_name in set(shards + self._shards):
+                shard_path = os.path.join(self.cache_dir, shard_name)
+                if os.path.exists(shard_path):
+                    os.remove(shard_path)
+            if os.path.exists(self._index_path()):
+                os.remove(self._index_path())
+            self._index, self._shards = {}, []
+            self.embedding_dim = None
@@ -0,0 +1,350 @@
+"""
+Backup incremental y paralelo de todos los modelos guardados
+Exporta cada modelo a un paquete en un pool de hilos, omite los que no cambiaron
+desde el último backup y mantiene un manifiesto para restaurar el conjunto completo
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import zipfile
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.config.settings import Settings
+from .model_packager import ModelPackager
+from .package_protection import PackageProtector
+from .chunk_store import ChunkStore, dedup_report
+
+
+class BackupEngine:
+    """Motor de backup de modelos ML/DL.
+
+    Cada modelo se guarda en ``<backup_dir>/<ml|dl>/<nombre>.zip`` con el mismo formato
+    que la exportación individual. ``backup_manifest.json`` registra, por modelo, la
+    suma de verificación de su manifiesto de archivos (ruta, tamaño y fecha de
+    modificación), de modo que los modelos sin cambios no se vuelven a exportar.
+
+    Con ``deduplicate=True`` los archivos se guardan como bloques en un almacén común
+    ``<backup_dir>/chunks`` y cada modelo como una receta ``<ml|dl>/<nombre>.recipe.json``,
+    así los artefactos repetidos entre modelos (tokenizador BERT, caché, vectorizadores)
+    ocupan espacio una sola vez. El almacén deduplicado no se cifra.
+    """
+
+    MANIFEST_FILE = 'backup_manifest.json'
+    FORMAT_VERSION = '1.0'
+
+    def __init__(self, backup_dir, max_workers=None, compression='auto', encrypted=True,
+                 progress_callback=None, deduplicate=False):
+        self.backup_dir = backup_dir
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 2))
+        self.compression = compression
+        self.deduplicate = deduplicate
+        self.encrypted = encrypted and not deduplicate
+        self.progress_callback = progress_callback
+        self._lock = threading.Lock()
+
+    def _emit(self, message):
+        if self.progress_callback:
+            self.progress_callback(message)
+
+    @staticmethod
+    def model_key(model_name, model_type):
+        return f"{model_type}/{model_name}"
+
+    @staticmethod
+    def model_source_dir(model_name, model_type):
+        base_dir = Settings.DEEP_MODELS_DIR if model_type == 'dl' else Settings.MODELS_DIR
+        return os.path.join(str(base_dir), model_name)
+
+    @staticmethod
+    def model_checksum(source_dir):
+        """Suma de verificación del manifiesto de archivos de un modelo
+
+        Usa ruta relativa, tamaño y fecha de modificación de cada archivo en lugar del
+        contenido, para decidir sin leer los pesos si el modelo cambió.
+        """
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(source_dir):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                rel_path = os.path.relpath(path, source_dir).replace(os.sep, '/')
+                digest.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def manifest_path(self):
+        return os.path.join(self.backup_dir, self.MANIFEST_FILE)
+
+    def load_manifest(self):
+        """Carga el manifiesto del directorio de backup (vacío si no existe)"""
+        path = self.manifest_path()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                self._emit(f"⚠️ Manifiesto de backup dañado, se hará un backup completo: {str(e)}")
+        return {'format_version': self.FORMAT_VERSION, 'models': {}}
+
+    def save_manifest(self, manifest):
+        manifest['last_update'] = datetime.datetime.now().isoformat()
+        tmp_path = self.manifest_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path())
+
+    def chunk_store(self):
+        return ChunkStore(os.path.join(self.backup_dir, 'chunks'))
+
+    def _export_model_chunked(self, model_name, model_type, checksum):
+        """Guarda los archivos del modelo en el almacén de bloques y escribe su receta"""
+        source_dir = self.model_source_dir(model_name, model_type)
+        archive = f"{model_type}/{model_name}.recipe.json"
+        archive_path = os.path.join(self.backup_dir, archive)
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+
+        store = self.chunk_store()
+        files_info = {}
+        model_size = new_bytes = 0
+        for root, _, files in os.walk(source_dir):
+            for name in files:
+                file_path = os.path.join(root, name)
+                arcname = os.path.relpath(file_path, source_dir).replace(os.sep, '/')
+                with open(file_path, 'rb') as f:
+                    recipe, written = store.put_stream(f)
+                size = sum(chunk_size for _, chunk_size in recipe)
+                files_info[arcname] = {'size': size, 'chunks': recipe}
+                model_size += size
+                new_bytes += written
+
+        recipe_info = {
+            'format_version': '3.0',
+            'model_type': model_type,
+            'model_name': model_name,
+            'exported_by': 'ClasificaTalento PRO',
+            'export_date': datetime.datetime.now().isoformat(),
+            'storage': 'chunked',
+            'protection': {'enabled': False, 'level': 'none', 'format': '.json'},
+            'files': files_info
+        }
+        tmp_path = archive_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(recipe_info, f)
+        os.replace(tmp_path, archive_path)
+
+        return {
+            'name': model_name,
+            'model_type': model_type,
+            'checksum': checksum,
+            'archive': archive,
+            'storage': 'chunked',
+            'archive_size': new_bytes,
+            'model_size': model_size,
+            'files': len(files_info),
+            'backup_date': datetime.datetime.now().isoformat()
+        }
+
+    def _export_model(self, model_name, model_type, checksum):
+        """Exporta un modelo a su paquete dentro del directorio de backup"""
+        if self.deduplicate:
+            return self._export_model_chunked(model_name, model_type, checksum)
+
+        source_dir = self.model_source_dir(model_name, model_type)
+        archive = f"{model_type}/{model_name}.zip"
+        archive_path = os.path.join(self.backup_dir, archive)
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+
+        protector = PackageProtector() if self.encrypted else None
+        package_info = {
+            'format_version': '3.0',
+            'model_type': model_type,
+            'model_name': model_name,
+            'exported_by': 'ClasificaTalento PRO',
+            'export_date': datetime.datetime.now().isoformat(),
+            'compression': self.compression,
+            'protection': {
+                'enabled': self.encrypted,
+                'level': 'high' if self.encrypted else 'none',
+                'format': '.zip',
+                **(protector.protection_info() if protector else {})
+            }
+        }
+
+        # Escribir a un temporal para no dejar un paquete a medias si falla
+        tmp_path = archive_path + '.tmp'
+        stats = ModelPackager(self.compression).export_model(source_dir, tmp_path, package_info, protector)
+        os.replace(tmp_path, archive_path)
+
+        return {
+            'name': model_name,
+            'model_type': model_type,
+            'checksum': checksum,
+            'archive': archive,
+            'archive_size': os.path.getsize(archive_path),
+            'model_size': stats['bytes'],
+            'files': stats['files'],
+            'backup_date': datetime.datetime.now().isoformat()
+        }
+
+    def backup_all(self, models, force=False):
+        """Hace backup incremental de la lista de modelos
+
+        Args:
+            models: lista de dicts con 'name' e 'is_deep_learning' (como ``list_available_models``)
+            force: exportar aunque la suma de verificación no haya cambiado
+
+        Returns:
+            dict: resumen con modelos exportados, omitidos y fallidos
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        manifest = self.load_manifest()
+        entries = manifest.setdefault('models', {})
+        summary = {'exported': [], 'skipped': [], 'failed': {}, 'total': len(models)}
+
+        pending = []
+        for model in models:
+            model_name = model['name']
+            model_type = 'dl' if model.get('is_deep_learning', False) else 'ml'
+            key = self.model_key(model_name, model_type)
+            source_dir = self.model_source_dir(model_name, model_type)
+            if not os.path.isdir(source_dir):
+                summary['failed'][key] = f"No se encontró el modelo: {source_dir}"
+                continue
+
+            checksum = self.model_checksum(source_dir)
+            previous = entries.get(key)
+            storage = 'chunked' if self.deduplicate else 'package'
+            if (not force and previous and previous.get('checksum') == checksum
+                    and previous.get('storage', 'package') == storage
+                    and os.path.exists(os.path.join(self.backup_dir, previous['archive']))):
+                summary['skipped'].append(key)
+                continue
+            pending.append((key, model_name, model_type, checksum))
+
+        self._emit(f"{len(pending)} modelos por exportar, {len(summary['skipped'])} sin cambios")
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._export_model, model_name, model_type, checksum): key
+                for key, model_name, model_type, checksum in pending
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                done += 1
+                try:
+                    entry = future.result()
+                    with self._lock:
+                        entries[key] = entry
+                        summary['exported'].append(key)
+                        # Guardar el manifiesto tras cada modelo para que un backup interrumpido sea reanudable
+                        self.save_manifest(manifest)
+                    self._emit(f"[{done}/{len(pending)}] Exportado: {key}")
+                except Exception as e:
+                    summary['failed'][key] = str(e)
+                    self._emit(f"[{done}/{len(pending)}] ❌ Error en {key}: {str(e)}")
+
+        self.save_manifest(manifest)
+        if self.deduplicate:
+            summary['dedup'] = self.dedup_report()
+            self._emit(f"Deduplicación: x{summary['dedup']['dedup_ratio']:.2f} "
+                       f"({summary['dedup']['saved_percent']:.1f}% de espacio ahorrado)")
+        return summary
+
+    def dedup_report(self):
+        """Razón de deduplicación de todos los modelos con almacenamiento por bloques"""
+        recipes = {}
+        for key, entry in self.load_manifest().get('models', {}).items():
+            if entry.get('storage') != 'chunked':
+                continue
+            with open(os.path.join(self.backup_dir, entry['archive']), 'r', encoding='utf-8') as f:
+                recipe_info = json.load(f)
+            for arcname, info in recipe_info['files'].items():
+                recipes[f"{key}/{arcname}"] = info['chunks']
+        report = dedup_report(recipes, self.chunk_store().stored_bytes())
+        report['models'] = len({name.rsplit('/', 1)[0] for name in recipes})
+        return report
+
+    def _restore_model(self, entry, overwrite):
+        model_name, model_type = entry['name'], entry['model_type']
+        target_dir = self.model_source_dir(model_name, model_type)
+        if os.path.exists(target_dir) and not overwrite:
+            return False
+
+        archive_path = os.path.join(self.backup_dir, entry['archive'])
+        tmp_dir = target_dir + '.restoring'
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+
+        try:
+            if entry.get('storage') == 'chunked':
+                self._restore_chunked(archive_path, tmp_dir)
+            else:
+                self._restore_package(archive_path, tmp_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+        os.replace(tmp_dir, target_dir)
+        return True
+
+    def _restore_chunked(self, recipe_path, target_dir):
+        with open(recipe_path, 'r', encoding='utf-8') as f:
+            recipe_info = json.load(f)
+        store = self.chunk_store()
+        target_root = os.path.abspath(target_dir)
+        for arcname, info in recipe_info['files'].items():
+            # Misma protección que la importación: ninguna receta escribe fuera del modelo
+            target_path = ModelPackager._safe_target(target_root, arcname)
+            with open(target_path, 'wb') as dst:
+                store.restore_stream(info['chunks'], dst)
+
+    def _restore_package(self, archive_path, target_dir):
+        with zipfile.ZipFile(archive_path, 'r') as zipf:
+            package_info, _ = ModelPackager.read_package_info(zipf)
+            if package_info is None:
+                raise ValueError("El paquete no contiene metadatos de modelo válidos")
+            protection_info = package_info.get('protection', {'enabled': False})
+            protector = (PackageProtector.from_protection_info(protection_info)
+                         if protection_info.get('enabled') else None)
+            ModelPackager().import_model(zipf, target_dir, package_info, protector)
+
+    def restore_all(self, overwrite=False, keys=None):
+        """Restaura todos los modelos del manifiesto (o solo ``keys``)
+
+        Returns:
+            dict: resumen con modelos restaurados, omitidos (ya existían) y fallidos
+        """
+        manifest = self.load_manifest()
+        entries = manifest.get('models', {})
+        if not entries:
+            raise ValueError(f"No se encontró un manifiesto de backup en {self.backup_dir}")
+
+        selected = {k: v for k, v in entries.items() if keys is None or k in keys}
+        summary = {'restored': [], 'skipped': [], 'failed': {}, 'total': len(selected)}
+
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._restore_model, entry, overwrite): key
+                       for key, entry in selected.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                done += 1
+                try:
+                    if future.result():
+                        summary['restored'].append(key)
+                        self._emit(f"[{done}/{len(selected)}] Restaurado: {key}")
+                    else:
+                        summary['skipped'].append(key)
+                        self._emit(f"[{done}/{len(selected)}] Ya existe, omitido: {key}")
+                except Exception as e:
+                    summary['failed'][key] = str(e)
+                    self._emit(f"[{done}/{len(selected)}] ❌ Error en {key}: {str(e)}")
+
+        return summary
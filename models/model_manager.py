@@ -189,6 +189,40 @@ class ModelManager:
             print(f"❌ Error eliminando modelo {model_name}: {e}")
             return False
     
+    def publish_model(self, model_name: str, is_deep_learning: bool = False) -> bool:
+        """Marca un modelo como publicado (el que usan los servicios sin interfaz)"""
+        try:
+            model_dir = self.deep_models_dir if is_deep_learning else self.models_dir
+            if not (model_dir / model_name).exists():
+                print(f"❌ No existe el modelo {model_name} en {model_dir}")
+                return False
+
+            data = {
+                'model_name': model_name,
+                'is_deep_learning': is_deep_learning,
+                'published_date': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            }
+            tmp_path = Settings.PUBLISHED_MODEL_FILE.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, Settings.PUBLISHED_MODEL_FILE)
+            return True
+
+        except Exception as e:
+            print(f"❌ Error publicando el modelo {model_name}: {e}")
+            return False
+
+    def get_published_model(self) -> Optional[Dict[str, Any]]:
+        """Devuelve el modelo publicado ({'model_name', 'is_deep_learning', ...}) o None"""
+        try:
+            if not Settings.PUBLISHED_MODEL_FILE.exists():
+                return None
+            with open(Settings.PUBLISHED_MODEL_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"❌ Error leyendo el modelo publicado: {e}")
+            return None
+
     def get_model_performance_summary(self, metadata: ModelMetadata) -> Dict[str, str]:
         """Genera resumen de rendimiento del modelo para mostrar en GUI"""
         summary = {
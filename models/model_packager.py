@@ -0,0 +1,271 @@
+"""
+Empaquetado de modelos en streaming
+Exporta e importa carpetas de modelos a .zip por bloques de tamaño fijo, sin
+cargar archivos completos en memoria, con progreso en bytes/segundo
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+
+from .package_protection import BLOCK_SIZE
+from .chunk_store import Chunker
+
+METADATA_FILES = ('package_info.json', 'senati_info.json')
+
+# Extensiones que se benefician de deflate; pesos (.h5, .pkl, .npy, ...) apenas comprimen
+COMPRESSIBLE_EXTENSIONS = {'.json', '.txt', '.csv', '.md', '.vocab', '.model', '.yaml', '.yml'}
+
+
+class _ProgressMeter:
+    """Acumula bytes procesados y notifica el avance a intervalos regulares"""
+
+    def __init__(self, total_bytes, callback=None, label='Procesando', interval=0.5):
+        self.total_bytes = total_bytes
+        self.callback = callback
+        self.label = label
+        self.interval = interval
+        self.done = 0
+        self.start = time.perf_counter()
+        self._last_report = 0.0
+
+    def update(self, n):
+        self.done += n
+        now = time.perf_counter()
+        if self.callback and now - self._last_report >= self.interval:
+            self._last_report = now
+            self.callback(self.message())
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def message(self):
+        mb = 1024 * 1024
+        percent = 100.0 * self.done / self.total_bytes if self.total_bytes else 100.0
+        return (f"{self.label}: {self.done / mb:.1f}/{self.total_bytes / mb:.1f} MB "
+                f"({percent:.0f}%) • {self.rate() / mb:.1f} MB/s")
+
+
+class _MeteredReader:
+    """Envoltura de un archivo que informa al medidor cada bloque leído"""
+
+    def __init__(self, fileobj, meter):
+        self.fileobj = fileobj
+        self.meter = meter
+
+    def read(self, n=-1):
+        data = self.fileobj.read(n)
+        self.meter.update(len(data))
+        return data
+
+
+class ModelPackager:
+    """Exporta/importa carpetas de modelos a paquetes .zip en streaming.
+
+    Args:
+        compression: 'auto' (deflate solo para archivos de texto), 'store' o 'deflate'
+        buffer_size: tamaño del bloque de lectura/escritura
+        progress_callback: función que recibe mensajes de progreso (str)
+    """
+
+    COMPRESSION_MODES = ('auto', 'store', 'deflate')
+
+    def __init__(self, compression='auto', buffer_size=BLOCK_SIZE, progress_callback=None):
+        if compression not in self.COMPRESSION_MODES:
+            raise ValueError(f"Modo de compresión no soportado: {compression}")
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.progress_callback = progress_callback
+
+    def _compress_type(self, arcname):
+        if self.compression == 'store':
+            return zipfile.ZIP_STORED
+        if self.compression == 'deflate':
+            return zipfile.ZIP_DEFLATED
+        extension = os.path.splitext(arcname)[1].lower()
+        return zipfile.ZIP_DEFLATED if extension in COMPRESSIBLE_EXTENSIONS else zipfile.ZIP_STORED
+
+    def _emit(self, message):
+        if self.progress_callback:
+            self.progress_callback(message)
+
+    @staticmethod
+    def _list_files(source_dir):
+        files = []
+        for root, _, names in os.walk(source_dir):
+            for name in names:
+                file_path = os.path.join(root, name)
+                files.append((file_path, os.path.relpath(file_path, source_dir).replace(os.sep, '/')))
+        return files
+
+    @staticmethod
+    def _stats(meter, num_files):
+        return {
+            'files': num_files,
+            'bytes': meter.done,
+            'seconds': time.perf_counter() - meter.start,
+            'bytes_per_second': meter.rate()
+        }
+
+    @staticmethod
+    def _safe_target(target_root, arcname):
+        target_path = os.path.abspath(os.path.join(target_root, arcname))
+        if os.path.commonpath([target_root, target_path]) != target_root:
+            raise ValueError(f"Ruta no permitida en el paquete: {arcname}")
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        return target_path
+
+    @staticmethod
+    def read_package_info(zipf):
+        """Lee los metadatos del paquete abierto
+
+        Returns:
+            tuple: (package_info, nombre del archivo de metadatos) o (None, None)
+        """
+        names = zipf.namelist()
+        for metadata_file in METADATA_FILES:
+            if metadata_file in names:
+                return json.loads(zipf.read(metadata_file).decode('utf-8')), metadata_file
+        return None, None
+
+    def export_model(self, source_dir, export_path, package_info, protector=None):
+        """Empaqueta ``source_dir`` en ``export_path``
+
+        ``package_info`` se escribe al final como package_info.json, completado con la
+        sección de archivos (con el SHA-256 de cada archivo si hay ``protector``).
+
+        Returns:
+            dict: estadísticas (archivos, bytes, segundos, bytes_per_second)
+        """
+        files = self._list_files(source_dir)
+        meter = _ProgressMeter(sum(os.path.getsize(path) for path, _ in files),
+                               self.progress_callback, 'Exportando')
+        files_info = {}
+
+        with zipfile.ZipFile(export_path, 'w', zipfile.ZIP_STORED) as zipf:
+            for file_path, arcname in files:
+                zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+                zinfo.compress_type = self._compress_type(arcname)
+                with open(file_path, 'rb') as f, zipf.open(zinfo, 'w', force_zip64=True) as dst:
+                    src = _MeteredReader(f, meter)
+                    if protector:
+                        files_info[arcname] = protector.encrypt_stream(src, dst, arcname)
+                    else:
+                        shutil.copyfileobj(src, dst, self.buffer_size)
+                        files_info[arcname] = {'size': zinfo.file_size}
+
+            package_info = dict(package_info)
+            package_info['files'] = files_info
+            zipf.writestr('package_info.json', json.dumps(package_info, indent=2),
+                          compress_type=zipfile.ZIP_DEFLATED)
+
+        self._emit(meter.message())
+        return self._stats(meter, len(files))
+
+    def export_chunked(self, source_dir, export_path, package_info, chunker=None):
+        """Empaqueta ``source_dir`` deduplicando bloques repetidos
+
+        Cada bloque definido por contenido se guarda una sola vez como ``chunks/<sha256>``
+        y cada archivo se describe con su receta de bloques en package_info.json.
+        Este formato no se cifra: la integridad se verifica con el SHA-256 de cada bloque.
+
+        Returns:
+            dict: estadísticas, incluyendo ``stored_bytes`` y ``dedup_ratio``
+        """
+        chunker = chunker or Chunker()
+        files = self._list_files(source_dir)
+        meter = _ProgressMeter(sum(os.path.getsize(path) for path, _ in files),
+                               self.progress_callback, 'Exportando')
+        files_info = {}
+        seen = set()
+        stored_bytes = 0
+
+        with zipfile.ZipFile(export_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as zipf:
+            for file_path, arcname in files:
+                recipe = []
+                compress_type = self._compress_type(arcname)
+                with open(file_path, 'rb') as f:
+                    for chunk in chunker.iter_chunks(_MeteredReader(f, meter)):
+                        chunk_hash = hashlib.sha256(chunk).hexdigest()
+                        if chunk_hash not in seen:
+                            seen.add(chunk_hash)
+                            zipf.writestr(f"chunks/{chunk_hash}", chunk, compress_type=compress_type)
+                            stored_bytes += len(chunk)
+                        recipe.append([chunk_hash, len(chunk)])
+                files_info[arcname] = {'size': sum(size for _, size in recipe), 'chunks': recipe}
+
+            package_info = dict(package_info)
+            package_info['storage'] = 'chunked'
+            package_info['files'] = files_info
+            zipf.writestr('package_info.json', json.dumps(package_info, indent=2),
+                          compress_type=zipfile.ZIP_DEFLATED)
+
+        self._emit(meter.message())
+        stats = self._stats(meter, len(files))
+        stats['stored_bytes'] = stored_bytes
+        stats['dedup_ratio'] = meter.done / stored_bytes if stored_bytes else 1.0
+        return stats
+
+    def _import_chunked(self, zipf, target_root, package_info):
+        files_info = package_info.get('files', {})
+        meter = _ProgressMeter(sum(info.get('size', 0) for info in files_info.values()),
+                               self.progress_callback, 'Importando')
+
+        for arcname, info in files_info.items():
+            target_path = self._safe_target(target_root, arcname)
+            try:
+                with open(target_path, 'wb') as dst:
+                    for chunk_hash, size in info['chunks']:
+                        chunk = zipf.read(f"chunks/{chunk_hash}")
+                        if hashlib.sha256(chunk).hexdigest() != chunk_hash or len(chunk) != size:
+                            raise ValueError(f"El archivo {arcname} está dañado (bloque {chunk_hash[:12]})")
+                        dst.write(chunk)
+                        meter.update(len(chunk))
+            except Exception:
+                if os.path.exists(target_path):
+                    os.remove(target_path)
+                raise
+
+        self._emit(meter.message())
+        return self._stats(meter, len(files_info))
+
+    def import_model(self, zipf, target_dir, package_info, protector=None):
+        """Extrae los archivos del paquete abierto en ``target_dir``
+
+        Si un archivo protegido no supera la verificación se elimina lo escrito y se
+        propaga la excepción. Los paquetes deduplicados se reconstruyen desde sus recetas.
+
+        Returns:
+            dict: estadísticas (archivos, bytes, segundos, bytes_per_second)
+        """
+        target_root = os.path.abspath(target_dir)
+        if package_info.get('storage') == 'chunked':
+            return self._import_chunked(zipf, target_root, package_info)
+
+        members = [info for info in zipf.infolist()
+                   if info.filename not in METADATA_FILES and not info.is_dir()]
+        files_info = package_info.get('files', {})
+        meter = _ProgressMeter(sum(info.file_size for info in members),
+                               self.progress_callback, 'Importando')
+
+        for info in members:
+            target_path = self._safe_target(target_root, info.filename)
+
+            try:
+                with zipf.open(info) as f, open(target_path, 'wb') as dst:
+                    src = _MeteredReader(f, meter)
+                    if protector:
+                        protector.decrypt_stream(src, dst, info.filename, files_info.get(info.filename))
+                    else:
+                        shutil.copyfileobj(src, dst, self.buffer_size)
+            except Exception:
+                if os.path.exists(target_path):
+                    os.remove(target_path)
+                raise
+
+        self._emit(meter.message())
+        return self._stats(meter, len(members))
@@ -0,0 +1,100 @@
+"""
+Protección de paquetes de modelos exportados
+XOR con clave cíclica (formato 2.0) aplicado por bloques con NumPy, más el SHA-256
+de cada archivo para detectar paquetes dañados o modificados
+
+La clave es fija y está en el código fuente: esto es ofuscación (los pesos no se
+pueden abrir con un descompresor cualquiera), no cifrado. Quien tenga el código
+puede revertirla, por lo que no debe usarse para proteger información sensible.
+"""
+
+import hashlib
+import numpy as np
+
+LEGACY_KEY = b'ClasificaTalentoPRO'
+
+SCHEME_LEGACY_XOR = 'xor'
+
+BLOCK_SIZE = 1024 * 1024
+
+
+class LegacyXorCipher:
+    """XOR con clave cíclica del formato 2.0, aplicado por bloques con NumPy.
+
+    Mantiene el desplazamiento entre bloques, por lo que procesar un archivo en
+    trozos produce exactamente los mismos bytes que el XOR byte a byte original.
+    """
+
+    def __init__(self, key=LEGACY_KEY):
+        self.key = np.frombuffer(key, dtype=np.uint8)
+        self.offset = 0
+        self._pattern = np.empty(0, dtype=np.uint8)
+
+    def process(self, block):
+        """Ofusca o restaura (es la misma operación) el siguiente bloque"""
+        n = len(block)
+        if n == 0:
+            return b''
+        start = self.offset % len(self.key)
+        if len(self._pattern) < start + n:
+            reps = -(-(start + n) // len(self.key))
+            self._pattern = np.tile(self.key, reps)
+        data = np.frombuffer(block, dtype=np.uint8)
+        self.offset += n
+        return np.bitwise_xor(data, self._pattern[start:start + n]).tobytes()
+
+
+class PackageProtector:
+    """Ofusca y restaura archivos de un paquete de modelo en streaming.
+
+    Por archivo se guarda en ``package_info.json`` su tamaño y el SHA-256 del
+    contenido original, que se comprueba al importar. Los paquetes 2.0 no traen
+    el hash y se importan sin esa comprobación.
+    """
+
+    def __init__(self, key=LEGACY_KEY, block_size=BLOCK_SIZE):
+        self.key = key
+        self.block_size = block_size
+
+    @classmethod
+    def from_protection_info(cls, protection_info):
+        """Crea el protector a partir de la sección 'protection' del paquete"""
+        scheme = protection_info.get('scheme', SCHEME_LEGACY_XOR)
+        if scheme != SCHEME_LEGACY_XOR:
+            raise ValueError(f"Esquema de protección no soportado: {scheme}")
+        return cls()
+
+    def protection_info(self):
+        """Campos a incluir en la sección 'protection' de package_info.json"""
+        return {'scheme': SCHEME_LEGACY_XOR}
+
+    def encrypt_stream(self, src, dst, arcname):
+        """Lee ``src`` por bloques y escribe el contenido ofuscado en ``dst``
+
+        Returns:
+            dict: entrada de archivo para package_info.json (size, sha256)
+        """
+        cipher = LegacyXorCipher(self.key)
+        digest = hashlib.sha256()
+        size = 0
+        for block in iter(lambda: src.read(self.block_size), b''):
+            digest.update(block)
+            dst.write(cipher.process(block))
+            size += len(block)
+        return {'size': size, 'sha256': digest.hexdigest()}
+
+    def decrypt_stream(self, src, dst, arcname, entry=None):
+        """Lee ``src`` por bloques y escribe el contenido original en ``dst``
+
+        Lanza ``ValueError`` si el SHA-256 no coincide con el de ``entry``; el
+        llamador debe descartar lo escrito en ``dst`` en ese caso.
+        """
+        cipher = LegacyXorCipher(self.key)
+        digest = hashlib.sha256()
+        for block in iter(lambda: src.read(self.block_size), b''):
+            block = cipher.process(block)
+            digest.update(block)
+            dst.write(block)
+        expected = (entry or {}).get('sha256')
+        if expected and digest.hexdigest() != expected:
+            raise ValueError(f"El archivo {arcname} está dañado o fue modificado")
@@ -0,0 +1,402 @@
+"""
+Extracción de texto de CVs (PDF y texto plano)
+Función compartida por la clasificación y el entrenamiento, con extracción
+paralela en un pool de procesos para lotes grandes
+
+Para el entrenamiento, ``ExtractionRunner`` extrae cada archivo en un proceso que se
+puede matar: un PDF malformado o gigantesco agota su tiempo (``timeout``) sin detener
+el resto del lote, y cada fallo queda registrado con su motivo (``FAILURE_REASONS``).
+"""
+
+import io
+import os
+import time
+import hashlib
+import multiprocessing
+from collections import deque
+from functools import partial
+from multiprocessing.connection import wait as wait_connections
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import PyPDF2
+
+from src.monitoring import metrics
+
+CV_EXTENSIONS = ('.pdf', '.txt')
+
+# Los procesos de extracción se crean desde hilos de trabajo de una aplicación con muchos
+# hilos (Qt, TensorFlow): con 'fork' el hijo podría heredar locks tomados y bloquearse,
+# así que siempre se arrancan con 'spawn'
+PROCESS_CONTEXT = multiprocessing.get_context('spawn')
+DEFAULT_TIMEOUT = 60  # Segundos máximos de extracción por archivo en ExtractionRunner
+
+# Motivos de fallo de extract_document / ExtractionRunner
+FAILURE_REASONS = {
+    'timeout': "tiempo de extracción agotado",
+    'crashed': "el proceso de extracción terminó inesperadamente",
+    'encrypted': "PDF protegido con contraseña",
+    'no_text_layer': "PDF sin capa de texto (¿escaneado?)",
+    'corrupt': "PDF dañado o no válido",
+    'unreadable': "no se pudo leer el archivo",
+    'empty': "archivo sin contenido",
+}
+
+
+class EncryptedPDFError(Exception):
+    """El PDF está cifrado y no se abre con contraseña vacía"""
+
+
+def _read_pdf(source, max_pages=None, max_chars=None):
+    """Texto, número de páginas y si se cortó por los límites; lanza si falla
+
+    Con ``max_pages`` o ``max_chars`` la extracción termina en cuanto se alcanza el
+    límite, sin procesar el resto del documento.
+    """
+    reader = PyPDF2.PdfReader(source)
+    if reader.is_encrypted:
+        # Muchos PDFs están "cifrados" solo con permisos y se abren con contraseña vacía
+        try:
+            decrypted = reader.decrypt('')
+        except Exception as e:
+            raise EncryptedPDFError(str(e) or "No se pudo descifrar") from e
+        if not decrypted:
+            raise EncryptedPDFError("Requiere contraseña")
+
+    total_pages = len(reader.pages)
+    truncated = max_pages is not None and total_pages > max_pages
+    text = ""
+    for page in reader.pages[:max_pages] if max_pages else reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            text += page_text + "\n"
+        if max_chars and len(text) >= max_chars:
+            text = text[:max_chars]
+            truncated = True
+            break
+    return text.strip(), total_pages, truncated
+
+
+def extract_text_from_pdf(pdf_path):
+    """Extrae el texto de todas las páginas de un PDF ('' si falla)"""
+    try:
+        with open(pdf_path, 'rb') as file:
+            return _read_pdf(file)[0]
+    except Exception:
+        return ""
+
+
+def extract_text(file_path):
+    """Extrae el texto de un CV en PDF o texto plano"""
+    if file_path.lower().endswith('.pdf'):
+        with metrics.timer('extraction', format='pdf'):
+            return extract_text_from_pdf(file_path)
+    with metrics.timer('extraction', format='txt'):
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read().strip()
+
+
+def list_cv_files(folder, recursive=False):
+    """Lista los CVs (.pdf/.txt) de una carpeta, ordenados por nombre"""
+    paths = []
+    if recursive:
+        for root, _, files in os.walk(folder):
+            paths.extend(os.path.join(root, name) for name in files
+                         if name.lower().endswith(CV_EXTENSIONS))
+    else:
+        with os.scandir(folder) as entries:
+            paths.extend(entry.path for entry in entries
+                         if entry.is_file() and entry.name.lower().endswith(CV_EXTENSIONS))
+    return sorted(paths)
+
+
+def extract_text_safe(file_path):
+    """Extrae el texto sin lanzar excepciones: devuelve (ruta, texto, error o None)"""
+    try:
+        return file_path, extract_text(file_path), None
+    except Exception as e:
+        return file_path, "", str(e)
+
+
+def extract_document(file_path, max_pages=None, max_chars=None):
+    """Extrae un CV junto con los datos que identifican el archivo, sin lanzar excepciones
+
+    El archivo se lee una sola vez: el mismo contenido se usa para el hash y para
+    PyPDF2, así que el hash corresponde exactamente al texto extraído.
+
+    Returns:
+        dict: 'path', 'text', 'sha256', 'size', 'mtime_ns', 'pages' (None si no es PDF),
+        'truncated' (se alcanzó ``max_pages``/``max_chars``), 'status' ('success'/'failed'),
+        'reason' (clave de ``FAILURE_REASONS`` o None) y 'error' (None o mensaje)
+    """
+    document = {'path': file_path, 'text': "", 'sha256': None, 'size': None, 'mtime_ns': None,
+                'pages': None, 'truncated': False, 'status': 'failed', 'reason': None, 'error': None}
+    try:
+        stat = os.stat(file_path)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return dict(document, reason='unreadable', error=str(e))
+    document.update(sha256=hashlib.sha256(data).hexdigest(), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    try:
+        if file_path.lower().endswith('.pdf'):
+            with metrics.timer('extraction', format='pdf'):
+                document['text'], document['pages'], document['truncated'] = _read_pdf(
+                    io.BytesIO(data), max_pages, max_chars)
+        else:
+            with metrics.timer('extraction', format='txt'):
+                document['text'] = data.decode('utf-8', errors='ignore').strip()
+                if max_chars and len(document['text']) > max_chars:
+                    document['text'], document['truncated'] = document['text'][:max_chars], True
+    except EncryptedPDFError as e:
+        document.update(reason='encrypted', error=str(e))
+    except Exception as e:
+        document.update(reason='corrupt', error=str(e) or type(e).__name__)
+
+    if document['text']:
+        document['status'] = 'success'
+    elif document['reason'] is None:
+        document['reason'] = 'no_text_layer' if document['pages'] else 'empty'
+        document['error'] = FAILURE_REASONS[document['reason']]
+    return document
+
+
+def _failed_document(path, reason, error):
+    return {'path': path, 'text': "", 'sha256': None, 'size': None, 'mtime_ns': None, 'pages': None,
+            'truncated': False, 'status': 'failed', 'reason': reason, 'error': error}
+
+
+def _runner_worker(conn, max_pages, max_chars):
+    """Bucle de un proceso de ExtractionRunner: recibe rutas y devuelve documentos"""
+    while True:
+        try:
+            path = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if path is None:
+            break
+        conn.send(extract_document(path, max_pages, max_chars))
+
+
+class ExtractionRunner:
+    """Extracción en procesos aislados con tiempo máximo por archivo
+
+    A diferencia de un ``ProcessPoolExecutor``, cada proceso atiende un archivo a la vez
+    y se puede matar: si un archivo supera ``timeout`` segundos (o el proceso muere),
+    el proceso se sustituye por otro y el archivo se devuelve como fallido con motivo
+    ``'timeout'`` (o ``'crashed'``), sin afectar al resto del lote.
+    """
+
+    POLL_SECONDS = 0.5  # Cada cuánto se consulta ``should_stop`` mientras se espera
+
+    def __init__(self, max_workers=None, timeout=DEFAULT_TIMEOUT, max_pages=None, max_chars=None):
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+
+    def _spawn(self):
+        parent_conn, child_conn = PROCESS_CONTEXT.Pipe()
+        process = PROCESS_CONTEXT.Process(target=_runner_worker, name='cv-extraction', daemon=True,
+                                          args=(child_conn, self.max_pages, self.max_chars))
+        process.start()
+        child_conn.close()
+        return {'process': process, 'conn': parent_conn, 'path': None, 'deadline': None}
+
+    @staticmethod
+    def _kill(slot):
+        slot['process'].kill()
+        slot['process'].join()
+        slot['conn'].close()
+
+    @staticmethod
+    def _close(slot):
+        try:
+            slot['conn'].send(None)
+        except OSError:
+            pass
+        slot['process'].join(timeout=5)
+        if slot['process'].is_alive():
+            slot['process'].kill()
+            slot['process'].join()
+        slot['conn'].close()
+
+    def iter_documents(self, paths, should_stop=None):
+        """Extrae ``paths`` y produce los dicts de ``extract_document`` en orden de finalización
+
+        Args:
+            should_stop: función sin argumentos; si devuelve True se abandonan los pendientes
+                (los procesos ocupados se matan)
+        """
+        pending = deque(paths)
+        slots = [self._spawn() for _ in range(min(self.max_workers, len(pending)))]
+        try:
+            while True:
+                for slot in slots:
+                    if slot['path'] is None and pending:
+                        slot['path'] = pending.popleft()
+                        slot['deadline'] = time.monotonic() + self.timeout if self.timeout else None
+                        slot['conn'].send(slot['path'])
+                busy = [slot for slot in slots if slot['path'] is not None]
+                if not busy or (should_stop and should_stop()):
+                    break
+
+                wait_seconds = self.POLL_SECONDS
+                deadlines = [slot['deadline'] for slot in busy if slot['deadline'] is not None]
+                if deadlines:
+                    wait_seconds = max(0.0, min(wait_seconds, min(deadlines) - time.monotonic()))
+                ready = wait_connections([slot['conn'] for slot in busy], timeout=wait_seconds)
+
+                now = time.monotonic()
+                for slot in busy:
+                    path = slot['path']
+                    if slot['conn'] in ready:
+                        try:
+                            document = slot['conn'].recv()
+                            slot['path'] = None
+                        except (EOFError, OSError):
+                            metrics.increment('extraction_crashes')
+                            document = _failed_document(path, 'crashed', FAILURE_REASONS['crashed'])
+                            self._kill(slot)
+                            slots[slots.index(slot)] = self._spawn()
+                        yield document
+                    elif slot['deadline'] is not None and now >= slot['deadline']:
+                        metrics.increment('extraction_timeouts')
+                        self._kill(slot)
+                        slots[slots.index(slot)] = self._spawn()
+                        yield _failed_document(path, 'timeout', f"Sin terminar tras {self.timeout:g}s")
+        finally:
+            for slot in slots:
+                if slot['path'] is None:
+                    self._close(slot)
+                else:
+                    self._kill(slot)
+
+
+def _iter_parallel(fn, paths, max_workers, use_processes, should_stop):
+    if not paths:
+        return
+    max_workers = max_workers or min(len(paths), os.cpu_count() or 2)
+    if use_processes and len(paths) > 1:
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=PROCESS_CONTEXT)
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [executor.submit(fn, path) for path in paths]
+        for future in as_completed(futures):
+            if should_stop and should_stop():
+                break
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_extracted_texts(paths, max_workers=None, use_processes=True, should_stop=None):
+    """Extrae el texto de muchos archivos en paralelo, en orden de finalización
+
+    PyPDF2 es Python puro, así que un pool de procesos aprovecha todos los núcleos;
+    con ``use_processes=False`` se usa un pool de hilos (útil para pocos archivos).
+
+    Args:
+        paths: rutas de los archivos
+        max_workers: tamaño del pool (por defecto, número de CPUs)
+        should_stop: función sin argumentos; si devuelve True se cancelan los pendientes
+
+    Yields:
+        tuple: (ruta, texto, error o None)
+    """
+    # Los tiempos por archivo de los procesos hijos no llegan al registro de métricas
+    # de este proceso; aquí se cuentan los archivos y los errores del lote
+    for result in _iter_parallel(extract_text_safe, paths, max_workers, use_processes, should_stop):
+        metrics.increment('extracted_files')
+        if result[2] is not None or not result[1]:
+            metrics.increment('extraction_errors')
+        yield result
+
+
+def iter_extracted_documents(paths, max_workers=None, use_processes=True, should_stop=None,
+                             timeout=DEFAULT_TIMEOUT, max_pages=None, max_chars=None):
+    """Como ``iter_extracted_texts``, pero produce los dicts de ``extract_document``
+
+    Con procesos se usa ``ExtractionRunner`` (tiempo máximo ``timeout`` por archivo);
+    con ``use_processes=False`` los archivos se extraen en hilos, que no se pueden
+    interrumpir, así que ``timeout`` no se aplica.
+    """
+    if not paths:
+        return
+    if use_processes:
+        runner = ExtractionRunner(min(max_workers or os.cpu_count() or 2, len(paths)), timeout, max_pages, max_chars)
+        documents = runner.iter_documents(paths, should_stop)
+    else:
+        extract = partial(extract_document, max_pages=max_pages, max_chars=max_chars)
+        documents = _iter_parallel(extract, paths, max_workers, False, should_stop)
+    for document in documents:
+        metrics.increment('extracted_files')
+        if document['status'] != 'success':
+            metrics.increment('extraction_errors')
+        yield document
+
+
+def format_failures(documents, limit=10):
+    """Informe de extracciones fallidas para los registros: resumen por motivo y archivos
+
+    Args:
+        documents: dicts con 'status', 'reason', 'error' y 'path' o 'filename'
+        limit: archivos a detallar como máximo
+
+    Returns:
+        list: líneas de texto (vacía si no hay fallos)
+    """
+    failed = [document for document in documents if document.get('status') != 'success']
+    if not failed:
+        return []
+    counts = {}
+    for document in failed:
+        reason = document.get('reason') or 'corrupt'
+        counts[reason] = counts.get(reason, 0) + 1
+    lines = [f"⚠️ {len(failed)} CVs sin texto: " + ", ".join(
+        f"{count} {FAILURE_REASONS.get(reason, reason)}" for reason, count in sorted(counts.items(), key=lambda c: -c[1]))]
+    for document in failed[:limit]:
+        name = document.get('filename') or os.path.basename(document.get('path') or '')
+        reason = document.get('reason') or 'corrupt'
+        detail = FAILURE_REASONS.get(reason, reason)
+        if document.get('error') and document['error'] != detail:
+            detail += f": {document['error']}"
+        lines.append(f"   • {name} — {detail}")
+    if len(failed) > limit:
+        lines.append(f"   … y {len(failed) - limit} más")
+    return lines
+
+
+def extract_labelled_corpus(labelled_paths, max_workers=None, progress_callback=None,
+                            timeout=DEFAULT_TIMEOUT, max_pages=None, max_chars=None):
+    """Extrae en paralelo un corpus etiquetado con el formato de los workers de entrenamiento
+
+    Args:
+        labelled_paths: lista de (ruta, profesión)
+        progress_callback: función (procesados, total, ruta) opcional
+        timeout, max_pages, max_chars: límites por archivo (ver ``ExtractionRunner``)
+
+    Returns:
+        list: dicts con 'text', 'profession', 'filename', 'status' ('success'/'failed'),
+        'reason' y 'error'
+    """
+    profession_by_path = dict(labelled_paths)
+    order = {path: i for i, path in enumerate(profession_by_path)}
+    cv_data = [None] * len(order)
+    documents = iter_extracted_documents(list(order), max_workers, timeout=timeout,
+                                         max_pages=max_pages, max_chars=max_chars)
+    for processed, document in enumerate(documents, 1):
+        path = document['path']
+        # Mantener el orden de entrada para que las particiones de entrenamiento sean reproducibles
+        cv_data[order[path]] = {
+            'text': document['text'],
+            'profession': profession_by_path[path],
+            'filename': os.path.basename(path),
+            'status': document['status'],
+            'reason': document['reason'],
+            'error': document['error']
+        }
+        if progress_callback:
+            progress_callback(processed, len(order), path)
+    return cv_data
@@ -0,0 +1,828 @@
+"""
+Cola persistente de trabajos de entrenamiento con límites de CPU y memoria
+
+Los trabajos (ML o DL, con sus carpetas de profesiones e hiperparámetros) se guardan
+en ``Settings.TRAINING_JOBS_DB``. Un planificador los ejecuta en segundo plano, cada
+uno en su propio proceso (``python -m models.cli train``), mientras quepan en los
+límites de CPUs y memoria. Los procesos se lanzan desacoplados: si la interfaz se
+cierra siguen entrenando y el siguiente planificador los vuelve a seguir; los que se
+interrumpieron (reinicio de la máquina, proceso terminado) vuelven a la cola y los DL
+se reanudan desde su último checkpoint.
+
+Solo un planificador a la vez reparte trabajos (la interfaz o ``run``), coordinados
+con un latido en la base de datos.
+
+Uso:
+    python -m models.training_jobs submit --name modelo --data /ruta/profesiones [--kind dl]
+    python -m models.training_jobs list [--state queued]
+    python -m models.training_jobs log ID [--follow]
+    python -m models.training_jobs cancel ID
+    python -m models.training_jobs run [--max-cpus 8] [--max-memory-mb 16000]
+
+Cada trabajo deja su registro y su resultado en ``Settings.TRAINING_JOBS_DIR/<id>/``.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import sqlite3
+import argparse
+import datetime
+import threading
+import traceback
+import subprocess
+from contextlib import contextmanager
+
+from src.config.settings import Settings
+from src.monitoring import metrics
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+JOB_STATES = ['queued', 'running', 'finished', 'failed', 'cancelled']
+ACTIVE_STATES = ('queued', 'running')
+
+# CPUs y memoria (MB) que se reservan por defecto según el tipo de modelo
+DEFAULT_RESOURCES = {
+    'ml': (2, 1024),
+    'lstm': (4, 2048),
+    'cnn': (4, 2048),
+    'bert_frozen': (4, 3072),
+    'bert': (8, 6144),
+}
+MAX_ATTEMPTS = 3          # Intentos antes de dar por fallido un trabajo interrumpido
+LEASE_SECONDS = 30.0      # Sin latido durante este tiempo, otro planificador toma el relevo
+KILL_GRACE_SECONDS = 60.0 # Tras cancelar, espera antes de forzar la terminación
+LOG_TAIL_BYTES = 64 * 1024
+MB = 1024 * 1024
+
+_COLUMNS = {
+    'id': 'id', 'nombre_modelo': 'model_name', 'tipo': 'kind', 'carpetas': 'folders',
+    'parametros': 'params', 'prioridad': 'priority', 'cpus': 'cpus', 'memoria_mb': 'memory_mb',
+    'estado': 'state', 'intentos': 'attempts', 'pid': 'pid', 'cancelar': 'cancel_requested',
+    'mensaje': 'message', 'resultado': 'result', 'fecha_creacion': 'created_at',
+    'fecha_inicio': 'started_at', 'fecha_fin': 'finished_at',
+}
+
+
+def _now():
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+# --- Recursos del sistema --------------------------------------------------------
+
+def total_memory_mb():
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().total // MB
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // MB
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def available_memory_mb():
+    """Memoria disponible ahora mismo, o None si no se puede medir"""
+    if PSUTIL_AVAILABLE:
+        return psutil.virtual_memory().available // MB
+    try:
+        with open('/proc/meminfo', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_alive(pid):
+    if not pid:
+        return False
+    if PSUTIL_AVAILABLE:
+        try:
+            return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+    if os.name == 'nt':
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259  # STILL_ACTIVE
+        finally:
+            ctypes.windll.kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def terminate_process(pid, force=False):
+    """Pide terminar un trabajo (y sus procesos de extracción); ``force`` lo mata"""
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/PID', str(pid), '/T'] + (['/F'] if force else []),
+                           capture_output=True)
+        else:
+            # Cada trabajo es líder de su propia sesión: se señala a todo el grupo
+            os.killpg(pid, signal.SIGKILL if force else signal.SIGTERM)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def _detached_options():
+    """El trabajo sobrevive al cierre del proceso que lo lanzó"""
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS}
+    return {'start_new_session': True}
+
+
+# --- Almacén de trabajos --------------------------------------------------------
+
+class JobStore:
+    """Trabajos de entrenamiento en SQLite; se puede usar a la vez desde varios hilos y procesos
+
+    Cada operación abre su propia conexión: la interfaz, el planificador y la línea de
+    comandos comparten la base de datos sin compartir conexiones.
+    """
+
+    TABLE = 'trabajos_entrenamiento'
+
+    def __init__(self, db_path=None, jobs_dir=None):
+        self.db_path = str(db_path or Settings.TRAINING_JOBS_DB)
+        self.jobs_dir = str(jobs_dir or os.path.dirname(self.db_path))
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nombre_modelo TEXT NOT NULL,
+                tipo TEXT NOT NULL,
+                carpetas TEXT NOT NULL,
+                parametros TEXT NOT NULL,
+                prioridad INTEGER NOT NULL DEFAULT 0,
+                cpus INTEGER NOT NULL,
+                memoria_mb INTEGER NOT NULL,
+                estado TEXT NOT NULL DEFAULT 'queued',
+                intentos INTEGER NOT NULL DEFAULT 0,
+                pid INTEGER,
+                cancelar INTEGER NOT NULL DEFAULT 0,
+                mensaje TEXT,
+                resultado TEXT,
+                fecha_creacion TIMESTAMP NOT NULL,
+                fecha_inicio TIMESTAMP,
+                fecha_fin TIMESTAMP
+            )
+            """)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_trabajos_estado ON {self.TABLE}(estado, prioridad)")
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS planificador (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                propietario TEXT NOT NULL,
+                latido REAL NOT NULL
+            )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _to_job(self, row, names):
+        job = {_COLUMNS[name]: value for name, value in zip(names, row)}
+        job['folders'] = json.loads(job['folders'])
+        job['params'] = json.loads(job['params'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        job['log_path'] = self.log_path(job['id'])
+        return job
+
+    def _select(self, where='', params=()):
+        with self._connect() as conn:
+            cursor = conn.execute(f"SELECT * FROM {self.TABLE} {where}", params)
+            names = [column[0] for column in cursor.description]
+            return [self._to_job(row, names) for row in cursor.fetchall()]
+
+    # --- Rutas de cada trabajo --------------------------------------------------
+
+    def job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, f"{job_id:05d}")
+
+    def log_path(self, job_id):
+        return os.path.join(self.job_dir(job_id), 'train.log')
+
+    def result_path(self, job_id):
+        return os.path.join(self.job_dir(job_id), 'result.json')
+
+    def status_path(self, job_id):
+        return os.path.join(self.job_dir(job_id), 'status.json')
+
+    # --- Consultas --------------------------------------------------------------
+
+    def submit(self, model_name, kind, profession_folders, params=None, priority=0, cpus=None, memory_mb=None):
+        """Encola un trabajo y devuelve su id
+
+        ``params`` admite los argumentos de entrenamiento de la vista correspondiente:
+        ``model_type``, ``epochs``, ``batch_size``, ``chunking``, ``performance_options``
+        y ``time_budget`` (segundos).
+        """
+        if kind not in ('ml', 'dl'):
+            raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+        if not model_name:
+            raise ValueError("El trabajo necesita un nombre de modelo")
+        if not profession_folders:
+            raise ValueError("El trabajo necesita al menos una carpeta de profesión")
+        missing = [folder for folder in profession_folders.values() if not os.path.isdir(folder)]
+        if missing:
+            raise ValueError(f"Carpetas inexistentes: {', '.join(missing)}")
+
+        params = dict(params or {})
+        default_cpus, default_memory = DEFAULT_RESOURCES.get(
+            'ml' if kind == 'ml' else params.get('model_type', 'lstm'), DEFAULT_RESOURCES['ml'])
+        with self._connect() as conn:
+            cursor = conn.execute(f"""
+            INSERT INTO {self.TABLE}
+                (nombre_modelo, tipo, carpetas, parametros, prioridad, cpus, memoria_mb, fecha_creacion)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (model_name, kind, json.dumps(profession_folders, ensure_ascii=False),
+                  json.dumps(params, ensure_ascii=False), priority, cpus or default_cpus,
+                  memory_mb or default_memory, _now()))
+            job_id = cursor.lastrowid
+        metrics.increment('training_job_submitted', kind=kind)
+        return job_id
+
+    def get(self, job_id):
+        jobs = self._select("WHERE id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def list_jobs(self, states=None, limit=None):
+        """Trabajos más recientes primero, opcionalmente filtrados por estado"""
+        where, params = '', ()
+        if states:
+            where = f"WHERE estado IN ({', '.join('?' * len(states))})"
+            params = tuple(states)
+        where += " ORDER BY id DESC"
+        if limit:
+            where += f" LIMIT {int(limit)}"
+        return self._select(where, params)
+
+    def next_queued(self):
+        """Trabajos en cola en orden de ejecución (prioridad y antigüedad)"""
+        return self._select("WHERE estado = 'queued' AND cancelar = 0 ORDER BY prioridad DESC, id ASC")
+
+    def counts(self):
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT estado, COUNT(*) FROM {self.TABLE} GROUP BY estado").fetchall()
+        return dict(rows)
+
+    # --- Transiciones -----------------------------------------------------------
+
+    def mark_running(self, job_id, pid):
+        with self._connect() as conn:
+            conn.execute(f"""
+            UPDATE {self.TABLE}
+            SET estado = 'running', pid = ?, intentos = intentos + 1, fecha_inicio = ?, fecha_fin = NULL,
+                mensaje = NULL
+            WHERE id = ?
+            """, (pid, _now(), job_id))
+
+    def mark_done(self, job_id, state, message=None, result=None):
+        with self._connect() as conn:
+            conn.execute(f"""
+            UPDATE {self.TABLE} SET estado = ?, mensaje = ?, resultado = ?, fecha_fin = ?, pid = NULL
+            WHERE id = ?
+            """, (state, message, json.dumps(result, ensure_ascii=False, default=str) if result else None,
+                  _now(), job_id))
+        metrics.increment('training_job_finished', state=state)
+
+    def requeue(self, job_id, message=None, params=None):
+        """Devuelve un trabajo a la cola (reintento manual o tras una interrupción)"""
+        with self._connect() as conn:
+            if params is not None:
+                conn.execute(f"UPDATE {self.TABLE} SET parametros = ? WHERE id = ?",
+                             (json.dumps(params, ensure_ascii=False), job_id))
+            conn.execute(f"""
+            UPDATE {self.TABLE} SET estado = 'queued', pid = NULL, cancelar = 0, mensaje = ?, fecha_fin = NULL
+            WHERE id = ?
+            """, (message, job_id))
+
+    def retry(self, job_id):
+        job = self.get(job_id)
+        if job is None or job['state'] in ACTIVE_STATES:
+            return False
+        with self._connect() as conn:
+            conn.execute(f"UPDATE {self.TABLE} SET intentos = 0 WHERE id = ?", (job_id,))
+        self.requeue(job_id)
+        return True
+
+    def request_cancel(self, job_id):
+        """Cancela un trabajo en cola al instante; uno en ejecución se termina desde el planificador"""
+        with self._connect() as conn:
+            conn.execute(f"""
+            UPDATE {self.TABLE} SET estado = 'cancelled', fecha_fin = ?, mensaje = 'Cancelado antes de empezar'
+            WHERE id = ? AND estado = 'queued'
+            """, (_now(), job_id))
+            cursor = conn.execute(f"UPDATE {self.TABLE} SET cancelar = 1 WHERE id = ? AND estado = 'running'",
+                                  (job_id,))
+            return cursor.rowcount > 0
+
+    def set_priority(self, job_id, priority):
+        with self._connect() as conn:
+            conn.execute(f"UPDATE {self.TABLE} SET prioridad = ? WHERE id = ?", (priority, job_id))
+
+    def delete_finished(self):
+        """Borra de la lista los trabajos terminados (sus registros se conservan en disco)"""
+        with self._connect() as conn:
+            cursor = conn.execute(f"DELETE FROM {self.TABLE} WHERE estado IN ('finished', 'failed', 'cancelled')")
+            return cursor.rowcount
+
+    def read_log(self, job_id, max_bytes=LOG_TAIL_BYTES):
+        """Final del registro de un trabajo"""
+        try:
+            with open(self.log_path(job_id), 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - max_bytes))
+                return f.read().decode('utf-8', errors='replace')
+        except FileNotFoundError:
+            return ''
+
+    # --- Turno del planificador -------------------------------------------------
+
+    def acquire_lease(self, owner, ttl=LEASE_SECONDS):
+        """Renueva o toma el turno de planificador; False si otro lo mantiene vivo"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT propietario, latido FROM planificador WHERE id = 1").fetchone()
+            if row is not None and row[0] != owner and now - row[1] < ttl:
+                return False
+            conn.execute("INSERT OR REPLACE INTO planificador (id, propietario, latido) VALUES (1, ?, ?)",
+                         (owner, now))
+            return True
+
+    def release_lease(self, owner):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM planificador WHERE id = 1 AND propietario = ?", (owner,))
+
+    def scheduler_alive(self, ttl=LEASE_SECONDS):
+        with self._connect() as conn:
+            row = conn.execute("SELECT latido FROM planificador WHERE id = 1").fetchone()
+        return row is not None and time.time() - row[0] < ttl
+
+
+# --- Ejecución ------------------------------------------------------------------
+
+def build_train_arguments(job, cpus, result_path):
+    """Argumentos de ``models.cli`` equivalentes a los parámetros del trabajo"""
+    from .cli import PERFORMANCE_MODES
+
+    params = job['params']
+    argv = ['--jobs', str(cpus), 'train', '--name', job['model_name'], '--kind', job['kind'],
+            '--output', result_path]
+    for profession, folder in job['folders'].items():
+        argv += ['--folder', f"{profession}={folder}"]
+    if params.get('model_type'):
+        argv += ['--model-type', params['model_type']]
+    if job['kind'] == 'dl':
+        argv += ['--epochs', str(params.get('epochs', 10)), '--batch-size', str(params.get('batch_size', 32))]
+        chunking = params.get('chunking')
+        if chunking and chunking.get('enabled', True):
+            argv.append('--chunking')
+            for option, key in (('--chunk-window', 'window'), ('--chunk-stride', 'stride'), ('--pooling', 'pooling')):
+                if chunking.get(key):
+                    argv += [option, str(chunking[key])]
+        performance = params.get('performance_options')
+        mode = next((name for name, value in PERFORMANCE_MODES.items() if value == performance), None)
+        if mode:
+            argv += ['--performance', mode]
+        if params.get('time_budget'):
+            argv += ['--time-budget', str(params['time_budget'] / 60)]
+        if params.get('resume'):
+            argv.append('--resume')
+    return argv
+
+
+def execute(job_dir, cli_argv):
+    """Proceso de un trabajo: ejecuta ``models.cli`` y deja su código de salida en status.json
+
+    Sin status.json, el planificador sabe que el proceso se interrumpió.
+    """
+    from .cli import main as cli_main
+
+    start = time.time()
+    try:
+        code = cli_main(cli_argv)
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    with open(os.path.join(job_dir, 'status.json'), 'w', encoding='utf-8') as f:
+        json.dump({'returncode': code, 'seconds': time.time() - start}, f)
+    return code
+
+
+class TrainingScheduler:
+    """Reparte los trabajos en cola entre procesos respetando los límites de recursos
+
+    - ``max_cpus`` y ``max_memory_mb`` acotan la suma de lo reservado por los trabajos
+      en ejecución (por defecto, todas las CPUs y el 80% de la memoria). Un trabajo
+      más pequeño puede adelantar a uno que aún no cabe.
+    - Antes de lanzar un trabajo se comprueba además la memoria libre real.
+    - Cada proceso recibe ``--jobs`` y ``OMP_NUM_THREADS``/``TF_NUM_INTRAOP_THREADS``
+      igual a sus CPUs reservadas, para que varios trabajos no se pisen.
+    """
+
+    def __init__(self, store=None, max_cpus=None, max_memory_mb=None, max_jobs=None, poll_interval=5.0):
+        self.store = store or JobStore()
+        self.max_cpus = max_cpus or os.cpu_count() or 2
+        total_memory = total_memory_mb()
+        self.max_memory_mb = max_memory_mb or (int(total_memory * 0.8) if total_memory else 4096)
+        self.max_jobs = max_jobs
+        self.poll_interval = poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.is_leader = False
+        self._processes = {}   # id -> Popen de los trabajos lanzados por este planificador
+        self._terminating = {} # id -> instante en que se pidió terminar
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # --- Bucle ------------------------------------------------------------------
+
+    def tick(self):
+        """Un paso del planificador; devuelve False si otro planificador tiene el turno"""
+        self.is_leader = self.store.acquire_lease(self.owner)
+        if not self.is_leader:
+            return False
+        running = self._reap()
+        self._handle_cancellations(running)
+        self._start_ready(running)
+        return True
+
+    def run(self):
+        """Bucle principal; termina con ``stop()``. Los trabajos en curso siguen ejecutándose"""
+        print(f"🗓️ Planificador de entrenamientos: {self.max_cpus} CPUs, {self.max_memory_mb} MB")
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.tick()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Error en la cola de entrenamientos: {e}")
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            self.store.release_lease(self.owner)
+
+    def start(self):
+        """Arranca el bucle en un hilo de fondo (interfaz gráfica)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name='training-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self):
+        """Revisa la cola ya (p. ej. justo después de encolar desde la interfaz)"""
+        self._wake.set()
+
+    # --- Pasos ------------------------------------------------------------------
+
+    def _reap(self):
+        """Cierra los trabajos terminados y devuelve los que siguen en ejecución"""
+        running = []
+        for job in self.store.list_jobs(states=('running',)):
+            process = self._processes.get(job['id'])
+            returncode = None
+            if process is not None:
+                returncode = process.poll()
+                finished = returncode is not None
+            else:
+                # Trabajo lanzado por otro planificador (o antes de reiniciar la interfaz)
+                finished = not process_alive(job['pid'])
+            if finished:
+                self._processes.pop(job['id'], None)
+                self._terminating.pop(job['id'], None)
+                self._finalize(job, returncode)
+            else:
+                running.append(job)
+        return running
+
+    def _finalize(self, job, returncode=None):
+        """Estado final según status.json; sin él, el proceso se interrumpió
+
+        Con el código de salida de un proceso propio se distingue además un fallo al
+        arrancar (código positivo) de una terminación por señal (código negativo).
+        """
+        status = _read_json(self.store.status_path(job['id']))
+        if status is None and returncode is not None and returncode > 0:
+            status = {'returncode': returncode}
+        result = _read_json(self.store.result_path(job['id']))
+        if status is not None and status.get('returncode') == 0 and result and result.get('model_saved'):
+            summary = {key: result.get(key) for key in ('model_name', 'accuracy', 'training_time', 'stopped_early')
+                       if key in result}
+            accuracy = result.get('accuracy')
+            message = f"Accuracy: {accuracy:.3f}" if isinstance(accuracy, (int, float)) else "Modelo guardado"
+            self.store.mark_done(job['id'], 'finished', message, summary)
+        elif job['cancel_requested']:
+            self.store.mark_done(job['id'], 'cancelled', "Cancelado durante el entrenamiento")
+        elif status is None and job['attempts'] < MAX_ATTEMPTS:
+            params = dict(job['params'])
+            if job['kind'] == 'dl':
+                params['resume'] = True  # Continúa desde el último checkpoint guardado
+            self.store.requeue(job['id'], f"Interrumpido (intento {job['attempts']}); vuelve a la cola", params)
+        else:
+            reason = _last_error_line(self.store.read_log(job['id'], 8192)) or "El proceso terminó sin guardar el modelo"
+            if status is None:
+                reason = f"Interrumpido {job['attempts']} veces. {reason}"
+            self.store.mark_done(job['id'], 'failed', reason)
+
+    def _handle_cancellations(self, running):
+        now = time.monotonic()
+        for job in running:
+            if not job['cancel_requested']:
+                continue
+            requested = self._terminating.get(job['id'])
+            if requested is None:
+                self._terminating[job['id']] = now
+                terminate_process(job['pid'])
+            elif now - requested > KILL_GRACE_SECONDS:
+                terminate_process(job['pid'], force=True)
+
+    def _start_ready(self, running):
+        used_cpus = sum(min(job['cpus'], self.max_cpus) for job in running)
+        used_memory = sum(min(job['memory_mb'], self.max_memory_mb) for job in running)
+        active = len(running)
+        for job in self.store.next_queued():
+            if self.max_jobs and active >= self.max_jobs:
+                break
+            cpus = min(job['cpus'], self.max_cpus)
+            memory = min(job['memory_mb'], self.max_memory_mb)
+            if used_cpus + cpus > self.max_cpus or used_memory + memory > self.max_memory_mb:
+                continue
+            available = available_memory_mb()
+            if available is not None and available < memory:
+                break  # La memoria libre real no alcanza: se espera a que termine algo
+            try:
+                self._launch(job, cpus)
+            except OSError as e:
+                self.store.mark_done(job['id'], 'failed', f"No se pudo iniciar el proceso: {e}")
+                continue
+            used_cpus += cpus
+            used_memory += memory
+            active += 1
+
+    def _launch(self, job, cpus):
+        job_dir = self.store.job_dir(job['id'])
+        os.makedirs(job_dir, exist_ok=True)
+        for path in (self.store.status_path(job['id']), self.store.result_path(job['id'])):
+            if os.path.exists(path):
+                os.remove(path)
+
+        cli_argv = build_train_arguments(job, cpus, self.store.result_path(job['id']))
+        command = [sys.executable, '-m', 'models.training_jobs', 'exec', '--job-dir', job_dir, '--'] + cli_argv
+        env = dict(os.environ, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8',
+                   OMP_NUM_THREADS=str(cpus), TF_NUM_INTRAOP_THREADS=str(cpus),
+                   TF_NUM_INTEROP_THREADS=str(min(2, cpus)))
+        with open(self.store.log_path(job['id']), 'a', encoding='utf-8') as log:
+            log.write(f"\n=== {_now()} · intento {job['attempts'] + 1} · {cpus} CPUs, "
+                      f"{job['memory_mb']} MB ===\n")
+            log.flush()
+            process = subprocess.Popen(command, cwd=str(Settings.BASE_DIR), env=env, stdin=subprocess.DEVNULL,
+                                       stdout=log, stderr=subprocess.STDOUT, **_detached_options())
+        self._processes[job['id']] = process
+        self.store.mark_running(job['id'], process.pid)
+        print(f"▶️ Trabajo {job['id']} ({job['kind'].upper()} '{job['model_name']}') iniciado con {cpus} CPUs")
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _last_error_line(log_text):
+    for line in reversed(log_text.strip().splitlines()):
+        if line.strip() and not line.startswith('==='):
+            return line.strip()[:300]
+    return None
+
+
+_shared_scheduler = None
+
+
+def shared_scheduler():
+    """Planificador único de la interfaz gráfica"""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = TrainingScheduler()
+    return _shared_scheduler
+
+
+# --- Línea de comandos ----------------------------------------------------------
+
+def _format_job(job):
+    created = (job['created_at'] or '').replace('T', ' ')
+    return (f"{job['id']:>5}  {job['state']:<9}  {job['kind']:<2}  {job['params'].get('model_type') or '-':<19}  "
+            f"{job['model_name']:<28}  {created:<19}  {job['message'] or ''}")
+
+
+def cmd_submit(args):
+    folders = {}
+    if args.data:
+        with os.scandir(args.data) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir():
+                    folders[entry.name] = entry.path
+    for spec in args.folder or []:
+        profession, _, folder = spec.partition('=')
+        if not folder:
+            raise ValueError(f"Formato inválido para --folder (se espera profesion=ruta): {spec}")
+        folders[profession] = os.path.abspath(folder)
+    folders = {profession: os.path.abspath(folder) for profession, folder in folders.items()}
+
+    from .cli import PERFORMANCE_MODES
+    params = {'model_type': args.model_type or ('random_forest' if args.kind == 'ml' else 'lstm')}
+    if args.kind == 'dl':
+        params.update({
+            'epochs': args.epochs,
+            'batch_size': args.batch_size,
+            'performance_options': PERFORMANCE_MODES.get(args.performance),
+            'time_budget': args.time_budget * 60 if args.time_budget else None,
+            'chunking': {'enabled': True, 'window': args.chunk_window, 'stride': args.chunk_stride,
+                         'pooling': args.pooling} if args.chunking else None
+        })
+    job_id = JobStore().submit(args.name, args.kind, folders, params, priority=args.priority,
+                               cpus=args.cpus, memory_mb=args.memory_mb)
+    print(job_id)
+    return 0
+
+
+def cmd_list(args):
+    jobs = JobStore().list_jobs(states=[args.state] if args.state else None, limit=args.limit)
+    if args.json:
+        print(json.dumps(jobs, indent=2, ensure_ascii=False, default=str))
+        return 0
+    for job in jobs:
+        print(_format_job(job))
+    return 0
+
+
+def cmd_status(args):
+    job = JobStore().get(args.id)
+    if job is None:
+        raise ValueError(f"No existe el trabajo {args.id}")
+    print(json.dumps(job, indent=2, ensure_ascii=False, default=str))
+    return 0
+
+
+def cmd_log(args):
+    store = JobStore()
+    if store.get(args.id) is None:
+        raise ValueError(f"No existe el trabajo {args.id}")
+    print(store.read_log(args.id), end='')
+    if args.follow:
+        position = os.path.getsize(store.log_path(args.id)) if os.path.exists(store.log_path(args.id)) else 0
+        try:
+            while store.get(args.id)['state'] in ACTIVE_STATES:
+                time.sleep(1)
+                if os.path.exists(store.log_path(args.id)):
+                    with open(store.log_path(args.id), 'rb') as f:
+                        f.seek(position)
+                        chunk = f.read()
+                        position = f.tell()
+                    print(chunk.decode('utf-8', errors='replace'), end='', flush=True)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def cmd_cancel(args):
+    store = JobStore()
+    if store.get(args.id) is None:
+        raise ValueError(f"No existe el trabajo {args.id}")
+    if store.request_cancel(args.id) and not store.scheduler_alive():
+        # Sin planificador activo nadie más enviará la señal
+        terminate_process(store.get(args.id)['pid'])
+    print(f"Trabajo {args.id}: {store.get(args.id)['state']}{' (cancelando)' if store.get(args.id)['cancel_requested'] else ''}")
+    return 0
+
+
+def cmd_retry(args):
+    if not JobStore().retry(args.id):
+        raise ValueError(f"El trabajo {args.id} no existe o sigue activo")
+    return 0
+
+
+def cmd_run(args):
+    scheduler = TrainingScheduler(max_cpus=args.max_cpus, max_memory_mb=args.max_memory_mb,
+                                  max_jobs=args.max_jobs, poll_interval=args.interval)
+    signal.signal(signal.SIGINT, lambda *_: scheduler.stop(timeout=0))
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop(timeout=0))
+    scheduler.run()
+    return 0
+
+
+def cmd_exec(args):
+    argv = args.cli_args[1:] if args.cli_args[:1] == ['--'] else args.cli_args
+    return execute(args.job_dir, argv)
+
+
+def build_parser():
+    from .cli import ML_MODEL_TYPES, DL_MODEL_TYPES, POOLING_MODES, PERFORMANCE_MODES
+
+    parser = argparse.ArgumentParser(prog='python -m models.training_jobs',
+                                     description="Cola de trabajos de entrenamiento")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    submit = subparsers.add_parser('submit', help="Encolar un entrenamiento")
+    submit.add_argument('--name', required=True, help="Nombre con el que se guarda el modelo")
+    submit.add_argument('--kind', choices=['ml', 'dl'], default='ml')
+    submit.add_argument('--data', help="Carpeta con una subcarpeta por profesión")
+    submit.add_argument('--folder', action='append', metavar='PROFESION=RUTA',
+                        help="Carpeta de una profesión (se puede repetir)")
+    submit.add_argument('--model-type', choices=ML_MODEL_TYPES + DL_MODEL_TYPES)
+    submit.add_argument('--epochs', type=int, default=10)
+    submit.add_argument('--batch-size', type=int, default=32)
+    submit.add_argument('--chunking', action='store_true')
+    submit.add_argument('--chunk-window', type=int)
+    submit.add_argument('--chunk-stride', type=int)
+    submit.add_argument('--pooling', choices=POOLING_MODES, default='mean')
+    submit.add_argument('--performance', choices=list(PERFORMANCE_MODES))
+    submit.add_argument('--time-budget', type=float, metavar='MIN')
+    submit.add_argument('--priority', type=int, default=0, help="Mayor prioridad se ejecuta antes")
+    submit.add_argument('--cpus', type=int, help="CPUs reservadas (por defecto según el tipo de modelo)")
+    submit.add_argument('--memory-mb', type=int, help="Memoria reservada en MB")
+    submit.set_defaults(func=cmd_submit)
+
+    listing = subparsers.add_parser('list', help="Listar trabajos")
+    listing.add_argument('--state', choices=JOB_STATES)
+    listing.add_argument('--limit', type=int, default=50)
+    listing.add_argument('--json', action='store_true')
+    listing.set_defaults(func=cmd_list)
+
+    status = subparsers.add_parser('status', help="Detalle de un trabajo (JSON)")
+    status.add_argument('id', type=int)
+    status.set_defaults(func=cmd_status)
+
+    log = subparsers.add_parser('log', help="Registro de un trabajo")
+    log.add_argument('id', type=int)
+    log.add_argument('--follow', '-f', action='store_true', help="Seguir el registro hasta que termine")
+    log.set_defaults(func=cmd_log)
+
+    cancel = subparsers.add_parser('cancel', help="Cancelar un trabajo en cola o en ejecución")
+    cancel.add_argument('id', type=int)
+    cancel.set_defaults(func=cmd_cancel)
+
+    retry = subparsers.add_parser('retry', help="Volver a encolar un trabajo terminado")
+    retry.add_argument('id', type=int)
+    retry.set_defaults(func=cmd_retry)
+
+    run = subparsers.add_parser('run', help="Ejecutar el planificador en primer plano")
+    run.add_argument('--max-cpus', type=int)
+    run.add_argument('--max-memory-mb', type=int)
+    run.add_argument('--max-jobs', type=int, help="Trabajos simultáneos como máximo")
+    run.add_argument('--interval', type=float, default=5.0, help="Segundos entre revisiones de la cola")
+    run.set_defaults(func=cmd_run)
+
+    execute_job = subparsers.add_parser('exec', help=argparse.SUPPRESS)
+    execute_job.add_argument('--job-dir', required=True)
+    execute_job.add_argument('cli_args', nargs=argparse.REMAINDER)
+    execute_job.set_defaults(func=cmd_exec)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
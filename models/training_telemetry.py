@@ -0,0 +1,315 @@
+"""
+Telemetría de entrenamientos: rendimiento por fase, tiempo restante estimado y memoria
+
+Un ``TrainingTelemetry`` acompaña a un entrenamiento desde la extracción de texto
+hasta la evaluación. Cada fase (``extraction``, ``vectorization``, ``training``...)
+informa de su avance con ``update``; la telemetría calcula la velocidad suavizada
+(archivos/s, muestras/s, tokens/s), el tiempo restante y la memoria del proceso, y:
+
+- llama a ``callback(instantánea)`` como mucho cada ``interval`` segundos (las vistas
+  de entrenamiento la muestran en vivo),
+- guarda una serie temporal que los clasificadores escriben junto al modelo en
+  ``training_telemetry.json`` para comparar ejecuciones.
+
+Comparar ejecuciones guardadas:
+    python -m models.training_telemetry saved_models/modelo_a saved_deep_models/modelo_b
+"""
+
+import os
+import sys
+import json
+import time
+import datetime
+import threading
+import argparse
+from contextlib import contextmanager
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+TELEMETRY_FILE = 'training_telemetry.json'
+RATE_SMOOTHING = 0.3   # Peso de la última medición en la media móvil exponencial
+MAX_SAMPLES = 5000     # Con más muestras, la serie se diezma a la mitad
+
+
+def process_memory_mb():
+    """Memoria residente del proceso actual en MB (None si no se puede medir)"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    try:
+        with open('/proc/self/statm', 'r', encoding='ascii') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Pico, no valor actual: es lo único disponible sin psutil ni /proc
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except (ImportError, OSError):
+        return None
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "—"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def format_snapshot(snapshot):
+    """Resumen de una línea para los registros de entrenamiento"""
+    parts = [snapshot['phase']]
+    if snapshot.get('total'):
+        parts.append(f"{snapshot['done']}/{snapshot['total']} {snapshot['unit']}")
+    if snapshot.get('rate'):
+        parts.append(f"{snapshot['rate']:.1f} {snapshot['unit']}/s")
+    if snapshot.get('samples_per_second'):
+        parts.append(f"{snapshot['samples_per_second']:.1f} muestras/s")
+    if snapshot.get('tokens_per_second'):
+        parts.append(f"{snapshot['tokens_per_second'] / 1000:.1f}k tokens/s")
+    if snapshot.get('eta_seconds') is not None:
+        parts.append(f"ETA {format_duration(snapshot['eta_seconds'])}")
+    elif snapshot.get('phase_seconds'):
+        parts.append(f"{format_duration(snapshot['phase_seconds'])} transcurridos")
+    if snapshot.get('memory_mb') is not None:
+        parts.append(f"{snapshot['memory_mb']:.0f} MB")
+    return " · ".join(parts)
+
+
+class TrainingTelemetry:
+    """Serie temporal del progreso de un entrenamiento, segura entre hilos"""
+
+    def __init__(self, callback=None, interval=1.0):
+        self.callback = callback
+        self.interval = interval
+        self.started_at = datetime.datetime.now()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.series = []
+        self.phases = []
+        self.peak_memory_mb = None
+        self._phase = None
+        self._last_emit = 0.0
+        self._last_sample = 0.0
+
+    # --- Fases ------------------------------------------------------------------
+
+    def start_phase(self, phase, total=None, unit='pasos'):
+        """Inicia una fase; la anterior, si la hay, se cierra"""
+        with self._lock:
+            self._close_phase()
+            now = time.perf_counter()
+            self._phase = {
+                'phase': phase, 'unit': unit, 'total': total, 'done': 0, 'samples': 0, 'tokens': 0,
+                'started': now, 'last_time': now, 'last_done': 0, 'last_samples': 0, 'last_tokens': 0,
+                'rate': None, 'samples_rate': None, 'tokens_rate': None, 'extra': {}
+            }
+        self._publish(force=True)
+
+    def end_phase(self):
+        with self._lock:
+            self._close_phase()
+
+    def _close_phase(self):
+        phase = self._phase
+        if phase is None:
+            return
+        seconds = time.perf_counter() - phase['started']
+        self.phases.append({
+            'phase': phase['phase'],
+            'unit': phase['unit'],
+            'done': phase['done'],
+            'seconds': seconds,
+            'rate': phase['done'] / seconds if seconds > 0 and phase['done'] else None,
+            'samples_per_second': phase['samples'] / seconds if seconds > 0 and phase['samples'] else None,
+            'tokens_per_second': phase['tokens'] / seconds if seconds > 0 and phase['tokens'] else None,
+        })
+        self._phase = None
+
+    @contextmanager
+    def ticking(self, phase, unit='pasos'):
+        """Fase sin avance medible (p. ej. ``fit`` de scikit-learn): solo tiempo y memoria
+
+        Un hilo auxiliar publica una instantánea cada ``interval`` segundos mientras dura.
+        """
+        self.start_phase(phase, unit=unit)
+        stop = threading.Event()
+
+        def tick():
+            while not stop.wait(self.interval):
+                self._publish(force=True)
+
+        thread = threading.Thread(target=tick, name=f"telemetry-{phase}", daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+            thread.join()
+            self.end_phase()
+
+    # --- Avance -----------------------------------------------------------------
+
+    def update(self, done=None, samples=0, tokens=0, total=None, force=False, **extra):
+        """Registra el avance de la fase actual
+
+        Args:
+            done: unidades completadas en total (si es None, se suma 1)
+            samples, tokens: muestras y tokens procesados desde la última llamada
+            total: corrige el total de la fase si no se conocía al iniciarla
+            force: publica la instantánea aunque no haya pasado ``interval``
+            extra: valores adicionales de la instantánea (p. ej. ``loss``)
+        """
+        with self._lock:
+            phase = self._phase
+            if phase is None:
+                return None
+            phase['done'] = phase['done'] + 1 if done is None else done
+            phase['samples'] += samples
+            phase['tokens'] += tokens
+            if total is not None:
+                phase['total'] = total
+            phase['extra'].update(extra)
+
+            now = time.perf_counter()
+            elapsed = now - phase['last_time']
+            if elapsed >= min(self.interval, 0.5) or force:
+                self._update_rates(phase, now, elapsed)
+        return self._publish(force=force)
+
+    @staticmethod
+    def _update_rates(phase, now, elapsed):
+        if elapsed <= 0:
+            return
+        for key, last_key, rate_key in (('done', 'last_done', 'rate'), ('samples', 'last_samples', 'samples_rate'),
+                                        ('tokens', 'last_tokens', 'tokens_rate')):
+            delta = phase[key] - phase[last_key]
+            if delta <= 0 and phase[rate_key] is None:
+                continue
+            current = delta / elapsed
+            previous = phase[rate_key]
+            phase[rate_key] = current if previous is None else (
+                RATE_SMOOTHING * current + (1 - RATE_SMOOTHING) * previous)
+            phase[last_key] = phase[key]
+        phase['last_time'] = now
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self):
+        phase = self._phase
+        memory = process_memory_mb()
+        if memory is not None:
+            self.peak_memory_mb = max(memory, self.peak_memory_mb or 0)
+        snapshot = {
+            't': round(time.perf_counter() - self._start, 3),
+            'memory_mb': round(memory, 1) if memory is not None else None,
+        }
+        if phase is None:
+            snapshot['phase'] = 'idle'
+            return snapshot
+
+        total, done, rate = phase['total'], phase['done'], phase['rate']
+        eta = None
+        if total and rate:
+            eta = max(total - done, 0) / rate
+        snapshot.update({
+            'phase': phase['phase'],
+            'unit': phase['unit'],
+            'done': done,
+            'total': total,
+            'progress': min(done / total, 1.0) if total else None,
+            'phase_seconds': round(time.perf_counter() - phase['started'], 3),
+            'rate': rate,
+            'samples_per_second': phase['samples_rate'],
+            'tokens_per_second': phase['tokens_rate'],
+            'eta_seconds': eta,
+            **phase['extra']
+        })
+        return snapshot
+
+    def _publish(self, force=False):
+        now = time.perf_counter()
+        with self._lock:
+            if not force and now - self._last_emit < self.interval:
+                return None
+            self._last_emit = now
+            snapshot = self._snapshot()
+            self.series.append(snapshot)
+            if len(self.series) > MAX_SAMPLES:
+                # Conserva la forma de la serie completa con la mitad de puntos
+                self.series = self.series[::2]
+        if self.callback is not None:
+            self.callback(snapshot)
+        return snapshot
+
+    # --- Resultado --------------------------------------------------------------
+
+    def to_dict(self):
+        with self._lock:
+            self._close_phase()
+            return {
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'total_seconds': time.perf_counter() - self._start,
+                'peak_memory_mb': self.peak_memory_mb,
+                'phases': list(self.phases),
+                'series': list(self.series),
+            }
+
+    def save(self, folder):
+        return save_telemetry(self.to_dict(), folder)
+
+
+def save_telemetry(telemetry, folder):
+    path = os.path.join(folder, TELEMETRY_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(telemetry, f, indent=2, ensure_ascii=False, default=str)
+    return path
+
+
+def load_telemetry(folder):
+    """Telemetría guardada junto a un modelo, o None si se entrenó sin ella"""
+    try:
+        with open(os.path.join(folder, TELEMETRY_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara la telemetría de entrenamientos guardados")
+    parser.add_argument('models', nargs='+', help="Carpetas de modelos guardados")
+    args = parser.parse_args(argv)
+
+    for folder in args.models:
+        telemetry = load_telemetry(folder)
+        name = os.path.basename(os.path.normpath(folder))
+        if telemetry is None:
+            print(f"{name}: sin telemetría")
+            continue
+        peak = telemetry.get('peak_memory_mb')
+        print(f"{name}  ({telemetry['started_at']}, {format_duration(telemetry['total_seconds'])}, "
+              f"pico {peak:.0f} MB)" if peak else f"{name}  ({telemetry['started_at']})")
+        for phase in telemetry['phases']:
+            rates = []
+            if phase.get('rate'):
+                rates.append(f"{phase['rate']:.1f} {phase['unit']}/s")
+            if phase.get('samples_per_second'):
+                rates.append(f"{phase['samples_per_second']:.1f} muestras/s")
+            if phase.get('tokens_per_second'):
+                rates.append(f"{phase['tokens_per_second']:.0f} tokens/s")
+            print(f"  {phase['phase']:<16} {format_duration(phase['seconds']):>9}  {'  '.join(rates)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
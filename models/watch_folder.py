@@ -0,0 +1,429 @@
+"""
+Servicio sin interfaz que vigila carpetas y clasifica automáticamente los CVs nuevos
+Usa watchdog (inotify/FSEvents/ReadDirectoryChanges) si está instalado y sondeo
+periódico en caso contrario; escribe los resultados en postulaciones.db o en JSONL
+
+Uso:
+    python -m models.watch_folder --folders /ruta/cvs [--sink sqlite|jsonl] [--model nombre]
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import sqlite3
+import argparse
+import datetime
+import threading
+from collections import OrderedDict
+
+from src.config.settings import Settings
+from src.monitoring import metrics
+from .text_extraction import CV_EXTENSIONS, DEFAULT_TIMEOUT, ExtractionRunner
+from .model_manager import ModelManager
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+class SQLiteSink:
+    """Escribe los resultados en la tabla ``clasificaciones_automaticas`` de postulaciones.db.
+
+    La misma tabla sirve de registro de archivos ya procesados (ruta, tamaño y fecha
+    de modificación), así un reinicio del servicio no vuelve a clasificar nada.
+    """
+
+    TABLE = 'clasificaciones_automaticas'
+
+    def __init__(self, db_path=None):
+        self.db_path = str(db_path or Settings.POSTULACIONES_DB)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {self.TABLE} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ruta TEXT NOT NULL,
+            archivo TEXT NOT NULL,
+            tamano INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            puesto_clasificacion TEXT,
+            porcentaje_clasificacion REAL,
+            nivel_confianza TEXT,
+            modelo_clasificacion TEXT,
+            estado TEXT NOT NULL,
+            mensaje TEXT,
+            fecha_clasificacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(ruta, tamano, mtime_ns)
+        )
+        """)
+        self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_auto_fecha ON {self.TABLE}(fecha_clasificacion)")
+        self.conn.commit()
+
+    @metrics.timed('db_read', sink='sqlite')
+    def is_processed(self, path, size, mtime_ns):
+        cursor = self.conn.execute(
+            f"SELECT 1 FROM {self.TABLE} WHERE ruta = ? AND tamano = ? AND mtime_ns = ?",
+            (path, size, mtime_ns)
+        )
+        return cursor.fetchone() is not None
+
+    @metrics.timed('db_write', sink='sqlite')
+    def write(self, rows):
+        self.conn.executemany(f"""
+        INSERT OR REPLACE INTO {self.TABLE}
+            (ruta, archivo, tamano, mtime_ns, puesto_clasificacion, porcentaje_clasificacion,
+             nivel_confianza, modelo_clasificacion, estado, mensaje, fecha_clasificacion)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            row['path'], row['file'], row['size'], row['mtime_ns'], row.get('predicted_profession'),
+            row.get('confidence'), row.get('confidence_level'), row['model'], row['status'],
+            row.get('message', ''), row['classified_at']
+        ) for row in rows])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class JSONLSink:
+    """Agrega una línea JSON por CV clasificado; el registro de procesados va en un SQLite aparte"""
+
+    def __init__(self, jsonl_path, state_db=None):
+        self.jsonl_path = jsonl_path
+        os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+        state_db = state_db or os.path.join(str(Settings.CACHE_DIR), 'watch_folder_state.db')
+        os.makedirs(os.path.dirname(state_db), exist_ok=True)
+        self.conn = sqlite3.connect(state_db, check_same_thread=False)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS procesados (
+            ruta TEXT NOT NULL, tamano INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+            PRIMARY KEY (ruta, tamano, mtime_ns)
+        )
+        """)
+        self.conn.commit()
+
+    @metrics.timed('db_read', sink='jsonl')
+    def is_processed(self, path, size, mtime_ns):
+        cursor = self.conn.execute(
+            "SELECT 1 FROM procesados WHERE ruta = ? AND tamano = ? AND mtime_ns = ?",
+            (path, size, mtime_ns)
+        )
+        return cursor.fetchone() is not None
+
+    @metrics.timed('db_write', sink='jsonl')
+    def write(self, rows):
+        with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO procesados (ruta, tamano, mtime_ns) VALUES (?, ?, ?)",
+            [(row['path'], row['size'], row['mtime_ns']) for row in rows]
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class FolderWatcher:
+    """Vigila carpetas y clasifica los CVs nuevos en lotes con el modelo publicado.
+
+    Un archivo se procesa solo cuando su tamaño y fecha de modificación no cambian
+    durante ``settle_seconds`` (evita leer copias a medias). La memoria está acotada:
+    como mucho ``max_pending`` archivos en espera y un lote de ``batch_size`` textos.
+    La extracción usa ``ExtractionRunner``: un PDF que tarde más de ``extract_timeout``
+    segundos se registra como error sin bloquear el servicio.
+    """
+
+    def __init__(self, folders, sink, model_name=None, is_deep_learning=False, batch_size=32,
+                 settle_seconds=2.0, poll_interval=2.0, max_workers=None, max_pending=10000,
+                 recursive=False, use_watchdog=True, extract_timeout=DEFAULT_TIMEOUT):
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        self.sink = sink
+        self.fixed_model = (model_name, is_deep_learning) if model_name else None
+        self.batch_size = batch_size
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.max_pending = max_pending
+        self.recursive = recursive
+        self.use_watchdog = use_watchdog and WATCHDOG_AVAILABLE
+        self.extract_timeout = extract_timeout
+
+        self.classifier = None
+        self.model_label = None
+        self._published_mtime = None
+        self._pending = OrderedDict()  # ruta -> (tamaño, mtime_ns, instante en que se vio estable)
+        # ruta -> (tamaño, mtime_ns) ya procesado o vacío; evita consultar el sink en cada sondeo
+        self._done = {}
+        self._events = set()
+        self._events_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self.stats = {'classified': 0, 'failed': 0, 'started': time.time()}
+
+    # --- Modelo -----------------------------------------------------------------
+
+    def _load_classifier(self, model_name, is_deep_learning):
+        if is_deep_learning:
+            from .deep_learning_classifier import DeepLearningClassifier
+            classifier = DeepLearningClassifier()
+        else:
+            from .cv_classifier import CVClassifier
+            classifier = CVClassifier()
+        if not classifier.load_model(model_name):
+            raise ValueError(f"No se pudo cargar el modelo '{model_name}'")
+        self.classifier = classifier
+        self.model_label = model_name
+        print(f"✅ Modelo cargado para clasificación automática: {model_name}")
+
+    def refresh_model(self):
+        """Carga el modelo fijo o recarga el publicado si cambió"""
+        if self.fixed_model:
+            if self.classifier is None:
+                self._load_classifier(*self.fixed_model)
+            return
+
+        published_file = Settings.PUBLISHED_MODEL_FILE
+        if not published_file.exists():
+            if self.classifier is None:
+                raise ValueError("No hay un modelo publicado; usa --model o publica uno desde la API")
+            return
+        mtime = published_file.stat().st_mtime_ns
+        if mtime != self._published_mtime:
+            published = ModelManager().get_published_model()
+            if published:
+                self._load_classifier(published['model_name'], published.get('is_deep_learning', False))
+                self._published_mtime = mtime
+
+    # --- Detección de archivos --------------------------------------------------
+
+    def _is_cv(self, path):
+        return path.lower().endswith(CV_EXTENSIONS)
+
+    def _scan(self):
+        """Sondeo completo de las carpetas (también se usa al arrancar con watchdog)"""
+        for folder in self.folders:
+            if self.recursive:
+                for root, _, files in os.walk(folder):
+                    for name in files:
+                        yield os.path.join(root, name)
+            else:
+                try:
+                    with os.scandir(folder) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                yield entry.path
+                except FileNotFoundError:
+                    continue
+
+    def _start_observer(self):
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    watcher._queue_event(event.src_path)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    watcher._queue_event(event.src_path)
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    watcher._queue_event(event.dest_path)
+
+        self._observer = Observer()
+        for folder in self.folders:
+            self._observer.schedule(_Handler(), folder, recursive=self.recursive)
+        self._observer.start()
+
+    def _queue_event(self, path):
+        if self._is_cv(path):
+            with self._events_lock:
+                self._events.add(path)
+
+    def _candidates(self):
+        if self.use_watchdog:
+            with self._events_lock:
+                events, self._events = self._events, set()
+            return events
+        return self._scan()
+
+    def _update_pending(self, paths):
+        """Registra candidatos y devuelve los que ya están estables y sin procesar"""
+        now = time.monotonic()
+        paths = iter(paths)
+        for path in paths:
+            if not self._is_cv(path):
+                continue
+            if path not in self._pending and len(self._pending) >= self.max_pending:
+                if self.use_watchdog:
+                    # Los eventos ya salieron de la cola: se devuelven para la próxima vuelta
+                    with self._events_lock:
+                        self._events.add(path)
+                        self._events.update(p for p in paths if p not in self._pending)
+                break
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self._pending.pop(path, None)
+                self._done.pop(path, None)
+                continue
+            previous = self._pending.get(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if previous is None or previous[:2] != signature:
+                if previous is None:
+                    if self._done.get(path) == signature:
+                        continue
+                    if self.sink.is_processed(path, *signature):
+                        self._done[path] = signature
+                        continue
+                self._pending[path] = (*signature, now)
+
+        ready = []
+        for path, (size, mtime_ns, since) in list(self._pending.items()):
+            if now - since < self.settle_seconds:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+                continue
+            if size == 0:
+                # Un archivo vacío estable no se clasifica; vuelve a entrar si cambia
+                del self._pending[path]
+                self._done[path] = (size, mtime_ns)
+                continue
+            ready.append((path, size, mtime_ns))
+        return ready
+
+    # --- Clasificación ----------------------------------------------------------
+
+    def _process(self, runner, ready):
+        for start in range(0, len(ready), self.batch_size):
+            if self._stop.is_set():
+                return
+            batch = ready[start:start + self.batch_size]
+            documents = {document['path']: document for document in
+                         runner.iter_documents([path for path, _, _ in batch], self._stop.is_set)}
+            if len(documents) < len(batch):
+                return  # Detenido a mitad de lote: los archivos siguen en espera
+            extracted = [path for path, _, _ in batch if documents[path]['status'] == 'success']
+            predictions = self.classifier.predict_batch([documents[path]['text'] for path in extracted])
+            results = dict(zip(extracted, predictions))
+
+            classified_at = datetime.datetime.now().isoformat(timespec='seconds')
+            rows = []
+            for path, size, mtime_ns in batch:
+                row = {
+                    'path': path, 'file': os.path.basename(path), 'size': size, 'mtime_ns': mtime_ns,
+                    'model': self.model_label, 'classified_at': classified_at
+                }
+                result = results.get(path)
+                if result is None or result.get('error', False):
+                    message = documents[path]['error'] if result is None else result.get('message', '')
+                    row.update({'status': 'error', 'message': message})
+                    self.stats['failed'] += 1
+                else:
+                    row.update({
+                        'status': 'ok',
+                        'predicted_profession': result['predicted_profession'],
+                        'confidence': result['confidence'],
+                        'confidence_level': result['confidence_level']
+                    })
+                    self.stats['classified'] += 1
+                rows.append(row)
+
+            self.sink.write(rows)
+            for path, size, mtime_ns in batch:
+                self._pending.pop(path, None)
+                self._done[path] = (size, mtime_ns)
+
+            elapsed_hours = max(time.time() - self.stats['started'], 1e-9) / 3600
+            total = self.stats['classified'] + self.stats['failed']
+            print(f"📄 Lote de {len(batch)} CVs clasificado "
+                  f"({total} en total, {total / elapsed_hours:.0f} CVs/hora)")
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        """Bucle principal; termina con ``stop()`` (o SIGINT/SIGTERM desde la línea de comandos)"""
+        self.refresh_model()
+        mode = "watchdog" if self.use_watchdog else f"sondeo cada {self.poll_interval}s"
+        print(f"👀 Vigilando {len(self.folders)} carpeta(s) ({mode})")
+
+        initial = list(self._scan())
+        if self.use_watchdog:
+            self._start_observer()
+
+        runner = ExtractionRunner(self.max_workers, self.extract_timeout or None)
+        try:
+            candidates = initial
+            while not self._stop.is_set():
+                self.refresh_model()
+                ready = self._update_pending(candidates)
+                if ready:
+                    self._process(runner, ready)
+                # Con watchdog, los archivos en espera se revisan también sin eventos nuevos
+                self._stop.wait(self.poll_interval if not ready else 0)
+                candidates = list(self._candidates())
+                if self.use_watchdog:
+                    candidates.extend(self._pending.keys())
+        finally:
+            if self._observer:
+                self._observer.stop()
+                self._observer.join()
+            self.sink.close()
+            print(f"🛑 Servicio detenido: {self.stats['classified']} clasificados, {self.stats['failed']} con error")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clasificación automática de CVs en carpetas vigiladas")
+    parser.add_argument('--folders', nargs='+', required=True, help="Carpetas a vigilar")
+    parser.add_argument('--sink', choices=['sqlite', 'jsonl'], default='sqlite',
+                        help="Destino de los resultados (postulaciones.db o archivo JSONL)")
+    parser.add_argument('--db', default=None, help="Ruta de la base de datos (por defecto postulaciones.db)")
+    parser.add_argument('--jsonl', default='clasificaciones.jsonl', help="Archivo JSONL de salida")
+    parser.add_argument('--model', default=None, help="Modelo a usar (por defecto, el publicado)")
+    parser.add_argument('--deep', action='store_true', help="El modelo indicado es de Deep Learning")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--settle', type=float, default=2.0, help="Segundos sin cambios antes de procesar")
+    parser.add_argument('--interval', type=float, default=2.0, help="Intervalo de sondeo en segundos")
+    parser.add_argument('--jobs', type=int, default=None, help="Procesos de extracción de texto")
+    parser.add_argument('--extract-timeout', type=float, default=DEFAULT_TIMEOUT, metavar='SEG',
+                        help="Segundos máximos de extracción por CV (0 = sin límite)")
+    parser.add_argument('--recursive', action='store_true', help="Incluir subcarpetas")
+    parser.add_argument('--polling', action='store_true', help="Forzar sondeo aunque watchdog esté disponible")
+    args = parser.parse_args(argv)
+
+    sink = SQLiteSink(args.db) if args.sink == 'sqlite' else JSONLSink(args.jsonl)
+    watcher = FolderWatcher(
+        args.folders, sink, model_name=args.model, is_deep_learning=args.deep,
+        batch_size=args.batch_size, settle_seconds=args.settle, poll_interval=args.interval,
+        max_workers=args.jobs, recursive=args.recursive, use_watchdog=not args.polling,
+        extract_timeout=args.extract_timeout
+    )
+
+    signal.signal(signal.SIGINT, lambda *_: watcher.stop())
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+    try:
+        watcher.run()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,15 @@
 from flask import Flask, jsonify, request
 from postulacion_backend import PostulacionManager
 from flask_cors import CORS
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.monitoring import metrics, profiling
 
 app = Flask(__name__)
 CORS(app)  # Permitir CORS para desarrollo local
+metrics.register_flask(app)  # /metrics (formato Prometheus), activo con CV_METRICS=1
+profiling.register_flask(app)  # Perfil por petición, activo con CV_PROFILE=1
 
 postulacion_manager = PostulacionManager()
 
@@ -25,7 +31,8 @@ def handle_postulaciones():
         cv_filename = cv_file.filename
         cv_data = cv_file.read()
 
-        result = postulacion_manager.process_postulacion(nombre, dni, telefono, correo, cv_filename, cv_data)
+        with metrics.timer('db_write', operation='add_postulacion'):
+            result = postulacion_manager.process_postulacion(nombre, dni, telefono, correo, cv_filename, cv_data)
 
         if result.get('success'):
             return jsonify(result), 201
@@ -33,7 +40,8 @@ def handle_postulaciones():
             return jsonify(result), 400
     
     # Manejo para GET
-    postulaciones = postulacion_manager.get_postulaciones_list()
+    with metrics.timer('db_read', operation='list_postulaciones'):
+        postulaciones = postulacion_manager.get_postulaciones_list()
     # Convertir a lista de dicts para JSON
     postulaciones_list = []
     for p in postulaciones:
@@ -9,14 +9,16 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from models.model_manager import ModelManager
 from models.cv_classifier import CVClassifier
+from src.monitoring import metrics, profiling
 
 app = Flask(__name__)
 CORS(app)
+metrics.register_flask(app)  # /metrics (formato Prometheus), activo con CV_METRICS=1
+profiling.register_flask(app)  # Perfil por petición, activo con CV_PROFILE=1
 
-# Inicializar base de datos con columnas extendidas
-add_classification_columns()
-
+# Inicializar base de datos (PostulacionManager crea la tabla) y luego las columnas extendidas
 postulacion_manager = PostulacionManager()
+add_classification_columns()
 model_manager = ModelManager()
 
 # Variable global para modelo activo
@@ -104,6 +106,8 @@ def select_model():
     active_model_name = model_name
     active_model_is_deep = is_deep
     load_active_model()
+    # Publicar el modelo para los servicios sin interfaz (carpetas vigiladas)
+    model_manager.publish_model(model_name, is_deep)
     return jsonify({'success': True, 'message': f'Modelo {model_name} seleccionado'})
 
 @app.route('/api/postulaciones/classify/<int:postulacion_id>', methods=['POST'])
@@ -111,10 +115,12 @@ def classify_postulacion(postulacion_id):
     global active_classifier, active_model_name
     if active_classifier is None:
         return jsonify({'success': False, 'message': 'No hay modelo activo cargado'}), 400
-    postulacion = postulacion_manager.get_postulacion_details(postulacion_id)
+    with metrics.timer('db_read', operation='get_postulacion'):
+        postulacion = postulacion_manager.get_postulacion_details(postulacion_id)
     if not postulacion:
         return jsonify({'success': False, 'message': 'Postulación no encontrada'}), 404
-    cv_data = postulacion_manager.download_cv(postulacion_id)
+    with metrics.timer('db_read', operation='download_cv'):
+        cv_data = postulacion_manager.download_cv(postulacion_id)
     if not cv_data:
         return jsonify({'success': False, 'message': 'CV no encontrado'}), 404
     cv_filename, cv_bytes = cv_data
@@ -131,20 +137,19 @@ def classify_postulacion(postulacion_id):
     porcentaje = result.get('confidence', 0.0)
     # Actualizar base de datos con puesto, porcentaje y modelo
     try:
-        update_classification_result(postulacion_id, puesto, porcentaje, active_model_name)
+        with metrics.timer('db_write', operation='update_classification'):
+            update_classification_result(postulacion_id, puesto, porcentaje, active_model_name)
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error guardando resultado: {str(e)}'}), 500
     return jsonify({'success': True, 'puesto': puesto, 'porcentaje': porcentaje, 'modelo': active_model_name})
 
 def update_classification_result(postulacion_id, puesto, porcentaje, modelo):
     import sqlite3
-    import os
-    DATABASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database')
-    DATABASE_NAME = "postulaciones.db"
-    DATABASE_PATH = os.path.join(DATABASE_DIR, DATABASE_NAME)
+    import postulacion_db
     conn = None
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
+        # Misma base de datos que el resto de la API (postulacion_db.DATABASE_PATH)
+        conn = sqlite3.connect(postulacion_db.DATABASE_PATH)
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE postulaciones
@@ -158,7 +163,8 @@ def update_classification_result(postulacion_id, puesto, porcentaje, modelo):
 
 @app.route('/api/postulaciones', methods=['GET'])
 def get_postulaciones():
-    postulaciones = postulacion_manager.get_postulaciones_list()
+    with metrics.timer('db_read', operation='list_postulaciones'):
+        postulaciones = postulacion_manager.get_postulaciones_list()
     postulaciones_list = []
     for p in postulaciones:
         postulaciones_list.append({
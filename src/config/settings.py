@@ -14,19 +14,33 @@ class Settings:
     # Directorios de modelos
     MODELS_DIR = BASE_DIR / 'saved_models'
     DEEP_MODELS_DIR = BASE_DIR / 'saved_deep_models'
+    CHECKPOINTS_DIR = DEEP_MODELS_DIR / 'checkpoints'
+    PUBLISHED_MODEL_FILE = MODELS_DIR / 'published_model.json'
     
     # Directorios de caché
     CACHE_DIR = BASE_DIR / 'cache'
     BERT_CACHE_DIR = DEEP_MODELS_DIR / 'bert_cache'
     
+    # Cola de trabajos de entrenamiento (base de datos y registros por trabajo)
+    TRAINING_JOBS_DIR = CACHE_DIR / 'training_jobs'
+    TRAINING_JOBS_DB = TRAINING_JOBS_DIR / 'jobs.db'
+    
+    # Manifiesto del corpus de entrenamiento (archivos vistos y su texto extraído)
+    CORPUS_MANIFEST_DB = CACHE_DIR / 'corpus_manifest.db'
+    
+    # Base de datos de postulaciones
+    POSTULACIONES_DB = BASE_DIR / 'page' / 'database' / 'postulaciones.db'
+    
     @classmethod
     def ensure_directories(cls):
         """Asegura que existan todos los directorios necesarios"""
         directories = [
             cls.MODELS_DIR,
             cls.DEEP_MODELS_DIR,
+            cls.CHECKPOINTS_DIR,
             cls.CACHE_DIR,
-            cls.BERT_CACHE_DIR
+            cls.BERT_CACHE_DIR,
+            cls.TRAINING_JOBS_DIR
         ]
         
         for directory in directories:
@@ -0,0 +1,7 @@
+"""
+Instrumentación y métricas de rendimiento
+"""
+
+from . import metrics, profiling
+
+__all__ = ['metrics', 'profiling']
@@ -0,0 +1,285 @@
+"""
+Métricas de rendimiento por etapa (extracción, vectorización, predicción, BD, carga de modelos)
+
+Temporizadores (context managers y decoradores) y contadores agregados en histogramas
+con buckets fijos, exportables en formato de texto de Prometheus (``/metrics`` de las
+APIs Flask) o como instantánea para el panel de diagnóstico de la interfaz.
+
+Las métricas se activan con la variable de entorno ``CV_METRICS=1`` o con ``enable()``.
+Desactivadas, ``timer()`` devuelve un context manager vacío compartido y ``increment()``
+retorna de inmediato, así que la instrumentación no tiene costo apreciable.
+"""
+
+import os
+import time
+import bisect
+import threading
+import functools
+
+# Buckets en segundos: desde operaciones de milisegundos hasta cargas de modelos BERT
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+STAGE_METRIC = 'cv_stage_duration_seconds'
+EVENT_METRIC = 'cv_events_total'
+
+
+class _NullTimer:
+    """Temporizador vacío usado cuando las métricas están desactivadas"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos (una serie por combinación de etiquetas)"""
+
+    def __init__(self, name, description, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0,
+                                                 'count': 0, 'max': 0.0}
+            series['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            series['sum'] += value
+            series['count'] += 1
+            series['max'] = max(series['max'], value)
+
+    def quantile(self, series, q):
+        """Cuantil estimado por interpolación lineal dentro del bucket (como histogram_quantile)"""
+        if not series['count']:
+            return 0.0
+        rank = q * series['count']
+        cumulative = 0
+        lower = 0.0
+        for bound, count in zip(self.buckets + (series['max'],), series['counts']):
+            if cumulative + count >= rank and count:
+                upper = min(bound, series['max'])
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return series['max']
+
+    def series(self):
+        with self._lock:
+            return {labels: {**series, 'counts': list(series['counts'])}
+                    for labels, series in self._series.items()}
+
+
+class Counter:
+    """Contador monotónico (una serie por combinación de etiquetas)"""
+
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, labels=()):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def series(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class _Timer:
+    __slots__ = ('registry', 'stage', 'labels', 'start')
+
+    def __init__(self, registry, stage, labels):
+        self.registry = registry
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.stage, time.perf_counter() - self.start, error=exc_type is not None,
+                              **self.labels)
+        return False
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    escaped = (f'{key}="{_escape(value)}"' for key, value in items)
+    return '{' + ','.join(escaped) + '}'
+
+
+class MetricsRegistry:
+    """Registro de métricas del proceso"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self.stages = Histogram(STAGE_METRIC, "Duración de cada etapa del sistema en segundos")
+        self.events = Counter(EVENT_METRIC, "Eventos contados por etapa (archivos, predicciones, errores)")
+
+    def timer(self, stage, **labels):
+        """Context manager que mide la duración de una etapa"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage, labels)
+
+    def observe(self, stage, seconds, error=False, **labels):
+        if not self.enabled:
+            return
+        self.stages.observe(seconds, _label_key({'stage': stage, **labels}))
+        if error:
+            self.events.inc(1, _label_key({'event': f"{stage}_errors"}))
+
+    def increment(self, event, amount=1, **labels):
+        if not self.enabled:
+            return
+        self.events.inc(amount, _label_key({'event': event, **labels}))
+
+    def reset(self):
+        self.started_at = time.time()
+        self.stages = Histogram(STAGE_METRIC, self.stages.description, self.stages.buckets)
+        self.events = Counter(EVENT_METRIC, self.events.description)
+
+    def snapshot(self):
+        """Resumen por serie para el panel de diagnóstico
+
+        Returns:
+            dict: 'stages' (lista con etapa, etiquetas, conteo, total, media, p50, p95 y máximo
+            en segundos) y 'events' (lista con evento, etiquetas y valor)
+        """
+        stages = []
+        for labels, series in self.stages.series().items():
+            labels = dict(labels)
+            stages.append({
+                'stage': labels.pop('stage'),
+                'labels': labels,
+                'count': series['count'],
+                'total': series['sum'],
+                'mean': series['sum'] / series['count'] if series['count'] else 0.0,
+                'p50': self.stages.quantile(series, 0.5),
+                'p95': self.stages.quantile(series, 0.95),
+                'max': series['max']
+            })
+        events = []
+        for labels, value in self.events.series().items():
+            labels = dict(labels)
+            events.append({'event': labels.pop('event'), 'labels': labels, 'value': value})
+        stages.sort(key=lambda item: item['total'], reverse=True)
+        events.sort(key=lambda item: item['event'])
+        return {'enabled': self.enabled, 'uptime': time.time() - self.started_at,
+                'stages': stages, 'events': events}
+
+    def render_prometheus(self):
+        """Exposición en formato de texto de Prometheus 0.0.4"""
+        lines = [f"# HELP {self.stages.name} {self.stages.description}",
+                 f"# TYPE {self.stages.name} histogram"]
+        for labels, series in sorted(self.stages.series().items()):
+            cumulative = 0
+            for bound, count in zip(self.stages.buckets, series['counts']):
+                cumulative += count
+                lines.append(f"{self.stages.name}_bucket{_format_labels(labels, [('le', repr(bound))])} {cumulative}")
+            lines.append(f"{self.stages.name}_bucket{_format_labels(labels, [('le', '+Inf')])} {series['count']}")
+            lines.append(f"{self.stages.name}_sum{_format_labels(labels)} {series['sum']}")
+            lines.append(f"{self.stages.name}_count{_format_labels(labels)} {series['count']}")
+
+        lines += [f"# HELP {self.events.name} {self.events.description}",
+                  f"# TYPE {self.events.name} counter"]
+        for labels, value in sorted(self.events.series().items()):
+            lines.append(f"{self.events.name}{_format_labels(labels)} {value}")
+
+        lines += ["# HELP cv_metrics_enabled 1 si la instrumentación está activa",
+                  "# TYPE cv_metrics_enabled gauge",
+                  f"cv_metrics_enabled {int(self.enabled)}"]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(enabled=os.environ.get('CV_METRICS', '0').lower() in ('1', 'true', 'yes'))
+
+
+def enable(value=True):
+    registry.enabled = value
+
+
+def is_enabled():
+    return registry.enabled
+
+
+def timer(stage, **labels):
+    """``with metrics.timer('prediction', model='ml'): ...``"""
+    return registry.timer(stage, **labels)
+
+
+def increment(event, amount=1, **labels):
+    registry.increment(event, amount, **labels)
+
+
+def timed(stage, **labels):
+    """Decorador equivalente a envolver la función en ``timer(stage, **labels)``"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            with registry.timer(stage, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    return registry.snapshot()
+
+
+def reset():
+    registry.reset()
+
+
+def render_prometheus():
+    return registry.render_prometheus()
+
+
+def register_flask(app, endpoint='/metrics'):
+    """Añade ``/metrics`` a una app Flask y mide la latencia de cada petición"""
+    from flask import Response, request, g
+
+    @app.before_request
+    def _start_request_timer():
+        if registry.enabled:
+            g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None and request.endpoint != 'metrics':
+            registry.observe('http_request', time.perf_counter() - start,
+                             endpoint=request.endpoint or 'desconocido', status=response.status_code)
+        return response
+
+    @app.route(endpoint, endpoint='metrics')
+    def metrics():
+        return Response(registry.render_prometheus(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    return app
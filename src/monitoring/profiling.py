@@ -0,0 +1,227 @@
+"""
+Perfilado opcional de entrenamientos, clasificaciones y peticiones de las APIs
+
+Se activa con la variable de entorno ``CV_PROFILE`` (o ``--profile`` en
+``python -m models.cli``):
+
+    CV_PROFILE=1         cProfile y, en entrenamientos DL, el profiler de TensorFlow
+    CV_PROFILE=cprofile  solo cProfile
+
+Cada ejecución perfilada deja en ``Settings.CACHE_DIR/profiles/<fecha>_<nombre>/``:
+``profile.prof`` (pstats, se abre con snakeviz o ``python -m pstats``), ``summary.txt``
+con las funciones de mayor tiempo acumulado, ``run.json`` con los metadatos y, si
+aplica, la traza de TensorFlow en ``tensorflow/`` (pestaña Profile de TensorBoard).
+
+Las ejecuciones anidadas en el mismo hilo (p. ej. ``train_model`` dentro del worker
+de entrenamiento) se registran dentro de la ejecución exterior.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import pstats
+import cProfile
+import platform
+import datetime
+import threading
+import functools
+
+from src.config.settings import Settings
+
+PROFILES_DIR = Settings.CACHE_DIR / 'profiles'
+SUMMARY_LINES = 40
+
+_state = threading.local()
+_mode = os.environ.get('CV_PROFILE', '').strip().lower()
+
+
+def enable(mode='1'):
+    """Activa el perfilado para el resto del proceso ('1' o 'cprofile')"""
+    global _mode
+    _mode = mode
+
+
+def disable():
+    global _mode
+    _mode = ''
+
+
+def is_enabled():
+    return _mode not in ('', '0', 'false', 'no')
+
+
+def tensorflow_enabled():
+    return is_enabled() and _mode != 'cprofile'
+
+
+def _safe_metadata(values):
+    """Solo valores simples: los argumentos pueden incluir corpus o modelos completos"""
+    return {key: value for key, value in values.items()
+            if isinstance(value, (str, int, float, bool)) or value is None}
+
+
+class ProfileRun:
+    """Una ejecución perfilada con cProfile (y opcionalmente TensorFlow)"""
+
+    def __init__(self, name, metadata=None, tf_trace=False):
+        self.name = name
+        self.metadata = _safe_metadata(metadata or {})
+        self.tf_trace = tf_trace
+        self.profiler = None
+        self.tf_active = False
+        self.nested = []
+        self.output_dir = None
+        self.error = None
+
+    def start(self):
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in self.name)
+        self.output_dir = PROFILES_DIR / f"{stamp}_{safe_name}"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.started_at = datetime.datetime.now()
+        self.start_time = time.perf_counter()
+
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError as e:
+            # Python 3.12+: solo puede haber un profiler activo por proceso
+            self.profiler = None
+            self.error = f"cProfile no disponible: {e}"
+
+        if self.tf_trace:
+            self.start_tensorflow_trace()
+        return self
+
+    def start_tensorflow_trace(self):
+        if self.tf_active or not tensorflow_enabled():
+            return
+        try:
+            import tensorflow as tf
+            tf.profiler.experimental.start(str(self.output_dir / 'tensorflow'))
+            self.tf_active = True
+        except Exception as e:
+            self.error = f"Profiler de TensorFlow no disponible: {e}"
+
+    def stop(self, failed=False):
+        duration = time.perf_counter() - self.start_time
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.tf_active:
+            try:
+                import tensorflow as tf
+                tf.profiler.experimental.stop()
+            except Exception as e:
+                self.error = f"Error deteniendo el profiler de TensorFlow: {e}"
+
+        if self.profiler is not None:
+            self.profiler.dump_stats(str(self.output_dir / 'profile.prof'))
+            summary = io.StringIO()
+            pstats.Stats(self.profiler, stream=summary).sort_stats('cumulative').print_stats(SUMMARY_LINES)
+            (self.output_dir / 'summary.txt').write_text(summary.getvalue(), encoding='utf-8')
+
+        run_info = {
+            'name': self.name,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_seconds': duration,
+            'failed': failed,
+            'metadata': self.metadata,
+            'nested_runs': self.nested,
+            'cprofile': self.profiler is not None,
+            'tensorflow_trace': self.tf_active,
+            'error': self.error,
+            'pid': os.getpid(),
+            'thread': threading.current_thread().name,
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'argv': sys.argv
+        }
+        with open(self.output_dir / 'run.json', 'w', encoding='utf-8') as f:
+            json.dump(run_info, f, indent=2, ensure_ascii=False, default=str)
+        print(f"📊 Perfil guardado en {self.output_dir}")
+        return self.output_dir
+
+
+def _current_run():
+    return getattr(_state, 'run', None)
+
+
+class profile_run:
+    """Context manager: ``with profile_run('entrenamiento_ml', metadata={...}):``
+
+    Sin perfilado activo no hace nada. Dentro de otra ejecución del mismo hilo solo
+    anota su nombre en la ejecución exterior (y arranca la traza de TensorFlow si
+    se pide y aún no está activa).
+    """
+
+    def __init__(self, name, metadata=None, tf_trace=False):
+        self.name = name
+        self.metadata = metadata
+        self.tf_trace = tf_trace
+        self.run = None
+
+    def __enter__(self):
+        if not is_enabled():
+            return None
+        outer = _current_run()
+        if outer is not None:
+            outer.nested.append({'name': self.name, 'metadata': _safe_metadata(self.metadata or {})})
+            if self.tf_trace:
+                outer.start_tensorflow_trace()
+            return outer
+        try:
+            self.run = ProfileRun(self.name, self.metadata, self.tf_trace).start()
+        except OSError as e:
+            print(f"⚠️ No se pudo iniciar el perfilado: {e}")
+            return None
+        _state.run = self.run
+        return self.run
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.run is not None:
+            _state.run = None
+            try:
+                self.run.stop(failed=exc_type is not None)
+            except OSError as e:
+                print(f"⚠️ No se pudo guardar el perfil: {e}")
+        return False
+
+
+def profiled(name, tf_trace=False):
+    """Decorador: perfila cada llamada a la función cuando el perfilado está activo
+
+    Los argumentos con nombre de tipo simple (p. ej. ``model_type``, ``epochs``) se
+    guardan como metadatos de la ejecución.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            with profile_run(name, metadata={'function': func.__qualname__, **kwargs}, tf_trace=tf_trace):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_flask(app):
+    """Perfila cada petición de una app Flask cuando el perfilado está activo"""
+    from flask import request, g
+
+    @app.before_request
+    def _start_profile():
+        if is_enabled() and _current_run() is None:
+            context = profile_run(f"http_{request.endpoint or 'desconocido'}",
+                                  metadata={'method': request.method, 'path': request.path})
+            if context.__enter__() is not None:
+                g._profile_context = context
+
+    @app.teardown_request
+    def _stop_profile(exc):
+        context = g.pop('_profile_context', None)
+        if context is not None:
+            context.__exit__(type(exc) if exc else None, exc, None)
+
+    return app
@@ -0,0 +1 @@
+"""Pruebas de los módulos de ``models``"""
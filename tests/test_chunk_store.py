@@ -0,0 +1,112 @@
+"""Pruebas del corte por contenido y del almacén de bloques deduplicados"""
+
+import io
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from models.chunk_store import Chunker, ChunkStore, dedup_report
+
+# Bloques pequeños para que unos cientos de KB produzcan muchos cortes
+SMALL = dict(min_size=1024, avg_size=4096, max_size=16 * 1024)
+
+
+def _random_bytes(n, seed=0):
+    return random.Random(seed).getrandbits(8 * n).to_bytes(n, 'little')
+
+
+def _chunks(data, chunker):
+    return list(chunker.iter_chunks(io.BytesIO(data)))
+
+
+def test_chunker_rejects_invalid_sizes():
+    with pytest.raises(ValueError):
+        Chunker(min_size=8192, avg_size=4096, max_size=16 * 1024)
+
+
+def test_chunks_cover_input_within_size_limits():
+    data = _random_bytes(300_000)
+    chunks = _chunks(data, Chunker(**SMALL))
+
+    assert b''.join(chunks) == data
+    assert len(chunks) > 10
+    # Solo el último bloque puede quedar por debajo del mínimo
+    assert all(SMALL['min_size'] <= len(chunk) <= SMALL['max_size'] for chunk in chunks[:-1])
+
+
+def test_cut_points_do_not_depend_on_read_size(monkeypatch):
+    data = _random_bytes(200_000, seed=1)
+    expected = _chunks(data, Chunker(**SMALL))
+
+    monkeypatch.setattr('models.chunk_store.READ_SIZE', 7_000)
+    assert _chunks(data, Chunker(**SMALL)) == expected
+
+
+def test_insertion_only_changes_nearby_chunks():
+    data = _random_bytes(400_000, seed=2)
+    edited = data[:100_000] + b'insertado' + data[100_000:]
+    chunker = Chunker(**SMALL)
+
+    original = set(_chunks(data, chunker))
+    shared = [chunk for chunk in _chunks(edited, chunker) if chunk in original]
+    assert sum(map(len, shared)) > 0.9 * len(data)
+
+
+def test_empty_file_has_no_chunks():
+    assert _chunks(b'', Chunker(**SMALL)) == []
+
+
+def test_store_roundtrip_and_deduplication(tmp_path):
+    store = ChunkStore(str(tmp_path / 'store'), Chunker(**SMALL))
+    data = _random_bytes(250_000, seed=3)
+
+    recipe, written = store.put_stream(io.BytesIO(data))
+    assert written == len(data)
+    assert sum(size for _, size in recipe) == len(data)
+
+    # El mismo contenido no vuelve a escribir ningún bloque
+    second_recipe, second_written = store.put_stream(io.BytesIO(data))
+    assert second_recipe == recipe
+    assert second_written == 0
+    assert store.stored_bytes() == sum(dict(map(tuple, recipe)).values())
+
+    restored = io.BytesIO()
+    store.restore_stream(recipe, restored)
+    assert restored.getvalue() == data
+
+
+def test_read_chunk_detects_corruption(tmp_path):
+    store = ChunkStore(str(tmp_path / 'store'), Chunker(**SMALL))
+    chunk_hash, _ = store.put_chunk(b'contenido del bloque')
+    with open(store.object_path(chunk_hash), 'wb') as f:
+        f.write(b'contenido alterado')
+
+    with pytest.raises(ValueError):
+        store.read_chunk(chunk_hash)
+
+
+def test_restore_checks_recipe_sizes(tmp_path):
+    store = ChunkStore(str(tmp_path / 'store'), Chunker(**SMALL))
+    chunk_hash, _ = store.put_chunk(b'contenido del bloque')
+
+    with pytest.raises(ValueError):
+        store.restore_stream([[chunk_hash, 5]], io.BytesIO())
+
+
+def test_dedup_report():
+    recipes = {
+        'a.bin': [['h1', 100], ['h2', 50]],
+        'b.bin': [['h1', 100], ['h3', 50]],
+    }
+    report = dedup_report(recipes)
+
+    assert report['files'] == 2
+    assert report['logical_bytes'] == 300
+    assert report['stored_bytes'] == 200
+    assert report['chunks'] == 4
+    assert report['unique_chunks'] == 3
+    assert report['dedup_ratio'] == pytest.approx(1.5)
+    assert report['saved_percent'] == pytest.approx(100 / 3)
+    assert dedup_report({})['dedup_ratio'] == 1.0
@@ -0,0 +1,58 @@
+"""Pruebas de los comandos de la línea de comandos"""
+
+import os
+import json
+from contextlib import nullcontext
+
+import pytest
+
+pytest.importorskip('PyPDF2')
+
+from models import cli
+
+
+class FakeClassifier:
+    def __init__(self):
+        self.texts = []
+
+    def predict_batch(self, texts):
+        self.texts.extend(texts)
+        return [{'predicted_profession': 'Ingeniero', 'confidence': 0.9, 'confidence_level': 'Alta'}
+                for _ in texts]
+
+
+def test_classify_writes_extraction_errors(tmp_path, monkeypatch):
+    classifier = FakeClassifier()
+    monkeypatch.setattr(cli, 'load_classifier', lambda *args: classifier)
+    folder = tmp_path / 'cvs'
+    folder.mkdir()
+    (folder / 'bueno.txt').write_text('Ingeniero de software', encoding='utf-8')
+    (folder / 'roto.pdf').write_bytes(b'no es un pdf')
+    (folder / 'vacio.txt').write_text('', encoding='utf-8')
+    output = tmp_path / 'resultados.jsonl'
+
+    assert cli.main(['--jobs', '1', 'classify', '--model', 'modelo', '--output', str(output), str(folder)]) == 0
+
+    rows = {os.path.basename(row['path']): row
+            for row in map(json.loads, output.read_text(encoding='utf-8').splitlines())}
+    assert rows['bueno.txt']['status'] == 'ok'
+    assert rows['roto.pdf']['status'] == 'error' and rows['roto.pdf']['message']
+    assert rows['vacio.txt']['status'] == 'error' and rows['vacio.txt']['message']
+    assert classifier.texts == ['Ingeniero de software']
+
+
+@pytest.mark.parametrize('mode, expected', [('full', '1'), ('cprofile', 'cprofile')])
+def test_profile_mode_names(tmp_path, monkeypatch, mode, expected):
+    enabled = []
+    monkeypatch.setattr(cli.profiling, 'enable', enabled.append)
+    monkeypatch.setattr(cli.profiling, 'profile_run', lambda *args, **kwargs: nullcontext())
+    monkeypatch.setattr(cli, 'load_classifier', lambda *args: FakeClassifier())
+
+    # Carpeta vacía: el comando termina con error, pero el perfilado ya quedó configurado
+    cli.main(['--profile', '--profile-mode', mode, 'classify', '--model', 'modelo', str(tmp_path)])
+    assert enabled == [expected]
+
+
+def test_profile_mode_rejects_numeric_value():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(['--profile-mode', '1', 'classify', '--model', 'modelo', '.'])
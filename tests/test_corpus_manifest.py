@@ -0,0 +1,155 @@
+"""Pruebas de la sincronización incremental del corpus"""
+
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip('PyPDF2')
+
+from models.corpus_manifest import CorpusManifest, format_diff, scan_folders
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Dos carpetas de profesiones con CVs en texto plano"""
+    folders = {'ingenieria': tmp_path / 'ingenieria', 'salud': tmp_path / 'salud'}
+    for profession, folder in folders.items():
+        folder.mkdir()
+        for i in range(2):
+            (folder / f'cv_{i}.txt').write_text(f'{profession} curriculum {i}', encoding='utf-8')
+    (folders['salud'] / 'notas.docx').write_text('no es un CV', encoding='utf-8')
+    return {profession: str(folder) for profession, folder in folders.items()}
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return CorpusManifest(tmp_path / 'manifest.db')
+
+
+def _sync(manifest, corpus):
+    # Hilos en lugar de procesos: los CVs de texto se extraen al instante
+    return manifest.sync(corpus, use_processes=False)
+
+
+def _touch(path, text):
+    stat = os.stat(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_scan_folders_lists_only_cvs(corpus):
+    scanned = scan_folders(corpus)
+    assert sorted(os.path.basename(path) for path in scanned) == ['cv_0.txt', 'cv_0.txt', 'cv_1.txt', 'cv_1.txt']
+    assert {entry['profession'] for entry in scanned.values()} == {'ingenieria', 'salud'}
+
+
+def test_first_sync_extracts_everything(manifest, corpus):
+    diff = _sync(manifest, corpus)
+    assert len(diff['added']) == 4
+    assert diff['extracted'] == 4
+    assert diff['failed'] == 0
+
+    data = manifest.training_data(corpus)
+    assert [(cv['profession'], cv['filename']) for cv in data] == [
+        ('ingenieria', 'cv_0.txt'), ('ingenieria', 'cv_1.txt'), ('salud', 'cv_0.txt'), ('salud', 'cv_1.txt')]
+    assert data[0]['text'] == 'ingenieria curriculum 0'
+    assert data[0]['sha256'] is not None
+
+
+def test_second_sync_is_unchanged(manifest, corpus):
+    _sync(manifest, corpus)
+    diff = _sync(manifest, corpus)
+    assert diff['unchanged'] == 4
+    assert diff['extracted'] == 0
+    assert format_diff(diff) == "0 nuevos, 0 modificados, 0 eliminados, 0 reetiquetados, 4 sin cambios"
+
+
+def test_modified_file_is_extracted_again(manifest, corpus):
+    _sync(manifest, corpus)
+    path = os.path.join(corpus['salud'], 'cv_0.txt')
+    _touch(path, 'salud curriculum actualizado')
+
+    diff = _sync(manifest, corpus)
+    assert diff['modified'] == [path]
+    assert diff['extracted'] == 1
+    texts = {cv['path']: cv['text'] for cv in manifest.training_data(corpus)}
+    assert texts[path] == 'salud curriculum actualizado'
+
+
+def test_touched_file_with_same_content_is_not_extracted(manifest, corpus):
+    _sync(manifest, corpus)
+    path = os.path.join(corpus['salud'], 'cv_0.txt')
+    _touch(path, 'salud curriculum 0')
+
+    diff = _sync(manifest, corpus)
+    assert diff['modified'] == []
+    assert diff['extracted'] == 0
+    assert diff['unchanged'] == 4
+
+
+def test_relabeled_folder_keeps_text(manifest, corpus):
+    _sync(manifest, corpus)
+    relabeled = {'ingenieria': corpus['ingenieria'], 'enfermeria': corpus['salud']}
+
+    diff = manifest.sync(relabeled, use_processes=False)
+    assert len(diff['relabeled']) == 2
+    assert diff['extracted'] == 0
+    assert {cv['profession'] for cv in manifest.training_data(relabeled)} == {'ingenieria', 'enfermeria'}
+
+
+def test_deleted_file(manifest, corpus):
+    _sync(manifest, corpus)
+    path = os.path.join(corpus['ingenieria'], 'cv_1.txt')
+    os.remove(path)
+
+    diff = _sync(manifest, corpus)
+    assert diff['deleted'] == [path]
+    assert path not in {cv['path'] for cv in manifest.training_data(corpus)}
+
+
+def test_emptied_folder_reports_deleted_files(manifest, corpus):
+    _sync(manifest, corpus)
+    for name in os.listdir(corpus['salud']):
+        os.remove(os.path.join(corpus['salud'], name))
+
+    diff = _sync(manifest, corpus)
+    assert len(diff['deleted']) == 2
+    assert {cv['profession'] for cv in manifest.training_data(corpus)} == {'ingenieria'}
+
+
+def test_moved_file_reuses_text(manifest, corpus):
+    _sync(manifest, corpus)
+    source = os.path.join(corpus['ingenieria'], 'cv_0.txt')
+    target = os.path.join(corpus['salud'], 'movido.txt')
+    shutil.move(source, target)
+
+    diff = _sync(manifest, corpus)
+    assert diff['added'] == [target]
+    assert diff['deleted'] == [source]
+    assert diff['reused'] == 1
+    assert diff['extracted'] == 0
+    texts = {cv['path']: cv['text'] for cv in manifest.training_data(corpus)}
+    assert texts[target] == 'ingenieria curriculum 0'
+
+
+def test_failed_extractions_are_recorded(manifest, corpus):
+    empty = os.path.join(corpus['salud'], 'vacio.txt')
+    open(empty, 'w').close()
+
+    diff = _sync(manifest, corpus)
+    assert diff['failed'] == 1
+    assert diff['failures'] == [{'path': empty, 'status': 'failed', 'reason': 'empty',
+                                 'error': 'archivo sin contenido'}]
+    assert len(manifest.training_data(corpus)) == 5
+    assert empty not in {cv['path'] for cv in manifest.training_data(corpus, successful_only=True)}
+
+
+def test_forget_folder(manifest, corpus):
+    _sync(manifest, corpus)
+    assert manifest.forget(corpus['salud']) == 2
+
+    diff = _sync(manifest, corpus)
+    assert len(diff['added']) == 2
+    assert diff['unchanged'] == 2
@@ -0,0 +1,68 @@
+"""Pruebas de la caché en disco de embeddings BERT"""
+
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from models.embedding_cache import EmbeddingCache
+
+COMMIT = 'a' * 40
+
+
+def _cache(root):
+    return EmbeddingCache(str(root), 'dccuchile/bert-base-spanish-wwm-uncased', revision=COMMIT, max_length=128)
+
+
+def _vectors(n, value):
+    return np.full((n, 4), value, dtype=np.float32)
+
+
+def test_roundtrip_and_reload(tmp_path):
+    cache = _cache(tmp_path)
+    hashes = [EmbeddingCache.text_hash(text) for text in ('cv uno', 'cv dos')]
+    assert cache.missing(hashes + hashes[:1]) == hashes
+
+    cache.add(hashes, np.arange(8, dtype=np.float32).reshape(2, 4))
+    reloaded = _cache(tmp_path)
+    assert len(reloaded) == 2
+    assert reloaded.missing(hashes) == []
+    np.testing.assert_array_equal(reloaded.get(hashes[::-1])[0], [4, 5, 6, 7])
+
+
+def test_cache_key_includes_revision_and_settings(tmp_path):
+    cache = _cache(tmp_path)
+    assert os.path.basename(cache.cache_dir) == f"dccuchile_bert-base-spanish-wwm-uncased@{COMMIT}_len128_mean"
+
+
+def test_concurrent_writers_do_not_lose_entries(tmp_path):
+    # Dos instancias abiertas antes de escribir: como dos procesos de entrenamiento en paralelo
+    first, second = _cache(tmp_path), _cache(tmp_path)
+    first.add(['h1'], _vectors(1, 1))
+    second.add(['h2'], _vectors(1, 2))
+    first.add(['h3'], _vectors(1, 3))
+
+    reloaded = _cache(tmp_path)
+    assert len(reloaded) == 3
+    assert len(set(reloaded._shards)) == 3
+    np.testing.assert_array_equal(reloaded.get(['h1', 'h2', 'h3'])[:, 0], [1, 2, 3])
+
+
+def test_dimension_mismatch(tmp_path):
+    first, second = _cache(tmp_path), _cache(tmp_path)
+    first.add(['h1'], _vectors(1, 1))
+
+    with pytest.raises(ValueError):
+        second.add(['h2'], np.zeros((1, 8), dtype=np.float32))
+    assert len([name for name in os.listdir(first.cache_dir) if name.endswith('.npy')]) == 1
+
+
+def test_clear_removes_shards_from_other_writers(tmp_path):
+    first, second = _cache(tmp_path), _cache(tmp_path)
+    first.add(['h1'], _vectors(1, 1))
+    second.add(['h2'], _vectors(1, 2))
+
+    first.clear()
+    assert len(_cache(tmp_path)) == 0
+    assert not [name for name in os.listdir(first.cache_dir) if name.endswith('.npy')]
@@ -0,0 +1,34 @@
+"""Pruebas de la restauración de backups deduplicados"""
+
+import json
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from models.model_backup import BackupEngine
+
+
+def _recipe(path, files):
+    path.write_text(json.dumps({'files': files}), encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('arcname', ['../fuera.txt', 'modelo/../../fuera.txt', '/tmp/absoluta.txt'])
+def test_restore_rejects_paths_outside_target(tmp_path, arcname):
+    engine = BackupEngine(str(tmp_path / 'backup'), deduplicate=True)
+    recipe = _recipe(tmp_path / 'malicioso.recipe.json', {arcname: {'size': 0, 'chunks': []}})
+
+    with pytest.raises(ValueError):
+        engine._restore_chunked(recipe, str(tmp_path / 'restaurado'))
+    assert not (tmp_path / 'fuera.txt').exists()
+
+
+def test_restore_rejects_chunk_size_mismatch(tmp_path):
+    engine = BackupEngine(str(tmp_path / 'backup'), deduplicate=True)
+    chunk_hash, _ = engine.chunk_store().put_chunk(b'pesos del modelo')
+    recipe = _recipe(tmp_path / 'modelo.recipe.json',
+                     {'weights.h5': {'size': 4, 'chunks': [[chunk_hash, 4]]}})
+
+    with pytest.raises(ValueError):
+        engine._restore_chunked(recipe, str(tmp_path / 'restaurado'))
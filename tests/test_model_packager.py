@@ -0,0 +1,165 @@
+"""Pruebas de la exportación e importación de modelos en paquetes .zip"""
+
+import os
+import json
+import random
+import zipfile
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from models.chunk_store import Chunker
+from models.model_packager import ModelPackager
+from models.package_protection import PackageProtector
+
+PACKAGE_INFO = {'model_name': 'modelo_prueba', 'version': '3.0'}
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    """Carpeta de modelo con pesos binarios (repetidos) y archivos de texto"""
+    root = tmp_path / 'modelo'
+    (root / 'tokenizer').mkdir(parents=True)
+    weights = random.Random(0).getrandbits(8 * 200_000).to_bytes(200_000, 'little')
+    (root / 'weights.h5').write_bytes(weights)
+    (root / 'weights_copy.h5').write_bytes(weights)
+    (root / 'config.json').write_text(json.dumps({'classes': ['a', 'b']}), encoding='utf-8')
+    (root / 'tokenizer' / 'vocab.txt').write_text('hola\nmundo\n' * 500, encoding='utf-8')
+    return root
+
+
+def _read_tree(root):
+    return {os.path.relpath(os.path.join(folder, name), root): open(os.path.join(folder, name), 'rb').read()
+            for folder, _, names in os.walk(root) for name in names}
+
+
+def _import(package_path, target_dir, protector=None, packager=None):
+    with zipfile.ZipFile(package_path) as zipf:
+        package_info, _ = ModelPackager.read_package_info(zipf)
+        return (packager or ModelPackager()).import_model(zipf, str(target_dir), package_info, protector)
+
+
+def _malicious_package(path, arcname, package_info=None):
+    with zipfile.ZipFile(path, 'w') as zipf:
+        zipf.writestr(arcname, b'fuera de la carpeta')
+        zipf.writestr('package_info.json', json.dumps(package_info or PACKAGE_INFO))
+
+
+@pytest.mark.parametrize('compression', ModelPackager.COMPRESSION_MODES)
+def test_export_import_roundtrip(tmp_path, model_dir, compression):
+    messages = []
+    packager = ModelPackager(compression, progress_callback=messages.append)
+    package = tmp_path / 'modelo.zip'
+
+    stats = packager.export_model(str(model_dir), str(package), PACKAGE_INFO)
+    assert stats['files'] == 4
+    assert stats['bytes'] == sum(len(data) for data in _read_tree(model_dir).values())
+    assert messages and messages[-1].startswith('Exportando')
+
+    with zipfile.ZipFile(package) as zipf:
+        package_info, metadata_file = ModelPackager.read_package_info(zipf)
+        assert metadata_file == 'package_info.json'
+        assert package_info['model_name'] == 'modelo_prueba'
+        assert set(package_info['files']) == {'weights.h5', 'weights_copy.h5', 'config.json', 'tokenizer/vocab.txt'}
+        if compression == 'auto':
+            assert zipf.getinfo('weights.h5').compress_type == zipfile.ZIP_STORED
+            assert zipf.getinfo('config.json').compress_type == zipfile.ZIP_DEFLATED
+
+    _import(package, tmp_path / 'importado', packager=packager)
+    assert _read_tree(tmp_path / 'importado') == _read_tree(model_dir)
+
+
+def test_invalid_compression():
+    with pytest.raises(ValueError):
+        ModelPackager('lzma')
+
+
+def test_protected_roundtrip(tmp_path, model_dir):
+    protector = PackageProtector()
+    package = tmp_path / 'modelo.zip'
+    ModelPackager().export_model(str(model_dir), str(package),
+                                 dict(PACKAGE_INFO, protection=protector.protection_info()), protector)
+
+    with zipfile.ZipFile(package) as zipf:
+        assert zipf.read('config.json') != (model_dir / 'config.json').read_bytes()
+        package_info, _ = ModelPackager.read_package_info(zipf)
+    reader = PackageProtector.from_protection_info(package_info['protection'])
+
+    _import(package, tmp_path / 'importado', reader)
+    assert _read_tree(tmp_path / 'importado') == _read_tree(model_dir)
+
+
+def test_protected_import_removes_tampered_file(tmp_path, model_dir):
+    protector = PackageProtector()
+    package = tmp_path / 'modelo.zip'
+    ModelPackager().export_model(str(model_dir), str(package), PACKAGE_INFO, protector)
+
+    # Se reescribe el paquete con un byte alterado en config.json
+    tampered = tmp_path / 'alterado.zip'
+    with zipfile.ZipFile(package) as src, zipfile.ZipFile(tampered, 'w') as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == 'config.json':
+                data = bytes([data[0] ^ 1]) + data[1:]
+            dst.writestr(info, data)
+
+    target = tmp_path / 'importado'
+    with pytest.raises(ValueError):
+        _import(tampered, target, protector)
+    assert not (target / 'config.json').exists()
+
+
+def test_chunked_export_deduplicates(tmp_path, model_dir):
+    package = tmp_path / 'modelo.zip'
+    chunker = Chunker(min_size=1024, avg_size=4096, max_size=16 * 1024)
+    stats = ModelPackager().export_chunked(str(model_dir), str(package), PACKAGE_INFO, chunker)
+
+    # weights_copy.h5 no añade bloques nuevos
+    assert stats['dedup_ratio'] > 1.4
+    assert stats['stored_bytes'] < stats['bytes']
+
+    with zipfile.ZipFile(package) as zipf:
+        package_info, _ = ModelPackager.read_package_info(zipf)
+    assert package_info['storage'] == 'chunked'
+    assert package_info['files']['weights.h5']['chunks'] == package_info['files']['weights_copy.h5']['chunks']
+
+    _import(package, tmp_path / 'importado')
+    assert _read_tree(tmp_path / 'importado') == _read_tree(model_dir)
+
+
+def test_chunked_import_detects_corrupt_chunk(tmp_path, model_dir):
+    package = tmp_path / 'modelo.zip'
+    ModelPackager().export_chunked(str(model_dir), str(package), PACKAGE_INFO)
+
+    corrupt = tmp_path / 'alterado.zip'
+    with zipfile.ZipFile(package) as src, zipfile.ZipFile(corrupt, 'w') as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename.startswith('chunks/'):
+                data = data[:-1] + bytes([data[-1] ^ 1])
+            dst.writestr(info, data)
+
+    with pytest.raises(ValueError):
+        _import(corrupt, tmp_path / 'importado')
+
+
+@pytest.mark.parametrize('arcname', ['../fuera.txt', 'modelo/../../fuera.txt', '/tmp/absoluta.txt'])
+def test_import_rejects_paths_outside_target(tmp_path, arcname):
+    package = tmp_path / 'malicioso.zip'
+    _malicious_package(package, arcname)
+    target = tmp_path / 'importado'
+
+    with pytest.raises(ValueError):
+        _import(package, target)
+    assert not (tmp_path / 'fuera.txt').exists()
+
+
+def test_chunked_import_rejects_paths_outside_target(tmp_path):
+    package = tmp_path / 'malicioso.zip'
+    _malicious_package(package, 'chunks/x', dict(PACKAGE_INFO, storage='chunked',
+                                                 files={'../fuera.txt': {'size': 0, 'chunks': []}}))
+
+    with pytest.raises(ValueError):
+        _import(package, tmp_path / 'importado')
+    assert not (tmp_path / 'fuera.txt').exists()
@@ -0,0 +1,69 @@
+"""Pruebas de la ofuscación en streaming de los paquetes de modelos"""
+
+import io
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from models.package_protection import LEGACY_KEY, SCHEME_LEGACY_XOR, LegacyXorCipher, PackageProtector
+
+DATA = bytes(range(256)) * 40 + b'fin'
+
+
+def _encrypt(protector, data, arcname='model/weights.h5'):
+    dst = io.BytesIO()
+    entry = protector.encrypt_stream(io.BytesIO(data), dst, arcname)
+    return dst.getvalue(), entry
+
+
+def _decrypt(protector, data, entry, arcname='model/weights.h5'):
+    dst = io.BytesIO()
+    protector.decrypt_stream(io.BytesIO(data), dst, arcname, entry)
+    return dst.getvalue()
+
+
+def test_legacy_xor_by_blocks_matches_bytewise_xor():
+    expected = bytes(b ^ LEGACY_KEY[i % len(LEGACY_KEY)] for i, b in enumerate(DATA))
+    cipher = LegacyXorCipher()
+    blocks = [DATA[i:i + 1000] for i in range(0, len(DATA), 1000)]
+
+    assert b''.join(cipher.process(block) for block in blocks) == expected
+
+
+@pytest.mark.parametrize('block_size', [7, 1024, 1 << 20])
+def test_stream_roundtrip(block_size):
+    protector = PackageProtector(block_size=block_size)
+    encrypted, entry = _encrypt(protector, DATA)
+
+    assert encrypted != DATA
+    assert entry['size'] == len(DATA)
+    # Mismos bytes que el formato 2.0: los paquetes antiguos se siguen leyendo
+    assert encrypted == LegacyXorCipher().process(DATA)
+
+    # El importador reconstruye el protector desde package_info.json
+    reader = PackageProtector.from_protection_info(protector.protection_info())
+    assert _decrypt(reader, encrypted, entry) == DATA
+
+
+def test_stream_detects_tampering():
+    protector = PackageProtector()
+    encrypted, entry = _encrypt(protector, DATA)
+    tampered = bytearray(encrypted)
+    tampered[100] ^= 1
+
+    with pytest.raises(ValueError):
+        _decrypt(protector, bytes(tampered), entry)
+
+
+def test_legacy_package_without_hash():
+    protector = PackageProtector.from_protection_info({})
+    assert protector.protection_info() == {'scheme': SCHEME_LEGACY_XOR}
+
+    encrypted = LegacyXorCipher().process(DATA)
+    assert _decrypt(protector, encrypted, None) == DATA
+
+
+def test_unknown_scheme():
+    with pytest.raises(ValueError):
+        PackageProtector.from_protection_info({'scheme': 'shake256-hmac-sha256'})
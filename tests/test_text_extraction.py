@@ -0,0 +1,130 @@
+"""Pruebas de la extracción de CVs y de ``ExtractionRunner``"""
+
+import os
+import signal
+import multiprocessing
+
+import pytest
+
+pytest.importorskip('PyPDF2')
+
+from models.text_extraction import ExtractionRunner, extract_document, format_failures, iter_extracted_documents
+
+needs_fifo = pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="requiere os.mkfifo")
+
+
+@pytest.fixture
+def blocking_cv(tmp_path):
+    """CV que bloquea al abrirlo: una FIFO sin escritor simula un PDF que cuelga a PyPDF2"""
+    path = tmp_path / 'bloqueado.txt'
+    os.mkfifo(path)
+    return str(path)
+
+
+def _extraction_children():
+    return [p for p in multiprocessing.active_children() if p.name == 'cv-extraction']
+
+
+def test_extract_document_text(tmp_path):
+    path = tmp_path / 'cv.txt'
+    path.write_text('  Ingeniero de software con experiencia  ', encoding='utf-8')
+
+    document = extract_document(str(path), max_chars=9)
+    assert document['status'] == 'success'
+    assert document['text'] == 'Ingeniero'
+    assert document['truncated'] is True
+    assert document['size'] == path.stat().st_size
+    assert document['pages'] is None
+
+
+@pytest.mark.parametrize('name, content, reason', [
+    ('vacio.txt', b'', 'empty'),
+    ('roto.pdf', b'esto no es un PDF', 'corrupt'),
+])
+def test_extract_document_failures(tmp_path, name, content, reason):
+    path = tmp_path / name
+    path.write_bytes(content)
+
+    document = extract_document(str(path))
+    assert document['status'] == 'failed'
+    assert document['reason'] == reason
+    assert document['sha256'] is not None
+
+
+def test_extract_document_missing_file(tmp_path):
+    document = extract_document(str(tmp_path / 'no_existe.pdf'))
+    assert document['reason'] == 'unreadable'
+    assert document['sha256'] is None
+
+
+def test_format_failures():
+    documents = [
+        {'path': '/cvs/a.pdf', 'status': 'success'},
+        {'path': '/cvs/b.pdf', 'status': 'failed', 'reason': 'timeout', 'error': 'Sin terminar tras 5s'},
+        {'path': '/cvs/c.txt', 'status': 'failed', 'reason': 'empty', 'error': 'archivo sin contenido'},
+    ]
+    assert format_failures(documents[:1]) == []
+    assert format_failures(documents, limit=1) == [
+        "⚠️ 2 CVs sin texto: 1 tiempo de extracción agotado, 1 archivo sin contenido",
+        "   • b.pdf — tiempo de extracción agotado: Sin terminar tras 5s",
+        "   … y 1 más",
+    ]
+
+
+def test_runner_extracts_in_processes(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'cv_{i}.txt'
+        path.write_text(f'curriculum {i}', encoding='utf-8')
+        paths.append(str(path))
+
+    documents = list(ExtractionRunner(max_workers=2).iter_documents(paths))
+    assert sorted(document['text'] for document in documents) == ['curriculum 0', 'curriculum 1', 'curriculum 2']
+    assert _extraction_children() == []
+
+
+@needs_fifo
+def test_runner_timeout_does_not_block_batch(tmp_path, blocking_cv):
+    ok = tmp_path / 'cv.txt'
+    ok.write_text('curriculum', encoding='utf-8')
+
+    documents = {document['path']: document
+                 for document in iter_extracted_documents([blocking_cv, str(ok)], max_workers=1, timeout=1)}
+    assert documents[blocking_cv]['status'] == 'failed'
+    assert documents[blocking_cv]['reason'] == 'timeout'
+    # El proceso colgado se sustituye y el resto del lote se extrae
+    assert documents[str(ok)]['text'] == 'curriculum'
+    assert _extraction_children() == []
+
+
+@needs_fifo
+def test_runner_reports_crashed_process(blocking_cv):
+    killed = []
+
+    def kill_busy_worker():
+        # El trabajador queda bloqueado en la FIFO; se mata como si PyPDF2 hubiera abortado
+        if not killed:
+            for process in _extraction_children():
+                os.kill(process.pid, signal.SIGKILL)
+                killed.append(process.pid)
+        return False
+
+    documents = list(ExtractionRunner(max_workers=1, timeout=None).iter_documents(
+        [blocking_cv], should_stop=kill_busy_worker))
+    assert killed
+    assert [(document['status'], document['reason']) for document in documents] == [('failed', 'crashed')]
+    assert _extraction_children() == []
+
+
+@needs_fifo
+def test_runner_stop_kills_busy_workers(blocking_cv):
+    calls = []
+
+    def should_stop():
+        calls.append(1)
+        return len(calls) > 2
+
+    documents = list(ExtractionRunner(max_workers=2, timeout=None).iter_documents(
+        [blocking_cv, blocking_cv], should_stop=should_stop))
+    assert documents == []
+    assert _extraction_children() == []
@@ -0,0 +1,153 @@
+"""Pruebas de la cola persistente de trabajos de entrenamiento"""
+
+import os
+
+import pytest
+
+from models.training_jobs import DEFAULT_RESOURCES, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(tmp_path / 'jobs.db', tmp_path / 'jobs')
+
+
+@pytest.fixture
+def folders(tmp_path):
+    folder = tmp_path / 'ingenieria'
+    folder.mkdir()
+    return {'ingenieria': str(folder)}
+
+
+def test_submit_defaults(store, folders):
+    job_id = store.submit('modelo', 'dl', folders, {'model_type': 'bert', 'epochs': 3})
+    job = store.get(job_id)
+
+    assert job['state'] == 'queued'
+    assert job['folders'] == folders
+    assert job['params'] == {'model_type': 'bert', 'epochs': 3}
+    assert (job['cpus'], job['memory_mb']) == DEFAULT_RESOURCES['bert']
+    assert job['attempts'] == 0
+    assert job['cancel_requested'] is False
+    assert job['log_path'].startswith(store.job_dir(job_id))
+
+
+@pytest.mark.parametrize('name, kind, use_folders', [
+    ('modelo', 'rl', True),
+    ('', 'ml', True),
+    ('modelo', 'ml', False),
+])
+def test_submit_validation(store, folders, name, kind, use_folders):
+    with pytest.raises(ValueError):
+        store.submit(name, kind, folders if use_folders else {})
+
+
+def test_submit_rejects_missing_folder(store, tmp_path):
+    with pytest.raises(ValueError):
+        store.submit('modelo', 'ml', {'salud': str(tmp_path / 'no_existe')})
+
+
+def test_queue_order_by_priority_then_age(store, folders):
+    first = store.submit('a', 'ml', folders)
+    urgent = store.submit('b', 'ml', folders, priority=5)
+    last = store.submit('c', 'ml', folders)
+
+    assert [job['id'] for job in store.next_queued()] == [urgent, first, last]
+    store.set_priority(last, 10)
+    assert store.next_queued()[0]['id'] == last
+
+
+def test_run_and_finish(store, folders):
+    job_id = store.submit('modelo', 'ml', folders)
+    store.mark_running(job_id, 1234)
+    job = store.get(job_id)
+    assert (job['state'], job['pid'], job['attempts']) == ('running', 1234, 1)
+    assert store.next_queued() == []
+
+    store.mark_done(job_id, 'finished', 'Entrenamiento completado', {'accuracy': 0.9})
+    job = store.get(job_id)
+    assert (job['state'], job['pid']) == ('finished', None)
+    assert job['result'] == {'accuracy': 0.9}
+    assert job['finished_at'] is not None
+    assert store.counts() == {'finished': 1}
+
+
+def test_cancel_queued_job(store, folders):
+    job_id = store.submit('modelo', 'ml', folders)
+
+    # Un trabajo en cola se cancela al instante; no hay proceso que terminar
+    assert store.request_cancel(job_id) is False
+    assert store.get(job_id)['state'] == 'cancelled'
+    assert store.next_queued() == []
+
+
+def test_cancel_running_job(store, folders):
+    job_id = store.submit('modelo', 'ml', folders)
+    store.mark_running(job_id, 1234)
+
+    assert store.request_cancel(job_id) is True
+    job = store.get(job_id)
+    assert job['state'] == 'running'
+    assert job['cancel_requested'] is True
+
+
+def test_requeue_after_interruption(store, folders):
+    job_id = store.submit('modelo', 'dl', folders, {'model_type': 'lstm'})
+    store.mark_running(job_id, 1234)
+
+    store.requeue(job_id, 'Interrumpido', params={'model_type': 'lstm', 'resume': True})
+    job = store.get(job_id)
+    assert (job['state'], job['pid'], job['message']) == ('queued', None, 'Interrumpido')
+    assert job['params']['resume'] is True
+    # El contador de intentos se conserva para limitar los reintentos automáticos
+    assert job['attempts'] == 1
+
+
+def test_retry_only_finished_jobs(store, folders):
+    job_id = store.submit('modelo', 'ml', folders)
+    assert store.retry(job_id) is False
+
+    store.mark_running(job_id, 1234)
+    store.mark_done(job_id, 'failed', 'Error')
+    assert store.retry(job_id) is True
+    job = store.get(job_id)
+    assert (job['state'], job['attempts'], job['message']) == ('queued', 0, None)
+    assert store.retry(9999) is False
+
+
+def test_list_and_delete_finished(store, folders):
+    done = store.submit('a', 'ml', folders)
+    queued = store.submit('b', 'ml', folders)
+    store.mark_done(done, 'finished')
+
+    assert [job['id'] for job in store.list_jobs()] == [queued, done]
+    assert [job['id'] for job in store.list_jobs(states=['queued'])] == [queued]
+    assert [job['id'] for job in store.list_jobs(limit=1)] == [queued]
+    assert store.delete_finished() == 1
+    assert [job['id'] for job in store.list_jobs()] == [queued]
+
+
+def test_read_log_tail(store, folders):
+    job_id = store.submit('modelo', 'ml', folders)
+    assert store.read_log(job_id) == ''
+
+    os.makedirs(store.job_dir(job_id))
+    with open(store.log_path(job_id), 'w', encoding='utf-8') as f:
+        f.write('inicio\n' + 'x' * 100 + '\nfin\n')
+    assert store.read_log(job_id, max_bytes=4) == 'fin\n'
+
+
+def test_scheduler_lease(store):
+    assert store.scheduler_alive() is False
+    assert store.acquire_lease('interfaz') is True
+    assert store.acquire_lease('cli') is False
+    assert store.acquire_lease('interfaz') is True
+    assert store.scheduler_alive() is True
+
+    # Un latido vencido permite que otro planificador tome el relevo
+    assert store.acquire_lease('cli', ttl=0) is True
+
+    store.release_lease('interfaz')
+    assert store.scheduler_alive() is True
+    store.release_lease('cli')
+    assert store.scheduler_alive() is False
@@ -0,0 +1,114 @@
+"""Pruebas de la detección y clasificación de CVs en carpetas vigiladas"""
+
+import os
+
+import pytest
+
+pytest.importorskip('joblib')
+pytest.importorskip('PyPDF2')
+
+from models.text_extraction import ExtractionRunner
+from models.watch_folder import FolderWatcher
+
+
+class MemorySink:
+    """Sink en memoria que cuenta las consultas de archivos procesados"""
+
+    def __init__(self):
+        self.rows = []
+        self.queries = 0
+
+    def is_processed(self, path, size, mtime_ns):
+        self.queries += 1
+        return any((row['path'], row['size'], row['mtime_ns']) == (path, size, mtime_ns) for row in self.rows)
+
+    def write(self, rows):
+        self.rows.extend(rows)
+
+    def close(self):
+        pass
+
+
+class FakeClassifier:
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, texts):
+        self.batches.append(texts)
+        return [{'predicted_profession': 'Ingeniero', 'confidence': 0.9, 'confidence_level': 'Alta'}
+                for _ in texts]
+
+
+def _watcher(folder, sink, **kwargs):
+    watcher = FolderWatcher([str(folder)], sink, model_name='modelo', settle_seconds=0,
+                            use_watchdog=False, **kwargs)
+    watcher.classifier = FakeClassifier()
+    watcher.model_label = 'modelo'
+    return watcher
+
+
+def _write(folder, name, text):
+    path = folder / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def _cycle(watcher, paths=None):
+    """Una vuelta del bucle principal: detectar, esperar a que se asienten y clasificar"""
+    watcher._update_pending(watcher._candidates() if paths is None else paths)
+    ready = watcher._update_pending([])
+    if ready:
+        watcher._process(ExtractionRunner(max_workers=1, timeout=30), ready)
+    return ready
+
+
+def test_classifies_and_reports_extraction_errors(tmp_path):
+    sink = MemorySink()
+    watcher = _watcher(tmp_path, sink)
+    good = _write(tmp_path, 'bueno.txt', 'Ingeniero de software')
+    broken = tmp_path / 'roto.pdf'
+    broken.write_bytes(b'no es un pdf')
+
+    assert len(_cycle(watcher)) == 2
+    rows = {row['path']: row for row in sink.rows}
+    assert rows[good]['status'] == 'ok'
+    assert rows[str(broken)]['status'] == 'error'
+    assert rows[str(broken)]['message']
+    # El texto vacío del PDF dañado no llega al modelo
+    assert watcher.classifier.batches == [['Ingeniero de software']]
+    assert not watcher._pending
+
+
+def test_polling_skips_processed_files_without_querying_sink(tmp_path):
+    sink = MemorySink()
+    watcher = _watcher(tmp_path, sink)
+    _write(tmp_path, 'cv.txt', 'Contadora con experiencia')
+    _cycle(watcher)
+
+    queries = sink.queries
+    assert _cycle(watcher) == []
+    assert sink.queries == queries
+
+
+def test_empty_files_leave_pending_until_they_change(tmp_path):
+    sink = MemorySink()
+    watcher = _watcher(tmp_path, sink)
+    path = _write(tmp_path, 'copiando.txt', '')
+
+    assert _cycle(watcher) == []
+    assert not watcher._pending
+    assert _cycle(watcher) == []
+
+    _write(tmp_path, 'copiando.txt', 'Abogado')
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert [path for path, _, _ in _cycle(watcher)] == [path]
+
+
+def test_watchdog_overflow_is_requeued(tmp_path):
+    watcher = _watcher(tmp_path, MemorySink(), max_pending=1)
+    watcher.use_watchdog = True
+    paths = [_write(tmp_path, f"cv{i}.txt", 'texto') for i in range(3)]
+
+    watcher._update_pending(paths)
+    assert list(watcher._pending) == paths[:1]
+    assert watcher._events == set(paths[1:])